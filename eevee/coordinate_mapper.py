@@ -11,6 +11,9 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
+# Used when no database_path is given; the offline benchmark points it at a scratch file
+DEFAULT_DATABASE_PATH = Path(__file__).parent / "coordinate_map.db"
+
 @dataclass
 class CoordinateEntry:
     """Represents a single coordinate-screenshot mapping"""
@@ -39,10 +42,10 @@ class CoordinateMapper:
         Initialize coordinate mapper with SQLite database
         
         Args:
-            database_path: Path to SQLite database file (defaults to eevee/coordinate_map.db)
+            database_path: Path to SQLite database file (defaults to DEFAULT_DATABASE_PATH, eevee/coordinate_map.db)
         """
         if database_path is None:
-            database_path = Path(__file__).parent / "coordinate_map.db"
+            database_path = DEFAULT_DATABASE_PATH
         
         self.database_path = database_path
         self.database_path.parent.mkdir(parents=True, exist_ok=True)
@@ -80,6 +80,7 @@ class EeveeAgent:
         self.circuit_breaker_reset_time = 300  # 5 minutes
         self.last_failure_time = 0
         self.circuit_breaker_open = False
+        self._api_state_lock = threading.Lock()  # the episode review thread may record failures too
         
         # ============== ENHANCED NAVIGATION INTELLIGENCE ==============
         # Core navigation tracking system for 80%+ efficiency target
@@ -160,17 +161,21 @@ class EeveeAgent:
             print(f" Failed to initialize LLM API: {e}")
             raise
         
-        # Initialize memory system (now mandatory with Neo4j)
+        # Initialize memory system (Neo4j is mandatory unless disabled for offline runs)
         try:
             from memory_system import MemorySystem
-            print(" Initializing memory system with mandatory Neo4j...")
-            self.memory = MemorySystem(self.memory_session, enable_neo4j=True)
-            
-            # Test Neo4j connection
-            if not self._test_neo4j_connection():
-                raise Exception("Neo4j connection test failed - Neo4j is required for operation")
-            
-            print(" Memory system with Neo4j initialized successfully")
+            if not self.enable_neo4j:
+                print(" Initializing memory system without Neo4j (enable_neo4j=False)")
+                self.memory = MemorySystem(self.memory_session, enable_neo4j=False)
+            else:
+                print(" Initializing memory system with mandatory Neo4j...")
+                self.memory = MemorySystem(self.memory_session, enable_neo4j=True)
+                
+                # Test Neo4j connection
+                if not self._test_neo4j_connection():
+                    raise Exception("Neo4j connection test failed - Neo4j is required for operation")
+                
+                print(" Memory system with Neo4j initialized successfully")
         except ImportError as e:
             print(f" CRITICAL: MemorySystem not available: {e}")
             print("Neo4j memory system is required for operation")
@@ -361,31 +366,35 @@ class EeveeAgent:
         current_time = time.time()
         
         # Reset circuit breaker if enough time has passed
-        if self.circuit_breaker_open and (current_time - self.last_failure_time) > self.circuit_breaker_reset_time:
-            self.circuit_breaker_open = False
-            self.api_failure_count = 0
-            if self.verbose:
-                print(" Circuit breaker reset - API calls resumed")
-        
-        return self.circuit_breaker_open
+        with self._api_state_lock:
+            if self.circuit_breaker_open and (current_time - self.last_failure_time) > self.circuit_breaker_reset_time:
+                self.circuit_breaker_open = False
+                self.api_failure_count = 0
+                if self.verbose:
+                    print(" Circuit breaker reset - API calls resumed")
+            
+            return self.circuit_breaker_open
     
     def _record_api_success(self):
         """Record successful API call and reset failure count"""
-        if self.api_failure_count > 0:
-            self.api_failure_count = 0
-            if self.verbose:
-                print(" API success - failure count reset")
+        with self._api_state_lock:
+            if self.api_failure_count > 0:
+                self.api_failure_count = 0
+                if self.verbose:
+                    print(" API success - failure count reset")
     
     def _record_api_failure(self):
         """Record API failure and update circuit breaker state"""
-        self.api_failure_count += 1
-        self.last_failure_time = time.time()
-        
-        if self.api_failure_count >= self.api_failure_threshold and not self.circuit_breaker_open:
-            self.circuit_breaker_open = True
-            if self.verbose:
-                print(f" Circuit breaker opened after {self.api_failure_count} failures")
-                print(f"   API calls suspended for {self.circuit_breaker_reset_time//60} minutes")
+        with self._api_state_lock:
+            self.api_failure_count += 1
+            self.last_failure_time = time.time()
+            opened = self.api_failure_count >= self.api_failure_threshold and not self.circuit_breaker_open
+            if opened:
+                self.circuit_breaker_open = True
+        
+        if opened and self.verbose:
+            print(f" Circuit breaker opened after {self.api_failure_count} failures")
+            print(f"   API calls suspended for {self.circuit_breaker_reset_time//60} minutes")
     
     def _detect_overworld_context(self, image_data: str) -> Dict[str, Any]:
         """
@@ -399,7 +408,7 @@ class EeveeAgent:
         """
         # First, create an ASCII grid overlay to help Gemini understand the layout
         try:
-            ascii_overlay = self._create_ascii_grid_overlay(image_data)
+            ascii_overlay = self._create_ascii_grid_overlay(image_data, grid="15x9")
         except Exception as e:
             if self.verbose:
                 print(f"️ ASCII overlay creation failed: {e}")
@@ -484,60 +493,70 @@ class EeveeAgent:
         
         return analysis
     
-    def _create_ascii_grid_overlay(self, image_data: str) -> str:
+    def _create_ascii_grid_overlay(self, image_data: str, grid: str = "8x8") -> str:
         """
-        Create an 8x8 ASCII grid overlay from the screenshot to help with navigation
+        Create an ASCII grid overlay from the screenshot to help with navigation
         
         Args:
             image_data: Base64 encoded screenshot
+            grid: Grid size as "COLSxROWS" ("8x8", or "15x10"/"15x9" for the native metatile
+                  grid, which is classified by the metatile atlas where it has learned the tile;
+                  frames the atlas cannot read fall back to 8x8)
             
         Returns:
             ASCII grid string with walkability and obstacle information
         """
         try:
-            from PIL import Image
-            from io import BytesIO
-            
-            # Decode base64 image
-            image_bytes = base64.b64decode(image_data)
-            img = Image.open(BytesIO(image_bytes))
-            img = img.convert('RGB')
-            
-            # Define grid size (8x8 for Pokemon's tile-based system)
-            GRID_SIZE = 8
+            from game_frame import GameFrame
+            from tile_grid import TileGrid, parse_grid, LEGACY_GRID
+            
+            pixels = GameFrame.from_base64(image_data).pixels
+            
+            # Native metatile grid: learned labels by hash lookup, this classifier for unknown tiles
+            atlas_analysis = None
+            if parse_grid(grid)[0] == 15:
+                from metatile_atlas import get_metatile_atlas, MAP_ROW_OFFSET
+                atlas = get_metatile_atlas()
+                atlas_analysis = atlas.analyze(pixels, classifier=self._classify_tiles_for_navigation)
+                if atlas_analysis is None:
+                    grid = LEGACY_GRID  # Not a GBA frame: 16px metatiles would not line up
+            
+            if atlas_analysis is not None:
+                engine, result = atlas.engine, atlas_analysis[0]
+                # Visited areas are keyed by 8x8 screen cell; find the one under each metatile's centre
+                height, width = pixels.shape[:2]
+                legacy_cols, legacy_rows = LEGACY_GRID
+                area_key = lambda x, y: ((x * 16 + 8) * legacy_cols // width,
+                                         (MAP_ROW_OFFSET + y * 16 + 8) * legacy_rows // height)
+            else:
+                # All tiles are measured and classified in one vectorized pass
+                engine = TileGrid(grid, classifier=self._classify_tiles_for_navigation)
+                result = engine.analyze(pixels)
+                area_key = lambda x, y: (x, y)
+            player_row, player_col = engine.player_tile
             
-            # Calculate tile dimensions
-            width, height = img.size
-            tile_width = width // GRID_SIZE
-            tile_height = height // GRID_SIZE
+            # One memory lookup per visited-area key, however many tiles share it
+            visited_areas = {}
             
             # Initialize ASCII map
             ascii_map = []
             
-            # Process each tile in the grid
-            for y in range(GRID_SIZE):
+            for y in range(engine.rows):
                 row = ""
                 
-                for x in range(GRID_SIZE):
-                    # Get tile region
-                    start_x = x * tile_width
-                    start_y = y * tile_height
-                    end_x = start_x + tile_width
-                    end_y = start_y + tile_height
-                    
-                    tile = img.crop((start_x, start_y, end_x, end_y))
-                    tile_array = np.array(tile)
-                    
-                    # Classify the tile using HSV analysis
-                    char = self._classify_tile_for_navigation(tile_array, (y, x))
+                for x in range(engine.cols):
+                    char = result.chars[y, x]
                     
                     # Mark player position at center
-                    if x == GRID_SIZE // 2 and y == GRID_SIZE // 2:
+                    if x == player_col and y == player_row:
                         char = "P"
                     
                     # Check if this area has been visited before
-                    elif self._is_area_visited(x, y):
-                        if char == ".":  # Only mark walkable areas as visited
+                    elif char == ".":
+                        key = area_key(x, y)
+                        if key not in visited_areas:
+                            visited_areas[key] = self._is_area_visited(*key)
+                        if visited_areas[key]:
                             char = "*"  # Visited walkable area
                     
                     row += char
@@ -545,10 +564,10 @@ class EeveeAgent:
                 ascii_map.append(row)
             
             # Format the output with coordinates
-            output = "  " + "".join([f"{i}" for i in range(GRID_SIZE)]) + "\n"
+            output = "  " + "".join([f"{i % 10}" for i in range(engine.cols)]) + "\n"
             
             for y, row in enumerate(ascii_map):
-                output += f"{y} {row}\n"
+                output += f"{y % 10} {row}\n"
             
             return output
             
@@ -557,12 +576,19 @@ class EeveeAgent:
                 print(f"️ ASCII grid overlay creation failed: {e}")
             return "ASCII grid creation failed"
     
-    def _classify_tile_for_navigation(self, tile_array: np.ndarray, position: tuple) -> str:
+    def _classify_tiles_for_navigation(self, mean_hsv: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
         Simple tile classification - removed hardcoded Pokemon game knowledge
         AI should learn navigation through visual reasoning, not pixel-perfect color detection
+        
+        Args:
+            mean_hsv: (rows, cols, 3) mean HSV per tile from the tile grid engine
+            
+        Returns:
+            (chars, walkable) arrays of shape (rows, cols)
         """
-        return "."  # Let AI handle navigation through visual analysis
+        shape = mean_hsv.shape[:2]
+        return np.full(shape, "."), np.ones(shape, dtype=bool)  # Let AI handle navigation through visual analysis
     
     def _is_area_visited(self, x: int, y: int) -> bool:
         """
@@ -722,11 +748,15 @@ class EeveeAgent:
             # Use SkyEmu HTTP controller
             self.controller = SkyEmuController()
             
+            # Shared RAM snapshots must come from the emulator this controller drives
+            from ram_snapshot import get_ram_snapshot_service
+            get_ram_snapshot_service().use_controller(self.controller)
+            
             # Test SkyEmu connection
             if not self.controller.is_connected():
                 print(f"️  Warning: SkyEmu server not connected")
                 print("   Make sure SkyEmu is running with HTTP server enabled")
-                print("   Default connection: localhost:8080")
+                print(f"   Connection: {self.controller.host}:{self.controller.port} (set SKYEMU_HOST / SKYEMU_PORT to change)")
         else:
             # Use standard Pokemon controller
             self.controller = PokemonController(window_title=self.window_title)
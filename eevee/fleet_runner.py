@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+Eevee Fleet Runner - parallel agent sessions across several SkyEmu emulators
+
+Launches or attaches to N SkyEmu endpoints and runs one ContinuousGameplay per
+endpoint in a process pool. Each worker gets its own session directory and
+memory session; LLM calls from all workers share one rate limiter so the
+fleet scales with emulator count until the API quota binds, and a dashboard
+in the parent aggregates per-worker progress.
+
+Usage examples:
+    # Attach to three emulators that are already running
+    python fleet_runner.py --endpoints localhost:8080,localhost:8081,localhost:8082 --max-turns 200
+
+    # Launch four emulators (one per port) and share a 60 requests/minute quota
+    python fleet_runner.py --count 4 --base-port 8080 --launch "SkyEmu --http-port {port} rom.gba" --llm-rpm 60
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+eevee_dir = Path(__file__).parent
+project_root = eevee_dir.parent
+sys.path.insert(0, str(eevee_dir))
+sys.path.append(str(project_root / "gemini-multimodal-playground" / "standalone"))
+
+
+@dataclass(frozen=True)
+class FleetEndpoint:
+    """One SkyEmu HTTP control server"""
+    host: str
+    port: int
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def __str__(self) -> str:
+        return f"{self.host}:{self.port}"
+
+
+def parse_endpoints(spec: str, default_host: str = "localhost") -> List[FleetEndpoint]:
+    """
+    Parse "host:port,host:port,port" into endpoints
+
+    Args:
+        spec: Comma-separated endpoints; a bare port uses `default_host`
+        default_host: Host for bare ports
+
+    Returns:
+        Endpoints in the given order
+    """
+    endpoints = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        host, _, port = item.rpartition(":")
+        endpoints.append(FleetEndpoint(host or default_host, int(port)))
+    return endpoints
+
+
+class SharedRateLimiter:
+    """
+    Request-per-minute limit shared by every process in the fleet
+
+    Generic cell rate algorithm over shared memory: each acquire() reserves
+    the next free slot under a process-shared lock and sleeps outside it, so
+    waiting workers never hold the lock. Up to `burst` calls may go out back
+    to back after an idle period. Must be handed to workers when they are
+    created (pool initializer), like any multiprocessing synchronization
+    primitive.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1, ctx=None):
+        """
+        Args:
+            rate_per_minute: Sustained calls per minute across all workers (0 disables limiting)
+            burst: Calls allowed back to back after being idle
+            ctx: multiprocessing context the workers are started with
+        """
+        ctx = ctx or multiprocessing.get_context("spawn")
+        self.rate_per_minute = rate_per_minute
+        self.interval = 60.0 / rate_per_minute if rate_per_minute > 0 else 0.0
+        self.burst = max(1, burst)
+        self._lock = ctx.Lock()
+        self._next_free = ctx.RawValue("d", 0.0)
+        self._calls = ctx.RawValue("q", 0)
+        self._waited = ctx.RawValue("d", 0.0)
+
+    def acquire(self) -> float:
+        """Block until a call may go out; returns the seconds waited"""
+        with self._lock:
+            self._calls.value += 1
+            if not self.interval:
+                return 0.0
+            now = time.time()
+            slot = max(self._next_free.value, now - (self.burst - 1) * self.interval)
+            self._next_free.value = slot + self.interval
+            wait = max(0.0, slot - now)
+            self._waited.value += wait
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls, waited = self._calls.value, self._waited.value
+        return {
+            "rate_per_minute": self.rate_per_minute,
+            "calls": calls,
+            "waited_seconds": round(waited, 2),
+            "avg_wait_ms": round(waited * 1000 / calls, 1) if calls else 0.0,
+        }
+
+
+# --- Worker side ---
+
+# Set in each worker process by the pool initializer
+_rate_limiter: Optional[SharedRateLimiter] = None
+_progress_queue = None
+
+
+def _init_worker(rate_limiter: Optional[SharedRateLimiter], progress_queue) -> None:
+    global _rate_limiter, _progress_queue
+    _rate_limiter = rate_limiter
+    _progress_queue = progress_queue
+
+
+def get_worker_rate_limiter() -> Optional[SharedRateLimiter]:
+    """The fleet-wide LLM rate limiter (None outside a fleet worker)"""
+    return _rate_limiter
+
+
+def report_progress(worker_id: int, turn: int, **fields) -> None:
+    """Send a progress update from a worker to the parent's dashboard"""
+    if _progress_queue is None:
+        return
+    try:
+        _progress_queue.put_nowait({"worker_id": worker_id, "turn": turn, "time": time.time(), **fields})
+    except Exception:
+        pass  # Dashboard updates are best effort
+
+
+def worker_directory(fleet_dir: Path, worker_id: int, endpoint: FleetEndpoint) -> Path:
+    return Path(fleet_dir) / f"worker_{worker_id:02d}_{endpoint.port}"
+
+
+def run_worker(worker_id: int, endpoint: FleetEndpoint, fleet_dir: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one ContinuousGameplay session against `endpoint` (executes in a pool process)
+
+    The worker works from its own directory so session runs, the fine-tuning
+    export and logs stay separate, and uses its own memory session.
+
+    Args:
+        worker_id: Index of the worker in the fleet
+        endpoint: Emulator to drive
+        fleet_dir: Fleet output directory
+        options: Gameplay options (goal, max_turns, turn_delay, model, ...)
+
+    Returns:
+        Worker summary dictionary
+    """
+    worker_dir = worker_directory(Path(fleet_dir), worker_id, endpoint)
+    worker_dir.mkdir(parents=True, exist_ok=True)
+    os.chdir(worker_dir)
+    # The controller and clients pick the emulator up from the environment
+    os.environ["SKYEMU_HOST"] = endpoint.host
+    os.environ["SKYEMU_PORT"] = str(endpoint.port)
+
+    started = time.time()
+    summary = {"worker_id": worker_id, "endpoint": str(endpoint), "worker_dir": str(worker_dir),
+               "status": "failed", "turns_completed": 0}
+    try:
+        from llm_api import get_llm_manager
+        from eevee_agent import EeveeAgent
+        from run_eevee import ContinuousGameplay, MEMORY_INTEGRATION_AVAILABLE
+
+        if _rate_limiter is not None:
+            get_llm_manager().set_rate_limiter(_rate_limiter)
+
+        memory_session = f"{options.get('memory_session', 'fleet')}_worker_{worker_id:02d}"
+        eevee = EeveeAgent(
+            window_title=options.get("window_title", "SkyEmu"),
+            model=options.get("model", "gemini-2.0-flash-exp"),
+            memory_session=memory_session,
+            verbose=options.get("verbose", False),
+            enable_neo4j=options.get("enable_neo4j", True),
+            enable_okr=options.get("enable_okr", True),
+        )
+        eevee.runs_dir = worker_dir / "runs"
+        eevee.runs_dir.mkdir(exist_ok=True)
+        if options.get("input_mode", "realtime") != "realtime" and hasattr(eevee.controller, "input_mode"):
+            eevee.controller.input_mode = options["input_mode"]
+        if options.get("enable_neo4j", True) and MEMORY_INTEGRATION_AVAILABLE:
+            from memory_integration import create_memory_enhanced_eevee
+            create_memory_enhanced_eevee(eevee, memory_session)
+
+        gameplay = ContinuousGameplay(eevee, interactive=False,
+                                      episode_review_frequency=options.get("episode_review_frequency", 100),
+                                      save_screenshots=options.get("save_screenshots", False),
+                                      checkpoint_every=options.get("checkpoint_every", 10),
+                                      savestate_budget_mb=options.get("savestate_budget_mb", 64.0))
+        gameplay.start_session(options.get("goal", "Explore Pokemon world and win battles"),
+                               options.get("max_turns", 100))
+        gameplay.turn_delay = options.get("turn_delay", 0.5)
+
+        def on_turn(turn, ai_result, execution_result):
+            report_progress(worker_id, turn,
+                            max_turns=gameplay.session.max_turns,
+                            buttons=execution_result.get("buttons_pressed") or ai_result.get("action"),
+                            success=bool(execution_result.get("success", True)),
+                            session_id=gameplay.session.session_id)
+
+        gameplay.turn_callbacks.append(on_turn)
+        session_summary = gameplay.run_continuous_loop()
+        summary.update(status=session_summary.get("status", "completed"),
+                       turns_completed=session_summary.get("turns_completed", 0),
+                       session_id=gameplay.session.session_id)
+    except (Exception, SystemExit) as e:
+        # The turn loop exits the interpreter on unrecoverable turn errors; keep the pool alive
+        print(f"❌ Fleet worker {worker_id} ({endpoint}) stopped: {e!r}")
+        summary["error"] = repr(e)
+    summary["elapsed_seconds"] = round(time.time() - started, 2)
+    return summary
+
+
+# --- Parent side ---
+
+class FleetDashboard:
+    """
+    Aggregates worker progress messages into per-worker and fleet totals
+
+    Runs a thread in the parent that drains the progress queue, prints a
+    compact table every `interval` seconds and keeps fleet_progress.json in
+    the fleet directory current.
+    """
+
+    def __init__(self, progress_queue, fleet_dir: Path, endpoints: List[FleetEndpoint],
+                 rate_limiter: Optional[SharedRateLimiter] = None, interval: float = 10.0):
+        self.queue = progress_queue
+        self.fleet_dir = Path(fleet_dir)
+        self.rate_limiter = rate_limiter
+        self.interval = interval
+        self.started = time.time()
+        self.workers: Dict[int, Dict[str, Any]] = {
+            worker_id: {"endpoint": str(endpoint), "turn": 0, "turns_seen": 0, "failures": 0,
+                        "first_update": None, "last_update": None, "finished": False, "status": "starting"}
+            for worker_id, endpoint in enumerate(endpoints)
+        }
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "FleetDashboard":
+        self._thread = threading.Thread(target=self._run, name="FleetDashboard", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.drain()
+        self.write()
+
+    def mark_finished(self, worker_id: int, status: str) -> None:
+        self.drain()
+        self.workers[worker_id].update(finished=True, status=status)
+
+    def _run(self) -> None:
+        next_print = time.time() + self.interval
+        while not self._stop.is_set():
+            self.drain(timeout=0.2)
+            if time.time() >= next_print:
+                self.print_table()
+                self.write()
+                next_print = time.time() + self.interval
+
+    def drain(self, timeout: float = 0.0) -> int:
+        """Apply every queued progress message; returns how many were read"""
+        import queue as queue_module
+        count = 0
+        while True:
+            try:
+                message = self.queue.get(timeout=timeout) if timeout and not count else self.queue.get_nowait()
+            except (queue_module.Empty, EOFError, OSError):
+                return count
+            self.update(message)
+            count += 1
+
+    def update(self, message: Dict[str, Any]) -> None:
+        worker = self.workers[message["worker_id"]]
+        worker["status"] = "running"
+        worker["turn"] = message["turn"]
+        worker["max_turns"] = message.get("max_turns")
+        worker["turns_seen"] += 1
+        worker["failures"] += 0 if message.get("success", True) else 1
+        worker["last_buttons"] = message.get("buttons")
+        worker["first_update"] = worker["first_update"] or message["time"]
+        worker["last_update"] = message["time"]
+
+    @staticmethod
+    def turns_per_minute(worker: Dict[str, Any]) -> float:
+        """Turn rate between a worker's first and last update (excludes its start-up time)"""
+        if worker["turns_seen"] < 2 or worker["last_update"] <= worker["first_update"]:
+            return 0.0
+        return (worker["turns_seen"] - 1) * 60.0 / (worker["last_update"] - worker["first_update"])
+
+    def snapshot(self) -> Dict[str, Any]:
+        workers = {worker_id: {**worker, "turns_per_minute": round(self.turns_per_minute(worker), 2)}
+                   for worker_id, worker in sorted(self.workers.items())}
+        return {
+            "elapsed_seconds": round(time.time() - self.started, 1),
+            "workers": workers,
+            "total_turns": sum(worker["turn"] for worker in workers.values()),
+            "turns_per_minute": round(sum(worker["turns_per_minute"] for worker in workers.values()), 2),
+            "active_workers": sum(1 for worker in workers.values() if not worker["finished"]),
+            "llm": self.rate_limiter.stats() if self.rate_limiter else None,
+        }
+
+    def print_table(self) -> None:
+        snapshot = self.snapshot()
+        print(f"\n📊 Fleet: {snapshot['active_workers']}/{len(self.workers)} active, "
+              f"{snapshot['total_turns']} turns, {snapshot['turns_per_minute']:.1f} turns/min "
+              f"({snapshot['elapsed_seconds']:.0f}s)")
+        for worker_id, worker in snapshot["workers"].items():
+            print(f"   #{worker_id:02d} {worker['endpoint']:<21} {worker['status']:<10} "
+                  f"turn {worker['turn']:>4}/{worker.get('max_turns') or '?'}  "
+                  f"{worker['turns_per_minute']:6.1f}/min  failures {worker['failures']}")
+        if snapshot["llm"]:
+            llm = snapshot["llm"]
+            print(f"   LLM: {llm['calls']} calls, avg wait {llm['avg_wait_ms']} ms for quota")
+
+    def write(self) -> None:
+        try:
+            with open(self.fleet_dir / "fleet_progress.json", "w") as f:
+                json.dump(self.snapshot(), f, indent=2)
+        except OSError as e:
+            print(f"⚠️ Could not write fleet progress: {e}")
+
+
+def ping_endpoint(endpoint: FleetEndpoint, timeout: float = 1.0) -> bool:
+    try:
+        with urllib.request.urlopen(f"{endpoint.url}/ping", timeout=timeout) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+
+def wait_for_endpoints(endpoints: List[FleetEndpoint], timeout: float = 30.0) -> List[FleetEndpoint]:
+    """Wait until every endpoint answers /ping; returns the ones that did"""
+    deadline = time.time() + timeout
+    pending = list(endpoints)
+    while pending and time.time() < deadline:
+        pending = [endpoint for endpoint in pending if not ping_endpoint(endpoint)]
+        if pending:
+            time.sleep(0.5)
+    for endpoint in pending:
+        print(f"⚠️ SkyEmu at {endpoint} did not respond to /ping")
+    return [endpoint for endpoint in endpoints if endpoint not in pending]
+
+
+def launch_emulators(command_template: str, endpoints: List[FleetEndpoint], log_dir: Path) -> List[subprocess.Popen]:
+    """
+    Start one emulator per endpoint
+
+    Args:
+        command_template: Shell-style command; {port} and {host} are substituted
+        endpoints: Endpoints to launch (host is normally localhost)
+        log_dir: Directory for each emulator's stdout/stderr log
+
+    Returns:
+        Started processes
+    """
+    processes = []
+    for endpoint in endpoints:
+        command = shlex.split(command_template.format(port=endpoint.port, host=endpoint.host))
+        log_file = open(Path(log_dir) / f"skyemu_{endpoint.port}.log", "w")
+        processes.append(subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT))
+        print(f"🚀 Launched SkyEmu for {endpoint} (pid {processes[-1].pid})")
+    return processes
+
+
+def run_fleet(endpoints: List[FleetEndpoint], options: Dict[str, Any], fleet_dir: Path,
+              worker: Callable[..., Dict[str, Any]] = run_worker,
+              rate_limiter: Optional[SharedRateLimiter] = None,
+              dashboard_interval: float = 10.0) -> Dict[str, Any]:
+    """
+    Run `worker(worker_id, endpoint, fleet_dir, options)` once per endpoint in a process pool
+
+    Args:
+        endpoints: Emulators to drive, one worker each
+        options: Options passed to every worker
+        fleet_dir: Output directory (per-worker directories are created below it)
+        worker: Top-level worker function (run_worker by default)
+        rate_limiter: Shared LLM limiter; created with the spawn context if needed
+        dashboard_interval: Seconds between dashboard prints
+
+    Returns:
+        Fleet summary with per-worker results and the final dashboard snapshot
+    """
+    fleet_dir = Path(fleet_dir).resolve()
+    fleet_dir.mkdir(parents=True, exist_ok=True)
+    ctx = multiprocessing.get_context("spawn")
+    progress_queue = ctx.Queue()
+    dashboard = FleetDashboard(progress_queue, fleet_dir, endpoints, rate_limiter, dashboard_interval).start()
+
+    results = []
+    started = time.time()
+    try:
+        with ProcessPoolExecutor(max_workers=len(endpoints), mp_context=ctx,
+                                 initializer=_init_worker, initargs=(rate_limiter, progress_queue)) as pool:
+            futures = {pool.submit(worker, worker_id, endpoint, str(fleet_dir), options): worker_id
+                       for worker_id, endpoint in enumerate(endpoints)}
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"❌ Fleet worker {futures[future]} crashed: {e}")
+                    results.append({"worker_id": futures[future], "status": "crashed", "error": repr(e)})
+                dashboard.mark_finished(futures[future], results[-1]["status"])
+    finally:
+        dashboard.stop()
+
+    summary = {
+        "fleet_dir": str(fleet_dir),
+        "endpoints": [str(endpoint) for endpoint in endpoints],
+        "elapsed_seconds": round(time.time() - started, 2),
+        "workers": sorted(results, key=lambda result: result["worker_id"]),
+        "dashboard": dashboard.snapshot(),
+    }
+    with open(fleet_dir / "fleet_summary.json", "w") as f:
+        json.dump(summary, f, indent=2, default=str)
+    return summary
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run parallel Eevee sessions across several SkyEmu emulators")
+    parser.add_argument("--endpoints", type=str, help="Comma-separated host:port list of SkyEmu HTTP servers")
+    parser.add_argument("--count", type=int, default=2, help="Number of emulators when --endpoints is not given (default: 2)")
+    parser.add_argument("--host", type=str, default="localhost", help="Host for --count endpoints (default: localhost)")
+    parser.add_argument("--base-port", type=int, default=8080, help="First port for --count endpoints (default: 8080)")
+    parser.add_argument("--launch", type=str,
+                        help="Command that starts one emulator, with {port} placeholder (otherwise attach to running ones)")
+    parser.add_argument("--fleet-dir", type=str, help="Output directory (default: runs/fleet_<timestamp>)")
+    parser.add_argument("--goal", type=str, default="Explore Pokemon world and win battles", help="Goal for every session")
+    parser.add_argument("--max-turns", type=int, default=100, help="Turns per worker (default: 100)")
+    parser.add_argument("--turn-delay", type=float, default=0.5, help="Seconds between turns (default: 0.5)")
+    parser.add_argument("--model", type=str, default="gemini-2.0-flash-exp", help="AI model for every worker")
+    parser.add_argument("--memory-session", type=str, default="fleet",
+                        help="Memory session prefix; each worker appends _worker_NN (default: fleet)")
+    parser.add_argument("--llm-rpm", type=float, default=0,
+                        help="LLM requests per minute shared by the whole fleet (default: 0, unlimited)")
+    parser.add_argument("--llm-burst", type=int, default=1, help="LLM calls allowed back to back (default: 1)")
+    parser.add_argument("--episode-review-frequency", type=int, default=100,
+                        help="Episode review every N turns per worker (default: 100, 0 to disable)")
+    parser.add_argument("--input-mode", choices=["realtime", "frame_stepped"], default="realtime",
+                        help="Button input mode for every emulator (default: realtime)")
+    parser.add_argument("--checkpoint-every", type=int, default=10,
+                        help="Automatic in-memory checkpoint every N turns (default: 10)")
+    parser.add_argument("--savestate-budget-mb", type=float, default=64.0,
+                        help="Savestate memory budget per worker; 0 disables checkpoints (default: 64)")
+    parser.add_argument("--save-screenshots", action="store_true", help="Persist raw screenshots for every worker")
+    parser.add_argument("--dashboard-interval", type=float, default=10.0, help="Seconds between dashboard updates")
+    parser.add_argument("--verbose", action="store_true", help="Verbose worker output")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    if args.endpoints:
+        endpoints = parse_endpoints(args.endpoints, default_host=args.host)
+    else:
+        endpoints = [FleetEndpoint(args.host, args.base_port + i) for i in range(args.count)]
+    if len(set(endpoints)) != len(endpoints):
+        print("❌ Each fleet worker needs its own emulator endpoint")
+        sys.exit(1)
+
+    fleet_dir = Path(args.fleet_dir or eevee_dir / "runs" / f"fleet_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    fleet_dir.mkdir(parents=True, exist_ok=True)
+
+    emulators = launch_emulators(args.launch, endpoints, fleet_dir) if args.launch else []
+    try:
+        endpoints = wait_for_endpoints(endpoints, timeout=60.0 if emulators else 5.0)
+        if not endpoints:
+            print("❌ No SkyEmu endpoints reachable")
+            sys.exit(1)
+
+        rate_limiter = SharedRateLimiter(args.llm_rpm, burst=args.llm_burst) if args.llm_rpm > 0 else None
+        options = {
+            "goal": args.goal,
+            "max_turns": args.max_turns,
+            "turn_delay": args.turn_delay,
+            "model": args.model,
+            "memory_session": args.memory_session,
+            "episode_review_frequency": args.episode_review_frequency,
+            "input_mode": args.input_mode,
+            "checkpoint_every": args.checkpoint_every,
+            "savestate_budget_mb": args.savestate_budget_mb,
+            "save_screenshots": args.save_screenshots,
+            "verbose": args.verbose,
+        }
+        print(f"🚀 Fleet of {len(endpoints)} workers -> {fleet_dir}")
+        if rate_limiter:
+            print(f"⏱️  Shared LLM quota: {args.llm_rpm:g} requests/minute (burst {args.llm_burst})")
+
+        summary = run_fleet(endpoints, options, fleet_dir, rate_limiter=rate_limiter,
+                            dashboard_interval=args.dashboard_interval)
+        dashboard = summary["dashboard"]
+        print(f"\n✅ Fleet finished in {summary['elapsed_seconds']:.0f}s: {dashboard['total_turns']} turns, "
+              f"{dashboard['turns_per_minute']:.1f} turns/min")
+        for result in summary["workers"]:
+            print(f"   #{result['worker_id']:02d} {result.get('endpoint', '?')}: {result['status']}, "
+                  f"{result.get('turns_completed', 0)} turns")
+    except KeyboardInterrupt:
+        print("\n⏹️  Fleet interrupted")
+    finally:
+        for process in emulators:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Frame Fingerprinting for Eevee
+Exact and perceptual hashes of decoded frames, plus a small ring buffer that
+lets unchanged screens (dialogue boxes, walking into a wall) reuse the visual
+analysis of an earlier turn instead of paying for another vision call
+"""
+
+import copy
+import hashlib
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+# dHash compares horizontally adjacent cells of a 9x8 grayscale thumbnail -> 64 bits
+DHASH_SIZE = (9, 8)
+
+
+@dataclass(frozen=True)
+class FrameFingerprint:
+    """Exact digest of the decoded pixels and a 64-bit perceptual difference hash"""
+    exact: bytes
+    perceptual: int
+
+    def distance(self, other: "FrameFingerprint") -> int:
+        """Hamming distance between the perceptual hashes (0 = perceptually identical)"""
+        return bin(self.perceptual ^ other.perceptual).count("1")
+
+
+def fingerprint_image(image: Image.Image) -> FrameFingerprint:
+    """
+    Fingerprint a decoded frame
+
+    The exact hash covers the decoded RGB pixels, so two PNG encodings of the
+    same screen still match. The perceptual hash is a difference hash over a
+    box-filtered grayscale thumbnail, which ignores small changes such as a
+    blinking text cursor.
+
+    Args:
+        image: Decoded frame (any PIL mode)
+
+    Returns:
+        FrameFingerprint
+    """
+    rgb = image if image.mode == "RGB" else image.convert("RGB")
+    exact = hashlib.blake2b(rgb.tobytes(), digest_size=16).digest()
+
+    cells = np.asarray(rgb.convert("L").resize(DHASH_SIZE, Image.BOX))
+    bits = cells[:, 1:] > cells[:, :-1]  # 8 rows x 8 comparisons, row-major, first bit most significant
+    perceptual = int.from_bytes(np.packbits(bits).tobytes(), "big")
+    return FrameFingerprint(exact=exact, perceptual=perceptual)
+
+
+def fingerprint_frame(frame) -> FrameFingerprint:
+    """Fingerprint a GameFrame, caching the result on the frame"""
+    fingerprint = getattr(frame, "_fingerprint", None)
+    if fingerprint is None:
+        fingerprint = fingerprint_image(frame.image)
+        frame._fingerprint = fingerprint
+    return fingerprint
+
+
+class FrameAnalysisCache:
+    """
+    Ring buffer of recent frame fingerprints and their analysis results
+
+    A lookup matches a recent entry exactly (same pixels) or perceptually
+    (dHash within `max_distance` bits), and only when the RAM context - map
+    and player position - is the same, so a reused result never describes a
+    different spot than the one the player is standing on.
+    """
+
+    def __init__(self, capacity: int = 8, max_distance: int = 2):
+        """
+        Args:
+            capacity: Number of recent frames remembered
+            max_distance: Largest perceptual hash distance treated as the same screen (-1 disables perceptual hits)
+        """
+        self.capacity = capacity
+        self.max_distance = max_distance
+        self._entries: deque = deque(maxlen=capacity)  # (fingerprint, context, result), oldest first
+
+        # Metrics
+        self.counts = Counter()
+        self.last_status: Optional[str] = None
+
+    def lookup(self, fingerprint: FrameFingerprint, context: Any = None) -> Tuple[Optional[Dict], str]:
+        """
+        Find a cached result for this frame
+
+        Args:
+            fingerprint: Fingerprint of the current frame
+            context: Hashable RAM context the result must share (e.g. map and position)
+
+        Returns:
+            (copy of the cached result or None, status) where status is "exact", "perceptual" or "miss"
+        """
+        best = None
+        for entry in reversed(self._entries):  # newest first
+            cached_fingerprint, cached_context, result = entry
+            if cached_context != context:
+                continue
+            if cached_fingerprint.exact == fingerprint.exact:
+                best = ("exact", result)
+                break
+            if best is None and self.max_distance >= 0 and fingerprint.distance(cached_fingerprint) <= self.max_distance:
+                best = ("perceptual", result)
+
+        status, result = best if best else ("miss", None)
+        self.counts[status] += 1
+        self.last_status = status
+        return (copy.deepcopy(result) if result is not None else None), status
+
+    def store(self, fingerprint: FrameFingerprint, result: Dict, context: Any = None) -> None:
+        """Remember the analysis of a frame (the oldest entry drops out when full)"""
+        self._entries.append((fingerprint, context, copy.deepcopy(result)))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = sum(self.counts.values())
+        hits = self.counts["exact"] + self.counts["perceptual"]
+        return {
+            "lookups": lookups,
+            "exact_hits": self.counts["exact"],
+            "perceptual_hits": self.counts["perceptual"],
+            "misses": self.counts["miss"],
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "last_status": self.last_status,
+            "entries": len(self._entries),
+        }
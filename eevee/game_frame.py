@@ -0,0 +1,154 @@
+"""
+In-memory game frames for Eevee
+Carries a screenshot through capture -> overlay -> LLM without touching disk,
+decoding the PNG at most once, plus an optional background sink for
+persisting screenshots
+"""
+
+import atexit
+import base64
+import queue
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Optional, Dict, Any, Union
+
+from PIL import Image
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class GameFrame:
+    """
+    One captured emulator frame
+
+    Holds the encoded bytes exactly as SkyEmu sent them. The decoded PIL image,
+    pixel array and base64 string are computed on first access and cached, so
+    every consumer in a turn shares a single decode.
+    """
+
+    def __init__(self, encoded: bytes, format: str = "png", captured_at: float = None):
+        self.encoded = encoded
+        self.format = format
+        self.captured_at = captured_at if captured_at is not None else time.time()
+        self._image: Optional[Image.Image] = None
+        self._pixels = None
+        self._base64: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_base64(cls, data: str, format: str = "png") -> "GameFrame":
+        """Wrap an already base64-encoded screenshot"""
+        frame = cls(base64.b64decode(data), format=format)
+        frame._base64 = data
+        return frame
+
+    @classmethod
+    def from_image(cls, image: Image.Image, format: str = "png") -> "GameFrame":
+        """Wrap a decoded PIL image (encodes it once)"""
+        buffer = BytesIO()
+        image.save(buffer, format=format.upper())
+        frame = cls(buffer.getvalue(), format=format)
+        frame._image = image.convert('RGB')
+        return frame
+
+    @property
+    def image(self) -> Image.Image:
+        """Decoded RGB image (decoded once, treat as read-only)"""
+        if self._image is None:
+            with self._lock:
+                if self._image is None:
+                    self._image = Image.open(BytesIO(self.encoded)).convert('RGB')
+        return self._image
+
+    @property
+    def pixels(self):
+        """Decoded (height, width, 3) uint8 pixel array (requires numpy)"""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for GameFrame.pixels")
+        if self._pixels is None:
+            pixels = np.asarray(self.image, dtype=np.uint8)
+            pixels.flags.writeable = False
+            self._pixels = pixels
+        return self._pixels
+
+    @property
+    def base64(self) -> str:
+        """Base64 of the original encoded bytes (no re-encode)"""
+        if self._base64 is None:
+            self._base64 = base64.b64encode(self.encoded).decode('utf-8')
+        return self._base64
+
+    @property
+    def size(self):
+        return self.image.size
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write the encoded bytes to disk synchronously"""
+        path = Path(path)
+        path.write_bytes(self.encoded)
+        return path
+
+
+class FrameSink:
+    """
+    Background writer for screenshots
+
+    submit() only enqueues; a daemon thread does the disk I/O so the turn loop
+    never waits on the filesystem. Pending writes are flushed at exit.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_pending: int = 64):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self.written = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._run, name="FrameSink", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, data: Union[GameFrame, Image.Image, bytes], filename: str) -> Path:
+        """
+        Queue bytes (or a frame's encoded bytes) for writing
+
+        A PIL image is encoded as PNG on the writer thread; it must not be
+        modified after submitting.
+
+        Returns:
+            Path the file will be written to
+        """
+        path = Path(filename)
+        if not path.is_absolute():
+            path = self.directory / path
+        payload = data.encoded if isinstance(data, GameFrame) else data
+        self._queue.put((path, payload))
+        return path
+
+    def _run(self) -> None:
+        while True:
+            path, payload = self._queue.get()
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                if isinstance(payload, Image.Image):
+                    payload.save(path, format='PNG')
+                else:
+                    path.write_bytes(payload)
+                self.written += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"⚠️ Failed to write screenshot {path}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until every queued write has finished"""
+        self._queue.join()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"written": self.written, "failed": self.failed, "pending": self._queue.qsize()}
@@ -126,9 +126,45 @@ class HealingBookmarkSystem:
             print(f"⚠️ Healing detection failed: {e}")
             return False
     
+    def record_healed_event(self, event, location_data: Dict[str, Any], session_id: str,
+                            healing_duration: float = 0.0) -> bool:
+        """
+        Bookmark a healing location from a ram_events.Healed event
+        
+        The event already establishes that the party was restored, so no RAM
+        dict comparison is needed.
+        
+        Args:
+            event: Healed event with the party before and after
+            location_data: Location info (map_id, x, y, location_name)
+            session_id: Current session identifier
+            healing_duration: Time taken for healing in seconds
+            
+        Returns:
+            bool: True if successfully bookmarked
+        """
+        ram_before = {"party_summary": self._summarize_party(event.party_before)}
+        ram_after = {"party_summary": self._summarize_party(event.party_after)}
+        return self.bookmark_healing_location(location_data, ram_before, ram_after, session_id,
+                                              healing_duration, healing_successful=True)
+    
+    @staticmethod
+    def _summarize_party(party) -> Dict[str, Any]:
+        """party_summary-style counts for a list of ram_events.PartySlot"""
+        fainted = sum(1 for slot in party if slot.hp == 0)
+        healthy = sum(1 for slot in party if slot.is_healthy)
+        return {
+            "total_pokemon": len(party),
+            "healthy_pokemon": healthy,
+            "fainted_pokemon": fainted,
+            "needs_healing": healthy < len(party),
+            "party_health_status": "healthy" if healthy == len(party) else "poor",
+        }
+    
     def bookmark_healing_location(self, location_data: Dict[str, Any], ram_before: Dict[str, Any], 
                                  ram_after: Dict[str, Any], session_id: str, 
-                                 healing_duration: float = 0.0) -> bool:
+                                 healing_duration: float = 0.0,
+                                 healing_successful: Optional[bool] = None) -> bool:
         """
         Bookmark a healing location after a healing session
         
@@ -138,13 +174,15 @@ class HealingBookmarkSystem:
             ram_after: RAM data after healing
             session_id: Current session identifier
             healing_duration: Time taken for healing in seconds
+            healing_successful: Known outcome; detected from the RAM data if omitted
             
         Returns:
             bool: True if successfully bookmarked
         """
         try:
             # Detect if healing was successful
-            healing_successful = self.detect_healing_success(ram_before, ram_after)
+            if healing_successful is None:
+                healing_successful = self.detect_healing_success(ram_before, ram_after)
             
             # Extract location information
             map_id = location_data.get("map_id", 0)
@@ -0,0 +1,253 @@
+"""
+Image Encoder for Eevee
+Encodes frames for LLM requests in the format, quality and scale that
+provider_config assigns to each provider and task, keeps every payload under
+a byte budget and caches the result per frame
+"""
+
+import base64
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image, features
+
+MIME_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+LOSSY_FORMATS = ("jpeg", "webp")
+WEBP_AVAILABLE = features.check("webp")
+WEBP_METHOD = 2  # libwebp effort 0-6: 4+ costs ~10 ms per frame for a few percent smaller payloads
+
+# Budget ladder: lossy quality drops by QUALITY_STEP down to MIN_QUALITY, then the
+# image shrinks by SCALE_STEP down to MIN_SCALE
+QUALITY_STEP = 15
+MIN_QUALITY = 40
+SCALE_STEP = 0.75
+MIN_SCALE = 0.5
+
+
+def detect_mime_type(data: bytes, default: str = "image/png") -> str:
+    """MIME type from the magic bytes of an encoded image"""
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return default
+
+
+def detect_base64_mime_type(image_data: str, default: str = "image/png") -> str:
+    """MIME type of a base64 encoded image (only the first bytes are decoded)"""
+    try:
+        return detect_mime_type(base64.b64decode(image_data[:16]), default)
+    except Exception:
+        return default
+
+
+@dataclass(frozen=True)
+class EncodingProfile:
+    """How images for one provider/task are encoded"""
+    format: str = "png"      # "png", "jpeg" or "webp"
+    quality: int = 85        # lossy formats only
+    scale: float = 1.0       # downscale factor applied before encoding
+    max_bytes: int = 0       # payload budget (0 = unlimited)
+
+    @classmethod
+    def from_dict(cls, settings: Dict[str, Any]) -> "EncodingProfile":
+        image_format = str(settings.get("format", "png")).lower().replace("jpg", "jpeg")
+        if image_format not in MIME_TYPES:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        if image_format == "webp" and not WEBP_AVAILABLE:
+            image_format = "jpeg"  # Pillow built without libwebp
+        return cls(
+            format=image_format,
+            quality=int(settings.get("quality", 85)),
+            scale=float(settings.get("scale", 1.0)),
+            max_bytes=int(settings.get("max_bytes", 0)),
+        )
+
+
+@dataclass
+class EncodedImage:
+    """Encoded payload plus the metrics recorded for it"""
+    data: bytes
+    format: str
+    quality: int
+    size: Tuple[int, int]
+    encode_ms: float
+    within_budget: bool = True
+    cached: bool = False
+    _base64: Optional[str] = None
+
+    @property
+    def mime_type(self) -> str:
+        return MIME_TYPES[self.format]
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.data)
+
+    @property
+    def base64(self) -> str:
+        if self._base64 is None:
+            self._base64 = base64.b64encode(self.data).decode("utf-8")
+        return self._base64
+
+    def describe(self) -> Dict[str, Any]:
+        """Payload metrics for logs"""
+        return {
+            "format": self.format,
+            "quality": self.quality,
+            "size": list(self.size),
+            "bytes": self.size_bytes,
+            "encode_ms": round(self.encode_ms, 3),
+            "within_budget": self.within_budget,
+            "cached": self.cached,
+        }
+
+
+class ImageEncoder:
+    """
+    Encodes images per provider/task profile with a byte budget and an LRU payload cache
+
+    Payloads are cached by the digest of the decoded pixels and the profile, so
+    the same frame (or overlay) is encoded once however often it is sent. A
+    frame already stored in the requested format at full scale is passed
+    through without re-encoding.
+    """
+
+    def __init__(self, cache_size: int = 16):
+        """
+        Args:
+            cache_size: Encoded payloads kept in memory (0 disables caching)
+        """
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Any, EncodedImage]" = OrderedDict()
+        self.last: Optional[EncodedImage] = None
+
+        # Metrics
+        self.encodes = 0
+        self.cache_hits = 0
+        self.passthroughs = 0
+        self.over_budget = 0
+        self.total_encode_ms = 0.0
+        self.total_bytes = 0
+        self.total_raw_bytes = 0
+        self.by_format: Dict[str, int] = {}
+
+    def encode(self, image, provider: Optional[str] = None, task_type: str = "screenshot_analysis",
+               profile: Optional[EncodingProfile] = None) -> EncodedImage:
+        """
+        Encode an image for an LLM request
+
+        Args:
+            image: GameFrame or PIL image
+            provider: Provider the request goes to (selects the profile)
+            task_type: Task type from TASK_MODEL_MAPPING keys (selects the profile)
+            profile: Explicit profile, overrides provider/task lookup
+
+        Returns:
+            EncodedImage (data, mime_type, base64, size_bytes, encode_ms)
+        """
+        if profile is None:
+            from provider_config import get_image_encoding_for_task
+            profile = EncodingProfile.from_dict(get_image_encoding_for_task(provider, task_type))
+
+        frame = image if hasattr(image, "encoded") else None
+        pil_image = frame.image if frame is not None else image
+        rgb = pil_image if pil_image.mode == "RGB" else pil_image.convert("RGB")
+
+        key = None
+        if self.cache_size > 0:
+            key = (hashlib.blake2b(rgb.tobytes(), digest_size=16).digest(), rgb.size, profile)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                self.last = EncodedImage(cached.data, cached.format, cached.quality, cached.size, 0.0,
+                                         cached.within_budget, cached=True, _base64=cached._base64)
+                return self.last
+
+        start = time.perf_counter()
+        if (frame is not None and getattr(frame, "format", "").lower() == profile.format
+                and profile.scale == 1.0 and (not profile.max_bytes or len(frame.encoded) <= profile.max_bytes)):
+            self.passthroughs += 1
+            result = EncodedImage(frame.encoded, profile.format, profile.quality, rgb.size, 0.0)
+        else:
+            result = self._encode_within_budget(rgb, profile)
+        result.encode_ms = (time.perf_counter() - start) * 1000
+
+        self.encodes += 1
+        self.total_encode_ms += result.encode_ms
+        self.total_bytes += result.size_bytes
+        self.total_raw_bytes += rgb.width * rgb.height * 3
+        self.by_format[result.format] = self.by_format.get(result.format, 0) + 1
+        if not result.within_budget:
+            self.over_budget += 1
+            print(f"⚠️ Image payload {result.size_bytes} bytes exceeds budget of {profile.max_bytes} bytes")
+
+        if key is not None:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        self.last = result
+        return result
+
+    def _encode_within_budget(self, image: Image.Image, profile: EncodingProfile) -> EncodedImage:
+        """Walk the quality/scale ladder until the payload fits profile.max_bytes"""
+        quality, scale = profile.quality, profile.scale
+        while True:
+            data, size = self._encode_once(image, profile.format, quality, scale)
+            if not profile.max_bytes or len(data) <= profile.max_bytes:
+                return EncodedImage(data, profile.format, quality, size, 0.0)
+            if profile.format in LOSSY_FORMATS and quality - QUALITY_STEP >= MIN_QUALITY:
+                quality -= QUALITY_STEP
+            elif scale * SCALE_STEP >= MIN_SCALE - 1e-9:
+                scale *= SCALE_STEP
+            else:
+                return EncodedImage(data, profile.format, quality, size, 0.0, within_budget=False)
+
+    @staticmethod
+    def _encode_once(image: Image.Image, image_format: str, quality: int, scale: float) -> Tuple[bytes, Tuple[int, int]]:
+        if scale != 1.0:
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            # Nearest keeps pixel art flat-coloured, which PNG compresses far better than blended edges
+            image = image.resize(size, Image.NEAREST if image_format == "png" else Image.BOX)
+        buffer = BytesIO()
+        if image_format == "png":
+            image.save(buffer, format="PNG", compress_level=6)
+        elif image_format == "jpeg":
+            image.save(buffer, format="JPEG", quality=quality)
+        else:
+            image.save(buffer, format="WEBP", quality=quality, method=WEBP_METHOD)
+        return buffer.getvalue(), image.size
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.encodes + self.cache_hits
+        return {
+            "encodes": self.encodes,
+            "cache_hits": self.cache_hits,
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0,
+            "passthroughs": self.passthroughs,
+            "over_budget": self.over_budget,
+            "by_format": dict(self.by_format),
+            "avg_bytes": round(self.total_bytes / self.encodes) if self.encodes else 0,
+            "avg_encode_ms": round(self.total_encode_ms / self.encodes, 3) if self.encodes else 0.0,
+            "compression_ratio": round(self.total_raw_bytes / self.total_bytes, 1) if self.total_bytes else 0.0,
+            "last": self.last.describe() if self.last else None,
+        }
+
+
+# Global encoder shared by everything that sends images
+_global_image_encoder = None
+
+
+def get_image_encoder() -> ImageEncoder:
+    """Get global image encoder instance"""
+    global _global_image_encoder
+    if _global_image_encoder is None:
+        _global_image_encoder = ImageEncoder()
+    return _global_image_encoder
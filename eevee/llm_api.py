@@ -8,10 +8,11 @@ import time
 import base64
 import json
 import random
+import threading
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional, Tuple, Union
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from datetime import datetime
 
 # Import debug logger at top level for clean logging
@@ -25,6 +26,7 @@ class LLMProvider(Enum):
     """Supported LLM providers"""
     GEMINI = "gemini"
     MISTRAL = "mistral"
+    STUB = "stub"
 
 class ModelCapability(Enum):
     """Model capabilities"""
@@ -42,6 +44,7 @@ class LLMResponse:
     model: Optional[str] = None
     response_time: Optional[float] = None
     tokens_used: Optional[int] = None
+    cached: bool = False  # served by the LLM response cache
 
 @dataclass
 class LLMRequest:
@@ -52,6 +55,15 @@ class LLMRequest:
     max_tokens: int = 1000
     temperature: float = 0.7
     model_preference: Optional[str] = None
+    mime_type: Optional[str] = None  # detected from image_data when not given
+
+    @property
+    def image_mime_type(self) -> str:
+        """MIME type of image_data (the encoder sends PNG, JPEG or WebP)"""
+        if self.mime_type:
+            return self.mime_type
+        from image_encoder import detect_base64_mime_type
+        return detect_base64_mime_type(self.image_data)
 
 class BaseLLMProvider(ABC):
     """Abstract base class for LLM providers"""
@@ -64,6 +76,8 @@ class BaseLLMProvider(ABC):
         self.last_failure_time = 0
         self.circuit_breaker_reset_time = config.get('circuit_breaker_reset_time', 300)
         self.api_failure_threshold = config.get('api_failure_threshold', 5)
+        # The turn loop and the background episode review call the same provider
+        self._breaker_lock = threading.Lock()
     
     @abstractmethod
     def get_available_models(self) -> Dict[str, ModelCapability]:
@@ -84,24 +98,27 @@ class BaseLLMProvider(ABC):
         """Check if circuit breaker should prevent API calls"""
         current_time = time.time()
         
-        if self.circuit_breaker_open and (current_time - self.last_failure_time) > self.circuit_breaker_reset_time:
-            self.circuit_breaker_open = False
-            self.api_failure_count = 0
-        
-        return self.circuit_breaker_open
+        with self._breaker_lock:
+            if self.circuit_breaker_open and (current_time - self.last_failure_time) > self.circuit_breaker_reset_time:
+                self.circuit_breaker_open = False
+                self.api_failure_count = 0
+            
+            return self.circuit_breaker_open
     
     def _record_api_success(self):
         """Record successful API call"""
-        if self.api_failure_count > 0:
-            self.api_failure_count = 0
+        with self._breaker_lock:
+            if self.api_failure_count > 0:
+                self.api_failure_count = 0
     
     def _record_api_failure(self):
         """Record API failure and update circuit breaker"""
-        self.api_failure_count += 1
-        self.last_failure_time = time.time()
-        
-        if self.api_failure_count >= self.api_failure_threshold:
-            self.circuit_breaker_open = True
+        with self._breaker_lock:
+            self.api_failure_count += 1
+            self.last_failure_time = time.time()
+            
+            if self.api_failure_count >= self.api_failure_threshold:
+                self.circuit_breaker_open = True
 
 class GeminiProvider(BaseLLMProvider):
     """Google Gemini API provider"""
@@ -225,7 +242,7 @@ class GeminiProvider(BaseLLMProvider):
                 
                 if request.image_data:
                     content_parts.append({
-                        "mime_type": "image/jpeg",
+                        "mime_type": request.image_mime_type,
                         "data": base64.b64decode(request.image_data)
                     })
                 
@@ -551,7 +568,7 @@ class MistralProvider(BaseLLMProvider):
                         {"type": "text", "text": request.prompt},
                         {
                             "type": "image_url",
-                            "image_url": f"data:image/jpeg;base64,{request.image_data}"
+                            "image_url": f"data:{request.image_mime_type};base64,{request.image_data}"
                         }
                     ]
                 }]
@@ -657,6 +674,62 @@ class MistralProvider(BaseLLMProvider):
         
         return []
 
+class StubProvider(BaseLLMProvider):
+    """Offline provider returning canned responses (benchmarks and tests, no API key)"""
+    
+    DEFAULT_BUTTONS = [["up"], ["right"], ["a"], ["down"], ["left"], ["b"]]
+    
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.latency = config.get('latency_ms', 0) / 1000.0
+        # Models upload time: extra latency per KB of image payload
+        self.latency_per_kb = config.get('latency_per_kb_ms', 0) / 1000.0
+        self.button_cycle = config.get('button_cycle') or self.DEFAULT_BUTTONS
+        self.call_count = 0
+    
+    def get_available_models(self) -> Dict[str, ModelCapability]:
+        """Get available stub models and their capabilities"""
+        return {"stub-model": ModelCapability.BOTH}
+    
+    def get_default_model(self, capability: ModelCapability) -> str:
+        """Get default stub model for given capability"""
+        return "stub-model"
+    
+    def call_api(self, request: LLMRequest) -> LLMResponse:
+        """Return a canned visual-analysis or strategic-decision response"""
+        start_time = time.time()
+        latency = self.latency
+        if request.image_data and self.latency_per_kb:
+            latency += self.latency_per_kb * len(request.image_data) * 3 / 4 / 1024
+        if latency:
+            time.sleep(latency)
+        
+        buttons = list(self.button_cycle[self.call_count % len(self.button_cycle)])
+        self.call_count += 1
+        
+        if request.image_data:
+            # Shape expected by VisualAnalysis._parse_movement_response
+            text = json.dumps({
+                "scene_type": "navigation",
+                "recommended_template": "ai_directed_navigation",
+                "valid_buttons": [{"key": "A", "action": "interact", "result": "stub"}],
+                "confidence": "high"
+            })
+        else:
+            # Shape expected by the strategic decision parser in run_eevee
+            text = "```json\n" + json.dumps({
+                "button_presses": buttons,
+                "reasoning": "stub provider response"
+            }) + "\n```"
+        
+        return LLMResponse(
+            text=text,
+            button_presses=buttons,
+            provider="stub",
+            model=request.model_preference or "stub-model",
+            response_time=time.time() - start_time
+        )
+
 class LLMAPIManager:
     """Main API manager that handles multiple providers and model selection"""
     
@@ -671,6 +744,18 @@ class LLMAPIManager:
         self.providers = {}
         self.current_provider = None
         
+        # Optional limiter shared with other processes (fleet mode); acquire() blocks until a call may go out
+        self.rate_limiter = None
+        
+        # Response cache (LLM_CACHE_MODE=record/replay); passthrough leaves every call to the provider
+        from llm_cache import LLMResponseCache
+        cache_config = self.config.get('cache', {})
+        self.cache = LLMResponseCache(
+            mode=cache_config.get('mode', 'passthrough'),
+            database_path=cache_config.get('path'),
+            memory_size=cache_config.get('memory_size', 256)
+        )
+        
         # Initialize providers
         self._init_providers()
         
@@ -700,6 +785,16 @@ class LLMAPIManager:
                 'circuit_breaker_reset_time': 300,
                 'api_failure_threshold': 3
             },
+            'stub': {
+                'enabled': llm_provider == 'stub',
+                'latency_ms': float(os.getenv('STUB_LLM_LATENCY_MS', '0')),
+                'latency_per_kb_ms': float(os.getenv('STUB_LLM_LATENCY_PER_KB_MS', '0'))
+            },
+            'cache': {
+                'mode': os.getenv('LLM_CACHE_MODE', 'passthrough'),
+                'path': os.getenv('LLM_CACHE_PATH') or None,
+                'memory_size': int(os.getenv('LLM_CACHE_MEMORY_SIZE', '256'))
+            },
             # Fallback provider options removed per user request
             'hybrid_mode': llm_provider == 'hybrid'
         }
@@ -720,6 +815,10 @@ class LLMAPIManager:
             except Exception as e:
                 print(f"⚠️ Failed to initialize Mistral provider: {e}")
         
+        # Offline stub provider (LLM_PROVIDER=stub) for benchmarks and tests
+        if self.config.get('stub', {}).get('enabled'):
+            self.providers['stub'] = StubProvider(self.config['stub'])
+        
         if not self.providers:
             raise ValueError("No LLM providers could be initialized. Check your API keys.")
     
@@ -730,6 +829,18 @@ class LLMAPIManager:
             return True
         return False
     
+    def set_rate_limiter(self, rate_limiter) -> None:
+        """Throttle every API call through `rate_limiter.acquire()` (None removes it)"""
+        self.rate_limiter = rate_limiter
+    
+    def set_cache_mode(self, mode: str) -> None:
+        """Switch the response cache between passthrough, record and replay"""
+        self.cache.set_mode(mode)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit ratio and tokens saved by the response cache"""
+        return self.cache.get_stats()
+    
     def get_available_providers(self) -> List[str]:
         """Get list of available provider names"""
         return list(self.providers.keys())
@@ -740,7 +851,8 @@ class LLMAPIManager:
              use_tools: bool = False,
              max_tokens: int = 1000,
              model_preference: Optional[str] = None,
-             provider_preference: Optional[str] = None) -> LLMResponse:
+             provider_preference: Optional[str] = None,
+             mime_type: Optional[str] = None) -> LLMResponse:
         """
         Make unified LLM API call
         
@@ -751,13 +863,18 @@ class LLMAPIManager:
             max_tokens: Maximum tokens for response
             model_preference: Specific model to use
             provider_preference: Specific provider to use
+            mime_type: MIME type of image_data (detected from the data if omitted)
             
         Returns:
             LLMResponse with standardized format
         """
         # Determine provider to use
         provider_name = provider_preference or self.current_provider
-        
+
+        # Stub mode answers every task offline, whatever provider the task maps to
+        if self.current_provider == 'stub':
+            provider_name = 'stub'
+
         if provider_name not in self.providers:
             # Fallback to any available provider
             if self.providers:
@@ -775,13 +892,48 @@ class LLMAPIManager:
             image_data=image_data,
             use_tools=use_tools,
             max_tokens=max_tokens,
-            model_preference=model_preference
+            model_preference=model_preference,
+            mime_type=mime_type
         )
         
-        # Make API call
         provider = self.providers[provider_name]
+        
+        # Serve from the response cache before touching the provider or the shared quota
+        cache_address = None
+        if self.cache.enabled:
+            lookup_start = time.time()
+            model = model_preference or provider.get_default_model(
+                ModelCapability.VISION if image_data else ModelCapability.TEXT)
+            cache_address = self.cache.make_key(provider_name, model, prompt, image_data, {
+                'use_tools': use_tools,
+                'max_tokens': max_tokens,
+                'temperature': request.temperature,
+                'mime_type': mime_type
+            })
+            cached = self.cache.lookup(cache_address)
+            if cached is not None:
+                cached.update(cached=True, response_time=time.time() - lookup_start)
+                return LLMResponse(**cached)
+            if self.cache.mode == 'replay':
+                print(f"⚠️ LLM cache miss in replay mode ({provider_name}/{model}) - provider not called")
+                return LLMResponse(
+                    text="",
+                    button_presses=[],
+                    error="LLM cache miss in replay mode",
+                    provider=provider_name,
+                    model=model
+                )
+        
+        # Make API call (waiting for the shared quota first, if any)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
         response = provider.call_api(request)
         
+        # Only successful responses are recorded
+        if cache_address is not None and not response.error:
+            self.cache.store(cache_address, asdict(response), prompt=prompt,
+                             provider=provider_name, model=model)
+        
         # Fallback provider functionality removed per user request
         # System will fail fast instead of falling back to different providers
         
@@ -814,7 +966,8 @@ def call_llm(prompt: str,
              use_tools: bool = False,
              max_tokens: int = 1000,
              model: Optional[str] = None,
-             provider: Optional[str] = None) -> LLMResponse:
+             provider: Optional[str] = None,
+             mime_type: Optional[str] = None) -> LLMResponse:
     """
     Convenience function for making LLM calls
     
@@ -825,6 +978,7 @@ def call_llm(prompt: str,
         max_tokens: Maximum tokens for response
         model: Specific model to use
         provider: Specific provider to use
+        mime_type: MIME type of image_data (detected from the data if omitted)
         
     Returns:
         LLMResponse with standardized format
@@ -836,7 +990,8 @@ def call_llm(prompt: str,
         use_tools=use_tools,
         max_tokens=max_tokens,
         model_preference=model,
-        provider_preference=provider
+        provider_preference=provider,
+        mime_type=mime_type
     )
 
 # Backwards compatibility functions
@@ -0,0 +1,193 @@
+"""
+LLM Response Cache for Eevee
+Content-addressed cache of provider responses, keyed by provider, model,
+prompt hash, image hash and generation config. A bounded in-memory LRU sits
+in front of a SQLite table, so recorded responses survive between runs.
+
+Modes:
+    passthrough - cache bypassed, every call goes to the provider (default)
+    record      - hits are served from the cache, misses call the provider and are stored
+    replay      - hits only; a miss returns an error response instead of calling the provider,
+                  so a run from the same savestate is reproducible and costs nothing
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+CACHE_MODES = ("passthrough", "record", "replay")
+CHARS_PER_TOKEN = 4  # rough estimate when the provider does not report usage
+
+
+def _sha256(text: Optional[str]) -> Optional[str]:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest() if text else None
+
+
+class LLMResponseCache:
+    """Two-tier (LRU + SQLite) store of LLM responses addressed by request content"""
+
+    def __init__(self, mode: str = "passthrough", database_path: Path = None, memory_size: int = 256):
+        """
+        Args:
+            mode: passthrough, record or replay
+            database_path: SQLite file (defaults to eevee/llm_cache.db)
+            memory_size: Responses kept in the in-memory LRU tier
+        """
+        if database_path is None:
+            database_path = Path(__file__).parent / "llm_cache.db"
+        self.database_path = Path(database_path)
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._database_ready = False
+        self.mode = "passthrough"
+        self.set_mode(mode)
+
+        # Metrics
+        self.lookups = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.stores = 0
+        self.replay_misses = 0
+        self.tokens_saved = 0
+        self.seconds_saved = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "passthrough"
+
+    def set_mode(self, mode: str) -> None:
+        """Switch between passthrough, record and replay"""
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode '{mode}' (expected one of {', '.join(CACHE_MODES)})")
+        self.mode = mode
+        if self.enabled and not self._database_ready:
+            self._init_database()
+
+    def _init_database(self):
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.database_path)) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    cache_key TEXT PRIMARY KEY,
+                    provider TEXT,
+                    model TEXT,
+                    prompt_hash TEXT,
+                    image_hash TEXT,
+                    response TEXT NOT NULL,
+                    tokens INTEGER DEFAULT 0,
+                    response_time REAL DEFAULT 0,
+                    hits INTEGER DEFAULT 0,
+                    created_at REAL
+                )
+            """)
+        self._database_ready = True
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt: str, image_data: Optional[str] = None,
+                 generation_config: Optional[Dict[str, Any]] = None) -> Dict[str, Optional[str]]:
+        """
+        Content address of a request
+
+        Args:
+            provider: Provider name
+            model: Model the request resolves to
+            prompt: Prompt text
+            image_data: Base64 image payload, if any
+            generation_config: use_tools, max_tokens, temperature, mime_type...
+
+        Returns:
+            dict with 'key', 'prompt_hash' and 'image_hash'
+        """
+        prompt_hash, image_hash = _sha256(prompt), _sha256(image_data)
+        identity = json.dumps({
+            "provider": provider,
+            "model": model,
+            "prompt": prompt_hash,
+            "image": image_hash,
+            "config": generation_config or {},
+        }, sort_keys=True)
+        return {"key": _sha256(identity), "prompt_hash": prompt_hash, "image_hash": image_hash}
+
+    def lookup(self, address: Dict[str, Optional[str]]) -> Optional[Dict[str, Any]]:
+        """
+        Cached response fields for a request address, or None on a miss (always None in passthrough)
+        """
+        if not self.enabled:
+            return None
+        key = address["key"]
+        with self._lock:
+            self.lookups += 1
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            else:
+                with closing(sqlite3.connect(self.database_path)) as conn, conn:
+                    row = conn.execute("SELECT response, tokens, response_time FROM llm_responses WHERE cache_key = ?",
+                                       (key,)).fetchone()
+                    if row is None:
+                        if self.mode == "replay":
+                            self.replay_misses += 1
+                        return None
+                    conn.execute("UPDATE llm_responses SET hits = hits + 1 WHERE cache_key = ?", (key,))
+                entry = {"response": row[0], "tokens": row[1], "response_time": row[2]}
+                self._remember(key, entry)
+                self.disk_hits += 1
+            self.tokens_saved += entry["tokens"]
+            self.seconds_saved += entry["response_time"] or 0.0
+        return json.loads(entry["response"])  # fresh copy: callers may mutate the response
+
+    def store(self, address: Dict[str, Optional[str]], response: Dict[str, Any], prompt: str = "",
+              provider: str = None, model: str = None) -> None:
+        """
+        Record a provider response (ignored in passthrough)
+
+        Args:
+            address: Result of make_key
+            response: LLMResponse fields
+            prompt: Prompt text, used to estimate tokens when the provider reports none
+        """
+        if not self.enabled:
+            return
+        tokens = response.get("tokens_used") or (len(prompt) + len(response.get("text") or "")) // CHARS_PER_TOKEN
+        entry = {"response": json.dumps(response), "tokens": tokens, "response_time": response.get("response_time") or 0.0}
+        with self._lock:
+            self._remember(address["key"], entry)
+            with closing(sqlite3.connect(self.database_path)) as conn, conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO llm_responses
+                    (cache_key, provider, model, prompt_hash, image_hash, response, tokens, response_time, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (address["key"], provider, model, address["prompt_hash"], address["image_hash"],
+                      entry["response"], tokens, entry["response_time"], time.time()))
+            self.stores += 1
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "mode": self.mode,
+            "lookups": self.lookups,
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.lookups - hits,
+            "replay_misses": self.replay_misses,
+            "stores": self.stores,
+            "hit_ratio": round(hits / self.lookups, 3) if self.lookups else 0.0,
+            "tokens_saved": self.tokens_saved,
+            "seconds_saved": round(self.seconds_saved, 2),
+            "memory_entries": len(self._memory),
+        }
@@ -21,6 +21,9 @@ except ImportError:
     NEO4J_MEMORY_AVAILABLE = False
     print("⚠️  Neo4j visual memory not available")
 
+# One eevee_memory_<session>.db per memory session
+DEFAULT_MEMORY_DIR = Path(__file__).parent / "memory"
+
 class MemorySystem:
     """Persistent memory system for Eevee agent context and knowledge"""
     
@@ -33,8 +36,8 @@ class MemorySystem:
             enable_neo4j: Enable Neo4j visual memory integration
         """
         self.session_name = session_name
-        self.memory_dir = Path(__file__).parent / "memory"
-        self.memory_dir.mkdir(exist_ok=True)
+        self.memory_dir = Path(DEFAULT_MEMORY_DIR)
+        self.memory_dir.mkdir(parents=True, exist_ok=True)
         
         # Database setup
         self.db_path = self.memory_dir / f"eevee_memory_{session_name}.db"
@@ -0,0 +1,360 @@
+"""
+Metatile Atlas for Eevee
+Learns what each 16x16 map tile looks like from RAM-confirmed movement
+outcomes and classifies screen tiles with one hash lookup per tile
+"""
+
+import sqlite3
+import time
+from collections import Counter
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from tile_grid import TileGrid, TileGridResult, classify_hsv
+
+SCREEN_SIZE = (240, 160)
+# The camera centres the player's metatile, so map rows start 8px below the top edge;
+# the 15x9 full metatiles between the half rows at the top and bottom are hashed
+MAP_ROW_OFFSET = 8
+ATLAS_GRID = (15, 9)
+# Shared atlas file (looked up per instance, so tests can swap it)
+DEFAULT_DATABASE_PATH = Path(__file__).parent / "metatile_atlas.db"
+
+LABEL_CHARS = {
+    "walkable": ".",
+    "blocked": "#",
+    "tree": "T",
+    "water": "~",
+    "door": "D",
+    "npc": "N",
+    "ledge": "L",
+}
+WALKABLE_LABELS = {"walkable", "door", "ledge"}
+OUTCOMES = ("walkable", "blocked", "door", "ledge")
+
+DIRECTION_OFFSETS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+DIRECTION_STEPS = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}  # RAM (dx, dy)
+
+# Odd 64-bit multipliers for the tile hash (fixed so hashes stay valid across sessions)
+_TILE_WORDS = 16 * 16 * 3 // 8
+_HASH_MULTIPLIERS = np.random.default_rng(0x4D455441).integers(1, 2**63, size=_TILE_WORDS, dtype=np.uint64) | np.uint64(1)
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, vectorized (spreads the weak low bits of the multiply-sum)"""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+@dataclass
+class TileRecord:
+    """Movement evidence and label for one tile hash"""
+    walkable: int = 0
+    blocked: int = 0
+    door: int = 0
+    ledge: int = 0
+    hint: str = ""   # HSV class of the tile when first seen ("T", "~", ...)
+    label: str = ""  # explicit label (e.g. from visual analysis); overrides the evidence
+
+    def resolve(self, min_blocked_evidence: int) -> Optional[str]:
+        """Current label, or None while the evidence is inconclusive"""
+        if self.label:
+            return self.label
+        if self.door:
+            return "door"
+        if self.ledge:
+            return "ledge"
+        if self.walkable:
+            return "walkable"
+        if self.blocked >= min_blocked_evidence:
+            return {"T": "tree", "~": "water"}.get(self.hint, "blocked")
+        return None
+
+
+class MetatileAtlas:
+    """
+    Persistent dictionary from 16x16 tile hashes to learned labels
+
+    Each turn the frame before the input is hashed tile by tile; when exactly
+    one direction was pressed, the RAM outcome labels the tile next to the
+    player: a one-tile step means walkable, a two-tile step a ledge, a map
+    change a door, and no movement blocked (trees and water keep their HSV
+    class). A single failed press can be a turn on the spot or a menu cursor
+    move, so blocked needs repeated evidence and any successful step wins.
+    Tiles the atlas knows are classified by lookup; unknown ones fall back to
+    the HSV thresholds. Hashes are of exact pixels, so they carry over between
+    sessions and maps that share a tileset.
+    """
+
+    def __init__(self, database_path: Path = None, min_blocked_evidence: int = 2, verbose: bool = False):
+        """
+        Args:
+            database_path: SQLite file (defaults to DEFAULT_DATABASE_PATH, eevee/metatile_atlas.db)
+            min_blocked_evidence: Failed presses needed before a tile is labelled blocked
+            verbose: Print newly learned labels
+        """
+        if database_path is None:
+            database_path = DEFAULT_DATABASE_PATH
+        self.database_path = Path(database_path)
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        self.min_blocked_evidence = min_blocked_evidence
+        self.verbose = verbose
+
+        self.engine = TileGrid(ATLAS_GRID, classifier=lambda mean_hsv: classify_hsv(mean_hsv))
+        self._hint_engine = TileGrid((1, 1), classifier=lambda mean_hsv: classify_hsv(mean_hsv))
+        self._records: Dict[int, TileRecord] = {}
+        self._labels: Dict[int, str] = {}
+
+        # Metrics
+        self.tile_lookups = 0
+        self.tile_hits = 0
+        self.observations = Counter()
+
+        self._init_database()
+        self._load()
+
+    def _init_database(self):
+        with closing(sqlite3.connect(self.database_path)) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS metatiles (
+                    tile_hash INTEGER PRIMARY KEY,
+                    walkable INTEGER DEFAULT 0,
+                    blocked INTEGER DEFAULT 0,
+                    door INTEGER DEFAULT 0,
+                    ledge INTEGER DEFAULT 0,
+                    hint TEXT DEFAULT '',
+                    label TEXT DEFAULT '',
+                    updated_at REAL
+                )
+            """)
+            conn.commit()
+
+    def _load(self):
+        with closing(sqlite3.connect(self.database_path)) as conn, conn:
+            rows = conn.execute("SELECT tile_hash, walkable, blocked, door, ledge, hint, label FROM metatiles").fetchall()
+        for tile_hash, walkable, blocked, door, ledge, hint, label in rows:
+            key = tile_hash & 0xFFFFFFFFFFFFFFFF  # stored as signed 64-bit
+            self._records[key] = TileRecord(walkable, blocked, door, ledge, hint or "", label or "")
+            self._refresh_label(key)
+
+    def _save(self, keys: Iterable[int]):
+        now = time.time()
+        rows = []
+        for key in keys:
+            record = self._records[key]
+            rows.append((key - (1 << 64) if key >= 1 << 63 else key, record.walkable, record.blocked,
+                         record.door, record.ledge, record.hint, record.label, now))
+        with closing(sqlite3.connect(self.database_path)) as conn, conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO metatiles (tile_hash, walkable, blocked, door, ledge, hint, label, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+
+    def _refresh_label(self, key: int) -> Optional[str]:
+        label = self._records[key].resolve(self.min_blocked_evidence)
+        if label:
+            self._labels[key] = label
+        else:
+            self._labels.pop(key, None)
+        return label
+
+    # --- Hashing and classification ---
+
+    def map_pixels(self, pixels: np.ndarray) -> Optional[np.ndarray]:
+        """The 15x9-metatile band of a GBA frame, or None for other frame sizes"""
+        pixels = np.asarray(pixels)
+        if pixels.shape[1::-1] != SCREEN_SIZE:
+            return None
+        return pixels[MAP_ROW_OFFSET:MAP_ROW_OFFSET + ATLAS_GRID[1] * 16, :, :3]
+
+    def hash_tiles(self, pixels: np.ndarray) -> Optional[np.ndarray]:
+        """
+        64-bit hash of every full metatile on screen
+
+        Args:
+            pixels: (160, 240, 3) RGB frame
+
+        Returns:
+            (9, 15) uint64 array, or None when the frame is not a GBA screen
+        """
+        band = self.map_pixels(pixels)
+        if band is None:
+            return None
+        tiles = np.ascontiguousarray(self.engine.tile_view(np.ascontiguousarray(band, dtype=np.uint8)))
+        words = tiles.reshape(-1, _TILE_WORDS * 8).view(np.uint64)
+        with np.errstate(over="ignore"):
+            hashes = _mix64((words * _HASH_MULTIPLIERS).sum(axis=1, dtype=np.uint64))
+        return hashes.reshape(self.engine.rows, self.engine.cols)
+
+    def lookup(self, hashes: np.ndarray) -> List[List[Optional[str]]]:
+        """Learned label per tile hash (None where unknown)"""
+        labels = [[self._labels.get(key) for key in row] for row in hashes.tolist()]
+        self.tile_lookups += hashes.size
+        self.tile_hits += sum(label is not None for row in labels for label in row)
+        return labels
+
+    def analyze(self, pixels: np.ndarray, classifier: Optional[Callable] = None
+                ) -> Optional[Tuple[TileGridResult, np.ndarray]]:
+        """
+        Classify the metatiles of a frame, by lookup where the atlas knows the tile
+
+        Args:
+            pixels: (160, 240, 3) RGB frame
+            classifier: TileGrid classifier for the tiles the atlas does not know
+                        (defaults to the HSV thresholds)
+
+        Returns:
+            (TileGridResult on the 15x9 grid, bool mask of tiles classified by lookup),
+            or None when the frame is not a GBA screen
+        """
+        hashes = self.hash_tiles(pixels)
+        if hashes is None:
+            return None
+        engine = self.engine if classifier is None else TileGrid(ATLAS_GRID, classifier=classifier)
+        result = engine.analyze(self.map_pixels(pixels))
+        known = np.zeros(hashes.shape, dtype=bool)
+        for row, labels in enumerate(self.lookup(hashes)):
+            for col, label in enumerate(labels):
+                if label is not None:
+                    known[row, col] = True
+                    result.chars[row, col] = LABEL_CHARS.get(label, "?")
+                    result.walkable[row, col] = label in WALKABLE_LABELS
+        return result, known
+
+    def format_grid(self, pixels: np.ndarray) -> Optional[str]:
+        """ASCII map of the frame with learned labels (D door, L ledge, N NPC) and P for the player"""
+        analysis = self.analyze(pixels)
+        return self.engine.format_grid(analysis[0]) if analysis else None
+
+    def describe_neighbours(self, pixels: np.ndarray) -> Dict[str, str]:
+        """Learned labels of the four tiles around the player, e.g. {"up": "walkable", "left": "tree"}"""
+        hashes = self.hash_tiles(pixels)
+        if hashes is None:
+            return {}
+        player_row, player_col = self.engine.player_tile
+        neighbours = {}
+        for direction, (d_row, d_col) in DIRECTION_OFFSETS.items():
+            label = self.lookup(hashes[player_row + d_row:player_row + d_row + 1,
+                                      player_col + d_col:player_col + d_col + 1])[0][0]
+            if label:
+                neighbours[direction] = label
+        return neighbours
+
+    # --- Learning ---
+
+    def observe_move(self, pixels: np.ndarray, direction: str, outcome: str) -> Optional[str]:
+        """
+        Record the outcome of one step from the pre-move frame
+
+        Args:
+            pixels: Frame captured before the input
+            direction: "up", "down", "left" or "right"
+            outcome: "walkable", "blocked", "door" or "ledge"
+
+        Returns:
+            Label of the target tile after this observation (None while inconclusive
+            or when the frame is not a GBA screen)
+        """
+        if direction not in DIRECTION_OFFSETS or outcome not in OUTCOMES:
+            raise ValueError(f"Unknown direction/outcome: {direction}/{outcome}")
+        hashes = self.hash_tiles(pixels)
+        if hashes is None:
+            return None
+
+        player_row, player_col = self.engine.player_tile
+        d_row, d_col = DIRECTION_OFFSETS[direction]
+        row, col = player_row + d_row, player_col + d_col
+        key = int(hashes[row, col])
+
+        record = self._records.get(key)
+        if record is None:
+            tile = self.engine.tile_view(self.map_pixels(pixels))[row, col]
+            hint = str(self._hint_engine.analyze(tile).chars[0, 0])
+            record = self._records[key] = TileRecord(hint=hint)
+        before = self._labels.get(key)
+        setattr(record, outcome, getattr(record, outcome) + 1)
+        self.observations[outcome] += 1
+        label = self._refresh_label(key)
+        self._save([key])
+
+        if self.verbose and label and label != before:
+            print(f"🧩 Metatile learned: {direction} of player is {label}")
+        return label
+
+    def label_tile(self, pixels: np.ndarray, row: int, col: int, label: str) -> None:
+        """Set an explicit label (e.g. "npc" from visual analysis) for the tile at (row, col)"""
+        if label not in LABEL_CHARS:
+            raise ValueError(f"Unknown label: {label}")
+        hashes = self.hash_tiles(pixels)
+        if hashes is None:
+            return
+        key = int(hashes[row, col])
+        self._records.setdefault(key, TileRecord()).label = label
+        self._refresh_label(key)
+        self._save([key])
+
+    def learn_from_turn(self, pixels: Optional[np.ndarray], buttons: List[str], events: List[Any]) -> Optional[str]:
+        """
+        Label the tile the player tried to walk onto from this turn's RAM events
+
+        Only turns with a single d-pad press and nothing else are used, so the
+        outcome can be attributed to one tile.
+
+        Args:
+            pixels: Frame captured before the input
+            buttons: Buttons executed this turn
+            events: RAM events polled after the input
+
+        Returns:
+            Learned label of the target tile, or None if the turn was not usable
+        """
+        if pixels is None or len(buttons) != 1 or buttons[0] not in DIRECTION_OFFSETS:
+            return None
+        direction = buttons[0]
+
+        from ram_events import PlayerMoved, MapChanged, BattleStarted
+        if any(isinstance(event, BattleStarted) for event in events):
+            return None  # screen transition; the step itself shows up as PlayerMoved if it happened
+        if any(isinstance(event, MapChanged) and event.method == "walk" for event in events):
+            return self.observe_move(pixels, direction, "door")
+        moves = [event for event in events if isinstance(event, PlayerMoved)]
+        if not moves:
+            return self.observe_move(pixels, direction, "blocked")
+
+        (from_x, from_y), (to_x, to_y) = moves[0].from_position, moves[-1].to_position
+        step_x, step_y = DIRECTION_STEPS[direction]
+        delta = (to_x - from_x, to_y - from_y)
+        if delta == (step_x, step_y):
+            return self.observe_move(pixels, direction, "walkable")
+        if delta == (2 * step_x, 2 * step_y):
+            return self.observe_move(pixels, direction, "ledge")
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tiles": len(self._records),
+            "labelled": len(self._labels),
+            "labels": dict(Counter(self._labels.values())),
+            "observations": dict(self.observations),
+            "tile_lookups": self.tile_lookups,
+            "hit_rate": round(self.tile_hits / self.tile_lookups, 3) if self.tile_lookups else 0.0,
+        }
+
+
+# Global instance shared by the turn loop and analysis tools
+_global_metatile_atlas: Optional[MetatileAtlas] = None
+
+def get_metatile_atlas() -> MetatileAtlas:
+    """Get global metatile atlas instance"""
+    global _global_metatile_atlas
+    if _global_metatile_atlas is None:
+        _global_metatile_atlas = MetatileAtlas()
+    return _global_metatile_atlas
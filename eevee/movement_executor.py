@@ -0,0 +1,239 @@
+"""
+Movement Executor for Eevee
+Walks the player by watching only the coordinate/map bytes in RAM: each
+straight run is one held input, released as soon as the target tile is
+reached, with blocked steps detected within a few frames
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from ram_snapshot import SkyEmuClient, PokemonFireRedReader
+
+FRAME_SECONDS = 1 / 60
+
+DIRECTION_DELTAS = {
+    "up": (0, -1),
+    "down": (0, 1),
+    "left": (-1, 0),
+    "right": (1, 0),
+}
+
+
+@dataclass(frozen=True)
+class PlayerPosition:
+    """Player coordinates and map from SaveBlock8"""
+    x: int
+    y: int
+    map_bank: int
+    map_id: int
+
+    @property
+    def map_key(self):
+        return (self.map_bank, self.map_id)
+
+
+@dataclass
+class MoveResult:
+    """Outcome of one straight held-input run"""
+    direction: str
+    requested_tiles: int
+    tiles_moved: int = 0
+    blocked: bool = False
+    map_changed: bool = False
+    start: Optional[PlayerPosition] = None
+    end: Optional[PlayerPosition] = None
+    elapsed: float = 0.0
+    polls: int = 0
+    frames: int = 0
+
+    @property
+    def completed(self) -> bool:
+        return self.tiles_moved >= self.requested_tiles
+
+
+@dataclass
+class PathResult:
+    """Outcome of walking to a target coordinate"""
+    target: tuple
+    moves: List[MoveResult] = field(default_factory=list)
+    reached: bool = False
+    blocked: bool = False
+
+    @property
+    def buttons(self) -> List[str]:
+        """One entry per tile actually walked"""
+        return [move.direction for move in self.moves for _ in range(move.tiles_moved)]
+
+
+class MovementExecutor:
+    """
+    RAM-polled walking
+
+    Position polls read the SaveBlock8 pointer and the 6 coordinate/map bytes
+    behind the last known pointer in a single request; only when the pointer
+    has moved (map transitions relocate the save blocks) is a second request
+    needed.
+    """
+
+    COORD_BYTES = 6  # x (u16), y (u16), map id, map bank
+
+    def __init__(self, controller, client: SkyEmuClient = None,
+                 blocked_after_frames: int = 24, poll_frames: int = 2, max_frames_per_tile: int = 48):
+        """
+        Args:
+            controller: SkyEmuController used for input
+            client: RAM client (created for the controller's host/port if None)
+            blocked_after_frames: Frames of held input without progress before a step counts as blocked
+                                  (a walk step is 16 frames; turning to face a new direction is ~8)
+            poll_frames: Frames between position polls
+            max_frames_per_tile: Hard cap on frames spent per requested tile
+        """
+        self.controller = controller
+        self.client = client or SkyEmuClient(base_url=f"http://{controller.host}:{controller.port}")
+        self.blocked_after_frames = blocked_after_frames
+        self.poll_frames = poll_frames
+        self.max_frames_per_tile = max_frames_per_tile
+
+        addresses = PokemonFireRedReader.ADDRESSES
+        self._pointer_address = addresses['save_block_8_ptr']
+        self._coords_offset = addresses['player_coords_x_offset']
+        self._save_block_addr: Optional[int] = None
+
+    # --- Position polling ---
+
+    def _decode(self, data: bytes) -> PlayerPosition:
+        return PlayerPosition(
+            x=int.from_bytes(data[0:2], 'little'),
+            y=int.from_bytes(data[2:4], 'little'),
+            map_id=data[4],
+            map_bank=data[5],
+        )
+
+    def read_position(self) -> Optional[PlayerPosition]:
+        """Read just the player's coordinates and map"""
+        regions = [(self._pointer_address, 4)]
+        if self._save_block_addr:
+            regions.append((self._save_block_addr + self._coords_offset, self.COORD_BYTES))
+
+        chunks = self.client.read_regions(regions)
+        if not chunks:
+            return None
+
+        pointer = int.from_bytes(chunks[0], 'little')
+        if pointer == self._save_block_addr and len(chunks) > 1:
+            return self._decode(chunks[1])
+
+        # Save block moved (or first read) - follow the new pointer
+        self._save_block_addr = pointer
+        chunks = self.client.read_regions([(pointer + self._coords_offset, self.COORD_BYTES)])
+        if not chunks:
+            return None
+        return self._decode(chunks[0])
+
+    def _wait_frames(self, frames: int) -> None:
+        """Advance time by `frames`: exact frame steps when paused, otherwise wall clock"""
+        if getattr(self.controller, "input_mode", "realtime") == "frame_stepped":
+            self.controller.step_frames(frames)
+        else:
+            time.sleep(frames * FRAME_SECONDS)
+
+    # --- Walking ---
+
+    def walk(self, direction: str, tiles: int = 1) -> MoveResult:
+        """
+        Hold `direction` until `tiles` tiles have been walked, the step is blocked,
+        or the map changes
+        """
+        direction = direction.lower()
+        dx, dy = DIRECTION_DELTAS[direction]
+        result = MoveResult(direction=direction, requested_tiles=tiles)
+        start_time = time.time()
+
+        start = self.read_position()
+        result.start = result.end = start
+        if start is None or tiles <= 0:
+            return result
+
+        if not self.controller.hold_button(direction):
+            return result
+
+        frames_since_progress = 0
+        max_frames = self.max_frames_per_tile * tiles
+        try:
+            while result.frames < max_frames:
+                self._wait_frames(self.poll_frames)
+                result.frames += self.poll_frames
+                frames_since_progress += self.poll_frames
+
+                position = self.read_position()
+                result.polls += 1
+                if position is None:
+                    continue
+
+                if position.map_key != start.map_key:
+                    result.map_changed = True
+                    result.end = position
+                    break
+
+                moved = (position.x - start.x) * dx + (position.y - start.y) * dy
+                if moved > result.tiles_moved:
+                    result.tiles_moved = moved
+                    result.end = position
+                    frames_since_progress = 0
+                if result.tiles_moved >= tiles:
+                    break
+
+                if frames_since_progress >= self.blocked_after_frames:
+                    result.blocked = True
+                    break
+        finally:
+            self.controller.release_button(direction)
+
+        result.elapsed = time.time() - start_time
+        return result
+
+    def walk_to(self, target_x: int, target_y: int, max_segments: int = 8) -> PathResult:
+        """
+        Walk to a coordinate on the current map as a few straight runs
+
+        The longer axis is walked first; when a run is blocked the other axis is
+        tried before giving up.
+        """
+        path = PathResult(target=(target_x, target_y))
+
+        for _ in range(max_segments):
+            position = self.read_position()
+            if position is None:
+                break
+            dx = target_x - position.x
+            dy = target_y - position.y
+            if dx == 0 and dy == 0:
+                path.reached = True
+                break
+
+            horizontal = ("right" if dx > 0 else "left", abs(dx))
+            vertical = ("down" if dy > 0 else "up", abs(dy))
+            candidates = [horizontal, vertical] if abs(dx) > abs(dy) else [vertical, horizontal]
+
+            progressed = False
+            for direction, tiles in candidates:
+                if tiles == 0:
+                    continue
+                move = self.walk(direction, tiles)
+                path.moves.append(move)
+                if move.map_changed:
+                    return path
+                if move.tiles_moved > 0:
+                    progressed = True
+                    break
+
+            if not progressed:
+                path.blocked = True
+                break
+        else:
+            position = self.read_position()
+            path.reached = position is not None and (position.x, position.y) == (target_x, target_y)
+
+        return path
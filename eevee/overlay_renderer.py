@@ -0,0 +1,210 @@
+"""
+Grid Overlay Renderer for Eevee
+Draws the coordinate grid that VisualAnalysis sends to the vision model,
+caching everything that does not change between frames
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+FONT_PATH = "/System/Library/Fonts/Arial.ttf"
+
+GRID_COLOR = (204, 204, 204, 100)      # Light grey with transparency
+TEXT_COLOR = (204, 204, 204, 120)
+CENTER_TEXT_COLOR = (255, 255, 0, 200)  # Yellow for player position
+BANNER_FILL = (0, 0, 0, 200)
+BANNER_TEXT_COLOR = (255, 255, 255, 255)
+PLAYER_RING_COLOR = (255, 255, 0, 180)
+BANNER_PADDING = 5
+PLAYER_RING_RADIUS = 4
+
+# Loaded fonts by size; a missing TrueType font is looked up only once
+_font_cache: Dict[int, Any] = {}
+
+
+def load_font(size: int):
+    """Arial at `size`, or PIL's default font where Arial is not installed (cached)"""
+    font = _font_cache.get(size)
+    if font is None:
+        try:
+            font = ImageFont.truetype(FONT_PATH, size)
+        except OSError:
+            font = ImageFont.load_default()
+        _font_cache[size] = font
+    return font
+
+
+class GridOverlayRenderer:
+    """
+    Renders the coordinate grid overlay with cached layers
+
+    Per screen size it keeps the grid-line layer and the player ring; per
+    label text it keeps the rasterized glyph mask; per map it keeps the
+    banner. A frame then only pastes the 64 cached label masks onto a copy of
+    the grid layer, and when the player has not moved even that layer is
+    reused. Output matches drawing everything from scratch pixel for pixel.
+    """
+
+    def __init__(self, grid_size: int = 8, max_sprites: int = 4096):
+        """
+        Args:
+            grid_size: Tiles per side of the grid
+            max_sprites: Label masks kept before the least recently used are dropped
+        """
+        self.grid_size = grid_size
+        self.max_sprites = max_sprites
+        self._static: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self._sprites: "OrderedDict[Tuple[str, int], Tuple[Image.Image, Tuple[int, int]]]" = OrderedDict()
+        self._banners: Dict[Tuple[str, int], Tuple[Image.Image, Tuple[int, int]]] = {}
+        self._last_layer_key = None
+        self._last_layer: Optional[Image.Image] = None
+
+        # Metrics
+        self.renders = 0
+        self.layer_reuses = 0
+        self.sprite_hits = 0
+        self.sprite_misses = 0
+
+    # --- Cached parts ---
+
+    def _static_layers(self, size: Tuple[int, int]) -> Dict[str, Any]:
+        """Grid lines, label font and player ring for one screen size"""
+        static = self._static.get(size)
+        if static is not None:
+            return static
+
+        width, height = size
+        tile_width = width // self.grid_size
+        tile_height = height // self.grid_size
+        grid = Image.new('RGBA', size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(grid)
+        for x in range(0, width, tile_width):
+            draw.line([(x, 0), (x, height)], fill=GRID_COLOR, width=1)
+        for y in range(0, height, tile_height):
+            draw.line([(0, y), (width, y)], fill=GRID_COLOR, width=1)
+
+        # Player ring as a patch plus the mask of its outline pixels (drawn last, replacing what is below)
+        diameter = PLAYER_RING_RADIUS * 2 + 1
+        ring_mask = Image.new('L', (diameter, diameter), 0)
+        ImageDraw.Draw(ring_mask).ellipse([0, 0, diameter - 1, diameter - 1], outline=255, width=1)
+        ring = Image.new('RGBA', (diameter, diameter), PLAYER_RING_COLOR)
+
+        static = {
+            "grid": grid,
+            "tile_size": (tile_width, tile_height),
+            "font_size": max(8, min(12, tile_width // 4)),
+            "ring": ring,
+            "ring_mask": ring_mask,
+            "ring_origin": (width // 2 - PLAYER_RING_RADIUS, height // 2 - PLAYER_RING_RADIUS),
+        }
+        self._static[size] = static
+        return static
+
+    def _sprite(self, text: str, font_size: int) -> Tuple[Image.Image, Tuple[int, int]]:
+        """Glyph mask of a label (drawn at the origin), cached by text and font size"""
+        key = (text, font_size)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self.sprite_hits += 1
+            self._sprites.move_to_end(key)
+            return sprite
+
+        self.sprite_misses += 1
+        font = load_font(font_size)
+        left, top, right, bottom = ImageDraw.Draw(Image.new('L', (1, 1))).textbbox((0, 0), text, font=font)
+        mask = Image.new('L', (max(1, right), max(1, bottom)), 0)
+        ImageDraw.Draw(mask).text((0, 0), text, fill=255, font=font)
+        sprite = (mask, (0, 0))
+        self._sprites[key] = sprite
+        if len(self._sprites) > self.max_sprites:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def _banner(self, text: str, width: int) -> Tuple[Image.Image, Tuple[int, int]]:
+        """Opaque map banner patch for the top-right corner and its position"""
+        key = (text, width)
+        banner = self._banners.get(key)
+        if banner is not None:
+            return banner
+
+        font = load_font(14)
+        left, top, right, bottom = ImageDraw.Draw(Image.new('L', (1, 1))).textbbox((0, 0), text, font=font)
+        text_width, text_height = right - left, bottom - top
+        text_x = width - text_width - BANNER_PADDING
+        text_y = BANNER_PADDING
+        box = (text_x - BANNER_PADDING, text_y - BANNER_PADDING,
+               text_x + text_width + BANNER_PADDING, text_y + text_height + BANNER_PADDING)
+
+        # Rectangle fill replaces what is under it; the text is blended onto the rectangle
+        patch = Image.new('RGBA', (box[2] - box[0] + 1, box[3] - box[1] + 1), BANNER_FILL)
+        ImageDraw.Draw(patch).text((BANNER_PADDING, BANNER_PADDING), text, fill=BANNER_TEXT_COLOR, font=font)
+        banner = (patch, (box[0], box[1]))
+        self._banners[key] = banner
+        return banner
+
+    # --- Rendering ---
+
+    def render_layer(self, size: Tuple[int, int], coords: Optional[Dict[str, Any]] = None) -> Image.Image:
+        """
+        RGBA overlay layer (grid, coordinate labels, map banner, player ring) for a screen size
+
+        Args:
+            size: (width, height) of the frame
+            coords: Compact RAM game state; labels show world coordinates when RAM is available
+
+        Returns:
+            Overlay layer (shared between calls with the same input - do not modify)
+        """
+        coords = coords or {}
+        ram_available = coords.get("ram_available", False)
+        location = coords.get("location", {}) if ram_available else {}
+        player = (location.get("x", 0), location.get("y", 0)) if ram_available else None
+        map_display = f"Map:{location.get('map_bank', 0)}-{location.get('map_id', 0)}" if ram_available else "Map:?"
+
+        key = (size, player, map_display)
+        if key == self._last_layer_key:
+            self.layer_reuses += 1
+            return self._last_layer
+
+        static = self._static_layers(size)
+        tile_width, tile_height = static["tile_size"]
+        font_size = static["font_size"]
+        layer = static["grid"].copy()
+
+        center = self.grid_size // 2
+        for tile_x in range(self.grid_size):
+            for tile_y in range(self.grid_size):
+                if player is not None:
+                    text = f"{player[0] + tile_x - center},{player[1] + tile_y - center}"
+                    color = CENTER_TEXT_COLOR if tile_x == center and tile_y == center else TEXT_COLOR
+                else:
+                    text, color = f"{tile_x},{tile_y}", TEXT_COLOR
+                mask, _ = self._sprite(text, font_size)
+                origin = (tile_x * tile_width + 2, tile_y * tile_height + 2)
+                layer.paste(color, origin + (origin[0] + mask.width, origin[1] + mask.height), mask)
+
+        banner, origin = self._banner(map_display, size[0])
+        layer.paste(banner, origin)
+
+        if ram_available:
+            layer.paste(static["ring"], static["ring_origin"], static["ring_mask"])
+
+        self._last_layer_key, self._last_layer = key, layer
+        return layer
+
+    def render(self, image: Image.Image, coords: Optional[Dict[str, Any]] = None) -> Image.Image:
+        """Composite the overlay onto `image`; returns a new RGB image"""
+        self.renders += 1
+        layer = self.render_layer(image.size, coords)
+        return Image.alpha_composite(image.convert('RGBA'), layer).convert('RGB')
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.sprite_hits + self.sprite_misses
+        return {
+            "renders": self.renders,
+            "layer_reuses": self.layer_reuses,
+            "sprites": len(self._sprites),
+            "sprite_hit_rate": round(self.sprite_hits / lookups, 3) if lookups else 0.0,
+        }
@@ -132,6 +132,50 @@ def list_task_assignments() -> Dict[str, str]:
     """
     return TASK_MODEL_MAPPING.copy()
 
+# Image encoding per provider, with per-task overrides
+# Keys: format ("png", "jpeg", "webp"), quality (lossy formats), scale (downscale factor),
+# max_bytes (payload budget, 0 = unlimited). JPEG beats WebP here: WebP saves ~15% of
+# the bytes but takes ~10 ms to encode (tests/benchmark_image_payloads.py)
+IMAGE_ENCODING_PROFILES = {
+    "default": {"format": "png", "quality": 90, "scale": 1.0, "max_bytes": 200_000},
+    "gemini": {"format": "jpeg", "quality": 85, "max_bytes": 100_000},
+    "mistral": {"format": "jpeg", "quality": 85, "max_bytes": 100_000},
+    "stub": {"format": "png"},
+}
+
+IMAGE_ENCODING_TASK_OVERRIDES = {
+    # Move names and HP numbers must stay legible
+    "battle_decisions": {"quality": 90},
+    "menu_analysis": {"quality": 90},
+}
+
+def get_image_encoding_for_task(provider: Optional[str], task_type: str = "screenshot_analysis") -> Dict[str, Any]:
+    """
+    Get image encoding settings for a provider and task type
+
+    IMAGE_FORMAT, IMAGE_QUALITY, IMAGE_SCALE and IMAGE_MAX_BYTES environment
+    variables override the table for every provider.
+
+    Args:
+        provider: Provider name (None uses LLM_PROVIDER)
+        task_type: Task type from TASK_MODEL_MAPPING keys
+
+    Returns:
+        Dictionary with format, quality, scale and max_bytes
+    """
+    provider = (provider or os.getenv('LLM_PROVIDER', 'gemini')).lower()
+    settings = dict(IMAGE_ENCODING_PROFILES["default"])
+    settings.update(IMAGE_ENCODING_PROFILES.get(provider, {}))
+    settings.update(IMAGE_ENCODING_TASK_OVERRIDES.get(task_type, {}))
+
+    env_overrides = {'format': ('IMAGE_FORMAT', str), 'quality': ('IMAGE_QUALITY', int),
+                     'scale': ('IMAGE_SCALE', float), 'max_bytes': ('IMAGE_MAX_BYTES', int)}
+    for key, (env_var, cast) in env_overrides.items():
+        value = os.getenv(env_var)
+        if value:
+            settings[key] = cast(value)
+    return settings
+
 def get_prompt_template_path(provider: str, template_type: str = "base_prompts") -> Path:
     """
     Get the path to provider-specific prompt templates
@@ -250,6 +294,11 @@ class ProviderConfig:
                 'api_failure_threshold': self.api_failure_threshold,
                 'default_model': self.mistral_default,
                 'vision_model': self.mistral_vision
+            },
+            'stub': {
+                'enabled': self.primary_provider == 'stub',
+                'latency_ms': float(os.getenv('STUB_LLM_LATENCY_MS', '0')),
+                'latency_per_kb_ms': float(os.getenv('STUB_LLM_LATENCY_PER_KB_MS', '0'))
             }
         }
     
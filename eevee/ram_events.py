@@ -0,0 +1,339 @@
+"""
+RAM Event Stream for Eevee
+Diffs a few hot memory regions between snapshots and emits typed events, so
+consumers react to what changed instead of comparing full game state dicts
+"""
+
+import struct
+from collections import Counter, defaultdict
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from ram_snapshot import get_ram_snapshot_service, PokemonFireRedReader
+
+POSITION = struct.Struct('<HHBB')     # x, y, map id, map bank
+PARTY_SLOT = struct.Struct('<IBBHH')  # status, level, mail, current HP, max HP
+U32 = struct.Struct('<I')
+
+# MapChanged.direction is the d-pad button, the vocabulary SpatialMemory and the metatile atlas use
+DIRECTION_BUTTONS = ("up", "down", "left", "right")
+
+
+@dataclass
+class PartySlot:
+    """Battle-relevant stats of one party slot"""
+    hp: int
+    max_hp: int
+    status: int
+    level: int
+
+    @property
+    def is_healthy(self) -> bool:
+        return self.hp >= self.max_hp and self.status == 0
+
+
+# --- Events ---
+
+@dataclass
+class RamEvent:
+    """Base class; frame_stamp is the snapshot the change was first seen in"""
+    frame_stamp: int
+
+    def describe(self) -> str:
+        return type(self).__name__
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": type(self).__name__, **asdict(self)}
+
+
+@dataclass
+class PlayerMoved(RamEvent):
+    """Position changed within the same map"""
+    from_position: Tuple[int, int]
+    to_position: Tuple[int, int]
+
+    def describe(self) -> str:
+        return f"moved {self.from_position} -> {self.to_position}"
+
+
+@dataclass
+class MapChanged(RamEvent):
+    """Player entered a different map (bank, id)"""
+    from_map: Tuple[int, int]
+    to_map: Tuple[int, int]
+    from_position: Tuple[int, int]
+    to_position: Tuple[int, int]
+    direction: Optional[str] = None  # last d-pad button (up/down/left/right) before the change
+    method: str = "walk"             # walk, or warp when no movement preceded it
+
+    def describe(self) -> str:
+        return f"map {self.from_map[0]}-{self.from_map[1]} -> {self.to_map[0]}-{self.to_map[1]} ({self.method})"
+
+
+@dataclass
+class HpChanged(RamEvent):
+    slot: int  # 1-based party slot
+    old_hp: int
+    new_hp: int
+    max_hp: int
+
+    def describe(self) -> str:
+        return f"slot {self.slot} HP {self.old_hp} -> {self.new_hp}/{self.max_hp}"
+
+
+@dataclass
+class Healed(RamEvent):
+    """Whole party restored to full HP with no status conditions"""
+    party_before: List[PartySlot]
+    party_after: List[PartySlot]
+    map: Optional[Tuple[int, int]] = None
+    position: Optional[Tuple[int, int]] = None
+
+    @property
+    def fainted_before(self) -> int:
+        return sum(1 for slot in self.party_before if slot.hp == 0)
+
+    def describe(self) -> str:
+        return f"party healed ({len(self.party_after)} Pokemon, {self.fainted_before} were fainted)"
+
+
+@dataclass
+class BattleStarted(RamEvent):
+    battle_type_flags: int
+
+    def describe(self) -> str:
+        return f"battle started (flags 0x{self.battle_type_flags:X})"
+
+
+@dataclass
+class BattleEnded(RamEvent):
+    def describe(self) -> str:
+        return "battle ended"
+
+
+@dataclass
+class ItemGained(RamEvent):
+    item_id: int
+    quantity: int  # amount gained
+    total: int
+
+    def describe(self) -> str:
+        return f"gained Item #{self.item_id} x{self.quantity} (now {self.total})"
+
+
+@dataclass
+class ItemLost(RamEvent):
+    item_id: int
+    quantity: int  # amount used, sold or tossed
+    total: int
+
+    def describe(self) -> str:
+        return f"lost Item #{self.item_id} x{self.quantity} (now {self.total})"
+
+
+@dataclass
+class MoneyChanged(RamEvent):
+    old_money: int
+    new_money: int
+
+    def describe(self) -> str:
+        return f"money {self.old_money} -> {self.new_money}"
+
+
+# --- Region decoders ---
+
+def decode_position(data: bytes) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Return ((x, y), (bank, map id))"""
+    x, y, map_id, map_bank = POSITION.unpack(data)
+    return (x, y), (map_bank, map_id)
+
+
+def decode_party(data: bytes) -> List[PartySlot]:
+    slots = []
+    for status, level, _, hp, max_hp in PARTY_SLOT.iter_unpack(data[1:1 + data[0] * PARTY_SLOT.size]):
+        slots.append(PartySlot(hp=hp, max_hp=max_hp, status=status, level=level))
+    return slots
+
+
+def decode_money(data: bytes) -> int:
+    hidden, key = struct.unpack('<II', data)
+    money = hidden ^ key
+    return money if money <= 999999 else 0
+
+
+def decode_bag(data: bytes) -> Counter:
+    """Total quantity per item id across all pockets (same rules as the reader)"""
+    totals = Counter()
+    offset = 0
+    for _, _, capacity in PokemonFireRedReader.ITEM_POCKETS:
+        pocket = data[offset:offset + capacity * PokemonFireRedReader.ITEM_ENTRY_SIZE]
+        offset += len(pocket)
+        for item_id, quantity in PokemonFireRedReader.ITEM_ENTRY.iter_unpack(pocket):
+            if item_id == 0:
+                break
+            if quantity > 0:
+                totals[item_id] += quantity
+    return totals
+
+
+class RamWatcher:
+    """
+    Publishes typed events for changes between successive RAM snapshots
+
+    Only the hot regions (position, party HP/status, battle flags, money,
+    bag) are compared, as raw bytes; a region is decoded only when its bytes
+    changed. The first poll records a baseline and emits nothing.
+    """
+
+    def __init__(self, snapshot_service=None):
+        self.snapshot_service = snapshot_service or get_ram_snapshot_service()
+        self._subscribers: Dict[Type[RamEvent], List[Callable[[RamEvent], None]]] = defaultdict(list)
+        self._regions: Optional[Dict[str, bytes]] = None
+        self._last_snapshot = None
+        self._last_direction: Optional[str] = None
+
+        # Metrics
+        self.polls = 0
+        self.unchanged_polls = 0
+        self.decoded_regions = Counter()
+        self.event_counts = Counter()
+
+    def subscribe(self, event_type: Type[RamEvent], callback: Callable[[RamEvent], None]) -> None:
+        """Call `callback(event)` for every event of `event_type` (RamEvent receives all)"""
+        self._subscribers[event_type].append(callback)
+
+    def unsubscribe(self, event_type: Type[RamEvent], callback: Callable[[RamEvent], None]) -> None:
+        if callback in self._subscribers.get(event_type, []):
+            self._subscribers[event_type].remove(callback)
+
+    def poll(self, buttons: Optional[List[str]] = None) -> List[RamEvent]:
+        """
+        Capture (or reuse) the current snapshot, diff it and dispatch events
+
+        Args:
+            buttons: Buttons pressed since the last poll; labels MapChanged direction
+
+        Returns:
+            Events emitted by this poll, in dispatch order
+        """
+        snapshot = self.snapshot_service.get_snapshot()
+        if snapshot is None:
+            return []
+        if snapshot is self._last_snapshot:
+            # Same capture as last time (no input since): nothing can have changed
+            self.polls += 1
+            self.unchanged_polls += 1
+            return []
+        self._last_snapshot = snapshot
+        regions = PokemonFireRedReader.read_hot_regions(snapshot.memory)
+        return self.process(regions, snapshot.frame_stamp, buttons)
+
+    def process(self, regions: Dict[str, bytes], frame_stamp: int = 0,
+                buttons: Optional[List[str]] = None) -> List[RamEvent]:
+        """Diff `regions` (from read_hot_regions) against the previous ones and dispatch events"""
+        self.polls += 1
+        if buttons is not None:
+            directions = [button for button in buttons if button in DIRECTION_BUTTONS]
+            self._last_direction = directions[-1] if directions else None
+
+        previous, self._regions = self._regions, dict(regions)
+        if previous is None:
+            return []
+
+        changed = [name for name, data in regions.items() if name in previous and previous[name] != data]
+        if not changed:
+            self.unchanged_polls += 1
+            return []
+        self.decoded_regions.update(changed)
+
+        events: List[RamEvent] = []
+        for name in changed:
+            events.extend(getattr(self, f"_diff_{name}")(previous[name], regions[name], frame_stamp, regions))
+
+        for event in events:
+            self._dispatch(event)
+        return events
+
+    def _dispatch(self, event: RamEvent) -> None:
+        self.event_counts[type(event).__name__] += 1
+        for event_type, callbacks in list(self._subscribers.items()):
+            if isinstance(event, event_type):
+                for callback in list(callbacks):
+                    try:
+                        callback(event)
+                    except Exception as e:
+                        print(f"⚠️ RAM event handler failed for {type(event).__name__}: {e}")
+
+    # --- Per-region diffs ---
+
+    def _diff_position(self, old: bytes, new: bytes, frame_stamp: int, regions) -> List[RamEvent]:
+        old_position, old_map = decode_position(old)
+        new_position, new_map = decode_position(new)
+        if old_map != new_map:
+            direction = self._last_direction
+            return [MapChanged(frame_stamp, old_map, new_map, old_position, new_position,
+                               direction=direction, method="walk" if direction else "warp")]
+        if old_position != new_position:
+            return [PlayerMoved(frame_stamp, old_position, new_position)]
+        return []
+
+    def _diff_party(self, old: bytes, new: bytes, frame_stamp: int, regions) -> List[RamEvent]:
+        before, after = decode_party(old), decode_party(new)
+        events: List[RamEvent] = []
+        for index, (old_slot, new_slot) in enumerate(zip(before, after)):
+            if old_slot.hp != new_slot.hp:
+                events.append(HpChanged(frame_stamp, index + 1, old_slot.hp, new_slot.hp, new_slot.max_hp))
+
+        if (after and len(before) == len(after) and all(slot.is_healthy for slot in after)
+                and not all(slot.is_healthy for slot in before)):
+            position, map_key = decode_position(regions['position']) if 'position' in regions else (None, None)
+            events.append(Healed(frame_stamp, before, after, map=map_key, position=position))
+        return events
+
+    def _diff_battle(self, old: bytes, new: bytes, frame_stamp: int, regions) -> List[RamEvent]:
+        old_flags, new_flags = U32.unpack(old)[0], U32.unpack(new)[0]
+        if not old_flags and new_flags:
+            return [BattleStarted(frame_stamp, new_flags)]
+        if old_flags and not new_flags:
+            return [BattleEnded(frame_stamp)]
+        return []
+
+    def _diff_money(self, old: bytes, new: bytes, frame_stamp: int, regions) -> List[RamEvent]:
+        old_money, new_money = decode_money(old), decode_money(new)
+        return [MoneyChanged(frame_stamp, old_money, new_money)] if old_money != new_money else []
+
+    def _diff_bag(self, old: bytes, new: bytes, frame_stamp: int, regions) -> List[RamEvent]:
+        before, after = decode_bag(old), decode_bag(new)
+        events: List[RamEvent] = []
+        for item_id in sorted(set(before) | set(after)):
+            delta = after[item_id] - before[item_id]
+            if delta > 0:
+                events.append(ItemGained(frame_stamp, item_id, delta, after[item_id]))
+            elif delta < 0:
+                events.append(ItemLost(frame_stamp, item_id, -delta, after[item_id]))
+        return events
+
+    def reset(self) -> None:
+        """Forget the baseline; the next poll emits nothing"""
+        self._regions = None
+        self._last_snapshot = None
+        self._last_direction = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "polls": self.polls,
+            "unchanged_polls": self.unchanged_polls,
+            "decoded_regions": dict(self.decoded_regions),
+            "events": dict(self.event_counts),
+        }
+
+
+# Global instance shared by every event consumer
+_global_ram_watcher: Optional[RamWatcher] = None
+
+def get_ram_watcher() -> RamWatcher:
+    """Get global RAM watcher instance"""
+    global _global_ram_watcher
+    if _global_ram_watcher is None:
+        _global_ram_watcher = RamWatcher()
+    return _global_ram_watcher
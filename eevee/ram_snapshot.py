@@ -0,0 +1,167 @@
+"""
+RAM Snapshot Service for Eevee
+Captures the FireRed EWRAM/IWRAM regions once per emulator frame and shares the
+decoded game state with every consumer in the same turn
+"""
+
+import copy
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# analyse_skyemu_ram lives in tests/ but is the production RAM reader; other
+# modules import the reader classes from here
+tests_path = Path(__file__).parent / "tests"
+if str(tests_path) not in sys.path:
+    sys.path.insert(0, str(tests_path))
+
+from analyse_skyemu_ram import SkyEmuClient, PokemonFireRedReader
+
+try:
+    from skyemu_controller import SkyEmuController
+except ImportError:
+    SkyEmuController = None
+
+
+@dataclass
+class RamSnapshot:
+    """One captured set of memory regions plus the frame stamp it belongs to"""
+    frame_stamp: int
+    captured_at: float
+    memory: Any  # analyse_skyemu_ram.MemorySnapshot
+    compact_state: Optional[Dict[str, Any]] = field(default=None)
+
+
+class RamSnapshotService:
+    """
+    Shared, frame-stamped cache of emulator RAM
+
+    The frame stamp is the SkyEmuController input generation: every button
+    press, frame step or state load advances it, which invalidates the cached
+    snapshot. Without input the game state cannot change meaningfully, so
+    readers in the same turn (visual analysis, AI decision, healing detection,
+    pathfinding) decode from one capture instead of hitting the emulator each.
+    That only holds while the emulator is paused between frame-stepped inputs;
+    `max_age` is then a safety net. A realtime press returns while the walk
+    animation is still moving the player, so a running emulator limits reuse
+    to `running_max_age` (a few frames).
+    """
+
+    def __init__(self, max_age: float = 2.0, running_max_age: float = 4 / 60, base_url: str = None):
+        """
+        Args:
+            max_age: Seconds a snapshot is reused while the emulator is paused
+            running_max_age: Seconds a snapshot is reused while the emulator runs freely
+            base_url: SkyEmu server to read (default: SKYEMU_HOST/SKYEMU_PORT); see use_controller
+        """
+        self.max_age = max_age
+        self.running_max_age = running_max_age
+        self.base_url = base_url
+        self._client = None
+        self._reader = None
+        self._snapshot: Optional[RamSnapshot] = None
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.captures = 0
+        self.hits = 0
+
+    def _get_reader(self):
+        """Create the client/reader pair once and reuse it"""
+        if self._reader is None:
+            self._client = SkyEmuClient(base_url=self.base_url, debug=False)
+            self._reader = PokemonFireRedReader(self._client)
+        return self._reader
+
+    def use_controller(self, controller) -> None:
+        """Read RAM from the emulator `controller` drives, whose inputs invalidate the snapshots"""
+        base_url = f"http://{controller.host}:{controller.port}"
+        with self._lock:
+            if base_url != self.base_url:
+                self.base_url = base_url
+                self._client = self._reader = self._snapshot = None
+
+    def current_frame_stamp(self) -> int:
+        """Frame stamp for the emulator's current state"""
+        if SkyEmuController is None:
+            return 0
+        return SkyEmuController.input_generation()
+
+    def current_max_age(self) -> float:
+        """How long a snapshot may be reused while no input is sent"""
+        if SkyEmuController is not None and SkyEmuController.emulator_paused():
+            return self.max_age
+        return self.running_max_age
+
+    def _is_fresh(self, snapshot: Optional[RamSnapshot]) -> bool:
+        if snapshot is None:
+            return False
+        if snapshot.frame_stamp != self.current_frame_stamp():
+            return False
+        return time.time() - snapshot.captured_at <= self.current_max_age()
+
+    def get_snapshot(self) -> Optional[RamSnapshot]:
+        """Return the snapshot for the current frame, capturing it if needed"""
+        with self._lock:
+            if self._is_fresh(self._snapshot):
+                self.hits += 1
+                return self._snapshot
+
+            frame_stamp = self.current_frame_stamp()
+            memory = self._get_reader().capture_snapshot()
+            if memory is None:
+                self._snapshot = None
+                return None
+
+            self.captures += 1
+            self._snapshot = RamSnapshot(frame_stamp=frame_stamp, captured_at=time.time(), memory=memory)
+            return self._snapshot
+
+    def get_compact_game_state(self) -> Dict[str, Any]:
+        """
+        Get compact game state for the current frame
+
+        Decoded once per snapshot; callers receive their own copy so they can
+        annotate it freely.
+        """
+        try:
+            snapshot = self.get_snapshot()
+            if snapshot is None:
+                return {"ram_available": False, "error": "Failed to capture RAM snapshot"}
+
+            with self._lock:
+                if snapshot.compact_state is None:
+                    snapshot.compact_state = self._get_reader().get_compact_game_state(snapshot.memory)
+                return copy.deepcopy(snapshot.compact_state)
+
+        except Exception as e:
+            return {"ram_available": False, "error": f"RAM collection failed: {str(e)}"}
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot so the next read captures fresh memory"""
+        with self._lock:
+            self._snapshot = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Capture/hit counts and the emulator requests they cost"""
+        total = self.captures + self.hits
+        return {
+            "captures": self.captures,
+            "hits": self.hits,
+            "hit_rate": self.hits / total if total else 0.0,
+            "emulator_requests": self._client.request_count if self._client else 0,
+        }
+
+
+# Global instance shared by every RAM consumer
+_global_ram_snapshot_service: Optional[RamSnapshotService] = None
+
+def get_ram_snapshot_service() -> RamSnapshotService:
+    """Get global RAM snapshot service instance"""
+    global _global_ram_snapshot_service
+    if _global_ram_snapshot_service is None:
+        _global_ram_snapshot_service = RamSnapshotService()
+    return _global_ram_snapshot_service
@@ -21,6 +21,7 @@ Usage examples:
 """
 
 import argparse
+import asyncio
 import sys
 import os
 import json
@@ -48,6 +49,7 @@ try:
     # from utils.navigation_enhancement import NavigationEnhancer  # REMOVED - Pure AI autonomy
     from diary_generator import PokemonEpisodeDiary
     from visual_analysis import VisualAnalysis
+    from game_frame import FrameSink
     from evee_logger import get_comprehensive_logger
     
     # PHASE 2: Memory Integration
@@ -89,6 +91,8 @@ class TurnData:
     movement_data: Optional[Dict[str, Any]] = None
     screenshot_path: Optional[str] = None
     screenshot_base64: Optional[str] = None  # For fine-tuning
+    frame_cache: Optional[Dict[str, Any]] = None  # Visual analysis reuse for unchanged frames (hit rates)
+    image_encoder: Optional[Dict[str, Any]] = None  # Vision payload format, size and encode time (last = newest payload)
     
     # Strategic Decision Stage (mistral-large-latest or other)
     strategic_decision: Optional[LLMInteraction] = None
@@ -228,13 +232,62 @@ class InteractiveController:
 class ContinuousGameplay:
     """Manages continuous Pokemon gameplay with AI"""
     
-    def __init__(self, eevee_agent: EeveeAgent, interactive: bool = True, episode_review_frequency: int = 100):
+    def __init__(self, eevee_agent: EeveeAgent, interactive: bool = True, episode_review_frequency: int = 100,
+                 save_screenshots: bool = True, checkpoint_every: int = 10, savestate_budget_mb: float = 256.0):
         self.eevee = eevee_agent
         self.interactive = interactive
         self.session = None
         self.interactive_controller = None
         self.episode_review_frequency = episode_review_frequency
         
+        # Raw screenshots are persisted off the turn loop (optional)
+        self.screenshot_sink = FrameSink(Path(__file__).parent / "analysis") if save_screenshots else None
+        
+        # Screenshot and RAM are fetched concurrently at the start of each turn
+        self.async_capture = True
+        self._async_client = None
+        
+        # Pipelined turns: persistence runs on a background writer and the next frame is
+        # captured (after turn_delay) while the current turn finishes its bookkeeping
+        from turn_pipeline import BackgroundWriter, BackgroundReviewer, CapturePrefetcher, StageTimer
+        self.pipelined = True
+        self.turn_writer = BackgroundWriter()
+        self.capture_prefetcher = CapturePrefetcher(lambda: self._capture_game_context())
+        self.stage_timer = StageTimer()
+        
+        # Periodic episode reviews run on a snapshot in the background and are applied between turns
+        self.episode_reviewer = BackgroundReviewer(self._compute_episode_review, self._apply_episode_review)
+        
+        # RAM-polled walking for pathfinding (created on first use)
+        self._movement_executor = None
+        
+        # RAM change events, polled once per turn after input
+        self._turn_ram_events = []
+        self._healing_system = None
+        self._setup_ram_events()
+        
+        # Learned 16x16 tile labels (walkable, blocked, door, ledge), fed by this turn's RAM events
+        try:
+            from metatile_atlas import get_metatile_atlas
+            self.metatile_atlas = get_metatile_atlas()  # shared with EeveeAgent's navigation grid
+            self.metatile_atlas.verbose = self.eevee.verbose
+        except Exception as e:
+            print(f"WARNING: Metatile atlas unavailable: {e}")
+            self.metatile_atlas = None
+        
+        # In-memory savestates: automatic checkpoints and rollback (checkpoint_every=0 keeps only event checkpoints)
+        self.savestate_pool = None
+        if savestate_budget_mb > 0 and self.eevee.controller:
+            from savestate_pool import SavestatePool, scratch_dir_for
+            scratch_dir = scratch_dir_for(getattr(self.eevee.controller, 'host', None))
+            if scratch_dir is None:
+                print(f"⚠️ Savestate pool disabled: SkyEmu at {self.eevee.controller.host} is remote "
+                      f"(set SKYEMU_SCRATCH_DIR to a directory shared with it)")
+            else:
+                self.savestate_pool = SavestatePool(self.eevee.controller, budget_mb=savestate_budget_mb,
+                                                    checkpoint_every=checkpoint_every, scratch_dir=scratch_dir,
+                                                    verbose=self.eevee.verbose)
+        
         # Removed goal template mapper - AI should select templates naturally through prompts
         
         # Gameplay state
@@ -255,13 +308,86 @@ class ContinuousGameplay:
             self.visual_analyzer = None
             self.use_visual_analysis = False
         
+        # Dialogue boxes, menus and battles are recognized locally and skip the vision call
+        from scene_classifier import SceneClassifier
+        self.scene_classifier = SceneClassifier()
+        self.local_scene_routing = os.getenv('LOCAL_SCENE_ROUTING', 'true').lower() != 'false'
+        
+        # What the screen did since the previous turn (moved, blocked, transition, dialogue opened)
+        from frame_diff import get_frame_diff_engine
+        self.frame_diff = get_frame_diff_engine()
+        self._last_turn_actions = []
+        
         # Track recent actions for context (last 5 turns)
         self.recent_turns = []
         self.max_recent_turns = 5
         
+        # Called as callback(turn_number, ai_result, execution_result) after each turn (fleet progress)
+        self.turn_callbacks = []
+        
         # Set up interrupt handler
         signal.signal(signal.SIGINT, self._signal_handler)
         
+    def _setup_ram_events(self):
+        """Subscribe spatial memory, healing bookmarks and goal tracking to RAM events"""
+        try:
+            from ram_events import RamWatcher, RamEvent, MapChanged, Healed
+            from spatial_memory import SpatialMemory
+            
+            self.ram_watcher = RamWatcher()
+            self.spatial_memory = SpatialMemory()
+            self.ram_watcher.subscribe(MapChanged, self.spatial_memory.on_map_changed)
+            self.ram_watcher.subscribe(Healed, self._on_party_healed)
+            self.ram_watcher.subscribe(RamEvent, self._turn_ram_events.append)
+        except Exception as e:
+            print(f"WARNING: RAM event stream unavailable: {e}")
+            self.ram_watcher = None
+            self.spatial_memory = None
+    
+    def _poll_ram_events(self, execution_result: Dict[str, Any]) -> list:
+        """Diff RAM against the previous turn and dispatch events to subscribers"""
+        self._turn_ram_events.clear()
+        if not self.ram_watcher:
+            return []
+        try:
+            self.ram_watcher.poll(execution_result.get("actions_executed", []))
+            if self._turn_ram_events and self.eevee.verbose:
+                print(f"📡 RAM events: {'; '.join(event.describe() for event in self._turn_ram_events)}")
+        except Exception as e:
+            if self.eevee.debug:
+                print(f"WARNING: RAM event poll failed: {e}")
+        return list(self._turn_ram_events)
+    
+    def _observe_frame_diff(self, game_context: Dict[str, Any]):
+        """Compare this turn's frame with the previous turn's, i.e. the outcome of the last input"""
+        frame = game_context.get("frame")
+        if frame is None:
+            return None
+        try:
+            directions = [button for button in self._last_turn_actions if button in ("up", "down", "left", "right")]
+            diff = self.frame_diff.observe(frame, directions[-1] if directions else None)
+        except Exception as e:
+            if self.eevee.debug:
+                print(f"WARNING: Frame diff failed: {e}")
+            return None
+        game_context["frame_diff"] = diff
+        if diff is not None and self.eevee.verbose:
+            moved = f" {diff.direction}" if diff.direction else ""
+            print(f"🎞️ Screen since last turn: {diff.kind}{moved} (similarity {diff.similarity:.0%})")
+        return diff
+    
+    def _learn_metatiles(self, execution_result: Dict[str, Any]):
+        """Label the tile the player tried to step onto, using the pre-input frame and this turn's RAM events"""
+        frame = getattr(self, '_last_game_context', {}).get("frame")
+        if not self.metatile_atlas or frame is None:
+            return
+        try:
+            self.metatile_atlas.learn_from_turn(frame.pixels, execution_result.get("actions_executed", []),
+                                                self._turn_ram_events)
+        except Exception as e:
+            if self.eevee.debug:
+                print(f"WARNING: Metatile learning failed: {e}")
+    
     def _signal_handler(self, signum, frame):
         """Handle Ctrl+C gracefully"""
         print("\n�  Stopping gameplay...")
@@ -354,43 +480,68 @@ class ContinuousGameplay:
                 if self.interactive and self.interactive_controller:
                     self._handle_user_input()
                 
-                # Skip turn if paused
+                # Skip turn if paused (a prefetched frame would be stale by the time we resume)
                 if self.paused:
+                    self.capture_prefetcher.cancel()
                     time.sleep(0.5)
                     continue
                 
                 print(f"\n= Turn {turn_count}/{self.session.max_turns}")
                 
-                # Step 1: Capture current game state
-                game_context = self._capture_game_context()
-                # Store for navigation analysis
-                self._last_game_context = game_context
+                # Step 0: Apply a background episode review that finished during the last turn
+                self.episode_reviewer.poll()
+                
+                # Step 1: Capture current game state (prefetched while the previous turn finished)
+                with self.stage_timer.stage("capture"):
+                    game_context = self.capture_prefetcher.take() if self.pipelined else None
+                    if game_context is None:
+                        game_context = self._capture_game_context()
+                    # Store for navigation analysis
+                    self._last_game_context = game_context
+                    self._observe_frame_diff(game_context)
                 
                 # Step 2: Get AI analysis and decision (returns both AI result and movement data)
-                ai_result, movement_data = self._get_ai_decision(game_context, turn_count)
+                with self.stage_timer.stage("ai_decision"):
+                    ai_result, movement_data = self._get_ai_decision(game_context, turn_count)
                 
                 # Step 3: Execute AI's chosen action (with movement validation)
-                execution_result = self._execute_ai_action(ai_result, movement_data)
-                
-                # Step 4: Update memory and session state
-                self._update_session_state(turn_count, ai_result, execution_result)
+                with self.stage_timer.stage("execute"):
+                    execution_result = self._execute_ai_action(ai_result, movement_data)
+                inputs_done = time.perf_counter()
                 
-                # Step 4.0: Store complete turn data in Neo4j for persistent memory
-                self._store_complete_turn_data(turn_count, game_context, ai_result, execution_result, movement_data)
+                # Step 4: Update memory and session state (RAM event poll and savestate checkpoint use the controller)
+                with self.stage_timer.stage("session_state"):
+                    self._update_session_state(turn_count, ai_result, execution_result)
                 
-                # Step 4.1: Update legacy session data for episode reviewer (first)
-                self._update_session_data_file(turn_count, ai_result, execution_result)
+                # Step 4.0: Controller is free - capture the next frame once turn_delay has passed since the inputs
+                if self.pipelined and turn_count < self.session.max_turns:
+                    self.capture_prefetcher.start(max(0.0, self.turn_delay - (time.perf_counter() - inputs_done)))
                 
-                # Step 4.2: Comprehensive turn data logging (overrides with enhanced data)
-                self._log_complete_turn_data(turn_count, game_context, ai_result, execution_result, movement_data)
+                with self.stage_timer.stage("persist"):
+                    # Step 4.1: Store complete turn data in Neo4j for persistent memory
+                    self._store_complete_turn_data(turn_count, game_context, ai_result, execution_result, movement_data)
+                    
+                    # Step 4.2: Update legacy session data for episode reviewer (first)
+                    self._update_session_data_file(turn_count, ai_result, execution_result)
+                    
+                    # Step 4.3: Comprehensive turn data logging (overrides with enhanced data)
+                    self._log_complete_turn_data(turn_count, game_context, ai_result, execution_result, movement_data)
                 
                 # Step 4.5: Standard periodic episode review runs less frequently for template improvements
                 if hasattr(self, 'episode_review_frequency') and self.episode_review_frequency > 0:
                     if turn_count % self.episode_review_frequency == 0:
                         self._run_periodic_episode_review(turn_count)
                 
-                # Step 5: Wait before next turn
-                time.sleep(self.turn_delay)
+                for callback in self.turn_callbacks:
+                    callback(turn_count, ai_result, execution_result)
+                
+                if self.eevee.verbose and self.pipelined:
+                    print(f"🧵 Pipeline: writer {self.turn_writer.depth} pending, "
+                          f"capture {'prefetching' if self.capture_prefetcher.pending else 'idle'}")
+                
+                # Step 5: Wait before next turn (pipelined: the prefetch worker waits instead)
+                if not self.pipelined:
+                    time.sleep(self.turn_delay)
                 
             except Exception as e:
                 import traceback
@@ -404,9 +555,28 @@ class ContinuousGameplay:
         self.session.status = "completed" if self.running else "stopped"
         self.session.turns_completed = turn_count
         
+        # Finish background capture and persistence before exporting (a review still running is dropped)
+        self.episode_reviewer.close()
+        self.capture_prefetcher.close()
+        self.turn_writer.flush()
+        
         # Generate final fine-tuning dataset
         self._export_fine_tuning_dataset()
         
+        # Make sure queued screenshots reach disk before reporting
+        if self.screenshot_sink is not None:
+            self.screenshot_sink.flush()
+        
+        if self.savestate_pool:
+            if self.eevee.verbose:
+                print(f"💾 Savestate pool: {self.savestate_pool.get_stats()}")
+            self.savestate_pool.close()
+        
+        scene_stats = self.scene_classifier.get_stats()
+        if scene_stats["vision_calls_saved"]:
+            print(f"⚡ Local scene routing saved {scene_stats['vision_calls_saved']} vision calls "
+                  f"({scene_stats['scenes']})")
+        
         return self._get_session_summary()
     
     def _export_fine_tuning_dataset(self):
@@ -446,24 +616,39 @@ class ContinuousGameplay:
             print(f"WARNING: Failed to export fine-tuning dataset: {e}")
     
     def _capture_game_context(self) -> Dict[str, Any]:
-        """Capture current game state via screenshot"""
+        """Capture current game state via screenshot (kept in memory, persisted in background)"""
         try:
+            if self.async_capture:
+                try:
+                    frame = asyncio.run(self._capture_stage_async())
+                except Exception as e:
+                    if self.eevee.verbose:
+                        print(f"⚠️ Async capture failed, falling back to sequential: {e}")
+                    frame = None
+            else:
+                frame = None
+            
             # Use SkyEmu controller for screenshot
-            screenshot_path = self.eevee.controller.capture_screen()
+            if frame is None:
+                frame = self.eevee.controller.capture_frame()
+            if frame is None:
+                raise RuntimeError("SkyEmu returned no frame")
             
-            # Read screenshot as base64 for AI
-            with open(screenshot_path, 'rb') as f:
-                image_data = base64.b64encode(f.read()).decode('utf-8')
+            screenshot_path = None
+            if self.screenshot_sink is not None:
+                timestamp = time.strftime("%Y%m%d_%H%M%S")
+                screenshot_path = str(self.screenshot_sink.submit(frame, f"skyemu_screenshot_{timestamp}.png"))
             
             return {
+                "frame": frame,
                 "screenshot_path": screenshot_path,
-                "screenshot_data": image_data,
+                "screenshot_data": frame.base64,
                 "timestamp": datetime.now().isoformat(),
                 "window_found": True
             }
             
         except Exception as e:
-            print(f"�  Failed to capture screenshot: {e}")
+            print(f"�  Failed to capture screenshot: {e}")
             return {
                 "screenshot_path": None,
                 "screenshot_data": None,
@@ -472,6 +657,26 @@ class ContinuousGameplay:
                 "error": str(e)
             }
     
+    async def _capture_stage_async(self):
+        """Fetch the frame and the RAM snapshot concurrently
+        
+        The RAM snapshot lands in the shared frame-stamped cache, so the
+        overlay coordinates and AI decision later in the turn read it for free.
+        """
+        from skyemu_async_client import AsyncSkyEmuClient
+        from ram_snapshot import get_ram_snapshot_service
+        from game_frame import GameFrame
+        
+        if self._async_client is None:
+            controller = self.eevee.controller
+            self._async_client = AsyncSkyEmuClient(host=controller.host, port=controller.port)
+        
+        screen_bytes, _ = await asyncio.gather(
+            self._async_client.get_screen_bytes(format="png"),
+            asyncio.to_thread(get_ram_snapshot_service().get_snapshot),
+        )
+        return GameFrame(screen_bytes, format="png")
+    
     def _get_ai_decision(self, game_context: Dict[str, Any], turn_number: int) -> tuple:
         """Get AI analysis and action decision with two-stage visual analysis system
         
@@ -485,9 +690,22 @@ class ContinuousGameplay:
                 "reasoning": "Screenshot capture failed, using default action"
             }, None
         
-        # STAGE 1: Visual Analysis - Movement validation and object detection
+        # STAGE 0: Local scene classification - known screens get their analysis without a vision call
         movement_data = None
-        if self.use_visual_analysis and self.visual_analyzer:
+        local_scene = self._classify_scene(game_context)
+        if local_scene is not None and local_scene.known:
+            movement_data = self.scene_classifier.local_analysis(local_scene, getattr(self, '_last_movement_data', None))
+            self._last_visual_prompt = ""
+            self._last_visual_response = ""
+            self._last_visual_processing_time = local_scene.elapsed_ms
+            self._last_movement_data = movement_data
+            if self.eevee.verbose:
+                saved = self.scene_classifier.get_stats()["vision_calls_saved"]
+                print(f"⚡ Local scene: {local_scene.scene} ({local_scene.detail}, {local_scene.source}) - "
+                      f"vision call skipped ({saved} saved this session)")
+        
+        # STAGE 1: Visual Analysis - Movement validation and object detection
+        if movement_data is None and self.use_visual_analysis and self.visual_analyzer:
             try:
                 # Get session name for logging
                 session_name = getattr(self.session, 'session_id', None)
@@ -495,8 +713,10 @@ class ContinuousGameplay:
                 # Analyze current scene for movement validation
                 movement_data = self.visual_analyzer.analyze_current_scene(
                     screenshot_base64=game_context.get("screenshot_data"),
+                    frame=game_context.get("frame"),
                     verbose=self.eevee.verbose,
-                    session_name=session_name
+                    session_name=session_name,
+                    scene=local_scene  # Stage 0 already classified this frame (None when routing is off)
                 )
                 
                 # ENHANCED: Store visual analysis metadata for comprehensive logging
@@ -506,6 +726,12 @@ class ContinuousGameplay:
                     self._last_visual_response = meta.get('raw_response', '')
                     self._last_visual_processing_time = meta.get('processing_time_ms')
                 
+                # Tiles around the player that earlier turns confirmed through RAM
+                if movement_data is not None and self.metatile_atlas and game_context.get("frame") is not None:
+                    learned_tiles = self.metatile_atlas.describe_neighbours(game_context["frame"].pixels)
+                    if learned_tiles:
+                        movement_data["learned_tiles"] = learned_tiles
+                
                 # ENHANCED: Store movement data for turn storage
                 self._last_movement_data = movement_data
                 
@@ -525,6 +751,11 @@ class ContinuousGameplay:
                 print(f"💀 CRITICAL: Cannot proceed without visual analysis - terminating script")
                 exit()
         
+        # What the last input did on screen (e.g. blocked: the background did not scroll)
+        frame_diff = game_context.get("frame_diff")
+        if movement_data is not None and frame_diff is not None:
+            movement_data["last_turn_screen"] = frame_diff.describe()
+        
         # STAGE 1.5: Load Goal Context from okr.json
         okr_data = self._load_okr_context()
         if okr_data and self.eevee.verbose:
@@ -741,12 +972,18 @@ class ContinuousGameplay:
         self.session.last_analysis = ai_result.get("analysis", "")
         self.session.last_action = str(ai_result.get("action", []))
         
+        # RAM events for this turn; healing bookmarks and map connections are recorded by subscribers
+        self._poll_ram_events(execution_result)
+        self._learn_metatiles(execution_result)
+        self._last_turn_actions = execution_result.get("actions_executed", [])
+        
+        # Checkpoint on new maps, battles and every N turns so bad turns can be rolled back
+        if self.savestate_pool:
+            self.savestate_pool.maybe_checkpoint(turn_number, self._turn_ram_events)
+        
         # Track goal progress
         self._track_goal_progress(ai_result, execution_result)
         
-        # Detect healing and create healing bookmarks
-        self._detect_and_bookmark_healing(ai_result, execution_result)
-        
         # Store in memory if available
         if self.eevee.memory:
             try:
@@ -769,17 +1006,8 @@ class ContinuousGameplay:
     def _store_complete_turn_data(self, turn_number: int, game_context: Dict[str, Any], 
                                  ai_result: Dict[str, Any], execution_result: Dict[str, Any], 
                                  movement_data: Dict[str, Any] = None):
-        """Store complete turn data in Neo4j with all context"""
+        """Store complete turn data in Neo4j with all context (written by the background writer)"""
         try:
-            from neo4j_singleton import Neo4jSingleton
-            neo4j = Neo4jSingleton()
-            writer = neo4j.get_writer()
-            
-            if not writer or not writer.driver:
-                if self.eevee.verbose:
-                    print("⚠️ Neo4j writer not available for turn storage")
-                return
-            
             # Prepare complete turn data
             turn_data = {
                 "turn_id": f"{self.session.session_id}_turn_{turn_number}",
@@ -796,6 +1024,24 @@ class ContinuousGameplay:
                 "memory_context": getattr(self, '_last_memory_context', None)
             }
             
+            self._persist("neo4j_turn", self._write_neo4j_turn, turn_number, turn_data)
+                
+        except Exception as e:
+            if self.eevee.verbose:
+                print(f"⚠️ Neo4j turn storage error: {e}")
+    
+    def _write_neo4j_turn(self, turn_number: int, turn_data: Dict[str, Any]):
+        """Write one turn to Neo4j"""
+        try:
+            from neo4j_singleton import Neo4jSingleton
+            neo4j = Neo4jSingleton()
+            writer = neo4j.get_writer()
+            
+            if not writer or not writer.driver:
+                if self.eevee.verbose:
+                    print("⚠️ Neo4j writer not available for turn storage")
+                return
+            
             success = writer.store_game_turn(turn_data)
             
             if self.eevee.verbose:
@@ -873,16 +1119,16 @@ class ContinuousGameplay:
             # Add to session turns list
             self.session_turns.append(turn_data)
             
-            # Update the session data file
+            # Update the session data file (same file as the enhanced data: a pending rewrite is replaced)
             session_data = {
                 "session_id": self.session.session_id,
                 "goal": self.session.goal,
                 "start_time": self.session.start_time,
-                "turns": self.session_turns
+                "turns": list(self.session_turns)
             }
             
-            with open(self.session_data_file, 'w') as f:
-                json.dump(session_data, f, indent=2)
+            self._persist("session_file", self._write_json_file, self.session_data_file, session_data,
+                          coalesce_key=str(self.session_data_file))
             
         except Exception as e:
             if self.eevee.debug:
@@ -903,6 +1149,8 @@ class ContinuousGameplay:
                 movement_data=movement_data,
                 screenshot_path=game_context.get("screenshot_path"),
                 screenshot_base64=game_context.get("screenshot_data"),  # For fine-tuning
+                frame_cache=self._get_frame_cache_stats(),
+                image_encoder=self._get_image_encoder_stats(),
                 
                 # Strategic Decision Stage 
                 strategic_decision=self._extract_strategic_decision_data(ai_result),
@@ -944,6 +1192,54 @@ class ContinuousGameplay:
                 import traceback
                 traceback.print_exc()
     
+    def _classify_scene(self, game_context: Dict[str, Any]):
+        """Local scene classification of the captured frame (None when routing is off or there is no frame)"""
+        frame = game_context.get("frame")
+        if not self.local_scene_routing or frame is None or not self.use_visual_analysis:
+            return None
+        try:
+            from scene_classifier import read_battle_flags
+            return self.scene_classifier.classify(frame.pixels, battle_flags=read_battle_flags())
+        except Exception as e:
+            if self.eevee.debug:
+                print(f"WARNING: Local scene classification failed: {e}")
+            return None
+    
+    def _get_frame_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Frame-hash reuse of visual analysis so far (last_status is this turn's lookup)"""
+        frame_cache = getattr(self.visual_analyzer, 'frame_cache', None) if self.visual_analyzer else None
+        return frame_cache.get_stats() if frame_cache else None
+    
+    def _get_image_encoder_stats(self) -> Optional[Dict[str, Any]]:
+        """Vision payload sizes and encode times so far (last is the newest payload)"""
+        image_encoder = getattr(self.visual_analyzer, 'image_encoder', None) if self.visual_analyzer else None
+        return image_encoder.get_stats() if image_encoder else None
+    
+    def _get_pipeline_stats(self) -> Dict[str, Any]:
+        """Per-stage turn times and the queue depths of the background stages"""
+        return {
+            "stages": self.stage_timer.get_stats(),
+            "writer": self.turn_writer.get_stats(),
+            "capture_prefetch": self.capture_prefetcher.get_stats(),
+            "episode_review": self.episode_reviewer.get_stats(),
+            "screenshot_sink": self.screenshot_sink.get_stats() if self.screenshot_sink else None,
+        }
+    
+    def _persist(self, label: str, function, *args, coalesce_key: Optional[str] = None):
+        """Run a persistence job on the background writer (inline when the loop is not pipelined)"""
+        if self.pipelined:
+            self.turn_writer.submit(label, function, *args, coalesce_key=coalesce_key)
+        else:
+            function(*args)
+    
+    def _get_llm_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Response cache hit ratio and tokens saved so far"""
+        try:
+            from llm_api import get_llm_manager
+            return get_llm_manager().get_cache_stats()
+        except Exception:
+            return None
+    
     def _extract_visual_analysis_data(self, movement_data: Dict) -> LLMInteraction:
         """Extract visual analysis data from movement_data for structured logging"""
         if not movement_data or not hasattr(self, '_last_visual_prompt'):
@@ -1015,40 +1311,53 @@ class ContinuousGameplay:
         return True
     
     def _save_enhanced_session_data(self):
-        """Save enhanced session data with all turn details"""
+        """Save enhanced session data with all turn details (serialized by the background writer)"""
         try:
             if not hasattr(self, 'session_data_file'):
                 return
-                
-            # Create comprehensive session data
-            enhanced_session_data = {
-                "session_metadata": {
-                    "session_id": self.session.session_id,
-                    "goal": self.session.goal,
-                    "start_time": self.session.start_time,
-                    "status": self.session.status,
-                    "total_turns": len(self.session.turns_data) if hasattr(self.session, 'turns_data') else 0,
-                    "successful_turns": self.session.successful_turns if hasattr(self.session, 'successful_turns') else 0,
-                    "fine_tuning_eligible": len([t for t in self.session.turns_data if t.include_in_fine_tuning]) if hasattr(self.session, 'turns_data') else 0
-                },
-                
-                # Legacy format for backward compatibility
+            
+            turns_data = list(self.session.turns_data) if hasattr(self.session, 'turns_data') else []
+            session_metadata = {
                 "session_id": self.session.session_id,
                 "goal": self.session.goal,
                 "start_time": self.session.start_time,
-                "turns": self.session_turns if hasattr(self, 'session_turns') else [],
-                
-                # Enhanced turn data
-                "enhanced_turns": [asdict(turn) for turn in self.session.turns_data] if hasattr(self.session, 'turns_data') else []
+                "status": self.session.status,
+                "total_turns": len(turns_data),
+                "successful_turns": self.session.successful_turns if hasattr(self.session, 'successful_turns') else 0,
+                "fine_tuning_eligible": len([t for t in turns_data if t.include_in_fine_tuning])
             }
+            legacy_turns = list(self.session_turns) if hasattr(self, 'session_turns') else []
             
-            # Write enhanced session data
-            with open(self.session_data_file, 'w') as f:
-                json.dump(enhanced_session_data, f, indent=2, default=str)
+            self._persist("enhanced_session_file", self._write_enhanced_session_data, self.session_data_file,
+                          session_metadata, legacy_turns, turns_data, coalesce_key=str(self.session_data_file))
                 
         except Exception as e:
             print(f"WARNING: Failed to save enhanced session data: {e}")
     
+    def _write_enhanced_session_data(self, path: Path, session_metadata: Dict[str, Any],
+                                     legacy_turns: List[Dict[str, Any]], turns_data: List[TurnData]):
+        """Serialize and write the enhanced session data file"""
+        # Create comprehensive session data
+        enhanced_session_data = {
+            "session_metadata": session_metadata,
+            
+            # Legacy format for backward compatibility
+            "session_id": session_metadata["session_id"],
+            "goal": session_metadata["goal"],
+            "start_time": session_metadata["start_time"],
+            "turns": legacy_turns,
+            
+            # Enhanced turn data
+            "enhanced_turns": [asdict(turn) for turn in turns_data]
+        }
+        self._write_json_file(path, enhanced_session_data)
+    
+    @staticmethod
+    def _write_json_file(path: Path, data: Dict[str, Any]):
+        """Write data as indented JSON"""
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2, default=str)
+    
     def _handle_user_input(self):
         """Handle real-time user input during gameplay"""
         user_input = self.interactive_controller.get_user_input()
@@ -1083,9 +1392,48 @@ class ContinuousGameplay:
         elif cmd == "/help":
             self._show_help()
             
+        elif cmd.startswith("/rollback"):
+            parts = cmd.split()
+            self.rollback(int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 1)
+            
+        elif cmd == "/checkpoints":
+            if self.savestate_pool:
+                for slot in self.savestate_pool.checkpoints():
+                    print(f"   Turn {slot.turn}: {slot.reason} ({slot.size / 1024:.0f}KB)")
+            else:
+                print("⚠️ Savestate pool disabled")
+            
         else:
             print(f"S Unknown command: {command}")
     
+    def rollback(self, n: int = 1) -> bool:
+        """
+        Undo recent turns by restoring the n-th most recent checkpoint
+        
+        Args:
+            n: How many checkpoints to go back (1 = latest)
+            
+        Returns:
+            True if the emulator state was restored
+        """
+        if not self.savestate_pool:
+            print("⚠️ Savestate pool disabled - cannot roll back")
+            return False
+        
+        # The prefetched frame belongs to the undone turns, and its capture must not overlap the state load
+        self.capture_prefetcher.cancel(wait=True)
+        slot = self.savestate_pool.rollback(n)
+        if slot is None:
+            return False
+        
+        # Forget the undone turns' RAM baseline, running review and recent actions
+        self.episode_reviewer.cancel()
+        if self.ram_watcher:
+            self.ram_watcher.reset()
+        self.recent_turns = [turn for turn in self.recent_turns if turn.get("turn", 0) <= (slot.turn or 0)]
+        print(f"⏪ Rolled back to checkpoint from turn {slot.turn} ({slot.reason})")
+        return True
+    
     def _handle_user_task(self, task: str):
         """Handle user task during gameplay"""
         print(f"- User task received: {task}")
@@ -1113,6 +1461,8 @@ class ContinuousGameplay:
         print(f"   /resume - Resume gameplay")
         print(f"   /status - Show current status")
         print(f"   /quit   - Stop gameplay")
+        print(f"   /rollback [n] - Restore the n-th most recent checkpoint (default 1)")
+        print(f"   /checkpoints  - List checkpoints")
         print(f"   /help   - Show this help")
         print(f"\n- Or type any Pokemon task for the AI to consider")
     
@@ -1346,18 +1696,10 @@ class ContinuousGameplay:
     def _collect_ram_data(self) -> Dict[str, Any]:
         """Collect current RAM data for AI decision making"""
         try:
-            import sys
-            from pathlib import Path
-            tests_path = Path(__file__).parent / "tests"
-            if str(tests_path) not in sys.path:
-                sys.path.insert(0, str(tests_path))
-            from analyse_skyemu_ram import SkyEmuClient, PokemonFireRedReader
-            
-            client = SkyEmuClient(debug=False)
-            reader = PokemonFireRedReader(client)
-            
-            # Get enhanced compact game state
-            ram_data = reader.get_compact_game_state()
+            from ram_snapshot import get_ram_snapshot_service
+            
+            # Shared with visual analysis and pathfinding; re-captured after input
+            ram_data = get_ram_snapshot_service().get_compact_game_state()
             return ram_data
             
         except Exception as e:
@@ -1571,8 +1913,15 @@ class ContinuousGameplay:
                         action_aligned = True
                         break
             
+            # RAM events beyond plain walking (map changes, battles, items, healing) are concrete progress
+            from ram_events import PlayerMoved, MapChanged
+            milestones = [event.describe() for event in self._turn_ram_events
+                          if not isinstance(event, PlayerMoved)]
+            
             # Log progress
             if self.eevee.verbose:
+                if milestones:
+                    print(f"📊 Goal Progress: {'; '.join(milestones)}")
                 if action_aligned and action_successful:
                     print(f"✅ Goal Progress: Action aligned with goal recommendations")
                 elif not action_aligned and current_goal.get("status") == "blocked":
@@ -1589,7 +1938,10 @@ class ContinuousGameplay:
                 'goal_id': current_goal.get('id'),
                 'action_aligned': action_aligned,
                 'action_successful': action_successful,
-                'goal_status': current_goal.get('status')
+                'goal_status': current_goal.get('status'),
+                'position_changed': any(isinstance(event, (PlayerMoved, MapChanged))
+                                        for event in self._turn_ram_events),
+                'ram_events': milestones
             })
             
             # Keep only last 10 turns of tracking
@@ -1600,146 +1952,89 @@ class ContinuousGameplay:
             if self.eevee.debug:
                 print(f"WARNING: Goal progress tracking failed: {e}")
     
-    def _detect_and_bookmark_healing(self, ai_result: Dict[str, Any], execution_result: Dict[str, Any]):
-        """Detect successful healing and automatically bookmark Pokemon Center locations"""
+    def _on_party_healed(self, event):
+        """Bookmark the Pokemon Center where a Healed event happened"""
         try:
-            # Only check if action was successful
-            if not execution_result.get("success", False):
-                return
-            
-            # Get current and previous RAM data
             current_ram_data = self._collect_ram_data()
-            if not current_ram_data or not current_ram_data.get("ram_available", False):
+            if not current_ram_data.get("ram_available", False):
                 return
             
-            # Check if we're at a Pokemon Center and if healing may have occurred
+            # Only bookmark healing at Pokemon Centers (potions can also top up the party)
             current_location = current_ram_data.get("location", {})
             at_pokemon_center = current_ram_data.get("quick_status", {}).get("at_pokemon_center", False)
             location_name = current_location.get("location_name", "")
-            
-            # Only check healing at Pokemon Centers
             if not at_pokemon_center and "pokemon center" not in location_name.lower():
                 return
             
-            # Check if we have stored previous RAM data for comparison
-            if not hasattr(self, '_previous_ram_data'):
-                # Store current RAM data for next comparison
-                self._previous_ram_data = current_ram_data
-                return
+            from healing_bookmark_system import HealingBookmarkSystem
+            if self._healing_system is None:
+                self._healing_system = HealingBookmarkSystem()
             
-            previous_ram_data = self._previous_ram_data
+            location_data = {
+                "map_id": (current_location.get("map_bank", 0) * 1000) + current_location.get("map_id", 0),
+                "x": current_location.get("x", 0),
+                "y": current_location.get("y", 0),
+                "map_name": location_name or "Pokemon Center",
+                "location_name": location_name or "Pokemon Center"
+            }
             
-            # Use healing bookmark system to detect and bookmark healing
-            try:
-                from healing_bookmark_system import HealingBookmarkSystem
-                healing_system = HealingBookmarkSystem()
-                
-                # Detect if healing occurred
-                healing_detected = healing_system.detect_healing_success(previous_ram_data, current_ram_data)
-                
-                if healing_detected:
-                    # Create location data for bookmarking
-                    location_data = {
-                        "map_id": (current_location.get("map_bank", 0) * 1000) + current_location.get("map_id", 0),
-                        "x": current_location.get("x", 0),
-                        "y": current_location.get("y", 0),
-                        "map_name": current_location.get("location_name", "Pokemon Center"),
-                        "location_name": current_location.get("location_name", "Pokemon Center")
-                    }
-                    
-                    # Calculate approximate healing duration (basic estimate)
-                    healing_duration = 5.0  # Simple assumption: ~5 seconds per healing
-                    
-                    # Create bookmark
-                    session_id = getattr(self.session, 'session_id', 'unknown')
-                    bookmark_success = healing_system.bookmark_healing_location(
-                        location_data, previous_ram_data, current_ram_data, 
-                        session_id, healing_duration
-                    )
-                    
-                    if bookmark_success and self.eevee.verbose:
-                        print(f"🏥 HEALING BOOKMARK: Successfully saved {location_data['location_name']} at ({location_data['x']},{location_data['y']})")
-                        party_summary = current_ram_data.get("party_summary", {})
-                        print(f"   Health status: {party_summary.get('party_health_status', 'unknown')} - {party_summary.get('healthy_pokemon', 0)}/{party_summary.get('total_pokemon', 0)} healthy")
-                        
-            except ImportError:
-                if self.eevee.verbose:
-                    print("⚠️ Healing bookmark system not available")
+            # Calculate approximate healing duration (basic estimate)
+            healing_duration = 5.0  # Simple assumption: ~5 seconds per healing
             
-            # Always update previous RAM data for next comparison
-            self._previous_ram_data = current_ram_data
+            session_id = getattr(self.session, 'session_id', 'unknown')
+            bookmark_success = self._healing_system.record_healed_event(
+                event, location_data, session_id, healing_duration
+            )
             
+            if bookmark_success and self.eevee.verbose:
+                print(f"🏥 HEALING BOOKMARK: Successfully saved {location_data['location_name']} at ({location_data['x']},{location_data['y']})")
+                print(f"   {event.describe()}")
+                
+        except ImportError:
+            if self.eevee.verbose:
+                print("⚠️ Healing bookmark system not available")
         except Exception as e:
             if self.eevee.debug:
-                print(f"WARNING: Healing detection failed: {e}")
+                print(f"WARNING: Healing bookmark failed: {e}")
     
     def _execute_pathfinding_to_coordinate(self, target_x: int, target_y: int) -> List[str]:
-        """Smart pathfinding loop - moves one step at a time, validates with RAM"""
+        """Smart pathfinding - straight held-input runs, completion detected by polling RAM coordinates"""
         executed_buttons = []
-        max_attempts = 20  # Prevent infinite loops
         
         if self.eevee.verbose:
-            print(f"🧭 PATHFINDING LOOP: Moving to ({target_x},{target_y}) step by step")
+            print(f"🧭 PATHFINDING: Moving to ({target_x},{target_y})")
         
-        for attempt in range(max_attempts):
-            # Get current position from RAM
-            ram_data = self._collect_ram_data()
-            if not ram_data or not ram_data.get("ram_available", False):
-                if self.eevee.verbose:
-                    print("⚠️ RAM data not available for pathfinding")
-                break
-                
-            location_data = ram_data.get("location", {})
-            current_x = location_data.get("x", 0)
-            current_y = location_data.get("y", 0)
-            
-            # Check if we've reached target
-            if current_x == target_x and current_y == target_y:
-                if self.eevee.verbose:
-                    print(f"   ✅ Reached target ({target_x},{target_y}) in {attempt} steps")
-                break
-                
-            # Calculate next move (one button only)
-            dx = target_x - current_x
-            dy = target_y - current_y
-            
-            if abs(dx) > abs(dy):
-                button = "right" if dx > 0 else "left"
-            else:
-                button = "down" if dy > 0 else "up"
-                
+        if not self.eevee.controller:
             if self.eevee.verbose:
-                print(f"   Step {attempt+1}: ({current_x},{current_y}) → pressing {button}")
-                
-            # Press button and wait for movement
-            old_x, old_y = current_x, current_y
-            if self.eevee.controller:
-                self.eevee.controller.press_button(button)
-                time.sleep(0.5)  # Wait for movement to complete
-                
-                # Check if position actually changed
-                new_ram = self._collect_ram_data()
-                if new_ram and new_ram.get("ram_available", False):
-                    new_location = new_ram.get("location", {})
-                    new_x = new_location.get("x", old_x)
-                    new_y = new_location.get("y", old_y)
-                    
-                    if new_x != old_x or new_y != old_y:
-                        executed_buttons.append(button)
-                        if self.eevee.verbose:
-                            print(f"      ✅ Moved to ({new_x},{new_y})")
-                    else:
-                        # Blocked - try alternative or give up
-                        if self.eevee.verbose:
-                            print(f"      ❌ Movement blocked, trying alternative")
-                        executed_buttons.append("b")  # Back up or cancel
-                        break
-                else:
-                    executed_buttons.append(button)  # Hope for the best if RAM unavailable
-            else:
-                if self.eevee.verbose:
-                    print("⚠️ Controller not available")
-                break
+                print("⚠️ Controller not available")
+            return ["b"]
+        
+        try:
+            if self._movement_executor is None:
+                from movement_executor import MovementExecutor
+                self._movement_executor = MovementExecutor(self.eevee.controller)
+            path = self._movement_executor.walk_to(target_x, target_y)
+        except Exception as e:
+            if self.eevee.verbose:
+                print(f"⚠️ RAM data not available for pathfinding: {e}")
+            return ["b"]
+        
+        for move in path.moves:
+            if self.eevee.verbose:
+                start = f"({move.start.x},{move.start.y})" if move.start else "(?)"
+                end = f"({move.end.x},{move.end.y})" if move.end else "(?)"
+                status = "blocked" if move.blocked else "map changed" if move.map_changed else "ok"
+                print(f"   {move.direction} x{move.requested_tiles}: {start} → {end} "
+                      f"[{move.tiles_moved} tiles, {move.elapsed * 1000:.0f} ms, {status}]")
+        executed_buttons = path.buttons
+        
+        if path.reached:
+            if self.eevee.verbose:
+                print(f"   ✅ Reached target ({target_x},{target_y})")
+        elif path.blocked:
+            if self.eevee.verbose:
+                print(f"      ❌ Movement blocked")
+            executed_buttons.append("b")  # Back up or cancel
         
         if self.eevee.verbose:
             print(f"   📊 Pathfinding completed: {len(executed_buttons)} buttons executed")
@@ -2171,7 +2466,8 @@ Use the pokemon_controller tool with your chosen button sequence."""
             # Determine day number
             day_number = diary_gen.get_next_day_number(str(self.eevee.runs_dir))
             
-            # Load session data from file for complete diary generation
+            # Load session data from file for complete diary generation (after pending background writes)
+            self.turn_writer.flush()
             session_data = {}
             if hasattr(self, 'session_data_file') and self.session_data_file.exists():
                 with open(self.session_data_file, 'r') as f:
@@ -2202,7 +2498,14 @@ Use the pokemon_controller tool with your chosen button sequence."""
             "user_interactions": len(self.session.user_interactions),
             "last_analysis": self.session.last_analysis,
             "last_action": self.session.last_action,
-            "diary_path": diary_path
+            "diary_path": diary_path,
+            "frame_cache": self._get_frame_cache_stats(),
+            "image_encoder": self._get_image_encoder_stats(),
+            "frame_diff": self.frame_diff.get_stats(),
+            "metatile_atlas": self.metatile_atlas.get_stats() if self.metatile_atlas else None,
+            "scene_classifier": self.scene_classifier.get_stats(),
+            "llm_cache": self._get_llm_cache_stats(),
+            "pipeline": self._get_pipeline_stats()
         }
         
         # Update Neo4j session status and cleanup
@@ -2226,22 +2529,67 @@ Use the pokemon_controller tool with your chosen button sequence."""
         return summary
     
     def _run_periodic_episode_review(self, current_turn: int):
-        """Run AI-powered periodic episode review and apply prompt improvements automatically"""
+        """Start an AI-powered periodic episode review of the last turns (background when pipelined)"""
+        print(f"📊 PERIODIC REVIEW (Turn {current_turn}): Analyzing last {self.episode_review_frequency} turns...")
+        
+        # Get recent turns for analysis
+        recent_turns = self.session_turns[-self.episode_review_frequency:] if hasattr(self, 'session_turns') else []
+        
+        if not recent_turns:
+            print("WARNING: No recent turns available for analysis")
+            return
+        
+        self.episode_reviewer.background = self.pipelined
+        self.episode_reviewer.submit(current_turn, recent_turns, self.session.goal, self._current_goal_snapshot())
+    
+    def _current_goal_snapshot(self) -> Dict[str, str]:
+        """Name and description of the active goal in the task executor's hierarchy ("Unknown" without one)"""
+        snapshot = {"name": "Unknown", "description": "Unknown"}
+        task_executor = getattr(self.eevee, 'task_executor', None)
+        hierarchy = task_executor.current_goal_hierarchy if task_executor else None
+        current_goal = hierarchy.get_current_goal() if hierarchy else None
+        if current_goal:
+            snapshot.update(name=current_goal.name, description=current_goal.description)
+        return snapshot
+    
+    def _compute_episode_review(self, current_turn: int, recent_turns: List[Dict], session_goal: str,
+                                current_goal: Dict[str, str]) -> Dict[str, Any]:
+        """
+        LLM half of the periodic review, run on the review worker
+        
+        Reads only its (copied) arguments - including the active goal, taken on
+        the loop thread - and makes LLM calls through call_llm, never through
+        the agent. Goal hierarchy, okr.json and template changes are returned
+        for _apply_episode_review.
+        """
+        print(f"🎯 GOAL-ORIENTED PLANNING: Analyzing progress toward '{session_goal}'")
+        return {
+            "turn": current_turn,
+            "session_goal": session_goal,
+            "strategic_context": self._generate_strategic_context_analysis(recent_turns, current_turn),
+            "progress_analysis": self._analyze_goal_progress_with_ai(recent_turns, session_goal, current_goal),
+            "ai_performance": self._ai_evaluate_performance(recent_turns, current_turn),
+        }
+    
+    def _apply_episode_review(self, review: Dict[str, Any]):
+        """Apply a computed periodic review between turns: goal planning updates and template rewrites"""
         try:
-            print(f"📊 PERIODIC REVIEW (Turn {current_turn}): Analyzing last {self.episode_review_frequency} turns...")
-            
-            # Get recent turns for analysis
-            recent_turns = self.session_turns[-self.episode_review_frequency:] if hasattr(self, 'session_turns') else []
-            
-            if not recent_turns:
-                print("WARNING: No recent turns available for analysis")
-                return
+            current_turn = review["turn"]
+            if self.session.goal != review["session_goal"]:
+                print(f"⚠️ Goal changed during review of turn {current_turn}, applying it to '{self.session.goal}'")
             
             # Goal-oriented planning analysis
-            goal_planning_result = self._run_goal_oriented_planning_review(recent_turns, current_turn)
+            goal_planning_result = self._apply_goal_planning_review(
+                review["strategic_context"], review["progress_analysis"], current_turn
+            )
             
             # AI-powered template improvement analysis
-            ai_performance_result = self._ai_evaluate_performance(recent_turns, current_turn)
+            ai_performance_result = review["ai_performance"]
+            if "improvements" in ai_performance_result:
+                ai_performance_result["improvements_made"] = sum(
+                    self._write_improved_template(improvement)
+                    for improvement in ai_performance_result.pop("improvements")
+                )
             
             print("goal_planning_result", goal_planning_result)
             print("ai_performance_result", ai_performance_result)
@@ -2291,16 +2639,16 @@ Use the pokemon_controller tool with your chosen button sequence."""
                     "templates_analyzed": len(template_usage)
                 }
             
-            # For each problematic template, ask Gemini for improvements
-            improvements_made = 0
+            # For each problematic template, ask Gemini for improvements (written when the review is applied)
+            improvements = []
             for template_info in templates_to_improve[:1]:  # Only improve 1 template per review
                 improvement = self._improve_template_with_gemini(template_info)
                 if improvement["success"]:
-                    improvements_made += 1
+                    improvements.append(improvement)
             
             return {
                 "success": True,
-                "improvements_made": improvements_made,
+                "improvements": improvements,
                 "templates_analyzed": len(template_usage),
                 "problematic_templates": len(templates_to_improve)
             }
@@ -2312,7 +2660,7 @@ Use the pokemon_controller tool with your chosen button sequence."""
             }
     
     def _improve_template_with_gemini(self, template_info: Dict[str, Any]) -> Dict[str, Any]:
-        """Ask Gemini to improve a template and update the YAML file directly"""
+        """Ask Gemini to improve a template; the YAML is written by _write_improved_template"""
         try:
             template_name = template_info["template"]
             playbook_name = template_info["playbook"]
@@ -2357,38 +2705,51 @@ Please improve this template to better handle these scenarios. Focus on:
 
 Output ONLY the improved YAML content, nothing else."""
 
-            # Call Gemini for improvement
-            api_result = self.eevee._call_gemini_api(
+            # Call the template provider directly: this runs on the review worker, not through the agent
+            from llm_api import call_llm
+            from provider_config import get_provider_for_task, get_model_for_task
+            
+            llm_response = call_llm(
                 prompt=improvement_prompt,
-                image_data=None,
-                use_tools=False,
+                provider=get_provider_for_task("template_selection"),
+                model=get_model_for_task("template_selection"),
                 max_tokens=2000
             )
             
-            if api_result["error"]:
-                return {"success": False, "error": f"Gemini API failed: {api_result['error']}"}
+            if llm_response.error:
+                return {"success": False, "error": f"LLM error: {llm_response.error}"}
             
-            improved_content = api_result.get("text", "").strip()
+            improved_content = (llm_response.text or "").strip()
             
             # Basic validation - ensure it's YAML-like
             if not improved_content or "template_name:" not in improved_content:
                 return {"success": False, "error": "Invalid template response from Gemini"}
             
-            # Write directly to file (YOLO approach as requested)
-            with open(template_path, 'w') as f:
-                f.write(improved_content)
-            
-            print(f"✅ Updated template: {template_name} (failure rate was {failure_rate:.0%})")
-            
             return {
                 "success": True,
                 "template": template_name,
-                "file_path": str(template_path)
+                "file_path": str(template_path),
+                "failure_rate": failure_rate,
+                "content": improved_content
             }
             
         except Exception as e:
             return {"success": False, "error": f"Template improvement failed: {e}"}
     
+    def _write_improved_template(self, improvement: Dict[str, Any]) -> bool:
+        """Write an improved template from _improve_template_with_gemini to its YAML file"""
+        try:
+            # Write directly to file (YOLO approach as requested)
+            with open(improvement["file_path"], 'w') as f:
+                f.write(improvement["content"])
+            
+            print(f"✅ Updated template: {improvement['template']} (failure rate was {improvement['failure_rate']:.0%})")
+            return True
+            
+        except Exception as e:
+            print(f"⚠️ Failed to write improved template {improvement.get('template')}: {e}")
+            return False
+    
     def _build_ai_performance_analysis_prompt(self, recent_turns: List[Dict], stuck_indices: List[int], current_turn: int) -> str:
         """Build comprehensive prompt for AI performance analysis"""
         
@@ -3080,9 +3441,27 @@ Return ONLY the improved template content, ready to replace the current template
         4. Store results for injection into strategic prompts
         5. Update okr.json with current active goal
         """
+        print(f"🎯 GOAL-ORIENTED PLANNING: Analyzing progress toward '{self.session.goal}'")
+        
+        # NEW: Generate comprehensive strategic context analysis
+        strategic_context = self._generate_strategic_context_analysis(recent_turns, current_turn)
+        
+        # Analyze recent turns for goal progress using AI
+        progress_analysis = self._analyze_goal_progress_with_ai(recent_turns, self.session.goal)
+        
+        return self._apply_goal_planning_review(strategic_context, progress_analysis, current_turn)
+    
+    def _apply_goal_planning_review(self, strategic_context: Dict[str, Any], progress_analysis: Dict[str, Any],
+                                    current_turn: int) -> Dict[str, Any]:
+        """
+        Update goal hierarchy, okr.json and the stored periodic review from a computed analysis
+        
+        Args:
+            strategic_context: Result of _generate_strategic_context_analysis
+            progress_analysis: Result of _analyze_goal_progress_with_ai
+            current_turn: Turn the analysis was made at
+        """
         try:
-            print(f"🎯 GOAL-ORIENTED PLANNING: Analyzing progress toward '{self.session.goal}'")
-            
             # Import TaskExecutor for goal decomposition
             from task_executor import TaskExecutor, Goal, GoalHierarchy
             
@@ -3092,12 +3471,6 @@ Return ONLY the improved template content, ready to replace the current template
             
             task_executor = self.eevee.task_executor
             
-            # NEW: Generate comprehensive strategic context analysis
-            strategic_context = self._generate_strategic_context_analysis(recent_turns, current_turn)
-            
-            # Analyze recent turns for goal progress using AI
-            progress_analysis = self._analyze_goal_progress_with_ai(recent_turns, self.session.goal)
-            
             if not progress_analysis["success"]:
                 print(f"⚠️ Goal progress analysis failed: {progress_analysis.get('error', 'Unknown error')}")
                 # Still store strategic context even if goal analysis fails
@@ -3615,7 +3988,8 @@ Return ONLY the improved template content, ready to replace the current template
             print(f"⚠️ Failed to create contextual goal: {e}")
             return None
     
-    def _analyze_goal_progress_with_ai(self, recent_turns: List[Dict], session_goal: str) -> Dict[str, Any]:
+    def _analyze_goal_progress_with_ai(self, recent_turns: List[Dict], session_goal: str,
+                                       current_goal: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """Use AI to analyze progress toward current session goal"""
         try:
             # Build analysis prompt with correct data access patterns
@@ -3642,14 +4016,10 @@ Return ONLY the improved template content, ready to replace the current template
                 
                 turns_summary.append(f"Turn {i}: {reasoning} | Obs: {observations}{action_str}")
             
-            # Get current goal context for enhanced analysis
-            current_goal_name = "Unknown"
-            current_goal_description = "Unknown"
-            if hasattr(self.eevee, 'task_executor') and self.eevee.task_executor.current_goal_hierarchy:
-                current_goal = self.eevee.task_executor.current_goal_hierarchy.get_current_goal()
-                if current_goal:
-                    current_goal_name = current_goal.name
-                    current_goal_description = current_goal.description
+            # Get current goal context for enhanced analysis (the review worker passes a snapshot)
+            current_goal = current_goal or self._current_goal_snapshot()
+            current_goal_name = current_goal["name"]
+            current_goal_description = current_goal["description"]
             
             analysis_prompt = f"""
 **POKEMON GOAL PROGRESS ANALYSIS WITH DYNAMIC GOAL ADVANCEMENT**
@@ -3935,6 +4305,33 @@ Examples:
         help="Generate episode review every N turns (default: 100, 0 to disable)"
     )
     
+    parser.add_argument(
+        "--input-mode",
+        choices=["realtime", "frame_stepped"],
+        default="realtime",
+        help="realtime: wall-clock key presses; frame_stepped: pause emulator and step exact frames per button (default: realtime)"
+    )
+    
+    parser.add_argument(
+        "--llm-cache",
+        choices=["passthrough", "record", "replay"],
+        default=None,
+        help="LLM response cache: record responses, replay them without API calls, or passthrough (default: LLM_CACHE_MODE or passthrough)"
+    )
+    
+    parser.add_argument(
+        "--local-scenes",
+        choices=["on", "off"],
+        default=None,
+        help="Recognize dialogue, menu and battle screens locally and skip the vision call (default: LOCAL_SCENE_ROUTING or on)"
+    )
+    
+    parser.add_argument(
+        "--no-save-screenshots",
+        action="store_true",
+        help="Keep screenshots in memory only (skip writing raw captures to analysis/)"
+    )
+    
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -3956,6 +4353,21 @@ Examples:
     )
     
     
+    # Savestates
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=10,
+        help="Automatic in-memory checkpoint every N turns, besides new maps and battles (0 disables, default: 10)"
+    )
+    
+    parser.add_argument(
+        "--savestate-budget-mb",
+        type=float,
+        default=256.0,
+        help="Memory budget for in-memory savestates; 0 disables checkpoints (default: 256)"
+    )
+    
     # Emulator Configuration
     parser.add_argument(
         "--window-title",
@@ -4045,9 +4457,10 @@ def execute_basic_task(eevee: EeveeAgent, task: str) -> Dict[str, Any]:
     
     # Capture current game state
     try:
-        screenshot_path = eevee.controller.capture_screen()
-        with open(screenshot_path, 'rb') as f:
-            image_data = base64.b64encode(f.read()).decode('utf-8')
+        frame = eevee.controller.capture_frame()
+        if frame is None:
+            raise RuntimeError("SkyEmu returned no frame")
+        image_data = frame.base64
     except Exception as e:
         return {"success": False, "error": f"Screenshot capture failed: {e}"}
     
@@ -4111,6 +4524,11 @@ def main():
         eevee_dir = setup_environment()
         print_startup_banner(args)
         
+        # Cache mode is read when the LLM manager is created
+        if args.llm_cache:
+            os.environ["LLM_CACHE_MODE"] = args.llm_cache
+            print(f"💾 LLM cache: {args.llm_cache}")
+        
         # Initialize Eevee agent
         print("- Initializing Eevee AI system...")
         
@@ -4126,6 +4544,11 @@ def main():
             )
             print(" Eevee agent initialized successfully")
             
+            # Frame-stepped input runs button presses at emulator speed
+            if args.input_mode != "realtime" and hasattr(eevee.controller, "input_mode"):
+                eevee.controller.input_mode = args.input_mode
+                print(f"🎮 Input mode: {args.input_mode}")
+            
             # PHASE 2: Enhance with memory system (now mandatory)
             if MEMORY_INTEGRATION_AVAILABLE:
                 print("🧠 PHASE 2: Enhancing Eevee with mandatory memory integration...")
@@ -4187,11 +4610,17 @@ def main():
             print(f"\n{'='*60}")
             
             # Initialize continuous gameplay
-            gameplay = ContinuousGameplay(eevee, interactive=interactive, episode_review_frequency=args.episode_review_frequency)
+            gameplay = ContinuousGameplay(eevee, interactive=interactive, episode_review_frequency=args.episode_review_frequency,
+                                          save_screenshots=not args.no_save_screenshots,
+                                          checkpoint_every=args.checkpoint_every,
+                                          savestate_budget_mb=args.savestate_budget_mb)
             
             # Start session
             gameplay.start_session(args.goal, args.max_turns)
             gameplay.turn_delay = args.turn_delay
+            if args.local_scenes:
+                gameplay.local_scene_routing = args.local_scenes == "on"
+                print(f"⚡ Local scene routing: {args.local_scenes}")
             
             try:
                 # Run the main gameplay loop
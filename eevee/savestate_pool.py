@@ -0,0 +1,280 @@
+"""
+Savestate Pool for Eevee
+Keeps emulator savestates in memory under an LRU size budget, takes automatic
+checkpoints during play and rolls back to them with a single emulator load
+"""
+
+import ipaddress
+import os
+import shutil
+import socket
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def is_local_host(host: Optional[str]) -> bool:
+    """True if `host` is this machine (loopback address, "localhost" or our own hostname)"""
+    if not host or host.lower() in ("localhost", "0.0.0.0", socket.gethostname().lower()):
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+
+def scratch_dir_for(host: Optional[str]) -> Optional[str]:
+    """
+    Directory for the transient state files SkyEmu at `host` writes and we read back
+
+    SKYEMU_SCRATCH_DIR overrides the choice (a directory mounted at the same
+    path on both machines); otherwise only a local SkyEmu shares our
+    filesystem, so a remote one gets None and the pool cannot be used.
+
+    Returns:
+        Directory path, or None when there is no directory both sides can see
+    """
+    configured = os.getenv("SKYEMU_SCRATCH_DIR")
+    if configured:
+        return configured
+    if not is_local_host(host):
+        return None
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+@dataclass
+class SavestateSlot:
+    """One savestate held in memory"""
+    name: str
+    data: bytes
+    turn: Optional[int]
+    reason: str
+    created_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+class SavestatePool:
+    """
+    Named in-memory savestate slots with LRU eviction
+
+    SkyEmu saves and loads states through file paths, so each save goes to a
+    scratch file on a RAM-backed directory (/dev/shm when available) and is
+    read straight back into memory, which needs SkyEmu to share this
+    filesystem (see scratch_dir_for); a restore writes the bytes back out and
+    issues one load_state call. Checkpoints taken by `maybe_checkpoint` form a
+    timeline that `rollback(n)` walks back through.
+    """
+
+    CHECKPOINT_PREFIX = "checkpoint_"
+
+    def __init__(self, controller, budget_mb: float = 256.0, checkpoint_every: int = 10,
+                 scratch_dir: Optional[str] = None, verbose: bool = False):
+        """
+        Args:
+            controller: SkyEmuController (or anything with save_state/load_state)
+            budget_mb: Memory budget for all slots; least recently used slots are evicted beyond it
+            checkpoint_every: Automatic checkpoint interval in turns (0 disables interval checkpoints)
+            scratch_dir: Directory for the transient state files (defaults to scratch_dir_for(controller.host));
+                         SkyEmu must be able to read and write it at the same path
+            verbose: Print checkpoint and rollback messages
+        """
+        self.controller = controller
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.checkpoint_every = checkpoint_every
+        self.verbose = verbose
+
+        if scratch_dir is None:
+            scratch_dir = scratch_dir_for(getattr(controller, "host", None))
+            if scratch_dir is None:
+                raise ValueError(f"SkyEmu at {controller.host} does not share this filesystem; "
+                                 f"set SKYEMU_SCRATCH_DIR to a directory both machines see")
+        self.scratch_dir = Path(tempfile.mkdtemp(prefix="eevee_savestates_", dir=scratch_dir))
+
+        self._slots: "OrderedDict[str, SavestateSlot]" = OrderedDict()  # least recently used first
+        self._timeline: List[str] = []  # checkpoint names, oldest first
+
+        # Metrics
+        self.saves = 0
+        self.loads = 0
+        self.evictions = 0
+        self.save_time = 0.0
+        self.load_time = 0.0
+
+    @property
+    def used_bytes(self) -> int:
+        return sum(slot.size for slot in self._slots.values())
+
+    def _scratch_path(self) -> Path:
+        return self.scratch_dir / f"{uuid.uuid4().hex}.state"
+
+    def save(self, name: str, turn: Optional[int] = None, reason: str = "manual") -> bool:
+        """
+        Save the current emulator state into slot `name` (replacing it)
+
+        Args:
+            name: Slot name
+            turn: Turn number the state belongs to
+            reason: Why it was saved (shown in listings)
+
+        Returns:
+            True if the state was captured
+        """
+        path = self._scratch_path()
+        start = time.perf_counter()
+        try:
+            if not self.controller.save_state(str(path), quiet=True):
+                return False
+            data = path.read_bytes()
+        except Exception as e:
+            print(f"⚠️ Savestate {name} could not be captured: {e}")
+            return False
+        finally:
+            path.unlink(missing_ok=True)
+        self.save_time += time.perf_counter() - start
+        self.saves += 1
+
+        if len(data) > self.budget_bytes:
+            print(f"⚠️ Savestate {name} ({len(data) / 1024:.0f}KB) exceeds the pool budget; not kept")
+            return False
+
+        self._slots.pop(name, None)
+        self._slots[name] = SavestateSlot(name=name, data=data, turn=turn, reason=reason, created_at=time.time())
+        self._evict(keep=name)
+        return True
+
+    def load(self, name: str) -> bool:
+        """Restore slot `name` with a single emulator load"""
+        slot = self._slots.get(name)
+        if slot is None:
+            print(f"⚠️ No savestate named {name}")
+            return False
+
+        path = self._scratch_path()
+        start = time.perf_counter()
+        try:
+            path.write_bytes(slot.data)
+            if not self.controller.load_state(str(path), quiet=True):
+                return False
+        except Exception as e:
+            print(f"⚠️ Savestate {name} could not be restored: {e}")
+            return False
+        finally:
+            path.unlink(missing_ok=True)
+        self.load_time += time.perf_counter() - start
+        self.loads += 1
+        self._slots.move_to_end(name)
+        return True
+
+    def delete(self, name: str) -> bool:
+        if self._slots.pop(name, None) is None:
+            return False
+        if name in self._timeline:
+            self._timeline.remove(name)
+        return True
+
+    def _evict(self, keep: str) -> None:
+        """Drop least recently used slots until the pool fits its budget"""
+        while self.used_bytes > self.budget_bytes:
+            victim = next((name for name in self._slots if name != keep), None)
+            if victim is None:
+                break
+            self.delete(victim)
+            self.evictions += 1
+
+    # --- Checkpoints ---
+
+    def checkpoint(self, turn: int, reason: str = "interval") -> Optional[str]:
+        """Save an automatic checkpoint for `turn` and add it to the rollback timeline"""
+        name = f"{self.CHECKPOINT_PREFIX}{turn:05d}"
+        if not self.save(name, turn=turn, reason=reason):
+            return None
+        if name in self._timeline:
+            self._timeline.remove(name)
+        self._timeline.append(name)
+        if self.verbose:
+            print(f"💾 Checkpoint turn {turn} ({reason}) - {len(self._slots)} slots, "
+                  f"{self.used_bytes / 1024 / 1024:.1f}/{self.budget_bytes / 1024 / 1024:.0f}MB")
+        return name
+
+    def maybe_checkpoint(self, turn: int, events: Optional[list] = None) -> Optional[str]:
+        """
+        Checkpoint on entering a new map, starting a battle, or every `checkpoint_every` turns
+
+        Args:
+            turn: Turn just completed
+            events: ram_events emitted this turn
+
+        Returns:
+            Checkpoint name, or None if none was taken
+        """
+        reasons = [type(event).__name__ for event in events or []
+                   if type(event).__name__ in ("MapChanged", "BattleStarted")]
+        if reasons:
+            return self.checkpoint(turn, reason=reasons[0])
+        if self.checkpoint_every and turn % self.checkpoint_every == 0:
+            return self.checkpoint(turn, reason="interval")
+        return None
+
+    def checkpoints(self) -> List[SavestateSlot]:
+        """Checkpoints still held in memory, oldest first"""
+        self._timeline = [name for name in self._timeline if name in self._slots]
+        return [self._slots[name] for name in self._timeline]
+
+    def rollback(self, n: int = 1) -> Optional[SavestateSlot]:
+        """
+        Restore the n-th most recent checkpoint (1 = latest) and discard newer ones
+
+        Args:
+            n: How many checkpoints to go back
+
+        Returns:
+            The restored checkpoint, or None if there is none that far back
+        """
+        timeline = self.checkpoints()
+        if n < 1 or n > len(timeline):
+            print(f"⚠️ Cannot roll back {n} checkpoint(s); {len(timeline)} available")
+            return None
+
+        target = timeline[-n]
+        if not self.load(target.name):
+            return None
+        for slot in timeline[len(timeline) - n + 1:]:
+            self.delete(slot.name)
+        if self.verbose:
+            print(f"⏪ Rolled back to turn {target.turn} ({target.reason})")
+        return target
+
+    # --- Introspection ---
+
+    def list_slots(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": slot.name, "turn": slot.turn, "reason": slot.reason,
+             "size_kb": round(slot.size / 1024, 1), "created_at": slot.created_at}
+            for slot in self._slots.values()
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "slots": len(self._slots),
+            "checkpoints": len(self.checkpoints()),
+            "used_mb": round(self.used_bytes / 1024 / 1024, 2),
+            "budget_mb": round(self.budget_bytes / 1024 / 1024, 2),
+            "saves": self.saves,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "avg_save_ms": round(self.save_time * 1000 / self.saves, 2) if self.saves else 0.0,
+            "avg_load_ms": round(self.load_time * 1000 / self.loads, 2) if self.loads else 0.0,
+        }
+
+    def close(self) -> None:
+        """Drop all slots and remove the scratch directory"""
+        self._slots.clear()
+        self._timeline.clear()
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
@@ -0,0 +1,235 @@
+"""
+Scene Classifier for Eevee
+Recognizes dialogue boxes, the battle HUD and the start menu from a few pixel
+signatures (the RAM battle flags only corroborate a battle screen), so the
+turn loop can skip the vision call on screens whose analysis is already known
+"""
+
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Reference colours of the FireRed UI frames (RGB)
+BATTLE_FRAME = (40, 48, 48)       # dark border above the battle text/menu box
+BATTLE_TEXT_FILL = (40, 80, 104)  # teal fill behind battle messages
+HUD_COLOURS = ((248, 248, 216), (216, 208, 176))  # cream HP boxes
+COLOUR_TOLERANCE = 12
+WHITE_LEVEL = 224                 # every channel at least this bright
+
+# Screen regions as (top, bottom, left, right) on the 240x160 frame
+TEXT_BOX = (120, 152, 16, 224)
+BATTLE_FRAME_ROWS = (112, 114, 8, 232)
+ENEMY_HUD = (10, 40, 10, 110)
+PLAYER_HUD = (70, 105, 130, 235)
+START_MENU = (8, 100, 176, 232)
+START_MENU_LEFT = (8, 100, 16, 150)
+
+# Fractions of matching pixels a region needs
+THRESHOLDS = {
+    "battle_frame": 0.6,
+    "battle_text": 0.35,
+    "hud": 0.2,
+    "text_box": 0.5,
+    "start_menu": 0.6,
+}
+
+DEFAULT_TEMPLATE = "exploration_strategy"
+CURSOR_MOVEMENTS = ["up", "down", "left", "right"]
+
+
+@dataclass
+class SceneClassification:
+    """Result of one classification; scene is None when the screen needs visual analysis"""
+    scene: Optional[str]   # "battle", "dialogue", "menu" or None
+    detail: str = ""       # e.g. battle phase ("message", "menu")
+    source: str = "pixels"  # "pixels", or "ram" when the battle flags agree with the pixels
+    signals: Dict[str, float] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+    @property
+    def known(self) -> bool:
+        return self.scene is not None
+
+
+class SceneClassifier:
+    """
+    Labels a frame from the fraction of reference-coloured pixels in a few regions
+
+    Every second pixel of each region is sampled and regions are only checked
+    until a rule decides, so a frame costs well under a millisecond. Anything
+    that matches no signature - the overworld, bag and party screens - is left
+    to the vision model.
+    """
+
+    def __init__(self, sample_step: int = 2):
+        """
+        Args:
+            sample_step: Pixel stride within each region
+        """
+        self.sample_step = sample_step
+
+        # Metrics
+        self.classifications = Counter()
+        self.local_analyses = Counter()
+        self.total_ms = 0.0
+
+    def _region(self, pixels: np.ndarray, region) -> np.ndarray:
+        top, bottom, left, right = region
+        return pixels[top:bottom:self.sample_step, left:right:self.sample_step, :3]
+
+    def _colour_fraction(self, pixels: np.ndarray, region, colours) -> float:
+        """Fraction of sampled pixels within COLOUR_TOLERANCE of any of `colours`"""
+        sample = self._region(pixels, region).astype(np.int16)[..., None, :]
+        distance = np.abs(sample - np.array(colours, dtype=np.int16).reshape(-1, 3)).max(axis=-1)
+        return float((distance <= COLOUR_TOLERANCE).any(axis=-1).mean())
+
+    def _white_fraction(self, pixels: np.ndarray, region) -> float:
+        return float((self._region(pixels, region).min(axis=-1) >= WHITE_LEVEL).mean())
+
+    def _signal(self, pixels: np.ndarray, name: str) -> float:
+        if name == "battle_frame":
+            return self._colour_fraction(pixels, BATTLE_FRAME_ROWS, BATTLE_FRAME)
+        if name == "battle_text":
+            return self._colour_fraction(pixels, TEXT_BOX, BATTLE_TEXT_FILL)
+        if name == "enemy_hud":
+            return self._colour_fraction(pixels, ENEMY_HUD, HUD_COLOURS)
+        if name == "player_hud":
+            return self._colour_fraction(pixels, PLAYER_HUD, HUD_COLOURS)
+        if name == "text_box":
+            return self._white_fraction(pixels, TEXT_BOX)
+        if name == "start_menu":
+            return self._white_fraction(pixels, START_MENU)
+        if name == "start_menu_left":
+            return self._white_fraction(pixels, START_MENU_LEFT)
+        raise KeyError(name)
+
+    def classify(self, pixels: np.ndarray, battle_flags: Optional[int] = None) -> SceneClassification:
+        """
+        Classify a frame
+
+        Signals are computed lazily in rule order, so an overworld frame costs
+        four or five region checks.
+
+        Args:
+            pixels: (160, 240, 3) RGB frame
+            battle_flags: gBattleTypeFlags from RAM, if known. The game sets them at battle
+                          setup and does not clear them afterwards, so they never mark a
+                          battle on their own; they only confirm the battle signature
+
+        Returns:
+            SceneClassification (signals holds the fractions that were computed)
+        """
+        start = time.perf_counter()
+        pixels = np.asarray(pixels)
+        if pixels.shape[:2] != (160, 240):
+            result = SceneClassification(None)
+        else:
+            signals: Dict[str, float] = {}
+
+            def signal(name: str) -> float:
+                if name not in signals:
+                    signals[name] = self._signal(pixels, name)
+                return signals[name]
+
+            result = self._decide(signal, battle_flags)
+            result.signals = signals
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        self.total_ms += result.elapsed_ms
+        self.classifications[result.scene or "unknown"] += 1
+        return result
+
+    @staticmethod
+    def _decide(signal, battle_flags: Optional[int]) -> SceneClassification:
+        battle_screen = (signal("battle_frame") >= THRESHOLDS["battle_frame"]
+                         or (signal("enemy_hud") >= THRESHOLDS["hud"] and signal("player_hud") >= THRESHOLDS["hud"]))
+        if battle_screen:
+            if signal("battle_text") >= THRESHOLDS["battle_text"]:
+                detail = "message"
+            elif signal("text_box") >= THRESHOLDS["text_box"]:
+                detail = "menu"
+            else:
+                detail = "animation"
+            return SceneClassification("battle", detail, "ram" if battle_flags else "pixels")
+
+        if signal("text_box") >= THRESHOLDS["text_box"]:
+            return SceneClassification("dialogue", "text_box")
+        if signal("start_menu") >= THRESHOLDS["start_menu"] and signal("start_menu_left") < THRESHOLDS["start_menu"]:
+            return SceneClassification("menu", "start_menu")
+        return SceneClassification(None)
+
+    def local_analysis(self, classification: SceneClassification, previous: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Visual analysis data for a recognized scene, in the shape VisualAnalysis returns
+
+        Args:
+            classification: A known classification
+            previous: Last analysis from the vision model; dialogue and menus keep its template
+
+        Returns:
+            Movement data dict (scene_type, recommended_template, valid_buttons, ...)
+        """
+        scene = classification.scene
+        previous_template = (previous or {}).get("recommended_template")
+        if scene == "battle":
+            scene_type, template = "battle", "battle_analysis"
+            valid_buttons = [
+                {"key": "A", "action": "select_option", "result": "battle_action"},
+                {"key": "→", "action": "cursor_right", "result": "move_cursor"},
+                {"key": "↓", "action": "cursor_down", "result": "move_cursor"}
+            ]
+            if classification.detail == "message":
+                valid_buttons = [{"key": "A", "action": "advance_text", "result": "next_message"}]
+            description = f"Battle scene detected ({classification.detail}) - high confidence"
+        else:
+            scene_type = "menu"
+            template = previous_template if previous_template and previous_template != "battle_analysis" else DEFAULT_TEMPLATE
+            valid_buttons = [
+                {"key": "A", "action": "confirm", "result": "advance_text"},
+                {"key": "B", "action": "cancel", "result": "go_back"}
+            ]
+            if scene == "menu":
+                valid_buttons += [
+                    {"key": "↑", "action": "cursor_up", "result": "move_cursor"},
+                    {"key": "↓", "action": "cursor_down", "result": "move_cursor"}
+                ]
+            description = f"Menu/dialogue scene detected ({classification.detail}) - high confidence"
+
+        self.local_analyses[scene] += 1
+        return {
+            "scene_type": scene_type,
+            "recommended_template": template,
+            "valid_buttons": valid_buttons,
+            "confidence": "high",
+            "valid_movements": list(CURSOR_MOVEMENTS),
+            "spatial_context": f"Scene: {scene_type}, Valid buttons: {len(valid_buttons)}",
+            "character_position": "",
+            "visual_description": description,
+            "template_reason": f"Local scene classifier: {scene} ({classification.source}) → template '{template}'",
+            "local_scene": {"scene": scene, "detail": classification.detail, "source": classification.source},
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        frames = sum(self.classifications.values())
+        return {
+            "frames": frames,
+            "scenes": dict(self.classifications),
+            "vision_calls_saved": sum(self.local_analyses.values()),
+            "avg_ms": round(self.total_ms / frames, 3) if frames else 0.0,
+        }
+
+
+def read_battle_flags(snapshot_service=None) -> Optional[int]:
+    """gBattleTypeFlags from the shared RAM snapshot (None when RAM is unavailable)"""
+    try:
+        from ram_snapshot import get_ram_snapshot_service, PokemonFireRedReader
+
+        snapshot = (snapshot_service or get_ram_snapshot_service()).get_snapshot()
+        if snapshot is None:
+            return None
+        data = snapshot.memory.read(PokemonFireRedReader.ADDRESSES['battle_type_flags'], 4)
+        return int.from_bytes(bytes(data), "little") if data is not None else None
+    except Exception:
+        return None
@@ -5,7 +5,6 @@ Provides Pokemon game control interface using SkyEmu HTTP API
 
 import time
 import base64
-from io import BytesIO
 from typing import Optional, Dict, Any
 from pathlib import Path
 import sys
@@ -13,6 +12,7 @@ import sys
 # Add path to import SkyEmu client
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root / "skyemu-mcp"))
+sys.path.append(str(project_root / "gemini-multimodal-playground" / "standalone"))
 
 try:
     from skyemu_client import SkyEmuClient
@@ -21,23 +21,98 @@ except ImportError as e:
     print("Make sure SkyEmu MCP server is available")
     SkyEmuClient = None
 
+try:
+    from skyemu_transport import get_transport, default_endpoint
+except ImportError:
+    get_transport = None
+    default_endpoint = lambda: ("localhost", 8080)
+
+from game_frame import GameFrame
+
 class SkyEmuController:
     """Pokemon game controller using SkyEmu HTTP API"""
     
-    def __init__(self, host: str = "localhost", port: int = 8080):
+    # Advanced on every input, frame step or state load across all controller
+    # instances; RAM snapshots stamped with an older generation are stale
+    _input_generation = 0
+    # Whether the last input left the emulator paused (frame stepping) or
+    # running freely (realtime presses keep animating after they return)
+    _emulator_paused = False
+    
+    @classmethod
+    def input_generation(cls) -> int:
+        """Current input generation (frame stamp for cached RAM snapshots)"""
+        return cls._input_generation
+    
+    @classmethod
+    def emulator_paused(cls) -> bool:
+        """True if the emulator is paused, so RAM only changes with input"""
+        return cls._emulator_paused
+    
+    @classmethod
+    def _mark_input(cls, paused: Optional[bool] = None) -> None:
+        """
+        Record that emulator state may have changed
+        
+        Args:
+            paused: Whether the emulator is left paused (None keeps the current state)
+        """
+        cls._input_generation += 1
+        if paused is not None:
+            cls._emulator_paused = paused
+    
+    # Input modes: "realtime" presses with wall-clock sleeps while the emulator
+    # runs; "frame_stepped" pauses the emulator and advances exact frame counts
+    INPUT_MODES = ("realtime", "frame_stepped")
+    
+    # Frames the button is held, then frames stepped after release, per action type
+    DEFAULT_FRAME_BUDGETS = {
+        "walk": {"hold": 16, "release": 4},          # One tile step takes 16 frames
+        "menu_cursor": {"hold": 4, "release": 6},
+        "text_advance": {"hold": 4, "release": 16},
+        "menu": {"hold": 4, "release": 20},          # Start/Select menu open/close animation
+    }
+    
+    # Action type used for a button when the caller does not specify one
+    BUTTON_ACTION_TYPES = {
+        'up': 'walk', 'down': 'walk', 'left': 'walk', 'right': 'walk',
+        'a': 'text_advance', 'b': 'text_advance',
+        'start': 'menu', 'select': 'menu',
+    }
+    
+    def __init__(self, host: str = None, port: int = None, input_mode: str = "realtime"):
         """
         Initialize SkyEmu controller
         
         Args:
-            host: SkyEmu server hostname
-            port: SkyEmu server port
+            host: SkyEmu server hostname (default: SKYEMU_HOST or localhost)
+            port: SkyEmu server port (default: SKYEMU_PORT or 8080)
+            input_mode: "realtime" or "frame_stepped"
         """
-        self.host = host
-        self.port = port
+        if input_mode not in self.INPUT_MODES:
+            raise ValueError(f"Unknown input mode '{input_mode}', expected one of {self.INPUT_MODES}")
+        
+        default_host, default_port = default_endpoint()
+        self.host = host or default_host
+        self.port = port or default_port
         self.client = None
         self.key_delay = 0.2  # Default delay between key presses
         self._connected = False  # Track connection status
         
+        # Frame-stepped input (deterministic, runs at emulator speed)
+        self.input_mode = input_mode
+        self.frame_budgets = {name: dict(budget) for name, budget in self.DEFAULT_FRAME_BUDGETS.items()}
+        self.frames_stepped = 0
+        
+        # Liveness tracking - cached state refreshed by a cheap ping on a timer
+        # or after failures, never by the input/capture paths themselves
+        self.health_check_interval = 5.0  # Seconds a successful contact stays trusted
+        self.reconnect_backoff_initial = 0.5
+        self.reconnect_backoff_max = 30.0
+        self._last_contact = 0.0  # Last time the server answered anything
+        self._consecutive_failures = 0
+        self._next_reconnect_at = 0.0
+        
         # Pokemon Game Boy button mapping
         self.button_mapping = {
             'up': 'Up',
@@ -64,31 +139,30 @@ class SkyEmuController:
             try:
                 self.client = SkyEmuClient(host=self.host, port=self.port)
                 self._connected = True
+                self._record_success()
                 print(f"✅ Connected to SkyEmu at {self.host}:{self.port}")
                 return True
             except Exception as init_error:
                 # If initialization failed due to ping, try manual setup
-                import requests
+                if get_transport is None:
+                    raise init_error
+                transport = get_transport()
+                base_url = f"http://{self.host}:{self.port}"
                 
                 # Test if server is responding to screenshots
-                test_url = f"http://{self.host}:{self.port}/screen"
-                response = requests.get(test_url, params={"format": "png"})
-                response.raise_for_status()
+                transport.get(base_url, "screen", {"format": "png"})
                 
                 # Create minimal client manually
                 self.client = SkyEmuClient.__new__(SkyEmuClient)
-                self.client.base_url = f"http://{self.host}:{self.port}"
+                self.client.base_url = base_url
                 
-                # Add the _get method from SkyEmuClient
+                # Add the _get method from SkyEmuClient (same pooled transport)
                 def _get(endpoint, params=None):
-                    import requests
-                    url = f"{self.client.base_url}/{endpoint}"
-                    response = requests.get(url, params=params)
-                    response.raise_for_status()
-                    return response
+                    return transport.get(base_url, endpoint, params)
                 
                 self.client._get = _get
                 self._connected = True
+                self._record_success()
                 
                 print(f"✅ Connected to SkyEmu at {self.host}:{self.port} (bypass ping)")
                 return True
@@ -99,39 +173,89 @@ class SkyEmuController:
             self._connected = False
             return False
     
-    def is_connected(self) -> bool:
-        """Check if connected to SkyEmu"""
-        if self.client is None:
-            return False
-        
-        # Use the connection status we tracked during initialization
-        if self._connected:
-            # Quick verification - try to get a screenshot
-            try:
-                self.client.get_screen()
+    def _record_success(self) -> None:
+        """Note that the server just answered a request"""
+        self._last_contact = time.time()
+        self._consecutive_failures = 0
+        self._connected = True
+    
+    def _record_failure(self, error: Exception = None) -> None:
+        """Mark the connection down and schedule a reconnect with exponential backoff"""
+        self._connected = False
+        self._consecutive_failures += 1
+        backoff = min(self.reconnect_backoff_max,
+                      self.reconnect_backoff_initial * (2 ** (self._consecutive_failures - 1)))
+        self._next_reconnect_at = time.time() + backoff
+        if error is not None:
+            print(f"⚠️ SkyEmu request failed ({error}); retrying connection in {backoff:.1f}s")
+    
+    def _ping(self) -> bool:
+        """Lightweight health check against /ping - no screenshot download"""
+        try:
+            self.client._get("ping")
+            self._record_success()
+            return True
+        except Exception as e:
+            # Any HTTP answer (even an error status) proves the server is alive
+            if getattr(e, "response", None) is not None:
+                self._record_success()
                 return True
-            except:
-                self._connected = False
-                return False
+            self._record_failure()
+            return False
+    
+    def _client_call(self, method, *args, **kwargs):
+        """Invoke a client method, updating liveness from its outcome"""
+        try:
+            result = method(*args, **kwargs)
+        except Exception as e:
+            self._record_failure(e)
+            raise
+        self._record_success()
+        return result
+    
+    def _ensure_connected(self) -> bool:
+        """
+        Hot-path connection check: cached state only, no network round trip
         
+        When the connection is down, a reconnect is attempted once the backoff
+        window has elapsed.
+        """
+        if self._connected and self.client is not None:
+            return True
+        if time.time() < self._next_reconnect_at:
+            return False
+        if self._connect():
+            return True
+        self._record_failure()
         return False
     
+    def is_connected(self) -> bool:
+        """Check if connected to SkyEmu (pings only when the cached state is stale)"""
+        if not self._ensure_connected():
+            return False
+        
+        if time.time() - self._last_contact < self.health_check_interval:
+            return True
+        return self._ping()
+    
     def find_window(self) -> bool:
         """Check if SkyEmu connection is available (compatibility with PokemonController)"""
         return self.is_connected()
     
-    def press_button(self, button: str, duration: float = None) -> bool:
+    def press_button(self, button: str, duration: float = None, action_type: str = None) -> bool:
         """
         Press a Pokemon game button
         
         Args:
             button: Button name (up, down, left, right, a, b, start, select)
-            duration: How long to hold the button (uses default if None)
+            duration: How long to hold the button (uses default if None, realtime mode only)
+            action_type: Frame budget to use in frame_stepped mode (walk, menu_cursor,
+                         text_advance, menu); inferred from the button if None
             
         Returns:
             True if successful
         """
-        if not self.is_connected():
+        if not self._ensure_connected():
             print("❌ Not connected to SkyEmu")
             return False
         
@@ -141,51 +265,110 @@ class SkyEmuController:
             print(f"❌ Unknown button: {button}")
             return False
         
+        if self.input_mode == "frame_stepped":
+            return self._press_button_frames(button.lower(), skyemu_button, action_type)
+        
         try:
             # Use custom duration or default
             press_duration = duration if duration is not None else self.key_delay
             
             # Try the button press - even if API returns false, it might still work
             try:
-                result = self.client.press_button(skyemu_button, duration=press_duration)
-            except:
-                result = False
-            
-            # Since you reported buttons work even when API says failed,
-            # let's assume success if we can communicate with SkyEmu at all
-            if self.is_connected():
-                # Individual button presses logged in enhanced analysis instead
-                return True
-            else:
+                result = self._client_call(self.client.press_button, skyemu_button, duration=press_duration)
+            except Exception:
                 print(f"❌ Failed to press {button.upper()} button")
                 return False
+            self._mark_input(paused=False)
+            
+            # Since you reported buttons work even when API says failed,
+            # a completed HTTP exchange counts as success
+            return True
             
         except Exception as e:
             print(f"❌ Error pressing button {button}: {e}")
             return False
     
-    def press_sequence(self, buttons: list, delay_between: float = None) -> bool:
+    def _press_button_frames(self, button: str, skyemu_button: str, action_type: str = None) -> bool:
+        """
+        Press a button by holding it for a fixed number of emulator frames
+        
+        The emulator is left paused afterwards so the next capture sees exactly
+        the frame the input produced.
+        """
+        action_type = action_type or self.BUTTON_ACTION_TYPES.get(button, "text_advance")
+        budget = self.frame_budgets.get(action_type)
+        if budget is None:
+            print(f"❌ Unknown action type: {action_type}")
+            return False
+        
+        try:
+            self._client_call(self.client.set_input, {skyemu_button: 1})
+            self._client_call(self.client.step, budget["hold"])
+            self._client_call(self.client.set_input, {skyemu_button: 0})
+            if budget["release"] > 0:
+                self._client_call(self.client.step, budget["release"])
+        except Exception:
+            print(f"❌ Failed to press {button.upper()} button")
+            return False
+        
+        self.frames_stepped += budget["hold"] + budget["release"]
+        self._mark_input(paused=True)
+        return True
+    
+    def hold_button(self, button: str) -> bool:
+        """Hold a button down until release_button is called"""
+        skyemu_button = self.button_mapping.get(button.lower())
+        if not skyemu_button or not self._ensure_connected():
+            return False
+        try:
+            self._client_call(self.client.set_input, {skyemu_button: 1})
+        except Exception:
+            return False
+        self._mark_input()
+        return True
+    
+    def release_button(self, button: str) -> bool:
+        """Release a held button"""
+        skyemu_button = self.button_mapping.get(button.lower())
+        if not skyemu_button or not self._ensure_connected():
+            return False
+        try:
+            self._client_call(self.client.set_input, {skyemu_button: 0})
+        except Exception:
+            return False
+        self._mark_input()
+        return True
+    
+    def set_frame_budget(self, action_type: str, hold: int, release: int) -> None:
+        """Configure how many frames a button is held and released for an action type"""
+        self.frame_budgets[action_type] = {"hold": hold, "release": release}
+    
+    def press_sequence(self, buttons: list, delay_between: float = None, action_type: str = None) -> bool:
         """
         Press a sequence of buttons
         
         Args:
             buttons: List of button names to press in order
-            delay_between: Delay between button presses (uses default if None)
+            delay_between: Delay between button presses (uses default if None, realtime mode only)
+            action_type: Frame budget for every button in frame_stepped mode (inferred per button if None)
             
         Returns:
             True if all buttons pressed successfully
         """
-        if not self.is_connected():
+        if not self._ensure_connected():
             print("❌ Not connected to SkyEmu")
             return False
         
+        # Frame-stepped presses already include their settle frames
+        frame_stepped = self.input_mode == "frame_stepped"
         delay = delay_between if delay_between is not None else self.key_delay
         
         try:
             for button in buttons:
-                if not self.press_button(button):
+                if not self.press_button(button, action_type=action_type):
                     return False
-                time.sleep(delay)
+                if not frame_stepped:
+                    time.sleep(delay)
             
             # Button sequences logged in enhanced analysis instead
             return True
@@ -194,6 +377,24 @@ class SkyEmuController:
             print(f"❌ Error pressing button sequence: {e}")
             return False
     
+    def capture_frame(self) -> Optional[GameFrame]:
+        """
+        Capture current game screen into memory
+        
+        Returns:
+            GameFrame holding the PNG bytes from SkyEmu (decoded lazily), or None
+        """
+        if not self._ensure_connected():
+            print("❌ Not connected to SkyEmu")
+            return None
+        
+        try:
+            encoded = self._client_call(self.client.get_screen_bytes, format="png")
+            return GameFrame(encoded, format="png")
+        except Exception as e:
+            print(f"❌ Error capturing screenshot: {e}")
+            return None
+    
     def capture_screen(self, filename: str = None) -> str:
         """
         Capture current game screen
@@ -204,14 +405,11 @@ class SkyEmuController:
         Returns:
             Path to saved screenshot file
         """
-        if not self.is_connected():
-            print("❌ Not connected to SkyEmu")
+        frame = self.capture_frame()
+        if frame is None:
             return None
         
         try:
-            # Get screenshot from SkyEmu
-            image = self.client.get_screen(format="png")
-            
             # Generate filename if not provided
             if filename is None:
                 timestamp = time.strftime("%Y%m%d_%H%M%S")
@@ -227,8 +425,8 @@ class SkyEmuController:
             else:
                 filepath = Path(filename)
             
-            # Save the image
-            image.save(filepath)
+            # Write the PNG exactly as received - no decode/re-encode
+            frame.save(filepath)
             # Screenshot paths logged in enhanced analysis instead
             
             return str(filepath)
@@ -244,25 +442,10 @@ class SkyEmuController:
         Returns:
             Base64 encoded PNG image data
         """
-        if not self.is_connected():
-            print("❌ Not connected to SkyEmu")
-            return None
-        
-        try:
-            # Get screenshot from SkyEmu
-            image = self.client.get_screen(format="png")
-            
-            # Convert to base64
-            buffer = BytesIO()
-            image.save(buffer, format="PNG")
-            image_data = buffer.getvalue()
-            base64_data = base64.b64encode(image_data).decode('utf-8')
-            
-            return base64_data
-            
-        except Exception as e:
-            print(f"❌ Error getting screenshot as base64: {e}")
+        frame = self.capture_frame()
+        if frame is None:
             return None
+        return frame.base64
     
     def read_memory(self, addresses: list, map_id: int = 0) -> list:
         """
@@ -275,12 +458,12 @@ class SkyEmuController:
         Returns:
             List of byte values
         """
-        if not self.is_connected():
+        if not self._ensure_connected():
             print("❌ Not connected to SkyEmu")
             return []
         
         try:
-            return self.client.read_bytes(addresses, map_id)
+            return self._client_call(self.client.read_bytes, addresses, map_id)
         except Exception as e:
             print(f"❌ Error reading memory: {e}")
             return []
@@ -296,56 +479,61 @@ class SkyEmuController:
         Returns:
             True if successful
         """
-        if not self.is_connected():
+        if not self._ensure_connected():
             print("❌ Not connected to SkyEmu")
             return False
         
         try:
-            return self.client.write_bytes(address_value_pairs, map_id)
+            result = self._client_call(self.client.write_bytes, address_value_pairs, map_id)
+            self._mark_input()
+            return result
         except Exception as e:
             print(f"❌ Error writing memory: {e}")
             return False
     
-    def save_state(self, filename: str) -> bool:
+    def save_state(self, filename: str, quiet: bool = False) -> bool:
         """
         Save current emulation state
         
         Args:
             filename: Path to save the state file
+            quiet: Don't print on success (for frequent automatic checkpoints)
             
         Returns:
             True if successful
         """
-        if not self.is_connected():
+        if not self._ensure_connected():
             print("❌ Not connected to SkyEmu")
             return False
         
         try:
-            result = self.client.save_state(filename)
-            if result:
+            result = self._client_call(self.client.save_state, filename)
+            if result and not quiet:
                 print(f"💾 Saved state: {filename}")
             return result
         except Exception as e:
             print(f"❌ Error saving state: {e}")
             return False
     
-    def load_state(self, filename: str) -> bool:
+    def load_state(self, filename: str, quiet: bool = False) -> bool:
         """
         Load emulation state
         
         Args:
             filename: Path to the state file
+            quiet: Don't print on success
             
         Returns:
             True if successful
         """
-        if not self.is_connected():
+        if not self._ensure_connected():
             print("❌ Not connected to SkyEmu")
             return False
         
         try:
-            result = self.client.load_state(filename)
-            if result:
+            result = self._client_call(self.client.load_state, filename)
+            self._mark_input()
+            if result and not quiet:
                 print(f"📁 Loaded state: {filename}")
             return result
         except Exception as e:
@@ -359,11 +547,11 @@ class SkyEmuController:
         Returns:
             Dictionary with status information
         """
-        if not self.is_connected():
+        if not self._ensure_connected():
             return {"connected": False, "error": "Not connected to SkyEmu"}
         
         try:
-            status = self.client.get_status()
+            status = self._client_call(self.client.get_status)
             status["connected"] = True
             return status
         except Exception as e:
@@ -379,12 +567,14 @@ class SkyEmuController:
         Returns:
             True if successful
         """
-        if not self.is_connected():
+        if not self._ensure_connected():
             print("❌ Not connected to SkyEmu")
             return False
         
         try:
-            return self.client.step(frames)
+            result = self._client_call(self.client.step, frames)
+            self._mark_input(paused=True)
+            return result
         except Exception as e:
             print(f"❌ Error stepping frames: {e}")
             return False
@@ -396,12 +586,14 @@ class SkyEmuController:
         Returns:
             True if successful
         """
-        if not self.is_connected():
+        if not self._ensure_connected():
             print("❌ Not connected to SkyEmu")
             return False
         
         try:
-            return self.client.run()
+            result = self._client_call(self.client.run)
+            self._mark_input(paused=False)
+            return result
         except Exception as e:
             print(f"❌ Error running emulator: {e}")
             return False
@@ -276,6 +276,18 @@ class SpatialMemory:
                 "error": f"Failed to track connection: {str(e)}"
             }
     
+    def on_map_changed(self, event) -> Dict[str, Any]:
+        """
+        Record the connection described by a ram_events.MapChanged event
+        
+        Args:
+            event: MapChanged event (from/to map, direction, method)
+            
+        Returns:
+            Dict with connection tracking result
+        """
+        return self.track_map_connection(event.from_map, event.to_map, event.direction or "unknown", event.method)
+    
     def get_bookmarks_summary(self) -> Dict[str, Any]:
         """Get summary of all bookmarks"""
         return {
@@ -430,7 +442,7 @@ def test_spatial_memory():
         
         # Test map connection tracking
         print("\n🗺️ Testing map connection tracking...")
-        result = spatial.track_map_connection((3, 2), (1, 0), "north", "walk")
+        result = spatial.track_map_connection((3, 2), (1, 0), "up", "walk")
         print(f"Result: {json.dumps(result, indent=2)}")
         
         # Test summaries
@@ -12,12 +12,21 @@ information about a running Pokémon game, including:
 
 import requests
 import argparse
+import struct
 import time
 import sys # Added for stderr printing
 from enum import IntEnum, IntFlag
 from dataclasses import dataclass
+from pathlib import Path
 from typing import List, Optional, Tuple, Dict, Any
 
+# Shared pooled transport lives next to the standalone SkyEmu client
+sys.path.append(str(Path(__file__).resolve().parents[2] / "gemini-multimodal-playground" / "standalone"))
+from skyemu_transport import SkyEmuTransport, get_transport, default_endpoint
+
+import numpy as np
+from pokemon_decoder import decode_pokemon, LevelCalculator, BOX_POKEMON_SIZE
+
 # --- Enums and Dataclasses (remain the same) ---
 class StatusCondition(IntFlag):
     """Status conditions for Pokémon"""
@@ -55,6 +64,24 @@ class PokemonInfo:
     moves: List[str]
     move_pp: List[int]
 
+@dataclass
+class BoxPokemonInfo:
+    """Pokémon stored in a PC box (no battle stats are kept in storage)"""
+    box: int
+    slot: int
+    species_id: int
+    nickname: str
+    level: int
+    held_item: int
+    moves: List[str]
+    move_pp: List[int]
+
+@dataclass
+class PCStorage:
+    """Occupied PC box slots"""
+    current_box: int
+    pokemon: List[BoxPokemonInfo]
+
 @dataclass
 class GameState:
     """Basic game state information"""
@@ -70,23 +97,101 @@ class GameState:
 class SkyEmuClient:
     """Client for communicating with SkyEmu's HTTP Control Server"""
 
-    def __init__(self, base_url="http://localhost:8080", debug=False):
+    def __init__(self, base_url=None, debug=False, bulk_reads=True,
+                 transport: Optional[SkyEmuTransport] = None):
+        if base_url is None:
+            # SKYEMU_HOST / SKYEMU_PORT select the emulator (one per fleet worker)
+            host, port = default_endpoint()
+            base_url = f"http://{host}:{port}"
         self.base_url = base_url
         self.debug = debug
-        # Use a session for potential connection reuse
-        self.session = requests.Session()
+        # Process-wide keep-alive pool shared with the other SkyEmu clients
+        self.transport = transport if transport is not None else get_transport()
+        # Ranged/scatter reads collapse many bytes into one /read_byte request.
+        # Disabled automatically if the server answers with an unexpected length.
+        self.bulk_reads = bulk_reads
+        self.request_count = 0 # Number of HTTP requests issued (for benchmarking)
 
     def log_debug(self, message):
         """Print debug messages if debugging is enabled"""
         if self.debug:
             print(f"DEBUG: {message}", file=sys.stderr) # Print debug to stderr
 
+    def _get(self, endpoint, params=None):
+        """Issue a GET request against the control server and count it"""
+        self.request_count += 1
+        # Raises HTTPError for bad responses (4xx or 5xx)
+        return self.transport.get(self.base_url, endpoint, params)
+
+    def read_regions(self, regions):
+        """Read several (address, length) regions in a single /read_byte request.
+
+        SkyEmu accepts repeated ``addr`` parameters and inclusive ``START-END``
+        ranges, answering with every requested byte concatenated as hex.
+        Returns a list of bytes (one entry per region) or None on failure.
+        """
+        regions = [(addr, length) for addr, length in regions if length > 0]
+        if not regions:
+            return []
+
+        if not self.bulk_reads:
+            # Legacy path: one request per byte
+            chunks = []
+            for addr, length in regions:
+                data = self.read_bytes(addr, length)
+                if data is None:
+                    return None
+                chunks.append(data)
+            return chunks
+
+        addr_params = []
+        for addr, length in regions:
+            if length == 1:
+                addr_params.append(f"{addr:X}")
+            else:
+                addr_params.append(f"{addr:X}-{addr + length - 1:X}")
+        expected = sum(length for _, length in regions)
+        self.log_debug(f"Bulk read of {len(regions)} region(s), {expected} bytes: {addr_params}")
+
+        try:
+            response = self._get("read_byte", params={'addr': addr_params})
+            hex_text = response.text.strip('\x00 \t\n\r')
+            if len(hex_text) != expected * 2:
+                # Server does not understand ranges - fall back to per-byte reads for good
+                print(f"Warning: Bulk read returned {len(hex_text) // 2} bytes (expected {expected}), disabling bulk reads", file=sys.stderr)
+                self.bulk_reads = False
+                return self.read_regions(regions)
+            data = bytes.fromhex(hex_text)
+        except requests.exceptions.RequestException as e:
+            print(f"Error during bulk read of {len(regions)} region(s): {e}", file=sys.stderr)
+            return None
+        except ValueError as e:
+            print(f"Error: Could not parse bulk read response: {e}", file=sys.stderr)
+            return None
+
+        chunks = []
+        offset = 0
+        for _, length in regions:
+            chunks.append(data[offset:offset + length])
+            offset += length
+        return chunks
+
+    def read_scatter(self, addresses):
+        """Read a scatter list of individual addresses in one request"""
+        chunks = self.read_regions([(addr, 1) for addr in addresses])
+        if chunks is None:
+            return None
+        return b''.join(chunks)
+
     def read_byte(self, addresses):
         """Read one or multiple bytes at the specified addresses.
            Returns bytes or None on failure for any byte."""
         if isinstance(addresses, int):
             addresses = [addresses]
 
+        if self.bulk_reads and len(addresses) > 1:
+            return self.read_scatter(addresses)
+
         result = bytearray()
 
         for addr in addresses:
@@ -95,8 +200,7 @@ class SkyEmuClient:
             self.log_debug(f"Requesting byte at {addr:08X} (param: addr={addr_hex})")
 
             try:
-                response = self.session.get(f"{self.base_url}/read_byte", params=params, timeout=1) # Add timeout
-                response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+                response = self._get("read_byte", params=params)
 
                 # *** THE FIX IS HERE ***
                 # Trim whitespace AND potential null bytes from the response text
@@ -127,7 +231,11 @@ class SkyEmuClient:
 
     def read_bytes(self, address, length):
         """Read multiple consecutive bytes starting at address"""
-        # Optimized: Read bytes one by one using the fixed read_byte
+        if self.bulk_reads and length > 1:
+            chunks = self.read_regions([(address, length)])
+            return chunks[0] if chunks else None
+
+        # Fallback: read bytes one by one using read_byte
         data = bytearray()
         for i in range(length):
             byte_val = self.read_byte(address + i)
@@ -187,8 +295,7 @@ class SkyEmuClient:
     def status(self):
         """Get the status of the emulator"""
         try:
-            response = self.session.get(f"{self.base_url}/status", timeout=1)
-            response.raise_for_status()
+            response = self._get("status")
             content = response.text.strip()
             if content:
                 try:
@@ -216,6 +323,51 @@ class SkyEmuClient:
             return None
 
 
+# --- Region planning for bulk reads ---
+class MemoryRegionPlanner:
+    """Coalesces the address ranges a reader needs into a minimal set of block reads"""
+
+    def __init__(self, max_gap: int = 64):
+        # Ranges closer than max_gap bytes are merged; reading a few unused
+        # bytes is far cheaper than an extra address range in the request
+        self.max_gap = max_gap
+        self._ranges: List[Tuple[int, int]] = []
+
+    def add(self, address: int, length: int) -> None:
+        """Request `length` bytes starting at `address`"""
+        if address is not None and length > 0:
+            self._ranges.append((address, length))
+
+    def plan(self) -> List[Tuple[int, int]]:
+        """Return merged (address, length) blocks covering every requested range"""
+        blocks: List[List[int]] = []
+        for start, length in sorted(self._ranges):
+            end = start + length
+            if blocks and start <= blocks[-1][1] + self.max_gap:
+                blocks[-1][1] = max(blocks[-1][1], end)
+            else:
+                blocks.append([start, end])
+        return [(start, end - start) for start, end in blocks]
+
+
+class MemorySnapshot:
+    """Prefetched memory blocks that reader helpers decode from"""
+
+    def __init__(self):
+        self._blocks: List[Tuple[int, memoryview]] = []
+
+    def add_block(self, address: int, data) -> None:
+        self._blocks.append((address, memoryview(data)))
+
+    def read(self, address: int, length: int) -> Optional[memoryview]:
+        """Return a zero-copy view of [address, address+length) or None if not prefetched"""
+        for start, data in self._blocks:
+            offset = address - start
+            if 0 <= offset and offset + length <= len(data):
+                return data[offset:offset + length]
+        return None
+
+
 # --- PokemonGameReader Base Class (remains the same) ---
 class PokemonGameReader:
     """
@@ -274,16 +426,45 @@ class PokemonFireRedReader(PokemonGameReader):
         # Base address for Save Block 1 (where money, items etc. are)
         'save_block_1': 0x02025840,
         'save_block_2': 0x0202402C, # Player Data including name, party count
+
+        # Battle state (gBattleTypeFlags): non-zero while a battle is running
+        'battle_type_flags': 0x02022B4C,
         # Note: Save Block locations can sometimes shift slightly based on game events/checksums
     }
 
     POKEMON_SIZE = 100 # Size of a party Pokémon struct
+
+    # Precompiled little-endian layouts used by the decoders
+    U32 = struct.Struct('<I')
+    MAP_POSITION = struct.Struct('<HHBB')      # x, y, map id, map bank (SaveBlock8 + 0)
+    POKEMON_HEADER = struct.Struct('<II')      # personality, OT id
+    SUBSTRUCT_WORDS = struct.Struct('<12I')    # 48 encrypted substructure bytes at offset 32
+    GROWTH = struct.Struct('<HHI')             # species, held item, experience (offset 32)
+    ATTACKS = struct.Struct('<4H4B')           # 4 move ids, 4 PP (offset 44)
+    PARTY_STATS = struct.Struct('<I2xHH')      # status, current HP, max HP (offset 80)
+    ITEM_ENTRY = struct.Struct('<HH')          # item id, quantity
     MAX_PARTY_SIZE = 6
+
+    # PC storage (behind save_block_2_ptr): current box byte, padding, 14 boxes x 30 slots
+    PC_BOX_COUNT = 14
+    PC_BOX_CAPACITY = 30
+    PC_BOXES_OFFSET = 4
     PLAYER_NAME_LENGTH = 7 # Max 7 chars + terminator
 
     # Item structure: 2 bytes ID, 2 bytes quantity
     ITEM_ENTRY_SIZE = 4
 
+    # Capacities from Bulbapedia/common sources (verify!)
+    # Note: Actual *count* of items might be stored separately or implicitly (e.g., terminated by item ID 0)
+    # These capacities define the maximum number of *slots*.
+    ITEM_POCKETS = [
+        ("Items", 'items_pocket_start_offset', 42), # Adjusted capacity
+        ("Key Items", 'key_items_pocket_start_offset', 30),
+        ("Poké Balls", 'pokeballs_pocket_start_offset', 16), # Adjusted capacity
+        ("TMs/HMs", 'tms_hms_pocket_start_offset', 64),
+        ("Berries", 'berries_pocket_start_offset', 46), # Adjusted capacity
+    ]
+
     # Text encoding map (Based on common English FR/LG)
     TEXT_MAP = {
         0x00: "<NULL>", 0x01: "À", 0x02: "Á", 0x03: "Â", 0x04: "Ç", 0x05: "È", 0x06: "É",
@@ -414,9 +595,149 @@ class PokemonFireRedReader(PokemonGameReader):
         163: "Slash", 164: "Substitute", 165: "Struggle"
     }
 
-    def read_game_state(self) -> Optional[GameState]: # Return Optional
-        """Read the current game state for Pokémon FireRed/LeafGreen"""
+    def __init__(self, client: SkyEmuClient):
+        super().__init__(client)
+        self._snapshot: Optional[MemorySnapshot] = None
+        self._levels = LevelCalculator(self.EXPERIENCE_TABLES, self.SPECIES_GROWTH_RATES)
+
+    # --- Bulk prefetch ---
+
+    def _plan_static_regions(self, planner: MemoryRegionPlanner) -> None:
+        """Regions at fixed addresses: save block pointers, party and bag"""
+        planner.add(self.ADDRESSES['save_block_8_ptr'], 12) # All three save block pointers
+        planner.add(self.ADDRESSES['party_count'], 1)
+        planner.add(self.ADDRESSES['party_data'], self.MAX_PARTY_SIZE * self.POKEMON_SIZE)
+        planner.add(self.ADDRESSES['battle_type_flags'], 4)
+        for _, offset_key, capacity in self.ITEM_POCKETS:
+            planner.add(self.ADDRESSES['save_block_1'] + self.ADDRESSES[offset_key], capacity * self.ITEM_ENTRY_SIZE)
+
+    def _plan_pointer_regions(self, planner: MemoryRegionPlanner, save_block_8_addr: int, save_block_1_addr: int) -> None:
+        """Regions that live behind the save block pointers"""
+        if save_block_8_addr:
+            planner.add(save_block_8_addr + self.ADDRESSES['player_coords_x_offset'], 6) # X, Y, map ID, bank
+            planner.add(save_block_8_addr + self.ADDRESSES['money_hidden_offset'], 4)
+        if save_block_1_addr:
+            planner.add(save_block_1_addr + self.ADDRESSES['player_name_offset'], 8)
+            planner.add(save_block_1_addr + self.ADDRESSES['money_key_offset'], 4)
+
+    def _fetch_plan(self, planner: MemoryRegionPlanner, snapshot: MemorySnapshot) -> bool:
+        """Fetch every planned block with a single client request"""
+        blocks = planner.plan()
+        chunks = self.client.read_regions(blocks)
+        if chunks is None:
+            return False
+        for (address, _), data in zip(blocks, chunks):
+            snapshot.add_block(address, data)
+        return True
+
+    def capture_snapshot(self) -> Optional[MemorySnapshot]:
+        """Capture everything read_game_state needs in two bulk requests.
+
+        The first request covers fixed addresses (including the save block
+        pointers); the second covers the regions those pointers lead to.
+        The returned snapshot can be decoded any number of times via
+        read_game_state(snapshot=...) without touching the emulator again.
+        """
+        if not hasattr(self.client, 'read_regions'):
+            return None
+
+        snapshot = MemorySnapshot()
+        planner = MemoryRegionPlanner()
+        self._plan_static_regions(planner)
+        if not self._fetch_plan(planner, snapshot):
+            return None
+
+        pointers = snapshot.read(self.ADDRESSES['save_block_8_ptr'], 8)
+        if pointers is not None:
+            save_block_8_addr = int.from_bytes(pointers[0:4], byteorder='little')
+            save_block_1_addr = int.from_bytes(pointers[4:8], byteorder='little')
+            planner = MemoryRegionPlanner()
+            self._plan_pointer_regions(planner, save_block_8_addr, save_block_1_addr)
+            if not self._fetch_plan(planner, snapshot):
+                return None
+
+        return snapshot
+
+    @classmethod
+    def read_hot_regions(cls, snapshot: MemorySnapshot) -> Dict[str, bytes]:
+        """Raw bytes of the small regions that change from turn to turn
+
+        Cheap to compare between snapshots, so callers can skip decoding when
+        nothing moved. Regions missing from the snapshot are left out.
+
+        Returns:
+            Dict with 'position' (x, y, map id, bank), 'party' (count byte then
+            status..max HP of each slot), 'battle' (battle type flags),
+            'money' (hidden value then key) and 'bag' (every item pocket)
+        """
+        regions = {}
+        pointers = snapshot.read(cls.ADDRESSES['save_block_8_ptr'], 8)
+        if pointers is not None:
+            save_block_8_addr, save_block_1_addr = struct.unpack('<II', pointers)
+            position = snapshot.read(save_block_8_addr + cls.ADDRESSES['player_coords_x_offset'], 6)
+            if position is not None:
+                regions['position'] = bytes(position)
+            money = snapshot.read(save_block_8_addr + cls.ADDRESSES['money_hidden_offset'], 4)
+            key = snapshot.read(save_block_1_addr + cls.ADDRESSES['money_key_offset'], 4)
+            if money is not None and key is not None:
+                regions['money'] = bytes(money) + bytes(key)
+
+        count = snapshot.read(cls.ADDRESSES['party_count'], 1)
+        party = snapshot.read(cls.ADDRESSES['party_data'], cls.MAX_PARTY_SIZE * cls.POKEMON_SIZE)
+        if count is not None and party is not None:
+            slots = min(count[0], cls.MAX_PARTY_SIZE)
+            stats = (party[i * cls.POKEMON_SIZE + 80:i * cls.POKEMON_SIZE + 90] for i in range(slots))
+            regions['party'] = bytes(count) + b"".join(stats)
+
+        battle = snapshot.read(cls.ADDRESSES['battle_type_flags'], 4)
+        if battle is not None:
+            regions['battle'] = bytes(battle)
+
+        pockets = [snapshot.read(cls.ADDRESSES['save_block_1'] + cls.ADDRESSES[offset_key], capacity * cls.ITEM_ENTRY_SIZE)
+                   for _, offset_key, capacity in cls.ITEM_POCKETS]
+        if all(pocket is not None for pocket in pockets):
+            regions['bag'] = b"".join(pockets)
+        return regions
+
+    def prefetch(self) -> bool:
+        """Capture a snapshot so subsequent helper reads are served from it"""
+        snapshot = self.capture_snapshot()
+        if snapshot is None:
+            return False
+        self._snapshot = snapshot
+        return True
+
+    def _read_bytes(self, address: int, length: int) -> Optional[bytes]:
+        """Read from the prefetched snapshot, falling back to the client"""
+        if self._snapshot is not None:
+            data = self._snapshot.read(address, length)
+            if data is not None:
+                return data
+        return self.client.read_bytes(address, length)
+
+    def _read_byte(self, address: int) -> Optional[bytes]:
+        return self._read_bytes(address, 1)
+
+    def _read_pointer(self, pointer_address: int) -> Optional[int]:
+        pointer_bytes = self._read_bytes(pointer_address, 4)
+        if pointer_bytes is None or len(pointer_bytes) < 4:
+            print(f"Error reading pointer bytes at {pointer_address:08X}", file=sys.stderr)
+            return None
+        return self.U32.unpack_from(pointer_bytes)[0]
+
+    def read_game_state(self, snapshot: Optional[MemorySnapshot] = None) -> Optional[GameState]: # Return Optional
+        """Read the current game state for Pokémon FireRed/LeafGreen
+
+        Args:
+            snapshot: Previously captured memory to decode from; captured fresh if omitted
+        """
         try:
+            # Pull every needed region up front; on failure helpers read directly
+            if snapshot is not None:
+                self._snapshot = snapshot
+            else:
+                self.prefetch()
+
             # Read interdependent data first
             party_size = self._read_party_size()
             if party_size is None: return None # Critical failure
@@ -446,17 +767,23 @@ class PokemonFireRedReader(PokemonGameReader):
             print(f"Error assembling game state: {e}", file=sys.stderr)
             # Optionally log traceback: import traceback; traceback.print_exc()
             return None
+        finally:
+            # Never serve a later call from stale memory
+            self._snapshot = None
 
-    def get_compact_game_state(self) -> Dict[str, Any]:
+    def get_compact_game_state(self, snapshot: Optional[MemorySnapshot] = None) -> Dict[str, Any]:
         """
         Get standardized compact game state for visual analysis integration
         
+        Args:
+            snapshot: Previously captured memory to decode from; captured fresh if omitted
+        
         Returns:
             Dict with complete RAM data structure for AI decision-making
         """
         try:
             # Get full game state using existing method
-            game_state = self.read_game_state()
+            game_state = self.read_game_state(snapshot)
             if not game_state:
                 return {
                     "ram_available": False,
@@ -588,14 +915,14 @@ class PokemonFireRedReader(PokemonGameReader):
         """Read the player's name using Data Crystal documented address"""
         try:
             # Read SaveBlock1 pointer (personal data) for player name
-            save_block_1_addr = self.client.read_pointer(self.ADDRESSES['save_block_1_ptr'])
+            save_block_1_addr = self._read_pointer(self.ADDRESSES['save_block_1_ptr'])
             if save_block_1_addr is None:
                 self.client.log_debug("Failed to read SaveBlock1 pointer for player name")
                 return "Pointer Error"
             
             # Read player name from SaveBlock1 + offset (Data Crystal: Name = [0x0300500C] + 0x0000, 8 bytes)
             name_addr = save_block_1_addr + self.ADDRESSES['player_name_offset']
-            name_bytes = self.client.read_bytes(name_addr, 8)  # 8 bytes as per Data Crystal
+            name_bytes = self._read_bytes(name_addr, 8)  # 8 bytes as per Data Crystal
             if name_bytes is None:
                 self.client.log_debug(f"Failed to read player name bytes from {name_addr:08X}")
                 return "Read Error"
@@ -606,35 +933,32 @@ class PokemonFireRedReader(PokemonGameReader):
             print(f"Error processing player name: {e}", file=sys.stderr)
             return "Processing Error"
 
+    def _read_map_position(self) -> Optional[Tuple[int, int, int, int]]:
+        """Read (x, y, map id, map bank) from SaveBlock8 in one 6-byte read"""
+        save_block_8_addr = self._read_pointer(self.ADDRESSES['save_block_8_ptr'])
+        if save_block_8_addr is None:
+            self.client.log_debug("Failed to read SaveBlock8 pointer")
+            return None
+
+        self.client.log_debug(f"SaveBlock8 address: 0x{save_block_8_addr:08X}")
+
+        # Data Crystal: X = [0x03005008] + 0x000, Y = +0x002, Map = +0x004, Bank = +0x005
+        position_addr = save_block_8_addr + self.ADDRESSES['player_coords_x_offset']
+        position_bytes = self._read_bytes(position_addr, self.MAP_POSITION.size)
+        if position_bytes is None or len(position_bytes) < self.MAP_POSITION.size:
+            self.client.log_debug(f"Failed to read map position bytes at {position_addr:08X}")
+            return None
+        return self.MAP_POSITION.unpack_from(position_bytes)
+
     def _read_coordinates(self) -> Tuple[int, int]:
         """Read player's current X,Y coordinates via SaveBlock8 pointer using Data Crystal addresses"""
         try:
-            # Read SaveBlock8 pointer first
-            save_block_8_addr = self.client.read_pointer(self.ADDRESSES['save_block_8_ptr'])
-            if save_block_8_addr is None:
-                self.client.log_debug("Failed to read SaveBlock8 pointer")
-                return (0, 0)
-            
-            self.client.log_debug(f"SaveBlock8 address: 0x{save_block_8_addr:08X}")
-            
-            # Read X coordinate (Data Crystal: X = [0x03005008] + 0x000)
-            x_addr = save_block_8_addr + self.ADDRESSES['player_coords_x_offset']
-            x_bytes = self.client.read_bytes(x_addr, 2)
-            if x_bytes is None or len(x_bytes) < 2:
-                self.client.log_debug(f"Failed to read X coordinate bytes at {x_addr:08X}")
-                return (0, 0)
-            
-            # Read Y coordinate (Data Crystal: Y = [0x03005008] + 0x002)
-            y_addr = save_block_8_addr + self.ADDRESSES['player_coords_y_offset']
-            y_bytes = self.client.read_bytes(y_addr, 2)
-            if y_bytes is None or len(y_bytes) < 2:
-                self.client.log_debug(f"Failed to read Y coordinate bytes at {y_addr:08X}")
+            position = self._read_map_position()
+            if position is None:
                 return (0, 0)
 
-            # Read as unsigned 16-bit integers, little-endian
-            x = int.from_bytes(x_bytes, byteorder='little', signed=False)
-            y = int.from_bytes(y_bytes, byteorder='little', signed=False)
-            self.client.log_debug(f"Read coordinates from 0x{x_addr:08X},0x{y_addr:08X}: X={x}, Y={y}")
+            x, y, _, _ = position
+            self.client.log_debug(f"Read coordinates: X={x}, Y={y}")
             return (x, y)
         except Exception as e:
             print(f"Error reading/processing coordinates: {e}", file=sys.stderr)
@@ -643,26 +967,13 @@ class PokemonFireRedReader(PokemonGameReader):
     def _read_location(self) -> str:
         """Read current location (Map Bank and Map ID) via SaveBlock8 pointer using Data Crystal addresses"""
         try:
-            # Read SaveBlock8 pointer first
-            save_block_8_addr = self.client.read_pointer(self.ADDRESSES['save_block_8_ptr'])
-            if save_block_8_addr is None:
-                self.client.log_debug("Failed to read SaveBlock8 pointer for location")
-                return "Unknown Location (Pointer Error)"
-            
-            # Read map ID and bank from SaveBlock8 (Data Crystal: Map=[0x03005008]+0x0004, Bank=[0x03005008]+0x0005)
-            map_id_addr = save_block_8_addr + self.ADDRESSES['map_id_offset']
-            bank_addr = save_block_8_addr + self.ADDRESSES['map_bank_offset']
-            
-            map_id_byte = self.client.read_byte(map_id_addr)
-            bank_byte = self.client.read_byte(bank_addr)
-
-            if bank_byte is None or map_id_byte is None:
-                self.client.log_debug("Failed to read map bank or map ID bytes.")
+            # Map ID and bank from SaveBlock8 (Data Crystal: Map=[0x03005008]+0x0004, Bank=[0x03005008]+0x0005)
+            position = self._read_map_position()
+            if position is None:
                 return "Unknown Location (Read Error)"
 
-            map_id = map_id_byte[0]
-            bank = bank_byte[0]
-            self.client.log_debug(f"Read location from 0x{map_id_addr:08X},0x{bank_addr:08X}: Bank={bank}, MapID={map_id}")
+            _, _, map_id, bank = position
+            self.client.log_debug(f"Read location: Bank={bank}, MapID={map_id}")
 
             # Map name lookup dictionary - CONFIRMED LOCATIONS ONLY
             # Only includes locations we've verified through actual gameplay
@@ -693,15 +1004,15 @@ class PokemonFireRedReader(PokemonGameReader):
     def is_in_pokemon_center(self) -> bool:
         """Check if the player is currently in a Pokemon Center"""
         try:
-            save_block_8_addr = self.client.read_pointer(self.ADDRESSES['save_block_8_ptr'])
+            save_block_8_addr = self._read_pointer(self.ADDRESSES['save_block_8_ptr'])
             if save_block_8_addr is None:
                 return False
             
             bank_addr = save_block_8_addr + self.ADDRESSES['map_bank_offset']
             map_id_addr = save_block_8_addr + self.ADDRESSES['map_id_offset']
             
-            bank_byte = self.client.read_byte(bank_addr)
-            map_id_byte = self.client.read_byte(map_id_addr)
+            bank_byte = self._read_byte(bank_addr)
+            map_id_byte = self._read_byte(map_id_addr)
 
             if bank_byte is None or map_id_byte is None:
                 return False
@@ -721,13 +1032,13 @@ class PokemonFireRedReader(PokemonGameReader):
         """Read the player's money using Data Crystal documented addresses"""
         try:
             # Read SaveBlock8 pointer (map data) for hidden money value
-            save_block_8_addr = self.client.read_pointer(self.ADDRESSES['save_block_8_ptr'])
+            save_block_8_addr = self._read_pointer(self.ADDRESSES['save_block_8_ptr'])
             if save_block_8_addr is None:
                 self.client.log_debug("Failed to read SaveBlock8 pointer for money")
                 return None
             
             # Read SaveBlock1 pointer (personal data) for encryption key
-            save_block_1_addr = self.client.read_pointer(self.ADDRESSES['save_block_1_ptr'])
+            save_block_1_addr = self._read_pointer(self.ADDRESSES['save_block_1_ptr'])
             if save_block_1_addr is None:
                 self.client.log_debug("Failed to read SaveBlock1 pointer for money key")
                 return None
@@ -737,21 +1048,21 @@ class PokemonFireRedReader(PokemonGameReader):
             
             # 1. Read the encrypted money value from SaveBlock8 + offset (Data Crystal: Money_Hidden = [0x03005008] + 0x0218)
             money_addr = save_block_8_addr + self.ADDRESSES['money_hidden_offset']
-            encrypted_money_bytes = self.client.read_bytes(money_addr, 4)
+            encrypted_money_bytes = self._read_bytes(money_addr, 4)
             if encrypted_money_bytes is None or len(encrypted_money_bytes) < 4:
                 self.client.log_debug("Failed to read encrypted money bytes.")
                 return None
-            encrypted_money = int.from_bytes(encrypted_money_bytes, byteorder='little')
+            encrypted_money = self.U32.unpack_from(encrypted_money_bytes)[0]
             self.client.log_debug(f"Read encrypted money from 0x{money_addr:08X}: 0x{encrypted_money:08X}")
 
             # 2. Read the XOR key from SaveBlock1 + key offset (Data Crystal: Key = [0x0300500C] + 0x0F20)
             key_addr = save_block_1_addr + self.ADDRESSES['money_key_offset']
-            key_bytes = self.client.read_bytes(key_addr, 4)
+            key_bytes = self._read_bytes(key_addr, 4)
             if key_bytes is None or len(key_bytes) < 4:
                 self.client.log_debug("Failed to read money encryption key.")
                 return None
             
-            key = int.from_bytes(key_bytes, byteorder='little')
+            key = self.U32.unpack_from(key_bytes)[0]
             self.client.log_debug(f"Read money key from 0x{key_addr:08X}: 0x{key:08X}")
 
             # 3. Decrypt using XOR (Data Crystal: Money = Money_Hidden XOR Key)
@@ -772,7 +1083,7 @@ class PokemonFireRedReader(PokemonGameReader):
     def _read_party_size(self) -> Optional[int]:
         """Read number of Pokemon in party"""
         try:
-            size_byte = self.client.read_byte(self.ADDRESSES['party_count'])
+            size_byte = self._read_byte(self.ADDRESSES['party_count'])
             if size_byte is None:
                 print("Error: Failed to read party size byte.", file=sys.stderr)
                 return None
@@ -797,26 +1108,25 @@ class PokemonFireRedReader(PokemonGameReader):
             return None
 
     def _decrypt_pokemon_data(self, poke_data: bytes) -> bytes:
-        """Decrypt Pokemon data using PID and OT ID, handling substructure ordering"""
+        """Decrypt Pokemon data using PID and OT ID, handling substructure ordering
+
+        Single-structure reference; party and PC decoding go through pokemon_decoder.
+        """
         if len(poke_data) < self.POKEMON_SIZE:
             return poke_data
         
         try:
             # Extract PID and OT ID from the first 8 bytes (these are unencrypted)
-            personality_id = int.from_bytes(poke_data[0:4], byteorder='little')
-            ot_id = int.from_bytes(poke_data[4:8], byteorder='little')
+            personality_id, ot_id = self.POKEMON_HEADER.unpack_from(poke_data)
             
             # Generate decryption key (PID XOR OT ID)
             key = personality_id ^ ot_id
             self.client.log_debug(f"Decryption key: PID(0x{personality_id:08X}) ^ OT(0x{ot_id:08X}) = 0x{key:08X}")
             
-            # Decrypt the data section (bytes 32-79, the 48 encrypted bytes)
+            # Decrypt the data section (bytes 32-79, the 48 encrypted bytes) as 12 words
             decrypted_data = bytearray(poke_data)
-            for i in range(32, 80, 4):  # Decrypt 4 bytes at a time
-                if i + 4 <= len(poke_data):
-                    encrypted_word = int.from_bytes(poke_data[i:i+4], byteorder='little')
-                    decrypted_word = encrypted_word ^ key
-                    decrypted_data[i:i+4] = decrypted_word.to_bytes(4, byteorder='little')
+            words = self.SUBSTRUCT_WORDS.unpack_from(poke_data, 32)
+            self.SUBSTRUCT_WORDS.pack_into(decrypted_data, 32, *(word ^ key for word in words))
             
             # Now handle substructure ordering based on PID % 24
             # The 48 bytes are arranged as 4 substructures of 12 bytes each
@@ -853,106 +1163,99 @@ class PokemonFireRedReader(PokemonGameReader):
 
     def _read_party_pokemon(self, party_size: int) -> List[PokemonInfo]:
         """Read all Pokemon currently in the party, given the known size"""
-        party = []
         if not (0 < party_size <= self.MAX_PARTY_SIZE):
             self.client.log_debug(f"Skipping party read due to invalid size: {party_size}")
             return [] # Return empty list if size is invalid/zero
 
         try:
-            # Read the entire party block at once for potentially better performance
+            # Read the entire party block at once and decode every slot in one pass
             base_party_addr = self.ADDRESSES['party_data']
             total_party_bytes = party_size * self.POKEMON_SIZE
-            party_block = self.client.read_bytes(base_party_addr, total_party_bytes)
+            party_block = self._read_bytes(base_party_addr, total_party_bytes)
 
             if party_block is None or len(party_block) < total_party_bytes:
                 print(f"Error: Failed to read sufficient party data (needed {total_party_bytes}, got {len(party_block) if party_block else 0})", file=sys.stderr)
                 return [] # Cannot proceed
 
-            for i in range(party_size):
-                try:
-                    poke_offset = i * self.POKEMON_SIZE
-                    poke_data = party_block[poke_offset : poke_offset + self.POKEMON_SIZE]
-                    self.client.log_debug(f"Processing Pokémon {i+1} data (offset {poke_offset})...")
-
-                    if len(poke_data) < self.POKEMON_SIZE:
-                         print(f"Warning: Incomplete data for Pokémon {i+1}", file=sys.stderr)
-                         continue # Skip this pokemon
-
-                    # Decrypt the Pokemon data
-                    decrypted_data = self._decrypt_pokemon_data(poke_data)
-
-                    # Read unencrypted fields first
-                    personality_id = int.from_bytes(decrypted_data[0:4], byteorder='little')
-                    ot_id = int.from_bytes(decrypted_data[4:8], byteorder='little')
-
-                    # Nickname (10 bytes, null-terminated, using game's encoding)
-                    nickname_bytes = decrypted_data[8:18]
-                    nickname = self._convert_text(nickname_bytes)
-
-                    # Now read from properly decrypted and reordered substructures
-                    # Growth substructure (offset 32): Species ID at bytes 0-1
-                    growth_start = 32
-                    species_id = int.from_bytes(decrypted_data[growth_start:growth_start+2], byteorder='little')
-                    
-                    # Item held at bytes 2-3 (could be useful)
-                    held_item = int.from_bytes(decrypted_data[growth_start+2:growth_start+4], byteorder='little')
-                    
-                    # Experience at bytes 4-7 (could calculate level from this)
-                    experience = int.from_bytes(decrypted_data[growth_start+4:growth_start+8], byteorder='little')
-
-                    # Attacks substructure (offset 44): Move IDs and PP
-                    attacks_start = 44
-                    moves = []
-                    move_pp = []
-                    for j in range(4):
-                        move_offset = attacks_start + (j * 2)  # Move IDs: 0, 2, 4, 6
-                        pp_offset = attacks_start + 8 + j      # PP values: 8, 9, 10, 11
-                        
-                        if len(decrypted_data) > move_offset + 1:
-                            move_id = int.from_bytes(decrypted_data[move_offset:move_offset+2], byteorder='little')
-                            if move_id > 0:
-                                move_name = self.MOVE_NAMES.get(move_id, f"Move #{move_id}")
-                                moves.append(move_name)
-                                if len(decrypted_data) > pp_offset:
-                                    move_pp.append(decrypted_data[pp_offset])
-                                else:
-                                    move_pp.append(0)
-
-                    # Calculate level from experience using species-specific growth rate
-                    level = self._calculate_level_from_experience(species_id, experience)
-                    
-                    # HP and status from party stats (bytes 80+ in the 100-byte structure)
-                    # Current HP is at offset 86 in the full structure
-                    current_hp = int.from_bytes(decrypted_data[86:88], byteorder='little') if len(decrypted_data) > 87 else 0
-                    max_hp = int.from_bytes(decrypted_data[88:90], byteorder='little') if len(decrypted_data) > 89 else 0
-                    
-                    # Status condition at offset 80
-                    status_bytes = decrypted_data[80:84] if len(decrypted_data) > 83 else b'\x00\x00\x00\x00'
-                    status_value = int.from_bytes(status_bytes, byteorder='little')
-                    status = StatusCondition(status_value).get_status_name()
-
-                    pokemon = PokemonInfo(
-                        species_id=species_id,
-                        nickname=nickname,
-                        level=level,
-                        current_hp=current_hp,
-                        max_hp=max_hp,
-                        status=status,
-                        moves=moves,
-                        move_pp=move_pp
-                    )
-                    party.append(pokemon)
-                    self.client.log_debug(f"Processed Pokémon {i+1}: {nickname} (Species #{species_id}, Lvl {level})")
-
-                except IndexError as ie:
-                     print(f"Error processing Pokémon at index {i}: Data access out of bounds ({ie}). Skipping.", file=sys.stderr)
-                except Exception as e:
-                    print(f"Error processing Pokémon at index {i}: {e}", file=sys.stderr)
+            decoded = decode_pokemon(party_block, party_size, self.POKEMON_SIZE)
+            levels = self._levels.levels(decoded.species, decoded.experience)
+
+            party = []
+            rows = zip(decoded.species.tolist(), decoded.nickname.tolist(),
+                       levels.tolist(), decoded.current_hp.tolist(), decoded.max_hp.tolist(),
+                       decoded.status.tolist(), decoded.moves.tolist(), decoded.pp.tolist())
+            for i, (species_id, nickname, level, current_hp, max_hp, status, move_ids, pp) in enumerate(rows):
+                moves, move_pp = self._moves_with_pp(move_ids, pp)
+                party.append(PokemonInfo(
+                    species_id=species_id,
+                    nickname=self._convert_text(bytes(nickname)),
+                    level=level,
+                    current_hp=current_hp,
+                    max_hp=max_hp,
+                    status=StatusCondition(status).get_status_name(),
+                    moves=moves,
+                    move_pp=move_pp
+                ))
+                self.client.log_debug(f"Processed Pokémon {i+1}: {party[-1].nickname} (Species #{species_id}, Lvl {level})")
+            return party
 
         except Exception as e:
             print(f"General error reading party block: {e}", file=sys.stderr)
+            return []
+
+    def _moves_with_pp(self, move_ids, pp_values) -> Tuple[List[str], List[int]]:
+        """Names and PP of the known moves (move id 0 = empty slot)"""
+        moves, move_pp = [], []
+        for move_id, pp in zip(move_ids, pp_values):
+            if move_id > 0:
+                moves.append(self.MOVE_NAMES.get(move_id, f"Move #{move_id}"))
+                move_pp.append(pp)
+        return moves, move_pp
 
-        return party
+    def read_pc_boxes(self) -> Optional[PCStorage]:
+        """Read and decode all 14 PC boxes (420 slots) in one read and one decode pass
+
+        Returns:
+            PCStorage with the occupied slots, or None if storage could not be read
+        """
+        try:
+            storage_addr = self._read_pointer(self.ADDRESSES['save_block_2_ptr'])
+            if storage_addr is None:
+                self.client.log_debug("Failed to read PC storage pointer")
+                return None
+
+            slot_count = self.PC_BOX_COUNT * self.PC_BOX_CAPACITY
+            storage = self._read_bytes(storage_addr, self.PC_BOXES_OFFSET + slot_count * BOX_POKEMON_SIZE)
+            if storage is None:
+                print(f"Error: Failed to read PC storage at 0x{storage_addr:08X}", file=sys.stderr)
+                return None
+
+            decoded = decode_pokemon(storage[self.PC_BOXES_OFFSET:], slot_count, BOX_POKEMON_SIZE)
+            occupied = np.flatnonzero(decoded.occupied)
+            levels = self._levels.levels(decoded.species[occupied], decoded.experience[occupied])
+
+            pokemon = []
+            rows = zip(occupied.tolist(), decoded.species[occupied].tolist(), decoded.nickname[occupied].tolist(),
+                       levels.tolist(), decoded.held_item[occupied].tolist(),
+                       decoded.moves[occupied].tolist(), decoded.pp[occupied].tolist())
+            for index, species_id, nickname, level, held_item, move_ids, pp in rows:
+                moves, move_pp = self._moves_with_pp(move_ids, pp)
+                box, slot = divmod(index, self.PC_BOX_CAPACITY)
+                pokemon.append(BoxPokemonInfo(
+                    box=box + 1,
+                    slot=slot + 1,
+                    species_id=species_id,
+                    nickname=self._convert_text(bytes(nickname)),
+                    level=level,
+                    held_item=held_item,
+                    moves=moves,
+                    move_pp=move_pp
+                ))
+
+            return PCStorage(current_box=storage[0] + 1, pokemon=pokemon)
+        except Exception as e:
+            print(f"Error reading PC boxes: {e}", file=sys.stderr)
+            return None
 
     def _read_item_pocket(self, pocket_name: str, start_offset: int, capacity: int) -> List[Tuple[str, int]]:
         """Helper to read a specific item pocket."""
@@ -963,23 +1266,14 @@ class PokemonFireRedReader(PokemonGameReader):
 
             # Read the entire pocket data based on capacity (Item ID + Quantity per slot)
             pocket_data_size = capacity * self.ITEM_ENTRY_SIZE
-            pocket_data = self.client.read_bytes(pocket_addr, pocket_data_size)
+            pocket_data = self._read_bytes(pocket_addr, pocket_data_size)
 
             if pocket_data is None or len(pocket_data) < pocket_data_size:
                 print(f"Error: Failed to read sufficient data for {pocket_name} pocket.", file=sys.stderr)
                 return []
 
             item_count = 0
-            for i in range(capacity):
-                item_offset = i * self.ITEM_ENTRY_SIZE
-                item_entry = pocket_data[item_offset : item_offset + self.ITEM_ENTRY_SIZE]
-
-                if len(item_entry) < self.ITEM_ENTRY_SIZE:
-                    print(f"Warning: Incomplete item data in {pocket_name} at slot {i}", file=sys.stderr)
-                    continue
-
-                item_id = int.from_bytes(item_entry[0:2], byteorder='little')
-                quantity = int.from_bytes(item_entry[2:4], byteorder='little')
+            for i, (item_id, quantity) in enumerate(self.ITEM_ENTRY.iter_unpack(pocket_data[:pocket_data_size])):
 
                 # Item ID 0 marks the end or an empty slot. Quantity needs validation.
                 if item_id == 0:
@@ -1013,19 +1307,8 @@ class PokemonFireRedReader(PokemonGameReader):
         """Read all standard item pockets"""
         all_items = []
 
-        # Capacities from Bulbapedia/common sources (verify!)
-        # Note: Actual *count* of items might be stored separately or implicitly (e.g., terminated by item ID 0)
-        # These capacities define the maximum number of *slots*.
-        pockets_info = [
-            ("Items", self.ADDRESSES['items_pocket_start_offset'], 42), # Adjusted capacity
-            ("Key Items", self.ADDRESSES['key_items_pocket_start_offset'], 30),
-            ("Poké Balls", self.ADDRESSES['pokeballs_pocket_start_offset'], 16), # Adjusted capacity
-            ("TMs/HMs", self.ADDRESSES['tms_hms_pocket_start_offset'], 64),
-            ("Berries", self.ADDRESSES['berries_pocket_start_offset'], 46), # Adjusted capacity
-        ]
-
-        for name, offset, capacity in pockets_info:
-             pocket_items = self._read_item_pocket(name, offset, capacity)
+        for name, offset_key, capacity in self.ITEM_POCKETS:
+             pocket_items = self._read_item_pocket(name, self.ADDRESSES[offset_key], capacity)
              if pocket_items:
                  # Add a prefix to distinguish pockets if desired
                  # all_items.extend([(f"[{name}] {item_name}", qty) for item_name, qty in pocket_items])
@@ -1158,10 +1441,15 @@ def main():
     parser.add_argument('--url', default='http://localhost:8080', help='SkyEmu HTTP server URL (default: http://localhost:8080)')
     parser.add_argument('--refresh', type=float, default=0, help='Refresh interval in seconds (0 = run once; e.g., 0.5 for faster updates)')
     parser.add_argument('--debug', action='store_true', help='Enable detailed debug output to stderr')
+    parser.add_argument('--source', help='Decode a RAM dump or .sav file instead of a live emulator')
     args = parser.parse_args()
 
-    # Create client with debug flag
-    client = SkyEmuClient()
+    # Create client with debug flag (or an offline memory source)
+    if args.source:
+        from memory_sources import open_memory_source
+        client = open_memory_source(args.source, debug=args.debug)
+    else:
+        client = SkyEmuClient()
 
     # Basic memory access test (optional but recommended)
     print("\nTesting basic memory access...")
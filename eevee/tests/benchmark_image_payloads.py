@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark for vision request payloads
+
+Encodes the grid overlay of the recorded screenshots with several encoding
+profiles and sends each payload through call_llm, reporting payload size,
+encode time and request latency per profile plus a least-squares fit of
+latency against payload size. Offline by default: the stub provider adds
+--upload-ms-per-kb of latency per KB of image to model the upload. Pass
+--provider gemini/mistral (with API keys in .env) to time real requests.
+
+Usage:
+    python tests/benchmark_image_payloads.py
+    python tests/benchmark_image_payloads.py --requests 10 --upload-ms-per-kb 1.5
+    python tests/benchmark_image_payloads.py --provider gemini --requests 3
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+project_root = tests_dir.parent.parent
+sys.path.insert(0, str(tests_dir.parent))
+sys.path.append(str(project_root / "gemini-multimodal-playground" / "standalone"))
+
+import numpy as np
+from PIL import Image
+
+SCREENSHOTS = ["step_overworld_alone.png", "step_overworld_withNPC.png", "step_talking_NPC.png",
+               "step_battle_fight_moves.png", "pokecenter_1.png"]
+PROMPT = "Describe the scene and list the valid buttons as JSON."
+
+
+def build_profiles(provider: str):
+    from image_encoder import EncodingProfile, WEBP_AVAILABLE
+    from provider_config import get_image_encoding_for_task
+
+    profiles = {
+        "png": EncodingProfile(format="png"),
+        "jpeg q85": EncodingProfile(format="jpeg", quality=85),
+        "jpeg q60": EncodingProfile(format="jpeg", quality=60),
+        "jpeg q85 x0.5": EncodingProfile(format="jpeg", quality=85, scale=0.5),
+    }
+    if WEBP_AVAILABLE:
+        profiles["webp q85"] = EncodingProfile(format="webp", quality=85)
+    profiles[f"{provider} default"] = EncodingProfile.from_dict(get_image_encoding_for_task(provider))
+    return profiles
+
+
+def overlays():
+    """Grid overlays as VisualAnalysis sends them (RAM coordinates faked)"""
+    from overlay_renderer import GridOverlayRenderer
+
+    renderer = GridOverlayRenderer(grid_size=8)
+    coords = {"ram_available": True, "location": {"map_bank": 3, "map_id": 1, "x": 10, "y": 7}}
+    return [renderer.render(Image.open(tests_dir / name).convert("RGB"), coords) for name in SCREENSHOTS]
+
+
+def run_profile(profile, images, requests: int, provider: str) -> dict:
+    from image_encoder import ImageEncoder
+    from llm_api import call_llm
+
+    encoder = ImageEncoder(cache_size=0)
+    sizes, request_ms = [], []
+    for step in range(requests):
+        payload = encoder.encode(images[step % len(images)], profile=profile)
+        start = time.perf_counter()
+        response = call_llm(prompt=PROMPT, image_data=payload.base64, max_tokens=200,
+                            provider=provider, mime_type=payload.mime_type)
+        request_ms.append((time.perf_counter() - start) * 1000)
+        sizes.append(payload.size_bytes)
+        if response.error:
+            print(f"⚠️ {provider} request failed: {response.error}")
+
+    stats = encoder.get_stats()
+    return {
+        "kb": np.mean(sizes) / 1024,
+        "encode_ms": stats["avg_encode_ms"],
+        "request_ms": float(np.mean(request_ms)),
+        "sizes": sizes,
+        "latencies": request_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vision request latency vs image payload size")
+    parser.add_argument('--provider', default='stub', help='stub (offline), gemini or mistral (default: stub)')
+    parser.add_argument('--requests', type=int, default=10, help='Requests per profile (default: 10)')
+    parser.add_argument('--base-latency-ms', type=float, default=5.0,
+                        help='Stub latency per request (default: 5)')
+    parser.add_argument('--upload-ms-per-kb', type=float, default=1.0,
+                        help='Stub latency per KB of image payload (default: 1.0)')
+    args = parser.parse_args()
+
+    if args.provider == 'stub':
+        os.environ['LLM_PROVIDER'] = 'stub'
+        os.environ['STUB_LLM_LATENCY_MS'] = str(args.base_latency_ms)
+        os.environ['STUB_LLM_LATENCY_PER_KB_MS'] = str(args.upload_ms_per_kb)
+
+    images = overlays()
+    print(f"{'profile':<16} {'KB':>7} {'encode ms':>10} {'request ms':>11} {'total ms':>9}")
+    all_sizes, all_latencies = [], []
+    for label, profile in build_profiles(args.provider).items():
+        result = run_profile(profile, images, args.requests, args.provider)
+        all_sizes += result["sizes"]
+        all_latencies += result["latencies"]
+        print(f"{label:<16} {result['kb']:>7.1f} {result['encode_ms']:>10.2f} {result['request_ms']:>11.1f} "
+              f"{result['encode_ms'] + result['request_ms']:>9.1f}")
+
+    slope, intercept = np.polyfit(np.array(all_sizes) / 1024, all_latencies, 1)
+    correlation = np.corrcoef(all_sizes, all_latencies)[0, 1]
+    print(f"\nLatency ≈ {intercept:.1f} ms + {slope:.2f} ms/KB (r = {correlation:.2f}, {len(all_sizes)} requests)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
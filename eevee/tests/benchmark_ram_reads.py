@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark for FireRed RAM reads
+
+Counts HTTP requests (and wall time) per `get_compact_game_state` call with
+per-byte reads versus ranged/bulk reads. Runs fully offline against an
+in-process fake of SkyEmu's /read_byte endpoint backed by a synthetic memory
+image, so no emulator is needed.
+
+Usage:
+    python tests/benchmark_ram_reads.py
+    python tests/benchmark_ram_reads.py --iterations 5 --latency-ms 2
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from analyse_skyemu_ram import SkyEmuClient, PokemonFireRedReader
+from skyemu_transport import SkyEmuTransport
+
+EWRAM_START, EWRAM_SIZE = 0x02000000, 0x40000
+IWRAM_START, IWRAM_SIZE = 0x03000000, 0x8000
+
+
+class FakeResponse:
+    """Just enough of requests.Response for SkyEmuClient"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        raise ValueError("not json")
+
+
+class FakeSkyEmuSession:
+    """In-process stand-in for requests.Session talking to SkyEmu's /read_byte"""
+
+    def __init__(self, latency_ms: float = 0.0, seed: int = 7):
+        rng = random.Random(seed)
+        self.ewram = bytearray(rng.getrandbits(8) for _ in range(EWRAM_SIZE))
+        self.iwram = bytearray(rng.getrandbits(8) for _ in range(IWRAM_SIZE))
+        self.latency = latency_ms / 1000.0
+
+        addresses = PokemonFireRedReader.ADDRESSES
+        # Plausible save block pointers and a two-Pokemon party
+        self._write(addresses['save_block_8_ptr'], (0x0202552C).to_bytes(4, 'little'))
+        self._write(addresses['save_block_1_ptr'], (0x02024588).to_bytes(4, 'little'))
+        self._write(addresses['save_block_2_ptr'], (0x02029314).to_bytes(4, 'little'))
+        self._write(addresses['party_count'], bytes([2]))
+
+    def _region(self, addr):
+        if EWRAM_START <= addr < EWRAM_START + EWRAM_SIZE:
+            return self.ewram, addr - EWRAM_START
+        if IWRAM_START <= addr < IWRAM_START + IWRAM_SIZE:
+            return self.iwram, addr - IWRAM_START
+        return None, 0
+
+    def _write(self, addr, data):
+        for i, value in enumerate(data):
+            region, offset = self._region(addr + i)
+            region[offset] = value
+
+    def _read(self, addr):
+        region, offset = self._region(addr)
+        return region[offset] if region is not None else 0
+
+    def get(self, url, params=None, timeout=None):
+        if self.latency:
+            time.sleep(self.latency)
+        if not url.endswith("/read_byte"):
+            return FakeResponse("")
+
+        addr_params = params.get('addr', [])
+        if isinstance(addr_params, str):
+            addr_params = [addr_params]
+
+        out = []
+        for param in addr_params:
+            start_hex, _, end_hex = param.partition('-')
+            start = int(start_hex, 16)
+            end = int(end_hex, 16) if end_hex else start
+            out.extend(f"{self._read(a):02x}" for a in range(start, end + 1))
+        return FakeResponse("".join(out))
+
+
+def run(bulk_reads: bool, iterations: int, latency_ms: float) -> dict:
+    transport = SkyEmuTransport(session=FakeSkyEmuSession(latency_ms=latency_ms))
+    client = SkyEmuClient(bulk_reads=bulk_reads, transport=transport)
+    reader = PokemonFireRedReader(client)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        state = reader.get_compact_game_state()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests_per_call": client.request_count / iterations,
+        "ms_per_call": elapsed * 1000 / iterations,
+        "ram_available": state.get("ram_available", False),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Requests per get_compact_game_state, per-byte vs bulk")
+    parser.add_argument('--iterations', type=int, default=3, help='Calls per mode (default: 3)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Simulated per-request latency (default: 0)')
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'requests/call':>14} {'ms/call':>10}  ram_available")
+    results = {}
+    for label, bulk in (("per-byte", False), ("bulk", True)):
+        results[label] = run(bulk, args.iterations, args.latency_ms)
+        r = results[label]
+        print(f"{label:<10} {r['requests_per_call']:>14.0f} {r['ms_per_call']:>10.1f}  {r['ram_available']}")
+
+    before = results["per-byte"]["requests_per_call"]
+    after = results["bulk"]["requests_per_call"]
+    print(f"\nRequest reduction: {before:.0f} -> {after:.0f} ({before / max(after, 1):.0f}x fewer)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark ContinuousGameplay.run_continuous_loop fully offline
+
+Runs the real turn loop against the stub SkyEmu server (replaying recorded
+frames and serving RAM from a dump) with the stub LLM provider, and reports
+per-stage latency and turns per second so loop overhead can be tracked.
+Everything the run writes (databases, run logs) goes to a scratch directory.
+
+Usage:
+    python tests/benchmark_turn_loop.py
+    python tests/benchmark_turn_loop.py --turns 50 --frames runs/session_20250101_120000 \\
+        --ram ewram_iwram_dump.bin --llm-latency-ms 300 --emulator-latency-ms 2
+    python tests/benchmark_turn_loop.py --turn-delay 0.2 --sequential   # without the turn pipeline
+    python tests/benchmark_turn_loop.py --episode-review-frequency 5 [--sequential]  # reviews off/on the loop
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+tests_dir = Path(__file__).resolve().parent
+eevee_dir = tests_dir.parent
+project_root = eevee_dir.parent
+sys.path.insert(0, str(tests_dir))
+sys.path.append(str(eevee_dir))
+
+from skyemu_stub_server import StubSkyEmuServer, build_state, synthetic_ram
+
+# Stages wrapped on ContinuousGameplay, in turn order
+LOOP_STAGES = [
+    ("capture", "_capture_game_context"),
+    ("ai_decision", "_get_ai_decision"),
+    ("execute", "_execute_ai_action"),
+    ("session_state", "_update_session_state"),
+    ("store_turn", "_store_complete_turn_data"),
+    ("session_file", "_update_session_data_file"),
+    ("turn_log", "_log_complete_turn_data"),
+]
+
+
+class StageTimer:
+    """Collects wall time per named stage"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def wrap(self, name: str, func):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.samples[name].append((time.perf_counter() - start) * 1000)
+        return timed
+
+    def report(self, total_seconds: float, turns: int) -> None:
+        print(f"\n{'stage':<18}{'calls':>7}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+        print("-" * 65)
+        for name, samples in self.samples.items():
+            ordered = sorted(samples)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            print(f"{name:<18}{len(samples):>7}{statistics.mean(samples):>10.1f}"
+                  f"{statistics.median(samples):>10.1f}{p95:>10.1f}{ordered[-1]:>10.1f}")
+        print("-" * 65)
+        if turns:
+            print(f"Turns: {turns} in {total_seconds:.2f}s -> {total_seconds * 1000 / turns:.1f} ms/turn, "
+                  f"{turns / total_seconds:.2f} turns/s")
+
+
+@contextmanager
+def working_directory(path):
+    """Run with `path` as the working directory (the loop writes some logs relative to it)"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def instrument(gameplay, timer: StageTimer) -> None:
+    """Wrap the loop's stages (and the sub-stages worth separating) with timers"""
+    for name, attr in LOOP_STAGES:
+        setattr(gameplay, attr, timer.wrap(name, getattr(gameplay, attr)))
+
+    if gameplay.visual_analyzer:
+        analyzer = gameplay.visual_analyzer
+        analyzer.analyze_current_scene = timer.wrap("  visual_analysis", analyzer.analyze_current_scene)
+
+    from llm_api import get_llm_manager
+    manager = get_llm_manager()
+    manager.call = timer.wrap("  llm_call", manager.call)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline turn-loop benchmark (stub SkyEmu + stub LLM)")
+    parser.add_argument('--turns', type=int, default=20, help='Turns to run (default: 20)')
+    parser.add_argument('--frames', default=str(tests_dir),
+                        help='Session directory or PNG to replay (default: the PNGs in tests/)')
+    parser.add_argument('--ram', help='Memory dump or .sav served on /read_byte (default: synthetic overworld RAM)')
+    parser.add_argument('--port', type=int, default=0,
+                        help='Stub port; the agent is pointed at it (default: a free port)')
+    parser.add_argument('--emulator-latency-ms', type=float, default=0.0, help='Stub per-request latency')
+    parser.add_argument('--llm-latency-ms', type=float, default=0.0, help='Stub LLM latency per call')
+    parser.add_argument('--turn-delay', type=float, default=0.0, help='Seconds between turns (default: 0)')
+    parser.add_argument('--sequential', action='store_true',
+                        help='Disable the turn pipeline (inline persistence, capture at turn start)')
+    parser.add_argument('--episode-review-frequency', type=int, default=0,
+                        help='Run a periodic episode review every N turns (default: 0, off)')
+    parser.add_argument('--input-mode', choices=['realtime', 'frame_stepped'], default='frame_stepped',
+                        help='Controller input mode (realtime includes the per-button sleeps)')
+    args = parser.parse_args()
+
+    # Route every LLM call to the stub provider before the agent reads its config
+    os.environ['LLM_PROVIDER'] = 'stub'
+    os.environ['HYBRID_MODE'] = 'false'
+    os.environ['STUB_LLM_LATENCY_MS'] = str(args.llm_latency_ms)
+
+    state = build_state(args.frames, args.ram)
+    if not args.ram:
+        state.load_ram(synthetic_ram())
+
+    with StubSkyEmuServer(port=args.port, latency_ms=args.emulator_latency_ms, state=state) as server, \
+            tempfile.TemporaryDirectory(prefix="eevee_bench_") as scratch, working_directory(scratch):
+        print(f"🧪 Stub SkyEmu on {server.url}: {len(state.frames)} frame(s), RAM {args.ram or 'synthetic'}")
+        os.environ['SKYEMU_HOST'], os.environ['SKYEMU_PORT'] = server.host, str(server.port)
+        os.environ['LLM_CACHE_PATH'] = str(Path(scratch) / "llm_cache.db")
+
+        from eevee_agent import EeveeAgent
+        from run_eevee import ContinuousGameplay
+
+        # Keep the source tree clean: databases and relative run logs go to scratch
+        import coordinate_mapper, memory_system, metatile_atlas
+        coordinate_mapper.DEFAULT_DATABASE_PATH = Path(scratch) / "coordinate_map.db"
+        memory_system.DEFAULT_MEMORY_DIR = Path(scratch) / "memory"
+        metatile_atlas.DEFAULT_DATABASE_PATH = Path(scratch) / "metatile_atlas.db"
+
+        eevee = EeveeAgent(enable_neo4j=False, enable_okr=False)
+        eevee.controller.input_mode = args.input_mode
+        eevee.runs_dir = Path(scratch)
+
+        gameplay = ContinuousGameplay(eevee, interactive=False, episode_review_frequency=args.episode_review_frequency,
+                                      save_screenshots=False)
+        if gameplay.visual_analyzer:
+            gameplay.visual_analyzer.runs_dir = Path(scratch)
+        gameplay.turn_delay = args.turn_delay
+        gameplay.pipelined = not args.sequential
+
+        timer = StageTimer()
+        instrument(gameplay, timer)
+
+        gameplay.start_session("benchmark", max_turns=args.turns)
+        start = time.perf_counter()
+        gameplay.run_continuous_loop()
+        elapsed = time.perf_counter() - start
+
+        print(f"\n📊 Offline turn loop ({args.input_mode}, {'sequential' if args.sequential else 'pipelined'}, "
+              f"LLM {args.llm_latency_ms}ms, emulator {args.emulator_latency_ms}ms, delay {args.turn_delay}s)")
+        timer.report(elapsed, gameplay.session.turns_completed)
+        if not args.sequential:
+            pipeline = gameplay._get_pipeline_stats()
+            writer = pipeline["writer"]
+            print(f"Writer: {writer['completed']} jobs, {writer['coalesced']} coalesced, "
+                  f"max {writer['max_pending']} pending; capture prefetch: {pipeline['capture_prefetch']}")
+        if args.episode_review_frequency:
+            print(f"Episode review (blocked_ms = loop time spent on reviews): {gameplay.episode_reviewer.get_stats()}")
+        print(f"Emulator requests: {dict(sorted(state.request_counts.items()))}")
+
+    if not state.request_counts.get("screen") or not state.request_counts.get("read_byte"):
+        print("❌ The agent never captured a frame or read RAM from the stub - the numbers above are not meaningful")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Offline memory sources for PokemonFireRedReader
+
+Each source exposes the subset of the SkyEmuClient interface the reader uses
+(read_bytes, read_regions, read_byte, read_pointer, log_debug), so the same
+decoder runs over a live emulator, a raw RAM dump (mmap), an in-memory buffer
+or a FireRed .sav file. Reads return memoryview slices over the backing
+buffer, so no bytes are copied until a decoder actually needs them.
+
+Usage:
+    reader = PokemonFireRedReader(open_memory_source("pokemon_flame_red-memdump.bin"))
+    state = reader.read_game_state()
+"""
+
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+EWRAM_START, EWRAM_SIZE = 0x02000000, 0x40000
+IWRAM_START, IWRAM_SIZE = 0x03000000, 0x8000
+
+U32 = struct.Struct('<I')
+
+BufferLike = Union[bytes, bytearray, memoryview]
+
+
+class MemorySource:
+    """Address-mapped read-only view over one or more memory regions"""
+
+    def __init__(self, regions: Dict[int, BufferLike], debug: bool = False):
+        """
+        Args:
+            regions: Region start address -> backing buffer (not copied)
+            debug: Print debug messages to stderr
+        """
+        self.debug = debug
+        self.regions: List[Tuple[int, int, memoryview]] = sorted(
+            (start, start + len(data), memoryview(data)) for start, data in regions.items()
+        )
+
+    def log_debug(self, message):
+        if self.debug:
+            print(f"[DEBUG] {message}", file=sys.stderr)
+
+    def read_bytes(self, address: int, length: int) -> Optional[memoryview]:
+        """Zero-copy view of [address, address+length), or None if not mapped"""
+        for start, end, view in self.regions:
+            if start <= address and address + length <= end:
+                offset = address - start
+                return view[offset:offset + length]
+        self.log_debug(f"Unmapped read at 0x{address:08X} ({length} bytes)")
+        return None
+
+    def read_regions(self, regions) -> Optional[List[memoryview]]:
+        """Same contract as SkyEmuClient.read_regions: all regions or None"""
+        chunks = []
+        for address, length in regions:
+            chunk = self.read_bytes(address, length)
+            if chunk is None:
+                return None
+            chunks.append(chunk)
+        return chunks
+
+    def read_byte(self, addresses) -> Optional[bytes]:
+        if isinstance(addresses, int):
+            addresses = [addresses]
+        out = bytearray()
+        for address in addresses:
+            chunk = self.read_bytes(address, 1)
+            if chunk is None:
+                return None
+            out += chunk
+        return bytes(out)
+
+    def read_pointer(self, pointer_address: int) -> Optional[int]:
+        data = self.read_bytes(pointer_address, 4)
+        return U32.unpack(data)[0] if data is not None else None
+
+    def close(self) -> None:
+        for _, _, view in self.regions:
+            view.release()
+        self.regions = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def split_ram_dump(data: BufferLike) -> Dict[int, memoryview]:
+    """
+    Map a raw dump onto the GBA address space without copying
+
+    The dump layout is EWRAM (256KB) optionally followed by IWRAM (32KB);
+    shorter dumps cover EWRAM from its start.
+    """
+    view = memoryview(data)
+    regions = {EWRAM_START: view[:EWRAM_SIZE]}
+    if len(view) > EWRAM_SIZE:
+        regions[IWRAM_START] = view[EWRAM_SIZE:EWRAM_SIZE + IWRAM_SIZE]
+    return regions
+
+
+class BufferMemorySource(MemorySource):
+    """Memory source over an in-memory bytes/bytearray/memoryview dump"""
+
+    def __init__(self, data: BufferLike, debug: bool = False):
+        if not len(data):
+            raise ValueError("RAM dump is empty")
+        super().__init__(split_ram_dump(data), debug=debug)
+
+
+class MmapMemorySource(MemorySource):
+    """Memory source over a raw RAM dump file, mapped read-only"""
+
+    def __init__(self, path, debug: bool = False):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"RAM dump {self.path} is empty")
+        super().__init__(split_ram_dump(self._mmap), debug=debug)
+
+    def close(self) -> None:
+        super().close()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Views handed out by read_bytes are still alive; the map is
+            # released when they are garbage collected
+            pass
+        self._file.close()
+
+
+class SaveFileMemorySource(MemorySource):
+    """
+    Memory source over a FireRed/LeafGreen .sav file
+
+    The save holds two slots of 14 rotated 4KB sections; the newest slot whose
+    sections all carry a valid signature and checksum is loaded. Its save
+    blocks are laid out in a synthetic EWRAM at the game's usual addresses,
+    with the IWRAM save block pointers and the party copied to where the
+    running game keeps them, so the reader decodes it like live memory.
+    """
+
+    SECTION_SIZE = 0x1000
+    SECTIONS_PER_SLOT = 14
+    SLOT_SIZE = SECTION_SIZE * SECTIONS_PER_SLOT
+    SIGNATURE = 0x08012025
+    FOOTER = struct.Struct('<HHII')  # section id, checksum, signature, save index
+    FOOTER_OFFSET = 0xFF4
+
+    # Bytes of each section covered by its checksum (FRLG save block sizes)
+    SECTION_DATA_SIZES = {0: 0xF24, 4: 0xEE8, 13: 0x7D0}
+    DEFAULT_DATA_SIZE = 0xF80
+
+    # Where the game places each save block (section ids in brackets)
+    SAVE_BLOCK_2_ADDR = 0x02024588  # [0] player name, trainer id, money key
+    SAVE_BLOCK_1_ADDR = 0x0202552C  # [1-4] position, party, money, bag
+    POKEMON_STORAGE_ADDR = 0x02029314  # [5-13] PC boxes
+
+    # IWRAM pointers (the reader's save_block_8_ptr / save_block_1_ptr / save_block_2_ptr)
+    SAVE_BLOCK_1_PTR = 0x03005008
+    SAVE_BLOCK_2_PTR = 0x0300500C
+    POKEMON_STORAGE_PTR = 0x03005010
+
+    # Party as kept in the running game vs. its copy inside SaveBlock1
+    PARTY_COUNT_ADDR = 0x02024029
+    PARTY_DATA_ADDR = 0x02024284
+    PARTY_COUNT_OFFSET = 0x0034
+    PARTY_DATA_OFFSET = 0x0038
+    PARTY_DATA_SIZE = 6 * 100
+
+    def __init__(self, path_or_data, debug: bool = False, verify_checksums: bool = True):
+        """
+        Args:
+            path_or_data: .sav file path or its raw bytes
+            debug: Print debug messages to stderr
+            verify_checksums: Reject sections whose checksum does not match
+        """
+        if isinstance(path_or_data, (bytes, bytearray, memoryview)):
+            data = memoryview(path_or_data)
+        else:
+            data = memoryview(Path(path_or_data).read_bytes())
+        self.debug = debug
+        self.verify_checksums = verify_checksums
+
+        slot = self._select_slot(data)
+        if slot is None:
+            raise ValueError("No valid save slot found (erased or corrupted save)")
+        self.save_index, sections = slot
+
+        ewram = bytearray(EWRAM_SIZE)
+        iwram = bytearray(IWRAM_SIZE)
+        save_block_1 = self._join(sections, range(1, 5))
+        placements = [
+            (self.SAVE_BLOCK_2_ADDR, self.SAVE_BLOCK_2_PTR, self._join(sections, [0])),
+            (self.SAVE_BLOCK_1_ADDR, self.SAVE_BLOCK_1_PTR, save_block_1),
+            (self.POKEMON_STORAGE_ADDR, self.POKEMON_STORAGE_PTR, self._join(sections, range(5, 14))),
+        ]
+        for address, pointer, block in placements:
+            offset = address - EWRAM_START
+            ewram[offset:offset + len(block)] = block
+            U32.pack_into(iwram, pointer - IWRAM_START, address)
+
+        party_count = save_block_1[self.PARTY_COUNT_OFFSET]
+        ewram[self.PARTY_COUNT_ADDR - EWRAM_START] = party_count
+        party_offset = self.PARTY_DATA_ADDR - EWRAM_START
+        ewram[party_offset:party_offset + self.PARTY_DATA_SIZE] = \
+            save_block_1[self.PARTY_DATA_OFFSET:self.PARTY_DATA_OFFSET + self.PARTY_DATA_SIZE]
+
+        super().__init__({EWRAM_START: ewram, IWRAM_START: iwram}, debug=debug)
+
+    @classmethod
+    def section_checksum(cls, data: memoryview, size: int) -> int:
+        """Sum of the little-endian words, folded to 16 bits"""
+        total = sum(struct.unpack_from(f'<{size // 4}I', data))
+        return ((total >> 16) + total) & 0xFFFF
+
+    def _read_slot(self, data: memoryview, slot: int) -> Optional[Tuple[int, Dict[int, memoryview]]]:
+        """Return (save index, section id -> section data) or None if the slot is invalid"""
+        sections: Dict[int, memoryview] = {}
+        save_index = None
+        base = slot * self.SLOT_SIZE
+        for i in range(self.SECTIONS_PER_SLOT):
+            section = data[base + i * self.SECTION_SIZE:base + (i + 1) * self.SECTION_SIZE]
+            if len(section) < self.SECTION_SIZE:
+                return None
+            section_id, checksum, signature, index = self.FOOTER.unpack_from(section, self.FOOTER_OFFSET)
+            if signature != self.SIGNATURE or section_id >= self.SECTIONS_PER_SLOT:
+                return None
+            size = self.SECTION_DATA_SIZES.get(section_id, self.DEFAULT_DATA_SIZE)
+            if self.verify_checksums and self.section_checksum(section, size) != checksum:
+                self.log_debug(f"Slot {slot} section {section_id}: checksum mismatch")
+                return None
+            if save_index is not None and index != save_index:
+                return None
+            save_index = index
+            sections[section_id] = section[:size]
+        if len(sections) != self.SECTIONS_PER_SLOT:
+            return None
+        return save_index, sections
+
+    def _select_slot(self, data: memoryview):
+        slots = [slot for slot in (self._read_slot(data, 0), self._read_slot(data, 1)) if slot]
+        if not slots:
+            return None
+        return max(slots, key=lambda slot: slot[0])
+
+    @staticmethod
+    def _join(sections: Dict[int, memoryview], section_ids) -> bytes:
+        return b"".join(sections[section_id] for section_id in section_ids)
+
+
+def open_memory_source(source, debug: bool = False) -> MemorySource:
+    """
+    Open the right memory source for `source`
+
+    Args:
+        source: bytes/bytearray/memoryview dump, a .sav path, or a raw dump path
+        debug: Print debug messages to stderr
+
+    Returns:
+        MemorySource usable as PokemonFireRedReader's client
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return BufferMemorySource(source, debug=debug)
+    path = Path(source)
+    if path.suffix.lower() == '.sav':
+        return SaveFileMemorySource(path, debug=debug)
+    return MmapMemorySource(path, debug=debug)
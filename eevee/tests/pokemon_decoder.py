@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Vectorized Gen 3 Pokémon structure decoder
+
+Decrypts and reorders the 48-byte substructure block of many Pokémon at once
+(party slots or all 420 PC box slots) and exposes the interesting fields as
+typed NumPy arrays, replacing the per-slot XOR loop and dict reordering.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+BOX_POKEMON_SIZE = 80
+PARTY_POKEMON_SIZE = 100
+
+# Substructure order for each personality % 24 (G=Growth, A=Attacks, E=EVs, M=Misc)
+SUBSTRUCTURE_ORDERS = [
+    'GAEM', 'GAME', 'GEAM', 'GEMA', 'GMAE', 'GMEA',
+    'AGEM', 'AGME', 'AEGM', 'AEMG', 'AMGE', 'AMEG',
+    'EGAM', 'EGMA', 'EAGM', 'EAMG', 'EMGA', 'EMAG',
+    'MGAE', 'MGEA', 'MAGE', 'MAEG', 'MEGA', 'MEAG',
+]
+
+# For each order: the encrypted position holding G, A, E and M respectively
+SUBSTRUCTURE_POSITIONS = np.array(
+    [[order.index(kind) for kind in 'GAEM'] for order in SUBSTRUCTURE_ORDERS], dtype=np.intp
+)
+
+# Unencrypted header shared by box and party Pokémon (bytes 0-31)
+HEADER_DTYPE = np.dtype([
+    ('personality', '<u4'),
+    ('ot_id', '<u4'),
+    ('nickname', 'u1', (10,)),
+    ('language', 'u1'),
+    ('flags', 'u1'),
+    ('ot_name', 'u1', (7,)),
+    ('markings', 'u1'),
+    ('checksum', '<u2'),
+    ('unknown', '<u2'),
+])
+
+# Whole structures: header, 12 encrypted words, and for the party the battle stats
+BOX_DTYPE = np.dtype([('header', HEADER_DTYPE), ('encrypted', '<u4', (12,))])
+
+# Decrypted substructures in GAEM order (bytes 32-79)
+SUBSTRUCTURES_DTYPE = np.dtype([
+    ('species', '<u2'),
+    ('held_item', '<u2'),
+    ('experience', '<u4'),
+    ('pp_bonuses', 'u1'),
+    ('friendship', 'u1'),
+    ('growth_unknown', '<u2'),
+    ('moves', '<u2', (4,)),
+    ('pp', 'u1', (4,)),
+    ('evs', 'u1', (6,)),
+    ('contest', 'u1', (6,)),
+    ('pokerus', 'u1'),
+    ('met_location', 'u1'),
+    ('origins', '<u2'),
+    ('ivs', '<u4'),
+    ('ribbons', '<u4'),
+])
+
+# Party-only battle stats (bytes 80-99)
+PARTY_STATS_DTYPE = np.dtype([
+    ('status', '<u4'),
+    ('level', 'u1'),
+    ('mail', 'u1'),
+    ('current_hp', '<u2'),
+    ('max_hp', '<u2'),
+    ('attack', '<u2'),
+    ('defense', '<u2'),
+    ('speed', '<u2'),
+    ('sp_attack', '<u2'),
+    ('sp_defense', '<u2'),
+])
+
+PARTY_DTYPE = np.dtype([('header', HEADER_DTYPE), ('encrypted', '<u4', (12,)), ('stats', PARTY_STATS_DTYPE)])
+
+
+@dataclass
+class DecodedPokemon:
+    """Field arrays for N decoded Pokémon (party stats are None for box Pokémon)"""
+    personality: np.ndarray
+    ot_id: np.ndarray
+    nickname: np.ndarray     # (N, 10) raw text bytes
+    species: np.ndarray
+    held_item: np.ndarray
+    experience: np.ndarray
+    moves: np.ndarray        # (N, 4)
+    pp: np.ndarray           # (N, 4)
+    status: Optional[np.ndarray] = None
+    current_hp: Optional[np.ndarray] = None
+    max_hp: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.species)
+
+    @property
+    def occupied(self) -> np.ndarray:
+        """Mask of slots holding a Pokémon (empty box slots decode to species 0)"""
+        return self.species != 0
+
+
+def decode_pokemon(data, count: int, stride: int) -> DecodedPokemon:
+    """
+    Decode `count` consecutive Pokémon structures in one pass
+
+    Args:
+        data: Buffer holding the structures (bytes, bytearray, memoryview)
+        count: Number of structures
+        stride: Size of each structure (80 for box, 100 for party)
+
+    Returns:
+        DecodedPokemon with one array element per structure
+    """
+    if stride not in (BOX_POKEMON_SIZE, PARTY_POKEMON_SIZE):
+        raise ValueError(f"Unsupported Pokémon structure size: {stride}")
+    is_party = stride == PARTY_POKEMON_SIZE
+    record_dtype = PARTY_DTYPE if is_party else BOX_DTYPE
+    records = np.frombuffer(data, dtype=record_dtype, count=count)  # zero-copy view
+
+    header = records['header']
+    key = header['personality'] ^ header['ot_id']
+
+    # XOR all 12 words of every Pokémon with its key, then gather the four
+    # 12-byte substructures back into GAEM order
+    blocks = (records['encrypted'] ^ key[:, None]).reshape(count, 4, 3)
+    positions = SUBSTRUCTURE_POSITIONS[header['personality'] % 24]
+    ordered = blocks[np.arange(count)[:, None], positions]
+    fields = ordered.reshape(count, 12).view(SUBSTRUCTURES_DTYPE)[:, 0]
+
+    decoded = DecodedPokemon(
+        personality=header['personality'],
+        ot_id=header['ot_id'],
+        nickname=header['nickname'],
+        species=fields['species'],
+        held_item=fields['held_item'],
+        experience=fields['experience'],
+        moves=fields['moves'],
+        pp=fields['pp'],
+    )
+
+    if is_party:
+        stats = records['stats']
+        decoded.status = stats['status']
+        decoded.current_hp = stats['current_hp']
+        decoded.max_hp = stats['max_hp']
+
+    return decoded
+
+
+class LevelCalculator:
+    """Vectorized level-from-experience using per-species growth rates"""
+
+    def __init__(self, experience_tables: Dict[str, List[int]], species_growth_rates: Dict[int, str],
+                 default_rate: str = 'medium_fast'):
+        self.rates = list(experience_tables)
+        default_index = self.rates.index(default_rate)
+        max_species = max(species_growth_rates, default=0) + 1
+        self.species_rate = np.full(max(max_species, 1), default_index, dtype=np.intp)
+        for species, rate in species_growth_rates.items():
+            self.species_rate[species] = self.rates.index(rate)
+        self.default_index = default_index
+        # (rates, 99) thresholds for levels 1..99 (table index i is reached at level i)
+        self.thresholds = np.array([experience_tables[rate][1:100] for rate in self.rates], dtype=np.int64)
+
+    def levels(self, species: np.ndarray, experience: np.ndarray) -> np.ndarray:
+        """Levels for parallel species/experience arrays (tables are monotonic)"""
+        species = species.astype(np.intp)
+        in_table = species < len(self.species_rate)
+        rate_index = np.where(in_table, self.species_rate[np.where(in_table, species, 0)], self.default_index)
+        reached = experience.astype(np.int64)[:, None] >= self.thresholds[rate_index]
+        return np.clip(reached.sum(axis=1), 1, 100)
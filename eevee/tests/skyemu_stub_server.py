@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Local stub of SkyEmu's HTTP Control Server
+
+Implements /ping, /screen, /read_byte, /write_byte, /input, /step, /run,
+/status, /save and /load well enough for the Eevee clients, with optional
+per-request latency so concurrency wins can be measured offline.
+
+It can also stand in for a real game: /screen replays the frames recorded in
+a session directory (runs/session_*), moving to the next frame on every
+button press, and /read_byte serves RAM loaded from a memory dump.
+
+Usage:
+    python tests/skyemu_stub_server.py --port 8080 --latency-ms 15
+    python tests/skyemu_stub_server.py --frames runs/session_20250101_120000 --ram pokemon_flame_red-memdump.bin
+
+    # or in-process
+    server = StubSkyEmuServer(latency_ms=10).start()
+    ... http://127.0.0.1:{server.port} ...
+    server.stop()
+"""
+
+import argparse
+import base64
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from memory_sources import SaveFileMemorySource, split_ram_dump
+
+EWRAM_START, EWRAM_SIZE = 0x02000000, 0x40000
+IWRAM_START, IWRAM_SIZE = 0x03000000, 0x8000
+
+GBA_WIDTH, GBA_HEIGHT = 240, 160
+
+# FireRed save block pointers in IWRAM and where synthetic_ram() points them
+SAVE_BLOCK_8_PTR, SAVE_BLOCK_1_PTR = 0x03005008, 0x0300500C
+SYNTHETIC_SAVE_BLOCK_8, SYNTHETIC_SAVE_BLOCK_1 = 0x0202552C, 0x02024588
+
+
+def make_test_png(width: int = GBA_WIDTH, height: int = GBA_HEIGHT, shade: int = 0) -> bytes:
+    """Encode a simple gradient RGB PNG without any imaging dependency"""
+    rows = bytearray()
+    for y in range(height):
+        rows.append(0)  # filter type: none
+        for x in range(width):
+            rows += bytes(((x + shade) & 0xFF, (y + shade) & 0xFF, (x ^ y) & 0xFF))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(bytes(rows), 6)) + chunk(b"IEND", b""))
+
+
+def load_session_frames(path) -> List[bytes]:
+    """
+    Load recorded frames for replay
+
+    Args:
+        path: A PNG file, or a session directory. Raw screenshots stored in the
+              session's session_data.json are preferred; otherwise every PNG
+              under the directory (e.g. sshots/step_*_grid.png) in name order
+
+    Returns:
+        List of PNG-encoded frames (empty if nothing was found)
+    """
+    path = Path(path)
+    if path.is_file():
+        return [path.read_bytes()]
+    if not path.is_dir():
+        return []
+
+    session_file = path / "session_data.json"
+    if session_file.exists():
+        try:
+            with open(session_file) as f:
+                session = json.load(f)
+            frames = [base64.b64decode(turn["screenshot_base64"])
+                      for turn in session.get("enhanced_turns", []) if turn.get("screenshot_base64")]
+            if frames:
+                return frames
+        except (ValueError, KeyError) as e:
+            print(f"⚠️ Could not read frames from {session_file}: {e}")
+
+    return [png.read_bytes() for png in sorted(path.rglob("*.png"))]
+
+
+def load_ram_dump(path) -> Dict[int, bytes]:
+    """
+    Load RAM from a FireRed .sav or a raw memory dump (EWRAM 256KB
+    optionally followed by IWRAM 32KB)
+
+    Args:
+        path: Dump file, e.g. flame-red.sav or pokemon_flame_red-memdump.bin
+
+    Returns:
+        Region start address -> bytes (smaller dumps fill EWRAM from its start)
+    """
+    if Path(path).suffix.lower() == '.sav':
+        try:
+            source = SaveFileMemorySource(path)
+        except ValueError as e:
+            print(f"⚠️ Save file {path}: {e} - serving zeroed memory")
+            return {}
+        return {start: view for start, _, view in source.regions}
+
+    data = Path(path).read_bytes()
+    if not data:
+        print(f"⚠️ RAM dump {path} is empty - serving zeroed memory")
+        return {}
+    if len(data) not in (EWRAM_SIZE, EWRAM_SIZE + IWRAM_SIZE):
+        print(f"⚠️ RAM dump {path} is {len(data)} bytes, expected {EWRAM_SIZE} or {EWRAM_SIZE + IWRAM_SIZE}")
+    return split_ram_dump(data)
+
+
+def synthetic_ram(x: int = 10, y: int = 8, map_id: int = 2, bank: int = 3) -> Dict[int, bytes]:
+    """
+    Minimal FireRed RAM for runs without a dump: save block pointers, the
+    player's position and map (default Pewter City) and a player name; the
+    party, bag and battle state are empty
+
+    Returns:
+        Region start address -> bytes, for StubEmulatorState.load_ram
+    """
+    ewram, iwram = bytearray(EWRAM_SIZE), bytearray(IWRAM_SIZE)
+    struct.pack_into('<II', iwram, SAVE_BLOCK_8_PTR - IWRAM_START, SYNTHETIC_SAVE_BLOCK_8, SYNTHETIC_SAVE_BLOCK_1)
+    struct.pack_into('<HHBB', ewram, SYNTHETIC_SAVE_BLOCK_8 - EWRAM_START, x, y, map_id, bank)
+    ewram[SYNTHETIC_SAVE_BLOCK_1 - EWRAM_START:SYNTHETIC_SAVE_BLOCK_1 - EWRAM_START + 4] = bytes([0xCC, 0xBF, 0xBE, 0xFF])  # "RED"
+    return {EWRAM_START: bytes(ewram), IWRAM_START: bytes(iwram)}
+
+
+class StubEmulatorState:
+    """Memory, inputs, frame counter and save slots behind the stub server"""
+
+    def __init__(self, frames: Optional[List[bytes]] = None):
+        self.regions: Dict[int, bytearray] = {
+            EWRAM_START: bytearray(EWRAM_SIZE),
+            IWRAM_START: bytearray(IWRAM_SIZE),
+        }
+        self.frames = frames or [make_test_png()]
+        self.frame_index = 0  # advanced by button presses when replaying
+        self.frame_count = 0
+        self.inputs: Dict[str, int] = {}
+        self.paused = False
+        self.saved_states: Dict[str, Tuple[Dict[int, bytes], int]] = {}
+        self.request_counts: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def _locate(self, address: int) -> Tuple[Optional[bytearray], int]:
+        for start, data in self.regions.items():
+            if start <= address < start + len(data):
+                return data, address - start
+        return None, 0
+
+    def read(self, address: int, length: int) -> bytes:
+        data, offset = self._locate(address)
+        if data is None:
+            return bytes(length)
+        chunk = bytes(data[offset:offset + length])
+        return chunk + bytes(length - len(chunk))
+
+    def write(self, address: int, payload: bytes) -> None:
+        for i, value in enumerate(payload):
+            data, offset = self._locate(address + i)
+            if data is not None:
+                data[offset] = value
+
+    def load_ram(self, regions: Dict[int, bytes]) -> None:
+        for start, data in regions.items():
+            self.regions[start][:len(data)] = data
+
+    def press(self, button: str, value: int) -> None:
+        """Apply an input; each new press moves replay on to the next frame"""
+        if value and not self.inputs.get(button):
+            self.frame_index += 1
+        self.inputs[button] = value
+
+    def current_frame(self) -> bytes:
+        return self.frames[self.frame_index % len(self.frames)]
+
+    def step(self, frames: int) -> None:
+        self.frame_count += max(0, frames)
+
+    def save(self, path: str) -> None:
+        self.saved_states[path] = ({start: bytes(data) for start, data in self.regions.items()}, self.frame_count)
+        if os.path.isabs(path) and os.path.isdir(os.path.dirname(path)):
+            # Absolute paths are written out like SkyEmu does, so callers can read the state back
+            with open(path, 'wb') as f:
+                f.write(struct.pack('<I', self.frame_count))
+                for start in sorted(self.regions):
+                    f.write(self.regions[start])
+
+    def load(self, path: str) -> bool:
+        if os.path.isabs(path) and os.path.isfile(path):
+            with open(path, 'rb') as f:
+                data = f.read()
+            frame_count, offset = struct.unpack_from('<I', data)[0], 4
+            regions = {}
+            for start in sorted(self.regions):
+                regions[start] = data[offset:offset + len(self.regions[start])]
+                offset += len(self.regions[start])
+            if offset != len(data):
+                return False
+        elif path in self.saved_states:
+            regions, frame_count = self.saved_states[path]
+        else:
+            return False
+        for start, data in regions.items():
+            self.regions[start][:] = data
+        self.frame_count = frame_count
+        return True
+
+
+def _parse_addr(param: str) -> Tuple[int, int]:
+    """'ADDR' or inclusive 'START-END' (hex) -> (address, length)"""
+    start_hex, _, end_hex = param.partition('-')
+    start = int(start_hex, 16)
+    end = int(end_hex, 16) if end_hex else start
+    return start, end - start + 1
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like SkyEmu
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out as separate writes; don't let Nagle delay the body
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, body, content_type: str = "text/plain", status: int = 200) -> None:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server: "StubSkyEmuServer" = self.server.stub
+        if server.latency:
+            time.sleep(server.latency)
+
+        parsed = urlparse(self.path)
+        endpoint = parsed.path.strip("/")
+        params = parse_qs(parsed.query, keep_blank_values=True)
+        state = server.state
+
+        with state.lock:
+            state.request_counts[endpoint] = state.request_counts.get(endpoint, 0) + 1
+            handler = getattr(self, f"_handle_{endpoint}", None)
+            if handler is None:
+                self._reply(f"unknown endpoint: {endpoint}", status=404)
+                return
+            handler(state, params)
+
+    def _handle_ping(self, state, params):
+        self._reply("pong")
+
+    def _handle_screen(self, state, params):
+        self._reply(state.current_frame(), content_type="image/png")
+
+    def _handle_read_byte(self, state, params):
+        out = []
+        for param in params.get("addr", []):
+            address, length = _parse_addr(param)
+            out.append(state.read(address, length).hex())
+        self._reply("".join(out))
+
+    def _handle_write_byte(self, state, params):
+        for key, values in params.items():
+            if key == "map":
+                continue
+            state.write(int(key, 16), bytes([int(values[-1], 16)]))
+        self._reply("ok")
+
+    def _handle_input(self, state, params):
+        for key, values in params.items():
+            state.press(key, int(values[-1]))
+        self._reply("ok")
+
+    def _handle_step(self, state, params):
+        state.paused = True
+        state.step(int(params.get("frames", ["1"])[-1]))
+        self._reply("ok")
+
+    def _handle_run(self, state, params):
+        state.paused = False
+        self._reply("ok")
+
+    def _handle_status(self, state, params):
+        self._reply(json.dumps({
+            "emulator": "stub",
+            "mode": "PAUSE" if state.paused else "RUN",
+            "rom_loaded": True,
+            "frame": state.frame_count,
+            "replay_frame": state.frame_index % len(state.frames),
+            "inputs": state.inputs,
+        }), content_type="application/json")
+
+    def _handle_save(self, state, params):
+        state.save(params.get("path", [""])[-1])
+        self._reply("ok")
+
+    def _handle_load(self, state, params):
+        self._reply("ok" if state.load(params.get("path", [""])[-1]) else "failed")
+
+
+class StubSkyEmuServer:
+    """Threaded stub SkyEmu server for offline tests and benchmarks"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0,
+                 state: Optional[StubEmulatorState] = None):
+        self.latency = latency_ms / 1000.0
+        self.state = state or StubEmulatorState()
+        self._httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        return self._httpd.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "StubSkyEmuServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="StubSkyEmu", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def build_state(frames_path=None, ram_path=None) -> StubEmulatorState:
+    """Emulator state replaying `frames_path` and serving RAM from `ram_path`"""
+    frames = None
+    if frames_path:
+        frames = load_session_frames(frames_path)
+        if not frames:
+            print(f"⚠️ No frames found in {frames_path} - serving a test pattern")
+    state = StubEmulatorState(frames)
+    if ram_path:
+        state.load_ram(load_ram_dump(ram_path))
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub SkyEmu HTTP server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Simulated per-request latency')
+    parser.add_argument('--frames', help='Session directory (runs/session_*) or PNG to replay on /screen')
+    parser.add_argument('--ram', help='Memory dump or .sav to serve on /read_byte')
+    args = parser.parse_args()
+
+    server = StubSkyEmuServer(args.host, args.port, args.latency_ms, state=build_state(args.frames, args.ram))
+    print(f"Stub SkyEmu listening on {server.url} (latency {args.latency_ms}ms, "
+          f"{len(server.state.frames)} frame(s))")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test the async SkyEmu client against the local stub server and measure the
+latency win of fetching the frame and the RAM snapshot concurrently
+
+Usage:
+    python tests/test_async_skyemu_client.py
+    python tests/test_async_skyemu_client.py --latency-ms 20 --iterations 10
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+project_root = tests_dir.parent.parent
+sys.path.insert(0, str(tests_dir))
+sys.path.append(str(project_root / "gemini-multimodal-playground" / "standalone"))
+
+from skyemu_stub_server import StubSkyEmuServer
+from skyemu_async_client import AsyncSkyEmuClient
+from skyemu_transport import SkyEmuTransport
+from analyse_skyemu_ram import SkyEmuClient, PokemonFireRedReader
+
+
+def check_mirrored_methods(server: StubSkyEmuServer):
+    """Every mirrored SkyEmuClient method round-trips against the stub"""
+    client = AsyncSkyEmuClient(host=server.host, port=server.port, transport=SkyEmuTransport())
+
+    async def run():
+        assert await client.ping()
+        screen = await client.get_screen_bytes()
+        assert screen.startswith(b"\x89PNG"), "screen is not a PNG"
+
+        server.state.write(0x02000100, bytes([0x12, 0x34, 0x56]))
+        assert await client.read_bytes([0x02000100, 0x02000102]) == [0x12, 0x56]
+        assert await client.read_regions([(0x02000100, 3), (0x02000102, 1)]) == [b"\x12\x34\x56", b"\x56"]
+
+        assert await client.set_input({"A": 1})
+        assert server.state.inputs["A"] == 1
+        assert await client.step(5)
+        assert (await client.get_status())["frame"] == 5
+
+        assert await client.save_state("slot1")
+        server.state.write(0x02000100, b"\xff")
+        assert await client.step(3)
+        assert await client.load_state("slot1")
+        assert await client.read_bytes([0x02000100]) == [0x12]
+        assert server.state.frame_count == 5
+
+    asyncio.run(run())
+    print("✅ Async client mirrors ping/get_screen/read_bytes/set_input/step/save_state/load_state")
+
+
+def test_mirrored_methods():
+    with StubSkyEmuServer() as server:
+        check_mirrored_methods(server)
+
+
+def measure_capture(server: StubSkyEmuServer, iterations: int):
+    """Sequential vs concurrent frame + RAM capture"""
+    transport = SkyEmuTransport()
+    async_client = AsyncSkyEmuClient(host=server.host, port=server.port, transport=transport)
+    reader = PokemonFireRedReader(SkyEmuClient(base_url=server.url, transport=transport))
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        asyncio.run(async_client.get_screen_bytes())
+        reader.capture_snapshot()
+    sequential = (time.perf_counter() - start) * 1000 / iterations
+
+    async def concurrent_capture():
+        await asyncio.gather(async_client.get_screen_bytes(), asyncio.to_thread(reader.capture_snapshot))
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        asyncio.run(concurrent_capture())
+    concurrent = (time.perf_counter() - start) * 1000 / iterations
+
+    print(f"Sequential capture: {sequential:.1f} ms/turn")
+    print(f"Concurrent capture: {concurrent:.1f} ms/turn ({sequential / max(concurrent, 0.001):.2f}x)")
+    return sequential, concurrent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Async SkyEmu client test and capture benchmark")
+    parser.add_argument('--latency-ms', type=float, default=10.0, help='Stub per-request latency (default: 10)')
+    parser.add_argument('--iterations', type=int, default=5, help='Captures per mode (default: 5)')
+    args = parser.parse_args()
+
+    with StubSkyEmuServer(latency_ms=args.latency_ms) as server:
+        check_mirrored_methods(server)
+        sequential, concurrent = measure_capture(server, args.iterations)
+
+    # Screen and RAM overlap, so the concurrent stage should beat sequential
+    if args.latency_ms > 0 and concurrent >= sequential:
+        print("❌ Concurrent capture was not faster than sequential")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test the background episode reviewer used by ContinuousGameplay
+
+Reviews run on a deep copy of the recent turns, their results are applied
+only when the loop polls at a turn boundary, overlapping reviews are
+skipped, slow ones are abandoned after the timeout, and the loop's blocked
+time stays near zero however long the review's LLM calls take. The active
+goal is snapshotted on the loop thread, not read by the worker. Run
+tests/benchmark_turn_loop.py --episode-review-frequency 5 [--sequential]
+for the whole loop.
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+tests_dir = Path(__file__).parent
+sys.path.insert(0, str(tests_dir.parent))
+
+from turn_pipeline import BackgroundReviewer
+
+
+def make_turns(count: int):
+    return [{"turn": turn, "button_presses": ["up"], "ai_analysis": {"reasoning": "walk north"}}
+            for turn in range(1, count + 1)]
+
+
+def wait_until_done(reviewer: BackgroundReviewer, limit: float = 2.0):
+    deadline = time.time() + limit
+    while reviewer._future is not None and not reviewer._future.done() and time.time() < deadline:
+        time.sleep(0.005)
+
+
+def test_snapshot_and_boundary_apply():
+    applied = []
+    release = threading.Event()
+
+    def compute(turn, recent_turns, goal):
+        release.wait(2.0)  # the loop keeps playing (and mutating its turns) meanwhile
+        return {"turn": turn, "goal": goal, "buttons": [t["button_presses"] for t in recent_turns]}
+
+    reviewer = BackgroundReviewer(compute, applied.append)
+    session_turns = make_turns(5)
+    assert reviewer.submit(5, session_turns, "find pokemon center")
+
+    # Later turns change the live list and dicts; the review sees its snapshot
+    session_turns[0]["button_presses"].append("a")
+    session_turns.append({"turn": 6, "button_presses": ["b"]})
+    assert not reviewer.poll() and applied == []  # still running: nothing applied mid-review
+
+    release.set()
+    wait_until_done(reviewer)
+    assert applied == []  # finished, but only applied at the next turn boundary
+    assert reviewer.poll()
+    assert applied == [{"turn": 5, "goal": "find pokemon center", "buttons": [["up"]] * 5}]
+    assert not reviewer.poll() and len(applied) == 1
+    print("✅ Reviews run on a snapshot and are applied once, at the next turn boundary")
+
+
+def test_skip_timeout_and_cancel():
+    applied = []
+    release = threading.Event()
+    reviewer = BackgroundReviewer(lambda turn, goal: release.wait(2.0) and turn, applied.append, timeout=0.05)
+
+    assert reviewer.submit(10, "goal")
+    assert not reviewer.submit(20, "goal")  # previous review still running
+    time.sleep(0.08)
+    assert not reviewer.poll() and not reviewer.running  # abandoned after the timeout
+    release.set()
+
+    # A fresh review is not queued behind the abandoned worker
+    reviewer.timeout = 2.0
+    assert reviewer.submit(30, "goal")
+    wait_until_done(reviewer)
+    assert reviewer.poll() and applied == [30]
+
+    release.clear()
+    reviewer.submit(40, "goal")
+    reviewer.cancel()  # rollback / session end
+    release.set()
+    time.sleep(0.02)
+    assert not reviewer.poll() and applied == [30]
+
+    failing = BackgroundReviewer(lambda turn: 1 / 0, applied.append)
+    failing.submit(50)
+    wait_until_done(failing)
+    assert not failing.poll() and failing.get_stats()["failed"] == 1
+
+    stats = reviewer.get_stats()
+    assert (stats["started"], stats["applied"], stats["skipped"], stats["timed_out"], stats["cancelled"]) == \
+        (3, 1, 1, 1, 1)
+    print(f"✅ Overlapping reviews are skipped, slow ones time out, cancelled ones are never applied ({stats})")
+
+
+def test_blocked_time():
+    def compute(turn, recent_turns):
+        time.sleep(0.2)  # LLM calls
+        return turn
+
+    background = BackgroundReviewer(compute, lambda result: None)
+    inline = BackgroundReviewer(compute, lambda result: None, background=False)
+    turns = make_turns(100)
+
+    for reviewer in (background, inline):
+        reviewer.submit(100, turns)
+        wait_until_done(reviewer)
+        reviewer.poll()
+
+    background_ms, inline_ms = background.get_stats()["blocked_ms"], inline.get_stats()["blocked_ms"]
+    assert background.applied == inline.applied == 1
+    assert inline_ms >= 200 and background_ms < 50
+    print(f"ℹ️  Loop blocked by a 200 ms review: {background_ms:.1f} ms in background vs {inline_ms:.1f} ms inline")
+
+
+def test_goal_snapshot():
+    os.environ.setdefault('LLM_PROVIDER', 'stub')
+    os.environ.setdefault('HYBRID_MODE', 'false')
+    from run_eevee import ContinuousGameplay
+
+    class Hierarchy:
+        goal = SimpleNamespace(name="enter_gym", description="Walk into Pewter City Gym")
+        worker_reads = 0
+
+        def get_current_goal(self):
+            if threading.current_thread() is not threading.main_thread():
+                Hierarchy.worker_reads += 1
+            return self.goal
+
+    gameplay = ContinuousGameplay.__new__(ContinuousGameplay)
+    gameplay.eevee = SimpleNamespace(task_executor=SimpleNamespace(current_goal_hierarchy=Hierarchy()))
+    snapshot = gameplay._current_goal_snapshot()
+    assert snapshot == {"name": "enter_gym", "description": "Walk into Pewter City Gym"}
+    assert ContinuousGameplay._current_goal_snapshot(SimpleNamespace(eevee=SimpleNamespace()))["name"] == "Unknown"
+
+    # The review worker analyses the snapshot, never the live hierarchy
+    worker = threading.Thread(target=gameplay._analyze_goal_progress_with_ai,
+                              args=(make_turns(3), "beat brock", snapshot))
+    worker.start()
+    worker.join()
+    assert Hierarchy.worker_reads == 0
+    print("✅ Active goal snapshotted on the loop thread for the review worker")
+
+
+if __name__ == "__main__":
+    test_snapshot_and_boundary_apply()
+    test_skip_timeout_and_cancel()
+    test_blocked_time()
+    test_goal_snapshot()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test the array-native element detector against the contour version it replaced
+
+The reference below is the cv2 contour/per-point loop that
+Neo4jMemory.detect_player_and_elements used to run. Player positions must
+match it exactly; carpets and stairs are now occupancy maps, so they are
+checked on synthetic frames with known layouts. Run directly to also print
+the per-frame cost of both versions and of batched detection.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+project_root = tests_dir.parent.parent
+sys.path.insert(0, str(tests_dir.parent))
+sys.path.append(str(project_root / "gemini-multimodal-playground" / "standalone"))
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from element_detector import ElementDetector, PLAYER, CARPET, STAIRS
+
+SCREENSHOTS = ["step_overworld_alone.png", "step_overworld_withNPC.png", "step_talking_NPC.png",
+               "step_battle_fight_moves.png", "pokecenter_1.png", "pokecenter_2.png"]
+
+
+def load(name: str) -> np.ndarray:
+    return np.asarray(Image.open(tests_dir / name).convert("RGB"))
+
+
+def reference_detect(img_rgb: np.ndarray) -> dict:
+    """The previous contour-based detection (prints removed)"""
+    height, width = img_rgb.shape[:2]
+    game_area = np.ascontiguousarray(img_rgb[int(height * 0.1):int(height * 0.9), int(width * 0.1):int(width * 0.9)])
+    g_height, g_width = game_area.shape[:2]
+    grid_width, grid_height = 16, 12
+    cell_width, cell_height = g_width // grid_width, g_height // grid_height
+    map_grid = np.zeros((grid_height, grid_width), dtype=int)
+
+    red_pixels = np.where(cv2.inRange(game_area, np.array([150, 0, 0]), np.array([255, 100, 100])) > 0)
+    player_position = None
+    if len(red_pixels[0]) > 0:
+        player_y, player_x = int(np.median(red_pixels[0])), int(np.median(red_pixels[1]))
+        player_position = (min(player_x // cell_width, grid_width - 1), min(player_y // cell_height, grid_height - 1))
+        map_grid[player_position[1], player_position[0]] = 1
+
+    green_mask = cv2.inRange(game_area, np.array([0, 150, 0]), np.array([100, 255, 100]))
+    for contour in cv2.findContours(green_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[0]:
+        if cv2.contourArea(contour) > 50:
+            for point in contour:
+                x, y = point[0]
+                map_grid[min(y // cell_height, grid_height - 1), min(x // cell_width, grid_width - 1)] = 2
+
+    stair_mask = cv2.inRange(game_area, np.array([150, 150, 0]), np.array([255, 255, 150]))
+    stair_position = None
+    for contour in cv2.findContours(stair_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)[0]:
+        if cv2.contourArea(contour) > 30:
+            moments = cv2.moments(contour)
+            if moments["m00"] > 0:
+                cx, cy = int(moments["m10"] / moments["m00"]), int(moments["m01"] / moments["m00"])
+                stair_position = (min(cx // cell_width, grid_width - 1), min(cy // cell_height, grid_height - 1))
+                map_grid[stair_position[1], stair_position[0]] = 3
+    return {"map_grid": map_grid, "player_position": player_position, "stair_position": stair_position}
+
+
+def synthetic_room() -> np.ndarray:
+    """300x200 frame: crop is 240x160, cells are 15x13 with remainder folded into the last row"""
+    frame = np.full((200, 300, 3), 60, dtype=np.uint8)
+    frame[20 + 13 * 2:20 + 13 * 5, 30 + 15 * 1:30 + 15 * 4] = (40, 200, 40)    # carpet: cells x1-3, y2-4
+    frame[20 + 13 * 9:20 + 13 * 10, 30 + 15 * 12:30 + 15 * 14] = (200, 180, 90)  # stairs: cells x12-13, y9
+    frame[20 + 13 * 3 + 2:20 + 13 * 3 + 9, 30 + 15 * 2 + 4:30 + 15 * 2 + 11] = (220, 30, 30)  # player on carpet
+    frame[20 + 13 * 7, 30 + 15 * 7] = (40, 200, 40)                              # single green speck
+    return frame
+
+
+def test_matches_reference_player():
+    detector = ElementDetector()
+    frames = [load(name) for name in SCREENSHOTS]
+
+    # Synthetic red blobs exercise even pixel counts (median between two pixels) and the grid edges
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        frame = np.full((160, 240, 3), 80, dtype=np.uint8)
+        for _ in range(rng.integers(1, 4)):
+            y, x = rng.integers(0, 150), rng.integers(0, 230)
+            frame[y:y + rng.integers(1, 10), x:x + rng.integers(1, 10)] = (230, 40, 40)
+        frames.append(frame)
+
+    for frame in frames:
+        expected = reference_detect(frame)["player_position"]
+        assert detector.detect(frame).player_position == expected, expected
+    print(f"✅ Player cell matches the contour version on {len(frames)} frames")
+
+
+def test_occupancy_maps():
+    result = ElementDetector().detect(synthetic_room())
+    assert result.player_position == (2, 3) and result.map_grid[3, 2] == PLAYER
+    assert result.stair_position in [(12, 9), (13, 9)]
+    assert set(zip(*np.nonzero(result.map_grid == STAIRS))) == {(9, 12), (9, 13)}
+
+    # Whole carpet area is marked, not only the contour corners; specks are ignored
+    carpet = {(y, x) for y in range(2, 5) for x in range(1, 4)} - {(3, 2)}
+    assert set(zip(*np.nonzero(result.map_grid == CARPET))) == carpet
+    assert result.carpet_map[7, 7] == 1 and result.map_grid[7, 7] == 0
+    assert result.carpet_map[2, 1] == 15 * 13 and result.stair_map.sum() == 2 * 15 * 13
+    print("✅ Carpet and stair occupancy maps come from one binning pass")
+
+
+def test_batch_and_files():
+    detector = ElementDetector()
+    frames = [load(name) for name in SCREENSHOTS] + [synthetic_room(), np.zeros((160, 240, 3), dtype=np.uint8)]
+    batched = detector.detect_batch(frames)
+    for frame, result in zip(frames, batched):
+        single = ElementDetector().detect(frame)
+        assert single.player_position == result.player_position
+        assert single.stair_position == result.stair_position
+        assert (single.map_grid == result.map_grid).all() and (single.carpet_map == result.carpet_map).all()
+    assert batched[-1].player_position is None and not batched[-1].map_grid.any()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        paths = []
+        for index, frame in enumerate(frames[:4]):
+            paths.append(str(Path(scratch) / f"frame_{index}.png"))
+            Image.fromarray(frame).save(paths[-1])
+        paths.append(str(Path(scratch) / "missing.png"))
+        results = list(detector.detect_files(paths, batch_size=3))
+    assert [path for path, _ in results] == paths and results[-1][1] is None
+    assert [result.player_position for _, result in results[:4]] == [result.player_position for result in batched[:4]]
+    print(f"✅ Batched detection equals per-frame detection ({detector.get_stats()})")
+
+
+def measure_detection(iterations: int = 50):
+    frames = [load(name) for name in SCREENSHOTS]
+    detector = ElementDetector()
+    detector.detect(frames[0])  # build the cell index once
+
+    timings = {}
+    paths = [str(tests_dir / name) for name in SCREENSHOTS]
+    read = lambda path: cv2.cvtColor(cv2.imread(path), cv2.COLOR_BGR2RGB)
+    for label, run in (("contour loop from file", lambda: [reference_detect(read(path)) for path in paths]),
+                       ("contour loop", lambda: [reference_detect(frame) for frame in frames]),
+                       ("array-native", lambda: [detector.detect(frame) for frame in frames]),
+                       ("batched", lambda: detector.detect_batch(frames))):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        timings[label] = (time.perf_counter() - start) * 1000 / (iterations * len(frames))
+    print("ℹ️  element detection per frame: " + ", ".join(f"{label} {ms:.3f} ms" for label, ms in timings.items()))
+
+
+if __name__ == "__main__":
+    test_matches_reference_player()
+    test_occupancy_maps()
+    test_batch_and_files()
+    measure_detection()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test the fleet runner against several stub SkyEmu servers
+
+Checks that the shared LLM rate limiter spaces calls across processes, that
+run_fleet gives every worker its own directory and endpoint, and that
+throughput scales with emulator count while the LLM quota is not binding
+(and stops scaling once it is).
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+sys.path.insert(0, str(tests_dir))
+sys.path.append(str(tests_dir.parent))
+
+from skyemu_stub_server import StubSkyEmuServer
+from fleet_runner import (FleetEndpoint, SharedRateLimiter, parse_endpoints, run_fleet, _init_worker,
+                          get_worker_rate_limiter, report_progress, worker_directory)
+
+LLM_LATENCY = 0.05  # simulated model call per turn
+
+
+def acquire_times(calls: int):
+    limiter = get_worker_rate_limiter()
+    times = []
+    for _ in range(calls):
+        limiter.acquire()
+        times.append(time.time())
+    return times
+
+
+def light_worker(worker_id, endpoint, fleet_dir, options):
+    """Stands in for run_worker: one simulated LLM call and one button press per turn"""
+    from skyemu_controller import SkyEmuController
+
+    worker_dir = worker_directory(Path(fleet_dir), worker_id, endpoint)
+    worker_dir.mkdir(parents=True, exist_ok=True)
+    controller = SkyEmuController(host=endpoint.host, port=endpoint.port)
+    limiter = get_worker_rate_limiter()
+    for turn in range(1, options["max_turns"] + 1):
+        if limiter:
+            limiter.acquire()
+        time.sleep(LLM_LATENCY)
+        pressed = controller.press_button("a", duration=0.0)
+        report_progress(worker_id, turn, max_turns=options["max_turns"], buttons=["a"], success=pressed)
+    (worker_dir / "done.txt").write_text(str(endpoint))
+    return {"worker_id": worker_id, "endpoint": str(endpoint), "status": "completed",
+            "turns_completed": options["max_turns"], "pid": os.getpid()}
+
+
+def test_parse_endpoints():
+    assert parse_endpoints("localhost:8080, 10.0.0.2:9000,8082") == [
+        FleetEndpoint("localhost", 8080), FleetEndpoint("10.0.0.2", 9000), FleetEndpoint("localhost", 8082)]
+    print("✅ Endpoint lists parse host:port and bare ports")
+
+
+def test_shared_rate_limiter():
+    """Calls from three processes are spaced by the shared interval"""
+    ctx = multiprocessing.get_context("spawn")
+    limiter = SharedRateLimiter(rate_per_minute=1200, burst=1, ctx=ctx)  # one call per 50 ms
+    with ProcessPoolExecutor(max_workers=3, mp_context=ctx, initializer=_init_worker,
+                             initargs=(limiter, None)) as pool:
+        times = sorted(t for result in pool.map(acquire_times, [5, 5, 5]) for t in result)
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    assert len(times) == 15 and min(gaps) > 0.045, gaps
+    stats = limiter.stats()
+    assert stats["calls"] == 15 and stats["waited_seconds"] > 0
+    print(f"✅ Shared limiter spaced 15 calls from 3 processes (min gap {min(gaps) * 1000:.0f} ms, "
+          f"avg wait {stats['avg_wait_ms']} ms)")
+
+
+def run_stub_fleet(count: int, fleet_dir: Path, max_turns: int = 12, rate_limiter=None):
+    servers = [StubSkyEmuServer().start() for _ in range(count)]
+    try:
+        endpoints = [FleetEndpoint(server.host, server.port) for server in servers]
+        summary = run_fleet(endpoints, {"max_turns": max_turns}, fleet_dir, worker=light_worker,
+                            rate_limiter=rate_limiter, dashboard_interval=60.0)
+        presses = [server.state.request_counts.get("input", 0) for server in servers]
+    finally:
+        for server in servers:
+            server.stop()
+    return summary, presses
+
+
+def test_fleet_scaling():
+    """Per-worker directories and endpoints; throughput ~linear until the quota binds"""
+    with tempfile.TemporaryDirectory() as scratch:
+        single, _ = run_stub_fleet(1, Path(scratch) / "one")
+        summary, presses = run_stub_fleet(3, Path(scratch) / "three")
+
+        assert [result["status"] for result in summary["workers"]] == ["completed"] * 3
+        assert len({result["pid"] for result in summary["workers"]}) == 3
+        assert all(count > 0 for count in presses), presses  # every emulator was driven
+        for result in summary["workers"]:
+            endpoint = parse_endpoints(result["endpoint"])[0]
+            assert (worker_directory(Path(summary["fleet_dir"]), result["worker_id"], endpoint) / "done.txt").exists()
+        dashboard = summary["dashboard"]
+        assert dashboard["total_turns"] == 36 and dashboard["active_workers"] == 0
+        assert (Path(summary["fleet_dir"]) / "fleet_progress.json").exists()
+        assert (Path(summary["fleet_dir"]) / "fleet_summary.json").exists()
+
+        one_rate, three_rate = single["dashboard"]["turns_per_minute"], dashboard["turns_per_minute"]
+        assert three_rate > 2.4 * one_rate, (one_rate, three_rate)
+
+        # A quota below what three workers could use caps the fleet at the quota
+        quota = 600  # turns/minute; 3 unthrottled workers would do ~3x this
+        limited, _ = run_stub_fleet(3, Path(scratch) / "limited",
+                                    rate_limiter=SharedRateLimiter(quota, burst=1))
+        limited_rate = limited["dashboard"]["turns_per_minute"]
+        assert limited_rate < quota * 1.25, limited_rate
+        print(f"✅ Fleet throughput: 1 worker {one_rate:.0f} turns/min, 3 workers {three_rate:.0f} turns/min "
+              f"({three_rate / one_rate:.2f}x); with a {quota}/min LLM quota {limited_rate:.0f} turns/min")
+
+
+if __name__ == "__main__":
+    test_parse_endpoints()
+    test_shared_rate_limiter()
+    test_fleet_scaling()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test the frame diff engine on the recorded screenshots
+
+Steps are simulated by scrolling a screenshot the way the GBA camera does
+when the player walks (16 px per step). Checks moved/blocked/unchanged,
+dialogue boxes, battle and fade transitions, and that screenshots on disk
+are read once even when the same file is overwritten between captures.
+Run directly to also print the per-comparison cost.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+project_root = tests_dir.parent.parent
+sys.path.insert(0, str(tests_dir.parent))
+sys.path.append(str(project_root / "gemini-multimodal-playground" / "standalone"))
+
+import numpy as np
+from PIL import Image
+
+from frame_diff import FrameDiffEngine
+from game_frame import GameFrame
+
+
+def load(name: str) -> np.ndarray:
+    return np.asarray(Image.open(tests_dir / name).convert("RGB"))
+
+
+def scrolled(pixels: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    """Frame after the camera moved (dx, dy) pixels; new map content is mirrored in at the edge"""
+    padded = np.pad(pixels, ((32, 32), (32, 32), (0, 0)), mode="reflect")
+    return padded[32 + dy:32 + dy + 160, 32 + dx:32 + dx + 240]
+
+
+def test_movement():
+    engine = FrameDiffEngine()
+    for name in ("step_overworld_alone.png", "step_overworld_withNPC.png", "pokecenter_1.png"):
+        frame = load(name)
+        for direction, (dx, dy) in {"up": (0, -16), "down": (0, 16), "left": (-16, 0), "right": (16, 0)}.items():
+            diff = engine.compare(frame, scrolled(frame, dx, dy), direction)
+            assert (diff.kind, diff.direction, diff.shift) == ("moved", direction, (dx, dy)), (name, diff)
+
+        # Half a step (captured mid-walk) still counts as moving
+        assert engine.compare(frame, scrolled(frame, 8, 0), "right").direction == "right"
+
+        # Background still: blocked if a direction was pressed
+        assert engine.compare(frame, frame.copy(), "up").kind == "blocked"
+        assert engine.compare(frame, frame.copy()).kind == "unchanged"
+    print("✅ Background scroll gives moved + direction; a still background after a d-pad press is blocked")
+
+
+def test_player_window_and_scenes():
+    engine = FrameDiffEngine()
+    overworld = load("step_overworld_alone.png")
+
+    turned = overworld.copy()
+    turned[72:88, 112:128] = 255 - turned[72:88, 112:128]  # sprite faces another way
+    diff = engine.compare(overworld, turned, "left")
+    assert diff.kind == "blocked" and diff.player_changed
+
+    assert engine.compare(overworld, load("step_talking_NPC.png")).kind == "dialogue_opened"
+    assert engine.compare(load("pokecenter_2.png"), load("pokecenter_3.png")).kind == "dialogue_opened"
+    assert engine.compare(overworld, load("step_battle_opening.png"), "up").kind == "transition"
+    assert engine.compare(overworld, np.zeros_like(overworld)).kind == "transition"  # fade to black
+    print("✅ Player sprite changes, dialogue boxes, battle intros and fades are told apart")
+
+
+def test_ring_buffer():
+    engine = FrameDiffEngine(history=4)
+    with tempfile.TemporaryDirectory() as scratch:
+        # Runners overwrite one screenshot file per capture
+        path = Path(scratch) / "emulator_screen.png"
+        Image.fromarray(load("step_overworld_alone.png")).save(path)
+        before = engine.push(path)
+        assert engine.push(path) is before and engine.similarity(path, path) == 1.0
+        assert engine.get_stats()["frames_loaded"] == 1
+
+        time.sleep(0.01)
+        Image.fromarray(scrolled(load("step_overworld_alone.png"), 0, -16)).save(path)
+        diff = engine.observe(path, "up")
+        assert diff.kind == "moved" and engine.get_stats()["frames_loaded"] == 2
+
+    # GameFrames are reduced once and remember their record
+    frame = GameFrame.from_image(Image.open(tests_dir / "pokecenter_1.png"))
+    assert engine.push(frame) is engine.push(frame)
+    assert engine.observe(frame) is None  # already the newest frame
+    for step in range(6):
+        engine.push(scrolled(load("pokecenter_1.png"), 0, step))
+    assert len(engine.frames) == 4
+    print(f"✅ Ring buffer reads each capture once ({engine.get_stats()})")
+
+
+def measure_compare(iterations: int = 500):
+    engine = FrameDiffEngine()
+    frame = load("step_overworld_withNPC.png")
+    records = [engine.push(scrolled(frame, 0, step)) for step in range(0, 20, 4)]
+
+    start = time.perf_counter()
+    for step in range(iterations):
+        engine.compare(records[step % 5], records[(step + 1) % 5], "down")
+    compare_ms = (time.perf_counter() - start) * 1000 / iterations
+
+    start = time.perf_counter()
+    for step in range(50):
+        engine._load(frame, None)
+    reduce_ms = (time.perf_counter() - start) * 1000 / 50
+    print(f"ℹ️  frame diff: {reduce_ms:.2f} ms to reduce a frame once, {compare_ms:.3f} ms per comparison")
+
+
+if __name__ == "__main__":
+    test_movement()
+    test_player_window_and_scenes()
+    test_ring_buffer()
+    measure_compare()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test frame fingerprinting and visual analysis reuse on unchanged screens
+
+Checks exact and perceptual matches over the recorded test screenshots, the
+RAM-position guard and ring buffer eviction, and that VisualAnalysis skips
+the overlay and vision call when a frame recurs at the same spot.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+sys.path.insert(0, str(tests_dir.parent))
+
+from PIL import Image, ImageDraw
+
+from game_frame import GameFrame
+from frame_fingerprint import FrameAnalysisCache, fingerprint_frame, fingerprint_image
+
+POKECENTER = Image.open(tests_dir / "pokecenter_1.png").convert("RGB")
+TALKING = Image.open(tests_dir / "step_talking_NPC.png").convert("RGB")
+
+
+def with_cursor(image: Image.Image) -> Image.Image:
+    """Same screen with a small blinking text cursor drawn in"""
+    changed = image.copy()
+    ImageDraw.Draw(changed).rectangle((220, 140, 224, 144), fill=(40, 40, 40))
+    return changed
+
+
+def test_fingerprints():
+    frame_png = GameFrame.from_image(POKECENTER, format="png")
+    frame_bmp = GameFrame.from_image(POKECENTER, format="bmp")
+    assert frame_png.encoded != frame_bmp.encoded
+    assert fingerprint_frame(frame_png) == fingerprint_frame(frame_bmp)  # hash covers decoded pixels
+    assert fingerprint_frame(frame_png) is fingerprint_frame(frame_png)  # cached on the frame
+
+    base, cursor, other = fingerprint_image(POKECENTER), fingerprint_image(with_cursor(POKECENTER)), fingerprint_image(TALKING)
+    assert cursor.exact != base.exact and cursor.distance(base) <= 2
+    assert other.distance(base) > 8
+    print(f"✅ Fingerprints: re-encoded frame matches exactly, cursor blink {cursor.distance(base)} bits, "
+          f"different screen {other.distance(base)} bits")
+
+
+def test_cache_lookup():
+    cache = FrameAnalysisCache(capacity=2, max_distance=2)
+    base = fingerprint_image(POKECENTER)
+    here, elsewhere = (5, 1, 7, 4), (5, 1, 7, 5)
+
+    assert cache.lookup(base, here) == (None, "miss")
+    cache.store(base, {"valid_movements": ["up"]}, here)
+    result, status = cache.lookup(base, here)
+    assert status == "exact" and result == {"valid_movements": ["up"]}
+    result["valid_movements"].append("down")  # callers get their own copy
+    assert cache.lookup(base, here)[0] == {"valid_movements": ["up"]}
+
+    assert cache.lookup(fingerprint_image(with_cursor(POKECENTER)), here)[1] == "perceptual"
+    assert cache.lookup(base, elsewhere)[1] == "miss"  # same pixels, different position
+    assert cache.lookup(fingerprint_image(TALKING), here)[1] == "miss"
+
+    cache.store(fingerprint_image(TALKING), {"screen": "talking"}, here)
+    cache.store(fingerprint_image(Image.new("RGB", (240, 160))), {"screen": "black"}, here)
+    assert cache.lookup(base, here)[1] == "miss"  # pushed out of the ring buffer
+
+    stats = cache.get_stats()
+    assert stats["exact_hits"] == 2 and stats["perceptual_hits"] == 1 and stats["misses"] == 4
+    assert stats["hit_rate"] == round(3 / 7, 3)
+    print("✅ Analysis cache: exact and perceptual hits only at the same position, oldest frames evicted")
+
+
+def test_visual_analysis_reuse():
+    """A recurring frame returns the stored analysis without the overlay or vision call"""
+    from visual_analysis import VisualAnalysis
+
+    with tempfile.TemporaryDirectory() as scratch:
+        analyzer = VisualAnalysis(save_logs=False, runs_dir=Path(scratch))
+        analyzer.enable_coordinate_mapping = False
+        calls = {"overlay": 0, "llm": 0}
+        ram = {"ram_available": True, "location": {"map_bank": 5, "map_id": 1, "x": 7, "y": 4}}
+
+        def fake_overlay(frame):
+            calls["overlay"] += 1
+            return frame.image
+
+        def fake_llm(grid_image_base64, verbose=False, ram_data=None, mime_type=None):
+            calls["llm"] += 1
+            return {"success": True, "response": '{"valid_movements": ["up", "left"]}'}
+
+        analyzer._collect_ram_data = lambda: ram
+        analyzer._add_grid_overlay = fake_overlay
+        analyzer._call_pixtral_for_analysis = fake_llm
+
+        first = analyzer.analyze_current_scene(frame=GameFrame.from_image(POKECENTER))
+        again = analyzer.analyze_current_scene(frame=GameFrame.from_image(POKECENTER))
+        blink = analyzer.analyze_current_scene(frame=GameFrame.from_image(with_cursor(POKECENTER)))
+        assert first == again == blink and calls == {"overlay": 1, "llm": 1}
+
+        ram["location"]["y"] = 5
+        analyzer.analyze_current_scene(frame=GameFrame.from_image(POKECENTER))
+        assert calls["llm"] == 2
+        stats = analyzer.frame_cache.get_stats()
+        assert stats["exact_hits"] == 1 and stats["perceptual_hits"] == 1 and stats["last_status"] == "miss"
+    print("✅ VisualAnalysis reuses cached analysis for recurring frames (2 of 4 vision calls skipped)")
+
+
+def measure_fingerprint(iterations: int = 500):
+    frames = [GameFrame.from_image(POKECENTER) for _ in range(iterations)]
+    for frame in frames:
+        frame.image  # decode outside the timing, as the turn loop already has it decoded
+    start = time.perf_counter()
+    for frame in frames:
+        fingerprint_frame(frame)
+    print(f"ℹ️  fingerprint per frame: {(time.perf_counter() - start) * 1e6 / iterations:.0f} µs")
+
+
+if __name__ == "__main__":
+    test_fingerprints()
+    test_cache_lookup()
+    test_visual_analysis_reuse()
+    measure_fingerprint()
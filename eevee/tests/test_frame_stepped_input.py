@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test frame-stepped input mode of SkyEmuController against the stub server
+
+Checks that presses hold/release through /input + /step with the configured
+per-action frame budgets, and compares wall time with realtime presses.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+sys.path.insert(0, str(tests_dir))
+sys.path.append(str(tests_dir.parent))
+
+from skyemu_stub_server import StubSkyEmuServer
+from skyemu_controller import SkyEmuController
+from ram_snapshot import RamSnapshot, RamSnapshotService
+
+
+def test_frame_stepped_sequence():
+    """Buttons advance exactly their frame budgets and end released"""
+    with StubSkyEmuServer() as server:
+        controller = SkyEmuController(host=server.host, port=server.port, input_mode="frame_stepped")
+        controller.set_frame_budget("walk", hold=16, release=2)
+
+        start = time.perf_counter()
+        assert controller.press_sequence(["up", "right", "a"], delay_between=0.5)
+        elapsed = time.perf_counter() - start
+
+        budgets = controller.frame_budgets
+        expected = 2 * (16 + 2) + budgets["text_advance"]["hold"] + budgets["text_advance"]["release"]
+        assert server.state.frame_count == expected, f"stepped {server.state.frame_count}, expected {expected}"
+        assert controller.frames_stepped == expected
+        assert all(value == 0 for value in server.state.inputs.values()), "a button was left held"
+        assert server.state.paused, "emulator should stay paused between turns"
+
+        # Menu cursor presses use their own budget when asked for explicitly
+        before = server.state.frame_count
+        assert controller.press_sequence(["down"], action_type="menu_cursor")
+        menu = budgets["menu_cursor"]
+        assert server.state.frame_count - before == menu["hold"] + menu["release"]
+
+        print(f"✅ Frame-stepped: 3 buttons, {expected} frames in {elapsed * 1000:.1f} ms")
+
+
+def test_realtime_comparison():
+    """Realtime mode pays key_delay + delay_between per button"""
+    with StubSkyEmuServer() as server:
+        controller = SkyEmuController(host=server.host, port=server.port)
+        start = time.perf_counter()
+        assert controller.press_sequence(["up", "right", "a"], delay_between=0.5)
+        print(f"ℹ️  Realtime: 3 buttons in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+def test_snapshot_reuse_follows_input_mode():
+    """Cached RAM survives for seconds while paused, a few frames while running"""
+    service = RamSnapshotService()
+    with StubSkyEmuServer() as server:
+        controller = SkyEmuController(host=server.host, port=server.port, input_mode="frame_stepped")
+        assert controller.press_button("up") and SkyEmuController.emulator_paused()
+        snapshot = RamSnapshot(frame_stamp=service.current_frame_stamp(), captured_at=time.time() - 0.5, memory=None)
+        assert service._is_fresh(snapshot), "paused emulator should reuse a 0.5 s old snapshot"
+
+        controller.input_mode = "realtime"
+        controller.key_delay = 0.0
+        assert controller.press_button("up") and not SkyEmuController.emulator_paused()
+        snapshot.frame_stamp = service.current_frame_stamp()
+        assert not service._is_fresh(snapshot), "running emulator should not reuse a 0.5 s old snapshot"
+        snapshot.captured_at = time.time()
+        assert service._is_fresh(snapshot)
+
+        # Snapshots are read from the emulator the controller drives, not the environment default
+        service.use_controller(controller)
+        service.get_snapshot()
+        assert service._client.base_url == server.url and server.state.request_counts.get("read_byte")
+
+    print(f"✅ Snapshot reuse: {service.max_age:g} s paused, {service.running_max_age * 1000:.0f} ms running")
+
+
+if __name__ == "__main__":
+    test_frame_stepped_sequence()
+    test_realtime_comparison()
+    test_snapshot_reuse_follows_input_mode()
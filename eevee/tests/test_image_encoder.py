@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test the image encoder that prepares screenshots for LLM requests
+
+Checks the per-provider/task profiles from provider_config, the MIME type the
+providers now send, the byte budget ladder, the per-frame payload cache, PNG
+passthrough and the task type visual analysis encodes each screen with. Run directly to also print size and encode time per format.
+"""
+
+import os
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+sys.path.insert(0, str(tests_dir.parent))
+
+from PIL import Image
+
+from game_frame import GameFrame
+from image_encoder import ImageEncoder, EncodingProfile, detect_base64_mime_type, WEBP_AVAILABLE
+from llm_api import LLMRequest
+from provider_config import get_image_encoding_for_task
+from visual_analysis import VisualAnalysis
+
+SCREENSHOTS = ["step_overworld_alone.png", "step_battle_fight_moves.png", "pokecenter_1.png"]
+
+
+def load(name: str) -> Image.Image:
+    return Image.open(tests_dir / name).convert("RGB")
+
+
+def test_profiles():
+    assert get_image_encoding_for_task("mistral")["format"] == "jpeg"
+    assert get_image_encoding_for_task("gemini")["format"] == "jpeg"
+    assert get_image_encoding_for_task("stub")["format"] == "png"
+    assert get_image_encoding_for_task("mistral", "battle_decisions")["quality"] == 90
+    assert get_image_encoding_for_task("unknown")["max_bytes"] == 200_000
+
+    os.environ["IMAGE_FORMAT"], os.environ["IMAGE_MAX_BYTES"] = "webp", "5000"
+    try:
+        assert get_image_encoding_for_task("gemini") == {"format": "webp", "quality": 85, "scale": 1.0,
+                                                         "max_bytes": 5000}
+    finally:
+        del os.environ["IMAGE_FORMAT"], os.environ["IMAGE_MAX_BYTES"]
+    print("✅ Encoding profiles: per provider, per task overrides, environment overrides")
+
+
+def test_formats_and_mime_types():
+    encoder = ImageEncoder()
+    image = load(SCREENSHOTS[0])
+    formats = ["png", "jpeg", "webp"] if WEBP_AVAILABLE else ["png", "jpeg"]
+    for image_format in formats:
+        payload = encoder.encode(image, profile=EncodingProfile(format=image_format))
+        assert payload.mime_type == f"image/{image_format}"
+        assert detect_base64_mime_type(payload.base64) == payload.mime_type
+        assert Image.open(tests_dir / SCREENSHOTS[0]).size == Image.open(BytesIO(payload.data)).size
+
+        # Providers label the image with its real type instead of image/jpeg
+        assert LLMRequest(prompt="", image_data=payload.base64).image_mime_type == payload.mime_type
+    assert LLMRequest(prompt="", image_data="", mime_type="image/webp").image_mime_type == "image/webp"
+    print(f"✅ {', '.join(formats)} payloads decode and carry their own MIME type")
+
+
+def test_budget():
+    encoder = ImageEncoder(cache_size=0)
+    image = load(SCREENSHOTS[1])
+    unlimited = encoder.encode(image, profile=EncodingProfile(format="jpeg", quality=95))
+
+    budget = unlimited.size_bytes // 3
+    fitted = encoder.encode(image, profile=EncodingProfile(format="jpeg", quality=95, max_bytes=budget))
+    assert fitted.within_budget and fitted.size_bytes <= budget
+    assert fitted.quality < 95 or fitted.size != image.size
+
+    # PNG has no quality knob: only downscaling helps
+    png_budget = encoder.encode(image, profile=EncodingProfile(format="png")).size_bytes * 2 // 3
+    png = encoder.encode(image, profile=EncodingProfile(format="png", max_bytes=png_budget))
+    assert png.within_budget and png.size[0] < image.width
+
+    hopeless = encoder.encode(image, profile=EncodingProfile(format="png", max_bytes=100))
+    assert not hopeless.within_budget and encoder.get_stats()["over_budget"] == 1
+    print(f"ℹ️  {budget} byte budget: JPEG q{fitted.quality} {fitted.size[0]}x{fitted.size[1]} "
+          f"({fitted.size_bytes} bytes); {png_budget} byte budget: PNG {png.size[0]}x{png.size[1]} ({png.size_bytes} bytes)")
+    print("✅ Payloads are brought under the byte budget by lowering quality, then scale")
+
+
+def test_cache_and_passthrough():
+    encoder = ImageEncoder()
+    frame = GameFrame((tests_dir / SCREENSHOTS[2]).read_bytes())
+
+    png = encoder.encode(frame, profile=EncodingProfile(format="png"))
+    assert png.data is frame.encoded and encoder.passthroughs == 1  # already PNG: no re-encode
+
+    jpeg = encoder.encode(frame, profile=EncodingProfile(format="jpeg"))
+    again = encoder.encode(GameFrame.from_image(frame.image), profile=EncodingProfile(format="jpeg"))
+    assert again.cached and again.data == jpeg.data and again.encode_ms == 0.0
+
+    stats = encoder.get_stats()
+    assert (stats["encodes"], stats["cache_hits"]) == (2, 1)
+    assert stats["by_format"] == {"png": 1, "jpeg": 1} and stats["last"]["cached"]
+    print("✅ Encoded payloads are cached per frame; PNG frames pass through unchanged")
+
+
+def test_visual_analysis_task_type():
+    """Battle screens reach the battle_decisions encoding override"""
+    analyzer = VisualAnalysis.__new__(VisualAnalysis)
+    analyzer.scene_classifier = None
+    task_types = {name: analyzer._encoding_task_type(GameFrame((tests_dir / name).read_bytes()))
+                  for name in SCREENSHOTS}
+    assert task_types == {"step_overworld_alone.png": "screenshot_analysis",
+                          "step_battle_fight_moves.png": "battle_decisions",
+                          "pokecenter_1.png": "screenshot_analysis"}, task_types
+
+    # A classification the turn loop already made is reused instead of classifying again
+    from scene_classifier import SceneClassification
+    classified = analyzer.scene_classifier.get_stats()["frames"]
+    menu = SceneClassification(scene="menu", detail="start_menu")
+    assert analyzer._encoding_task_type(GameFrame((tests_dir / SCREENSHOTS[0]).read_bytes()), menu) == "menu_analysis"
+    assert analyzer.scene_classifier.get_stats()["frames"] == classified
+    print("✅ Vision payloads are encoded with the task type of the screen")
+
+
+def measure_formats(iterations: int = 20):
+    images = [load(name) for name in SCREENSHOTS]
+    profiles = [EncodingProfile(format="png"), EncodingProfile(format="jpeg", quality=85)]
+    if WEBP_AVAILABLE:
+        profiles.append(EncodingProfile(format="webp", quality=85))
+    profiles.append(EncodingProfile(format="jpeg", quality=85, scale=0.5))
+    for profile in profiles:
+        encoder = ImageEncoder(cache_size=0)
+        start = time.perf_counter()
+        for step in range(iterations):
+            encoder.encode(images[step % len(images)], profile=profile)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / iterations
+        print(f"ℹ️  {profile.format:4} q{profile.quality} x{profile.scale}: "
+              f"{encoder.get_stats()['avg_bytes'] / 1024:.1f} KB, {elapsed_ms:.2f} ms per frame")
+
+
+if __name__ == "__main__":
+    test_profiles()
+    test_formats_and_mime_types()
+    test_budget()
+    test_cache_and_passthrough()
+    test_visual_analysis_task_type()
+    measure_formats()
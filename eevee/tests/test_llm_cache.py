@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test the content-addressed LLM response cache behind LLMAPIManager.call
+
+Uses the offline stub provider and a scratch SQLite file: record stores
+misses and serves repeats, replay answers from disk without calling the
+provider (and fails cleanly on a miss), passthrough never caches. Run
+directly to also print the cost of a hit.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+sys.path.insert(0, str(tests_dir.parent))
+
+from llm_api import LLMAPIManager, LLMResponse
+from llm_cache import LLMResponseCache
+
+IMAGE = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+
+
+def make_manager(database_path: Path, mode: str, latency_ms: float = 0, memory_size: int = 256) -> LLMAPIManager:
+    return LLMAPIManager({
+        'default_provider': 'stub',
+        'stub': {'enabled': True, 'latency_ms': latency_ms},
+        'cache': {'mode': mode, 'path': database_path, 'memory_size': memory_size},
+    })
+
+
+def test_record_and_replay():
+    with tempfile.TemporaryDirectory() as scratch:
+        database_path = Path(scratch) / "llm_cache.db"
+        recorder = make_manager(database_path, "record")
+        stub = recorder.providers['stub']
+
+        first = recorder.call("visual prompt", image_data=IMAGE, max_tokens=500)
+        again = recorder.call("visual prompt", image_data=IMAGE, max_tokens=500)
+        strategic = recorder.call("strategic prompt", max_tokens=500)
+        assert stub.call_count == 2 and not first.cached and again.cached
+        assert (again.text, again.button_presses) == (first.text, first.button_presses)
+
+        # Any part of the address changes the key
+        recorder.call("visual prompt", image_data=IMAGE, max_tokens=400)
+        recorder.call("visual prompt", max_tokens=500)
+        recorder.call("visual prompt", image_data=IMAGE, max_tokens=500, model_preference="other-model")
+        assert stub.call_count == 5
+
+        # A new process replays from disk and never reaches the provider
+        replayer = make_manager(database_path, "replay")
+        replayed = [replayer.call("visual prompt", image_data=IMAGE, max_tokens=500),
+                    replayer.call("strategic prompt", max_tokens=500)]
+        assert [r.text for r in replayed] == [first.text, strategic.text] and all(r.cached for r in replayed)
+        missing = replayer.call("prompt never recorded")
+        assert missing.error and replayer.providers['stub'].call_count == 0
+
+        stats = replayer.get_cache_stats()
+        assert (stats["disk_hits"], stats["replay_misses"], stats["hit_ratio"]) == (2, 1, 0.667)
+        assert stats["tokens_saved"] > 0
+        print(f"✅ Record serves repeats, replay answers from disk without provider calls ({stats})")
+
+
+def test_passthrough_and_mode_switch():
+    with tempfile.TemporaryDirectory() as scratch:
+        database_path = Path(scratch) / "llm_cache.db"
+        manager = make_manager(database_path, "passthrough")
+        manager.call("prompt")
+        manager.call("prompt")
+        assert manager.providers['stub'].call_count == 2 and not database_path.exists()
+        assert manager.get_cache_stats()["lookups"] == 0
+
+        manager.set_cache_mode("record")
+        manager.call("prompt")
+        assert manager.call("prompt").cached and manager.providers['stub'].call_count == 3
+        try:
+            manager.set_cache_mode("rewind")
+            assert False, "unknown mode accepted"
+        except ValueError:
+            pass
+    print("✅ Passthrough never touches the cache; modes switch at runtime")
+
+
+def test_lru_and_errors():
+    with tempfile.TemporaryDirectory() as scratch:
+        cache = LLMResponseCache(mode="record", database_path=Path(scratch) / "llm_cache.db", memory_size=2)
+        addresses = [cache.make_key("stub", "stub-model", f"prompt {index}") for index in range(3)]
+        for index, address in enumerate(addresses):
+            cache.store(address, {"text": f"answer {index}", "button_presses": [], "tokens_used": 10})
+        assert cache.get_stats()["memory_entries"] == 2
+
+        # The evicted entry still comes back from SQLite
+        assert cache.lookup(addresses[0])["text"] == "answer 0"
+        assert cache.get_stats()["disk_hits"] == 1 and cache.tokens_saved == 10
+
+        # Cached dicts are copies
+        cache.lookup(addresses[0])["text"] = "mutated"
+        assert cache.lookup(addresses[0])["text"] == "answer 0"
+
+        # Failed provider calls are not recorded
+        manager = make_manager(Path(scratch) / "errors.db", "record")
+        manager.providers['stub'].call_api = lambda request: LLMResponse(text="", button_presses=[],
+                                                                         error="quota exceeded")
+        manager.call("failing prompt")
+        assert manager.call("failing prompt").error and manager.get_cache_stats()["stores"] == 0
+    print("✅ LRU tier is bounded, SQLite keeps evicted entries, errors are not cached")
+
+
+def measure_hit(iterations: int = 200):
+    with tempfile.TemporaryDirectory() as scratch:
+        manager = make_manager(Path(scratch) / "llm_cache.db", "record", latency_ms=20)
+        manager.call("strategic prompt " * 200, image_data=IMAGE)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            manager.call("strategic prompt " * 200, image_data=IMAGE)
+        hit_ms = (time.perf_counter() - start) * 1000 / iterations
+        print(f"ℹ️  LLM cache: {hit_ms:.3f} ms per memory hit vs 20 ms stub latency "
+              f"({manager.get_cache_stats()['seconds_saved']} s saved)")
+
+
+if __name__ == "__main__":
+    test_record_and_replay()
+    test_passthrough_and_mode_switch()
+    test_lru_and_errors()
+    measure_hit()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test offline memory sources: the same PokemonFireRedReader decoding a
+synthetic FireRed .sav, a raw RAM dump (bytes and mmap) and the stub server
+
+The save is built here with rotated sections and real checksums, so slot
+selection and corruption handling are exercised without a game.
+"""
+
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+sys.path.insert(0, str(tests_dir))
+
+from memory_sources import (BufferMemorySource, MmapMemorySource, SaveFileMemorySource,
+                            open_memory_source, EWRAM_START, IWRAM_START)
+from analyse_skyemu_ram import PokemonFireRedReader, SkyEmuClient
+from skyemu_stub_server import StubSkyEmuServer, build_state
+
+SUBSTRUCTURE_ORDERS = [
+    'GAEM', 'GAME', 'GEAM', 'GEMA', 'GMAE', 'GMEA',
+    'AGEM', 'AGME', 'AEGM', 'AEMG', 'AMGE', 'AMEG',
+    'EGAM', 'EGMA', 'EAGM', 'EAMG', 'EMGA', 'EMAG',
+    'MGAE', 'MGEA', 'MAGE', 'MAEG', 'MEGA', 'MEAG',
+]
+
+SAVE_BLOCK_2_SIZE, SAVE_BLOCK_1_SIZE, STORAGE_SIZE = 0xF24, 0x3D68, 0x83D0
+ITEMS_OFFSET = 0x02025840 + 0x044C - SaveFileMemorySource.SAVE_BLOCK_1_ADDR
+MONEY_KEY = 0x1234ABCD
+
+
+def encode_pokemon(pid: int, ot_id: int, nickname: bytes, species: int, moves, pp, hp: int, max_hp: int,
+                   experience: int = 0, held_item: int = 0) -> bytes:
+    """Build an encrypted 100-byte party Pokémon (the first 80 bytes are its box form)"""
+    plain = {
+        'G': struct.pack('<HHI4x', species, held_item, experience),
+        'A': struct.pack('<4H4B', *moves, *pp),
+        'E': bytes(12),
+        'M': bytes(12),
+    }
+    ordered = b"".join(plain[kind] for kind in SUBSTRUCTURE_ORDERS[pid % 24])
+    key = pid ^ ot_id
+    encrypted = struct.pack('<12I', *(word ^ key for word in struct.unpack('<12I', ordered)))
+    header = struct.pack('<II', pid, ot_id) + nickname.ljust(10, b'\xff') + bytes(14)
+    stats = struct.pack('<IBBHH', 0, 5, 0, hp, max_hp).ljust(20, b'\x00')
+    return header + encrypted + stats
+
+
+def build_save_blocks(x: int, money: int):
+    save_block_2 = bytearray(SAVE_BLOCK_2_SIZE)
+    save_block_2[0:4] = bytes([0xC2, 0xB5, 0xB4, 0xFF])  # "RED"
+    struct.pack_into('<I', save_block_2, 0xF20, MONEY_KEY)
+
+    save_block_1 = bytearray(SAVE_BLOCK_1_SIZE)
+    struct.pack_into('<HHBB', save_block_1, 0, x, 7, 2, 3)  # x, y, map id, bank
+    struct.pack_into('<I', save_block_1, 0x218, money ^ MONEY_KEY)
+    struct.pack_into('<I', save_block_1, SaveFileMemorySource.PARTY_COUNT_OFFSET, 2)
+    party = encode_pokemon(0x00000018, 0x0000BEEF, bytes([0xB5, 0xB5, 0xC6, 0xB5, 0xB5]), 133,
+                           (33, 39, 0, 0), (35, 30, 0, 0), 20, 22)
+    party += encode_pokemon(0x12345677, 0x0000BEEF, bytes([0xC0, 0xB9, 0xBB]), 25,
+                            (84, 0, 0, 0), (30, 0, 0, 0), 0, 19)
+    offset = SaveFileMemorySource.PARTY_DATA_OFFSET
+    save_block_1[offset:offset + len(party)] = party
+    struct.pack_into('<HH', save_block_1, ITEMS_OFFSET, 13, 5)
+    return save_block_2, save_block_1, bytearray(STORAGE_SIZE)
+
+
+def build_slot(save_index: int, rotation: int, x: int, money: int) -> bytearray:
+    save_block_2, save_block_1, storage = build_save_blocks(x, money)
+    sections = {0: save_block_2}
+    for i in range(4):
+        sections[1 + i] = save_block_1[i * 0xF80:(i + 1) * 0xF80]
+    for i in range(9):
+        sections[5 + i] = storage[i * 0xF80:(i + 1) * 0xF80]
+
+    slot = bytearray()
+    for position in range(14):
+        section_id = (position + rotation) % 14
+        data = bytes(sections[section_id]).ljust(SaveFileMemorySource.FOOTER_OFFSET, b'\x00')
+        size = SaveFileMemorySource.SECTION_DATA_SIZES.get(section_id, SaveFileMemorySource.DEFAULT_DATA_SIZE)
+        checksum = SaveFileMemorySource.section_checksum(memoryview(data), size)
+        slot += data + SaveFileMemorySource.FOOTER.pack(section_id, checksum, SaveFileMemorySource.SIGNATURE, save_index)
+    return slot
+
+
+def build_save() -> bytearray:
+    """Slot A is the older save (x=10), slot B the newer one (x=12)"""
+    return build_slot(5, rotation=3, x=10, money=1500) + build_slot(6, rotation=9, x=12, money=3000) + bytearray(0x4000)
+
+
+def test_slot_selection():
+    """The newest valid slot wins; a bad checksum falls back to the other slot"""
+    save = build_save()
+    source = SaveFileMemorySource(bytes(save))
+    assert source.save_index == 6
+    assert PokemonFireRedReader(source).read_game_state().x == 12
+
+    corrupted = bytearray(save)
+    corrupted[0xE000 + 0x10] ^= 0xFF
+    fallback = SaveFileMemorySource(bytes(corrupted))
+    assert fallback.save_index == 5
+    assert PokemonFireRedReader(fallback).read_game_state().x == 10
+
+    try:
+        SaveFileMemorySource(b'\xff' * 0x20000)
+        raise AssertionError("erased save should be rejected")
+    except ValueError:
+        pass
+    print("✅ Save slot selection: newest valid slot, checksum fallback, erased save rejected")
+
+
+def check_state(state, label: str):
+    assert state is not None, label
+    assert state.player_name == "RED", state.player_name
+    assert (state.x, state.y) == (12, 7), (state.x, state.y)
+    assert "[Bank 3, Map 2]" in state.location, state.location
+    assert state.money == 3000, state.money
+    assert [p.species_id for p in state.party] == [133, 25]
+    eevee, pikachu = state.party
+    assert eevee.nickname == "EEVEE" and eevee.current_hp == 20 and eevee.max_hp == 22
+    assert eevee.move_pp == [35, 30] and len(eevee.moves) == 2
+    assert pikachu.current_hp == 0 and len(pikachu.moves) == 1
+    assert state.items == [("Item #13", 5)], state.items
+
+
+def test_sources_decode_identically():
+    """Save, bytes dump, mmap dump and the stub server all decode the same state"""
+    save = bytes(build_save())
+    save_source = SaveFileMemorySource(save)
+    check_state(PokemonFireRedReader(save_source).read_game_state(), "save")
+
+    regions = {start: view for start, _, view in save_source.regions}
+    dump = bytes(regions[EWRAM_START]) + bytes(regions[IWRAM_START])
+    check_state(PokemonFireRedReader(BufferMemorySource(dump)).read_game_state(), "bytes")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        dump_path = Path(scratch) / "memdump.bin"
+        dump_path.write_bytes(dump)
+        save_path = Path(scratch) / "game.sav"
+        save_path.write_bytes(save)
+
+        with MmapMemorySource(dump_path) as mmap_source:
+            check_state(PokemonFireRedReader(mmap_source).read_game_state(), "mmap")
+        assert isinstance(open_memory_source(save_path), SaveFileMemorySource)
+
+        with StubSkyEmuServer(state=build_state(ram_path=str(save_path))) as server:
+            check_state(PokemonFireRedReader(SkyEmuClient(base_url=server.url)).read_game_state(), "stub")
+    print("✅ .sav, bytes, mmap and stub server decode the same game state")
+
+
+def measure_decode(iterations: int = 2000):
+    """Offline decode cost per read_game_state"""
+    reader = PokemonFireRedReader(SaveFileMemorySource(bytes(build_save())))
+    start = time.perf_counter()
+    for _ in range(iterations):
+        reader.read_game_state()
+    per_call = (time.perf_counter() - start) * 1e6 / iterations
+    print(f"ℹ️  read_game_state from memory: {per_call:.1f} µs/decode")
+
+
+if __name__ == "__main__":
+    test_slot_selection()
+    test_sources_decode_identically()
+    measure_decode()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Test the metatile atlas: tile hashing, learning from RAM events, persistence
+
+A synthetic overworld of textured 16x16 tiles is rendered the way the GBA
+camera shows it (player metatile at pixel (112, 72)), and turns are fed to
+the atlas with the RAM events they would produce. Run directly to also print
+lookup vs. HSV classification cost.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+project_root = tests_dir.parent.parent
+sys.path.insert(0, str(tests_dir))
+sys.path.insert(0, str(tests_dir.parent))
+sys.path.append(str(project_root / "gemini-multimodal-playground" / "standalone"))
+
+import numpy as np
+
+from metatile_atlas import MetatileAtlas
+from ram_events import PlayerMoved, MapChanged, BattleStarted
+from tile_grid import TileGrid
+
+rng = np.random.default_rng(7)
+TILE_COLOURS = {
+    "grass": (120, 200, 80),   # walkable
+    "path": (232, 216, 128),   # walkable
+    "tree": (84, 140, 36),     # HSV class T
+    "wall": (48, 48, 48),
+    "door": (200, 64, 48),
+    "ledge": (150, 190, 90),
+    "npc": (230, 120, 180),
+}
+TILES = {name: np.clip(np.array(colour) + rng.integers(-20, 21, size=(16, 16, 3)), 0, 255).astype(np.uint8)
+         for name, colour in TILE_COLOURS.items()}
+
+# 40x30 world: grass with a path column, a tree wall, a door, a ledge, a wall and an NPC
+WORLD = np.full((30, 40), "grass", dtype=object)
+WORLD[:, 20] = "path"
+WORLD[10, 15:25] = "tree"
+WORLD[20, 18] = "door"
+WORLD[12, 22] = "ledge"
+WORLD[25, 5:10] = "wall"
+WORLD[5, 11] = "npc"
+
+
+def render(x: int, y: int) -> np.ndarray:
+    """240x160 frame with the player standing at world tile (x, y)"""
+    canvas = np.zeros((11 * 16, 15 * 16, 3), dtype=np.uint8)
+    for row in range(11):
+        for col in range(15):
+            world_y, world_x = y - 5 + row, x - 7 + col
+            name = WORLD[world_y, world_x] if 0 <= world_y < 30 and 0 <= world_x < 40 else "wall"
+            canvas[row * 16:(row + 1) * 16, col * 16:(col + 1) * 16] = TILES[name]
+    return canvas[8:168]  # player's metatile (row 5 of the canvas) lands at y=72
+
+
+def moved(x, y, dx, dy):
+    return [PlayerMoved(0, (x, y), (x + dx, y + dy))]
+
+
+def test_hashing():
+    with tempfile.TemporaryDirectory() as scratch:
+        atlas = MetatileAtlas(Path(scratch) / "atlas.db")
+        here, right = atlas.hash_tiles(render(20, 15)), atlas.hash_tiles(render(21, 15))
+        assert here.shape == (9, 15) and atlas.engine.player_tile == (4, 7)
+        assert (here[:, 1:] == right[:, :-1]).all()  # one step scrolls the hashes by a column
+        assert here[4, 7] == here[0, 7] and here[4, 7] != here[4, 6]  # path vs grass
+        assert len(set(here.ravel().tolist())) == 3  # grass, path and the ledge
+        assert atlas.hash_tiles(np.zeros((96, 160, 3), dtype=np.uint8)) is None
+    print("✅ Metatile hashes: 15x9 grid aligned to the camera, identical tiles share a hash")
+
+
+def test_learning_from_ram_events():
+    with tempfile.TemporaryDirectory() as scratch:
+        db = Path(scratch) / "atlas.db"
+        atlas = MetatileAtlas(db, min_blocked_evidence=2)
+
+        # Step up the path: the path tile is walkable
+        assert atlas.learn_from_turn(render(20, 15), ["up"], moved(20, 15, 0, -1)) == "walkable"
+        # Into the tree line: one failed press is inconclusive (may only turn the player), two make it a tree
+        assert atlas.learn_from_turn(render(17, 11), ["up"], []) is None
+        assert atlas.learn_from_turn(render(16, 11), ["up"], []) == "tree"
+        # A map change after walking down onto the door tile
+        door_event = MapChanged(0, (3, 0), (3, 1), (18, 19), (4, 8), direction="down", method="walk")
+        assert atlas.learn_from_turn(render(18, 19), ["down"], [door_event]) == "door"
+        # Jumping the ledge moves two tiles
+        assert atlas.learn_from_turn(render(22, 11), ["down"], moved(22, 11, 0, 2)) == "ledge"
+        # Walls next to the path need two failed presses too
+        atlas.learn_from_turn(render(7, 24), ["down"], [])
+        assert atlas.learn_from_turn(render(6, 24), ["down"], []) == "blocked"
+
+        # Turns that cannot be attributed to one tile are ignored
+        assert atlas.learn_from_turn(render(20, 15), ["up", "a"], moved(20, 15, 0, -1)) is None
+        assert atlas.learn_from_turn(render(20, 15), ["a"], []) is None
+        assert atlas.learn_from_turn(render(20, 15), ["up"], [BattleStarted(0, 4)]) is None
+        assert atlas.learn_from_turn(render(20, 15), ["up"], moved(20, 15, 1, 0)) is None
+
+        stats = atlas.get_stats()
+        assert stats["labels"] == {"walkable": 1, "tree": 1, "door": 1, "ledge": 1, "blocked": 1}
+
+        # A later session loads the atlas and classifies a new area by lookup
+        reloaded = MetatileAtlas(db)
+        result, known = reloaded.analyze(render(18, 14))
+        assert known.any() and not known.all()  # grass was never stepped on: HSV fallback
+        assert (known == np.isin(WORLD[10:19, 11:26].astype(str), ["tree", "path", "ledge"])).all()
+        assert reloaded.describe_neighbours(render(20, 11)) == {"up": "tree", "down": "walkable"}
+        assert reloaded.describe_neighbours(render(18, 19)) == {"down": "door"}
+        grid = reloaded.format_grid(render(18, 14)).splitlines()
+        assert grid[1 + 4][2 + 7] == "P" and grid[1 + 0][2 + 4:2 + 14] == "T" * 10 and grid[1 + 2][2 + 11] == "L"
+        assert not result.walkable[0, 4:14].any() and result.walkable[2, 11]
+    print(f"✅ Atlas learned walkable/tree/door/ledge/blocked from RAM outcomes and reloaded them ({stats['labels']})")
+
+
+def test_explicit_labels_and_walk_evidence():
+    with tempfile.TemporaryDirectory() as scratch:
+        atlas = MetatileAtlas(Path(scratch) / "atlas.db", min_blocked_evidence=1)
+        frame = render(10, 5)
+        assert atlas.learn_from_turn(frame, ["left"], []) == "blocked"  # grass, e.g. the player only turned
+        assert atlas.learn_from_turn(frame, ["left"], moved(10, 5, -1, 0)) == "walkable"  # a real step wins
+        atlas.learn_from_turn(frame, ["right"], [])
+        assert atlas.describe_neighbours(frame)["right"] == "blocked"
+        atlas.label_tile(frame, 4, 8, "npc")  # e.g. from visual analysis
+        assert atlas.describe_neighbours(frame) == {"left": "walkable", "right": "npc", "up": "walkable",
+                                                    "down": "walkable"}  # same grass tile all around
+    print("✅ Successful steps override blocked evidence; explicit labels override both")
+
+
+def test_navigation_grid():
+    import base64
+    from io import BytesIO
+    import metatile_atlas
+    from eevee_agent import EeveeAgent
+    from PIL import Image
+
+    agent = EeveeAgent.__new__(EeveeAgent)  # grid only needs memory/verbose, not the emulator
+    agent.memory = None
+    agent.verbose = False
+    buffer = BytesIO()
+    Image.fromarray(render(20, 11)).save(buffer, format="PNG")
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        atlas = metatile_atlas._global_metatile_atlas = MetatileAtlas(Path(scratch) / "atlas.db", min_blocked_evidence=1)
+        try:
+            assert atlas.learn_from_turn(render(20, 11), ["up"], []) == "tree"
+            atlas.learn_from_turn(render(20, 11), ["down"], moved(20, 11, 0, 1))
+            rows = agent._create_ascii_grid_overlay(encoded, grid="15x10").splitlines()
+        finally:
+            metatile_atlas._global_metatile_atlas = None
+
+    # Learned trees and path by lookup; unknown grass keeps the agent's own classification (".")
+    assert len(rows) == 10 and rows[1 + 4][2 + 7] == "P"
+    assert rows[1 + 3][2 + 2:2 + 12] == "T" * 10 and set(rows[1 + 0][2:]) == {"."}
+    assert atlas.get_stats()["tile_lookups"] == 15 * 9
+    print("✅ Navigation grid classifies learned metatiles by lookup, the rest with the fallback classifier")
+
+
+class VisitMemory:
+    """Stands in for MemorySystem: one visited 8x8 area, every query recorded"""
+
+    def __init__(self, visited: str):
+        self.visited = visited
+        self.queries = []
+
+    def get_relevant_context(self, task_description: str):
+        self.queries.append(task_description)
+        return {"relevant_memories": [task_description] if task_description == f"visited {self.visited}" else []}
+
+
+def test_navigation_grid_visited_areas():
+    import base64
+    from io import BytesIO
+    import metatile_atlas
+    from eevee_agent import EeveeAgent
+    from PIL import Image
+
+    def encode(pixels):
+        buffer = BytesIO()
+        Image.fromarray(pixels).save(buffer, format="PNG")
+        return base64.b64encode(buffer.getvalue()).decode()
+
+    agent = EeveeAgent.__new__(EeveeAgent)
+    agent.memory = VisitMemory("grid_0_0")
+    agent.verbose = agent.debug = False
+
+    with tempfile.TemporaryDirectory() as scratch:
+        metatile_atlas._global_metatile_atlas = MetatileAtlas(Path(scratch) / "atlas.db")
+        try:
+            rows = agent._create_ascii_grid_overlay(encode(render(20, 11)), grid="15x9").splitlines()
+            queries = list(agent.memory.queries)
+            agent.memory.queries.clear()
+            small = agent._create_ascii_grid_overlay(encode(np.zeros((144, 160, 3), dtype=np.uint8)),
+                                                     grid="15x9").splitlines()
+        finally:
+            metatile_atlas._global_metatile_atlas = None
+
+    # grid_x_y keys stay 8x8 screen cells: the top-left 30x20 px cell covers the first two metatiles
+    assert rows[1][2:5] == "**." and all("*" not in row[2:] for row in rows[2:])
+    assert len(queries) == len(set(queries)) <= 64
+    # Frames the atlas cannot read keep the 8x8 grid instead of misaligned 16px tiles
+    assert small[0] == "  01234567" and len(small) == 9 and len(agent.memory.queries) == 63
+    print(f"✅ Visited areas: {len(queries)} memory queries for 15x9 metatiles, keys stay 8x8 screen cells")
+
+
+def measure_lookup(iterations: int = 200):
+    with tempfile.TemporaryDirectory() as scratch:
+        atlas = MetatileAtlas(Path(scratch) / "atlas.db", min_blocked_evidence=1)
+        atlas.learn_from_turn(render(20, 15), ["left"], moved(20, 15, -1, 0))
+        atlas.learn_from_turn(render(20, 15), ["up"], moved(20, 15, 0, -1))
+        frames = [render(15 + step % 10, 12 + step % 5) for step in range(iterations)]
+
+        start = time.perf_counter()
+        for frame in frames:
+            atlas.lookup(atlas.hash_tiles(frame))
+        lookup_us = (time.perf_counter() - start) * 1e6 / iterations
+
+        engine = TileGrid((15, 9))
+        start = time.perf_counter()
+        for frame in frames:
+            engine.analyze(frame[8:152])
+        hsv_us = (time.perf_counter() - start) * 1e6 / iterations
+        print(f"ℹ️  15x9 frame: hash + lookup {lookup_us:.0f} µs (hit rate {atlas.get_stats()['hit_rate']:.0%}), "
+              f"HSV classification {hsv_us:.0f} µs")
+
+
+if __name__ == "__main__":
+    test_hashing()
+    test_learning_from_ram_events()
+    test_explicit_labels_and_walk_evidence()
+    test_navigation_grid()
+    test_navigation_grid_visited_areas()
+    measure_lookup()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test the RAM-polled movement executor against the stub server
+
+A small walking simulation on top of the stub moves the player one tile per
+16 frames of held direction, with walls to exercise blocked-step detection.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+sys.path.insert(0, str(tests_dir))
+sys.path.append(str(tests_dir.parent))
+
+from skyemu_stub_server import StubSkyEmuServer, StubEmulatorState
+from skyemu_controller import SkyEmuController
+from movement_executor import MovementExecutor
+from analyse_skyemu_ram import PokemonFireRedReader
+
+SAVE_BLOCK_8 = 0x0202552C
+FRAMES_PER_TILE = 16
+DELTAS = {"Up": (0, -1), "Down": (0, 1), "Left": (-1, 0), "Right": (1, 0)}
+
+
+class WalkingState(StubEmulatorState):
+    """Stub state that walks the player while a direction is held"""
+
+    def __init__(self, x: int, y: int, walls=()):
+        super().__init__()
+        self.walls = set(walls)
+        self.progress = 0
+        self.write(PokemonFireRedReader.ADDRESSES['save_block_8_ptr'], SAVE_BLOCK_8.to_bytes(4, 'little'))
+        self._set_position(x, y)
+        self.write(SAVE_BLOCK_8 + 4, bytes([3, 1]))  # map id, bank
+
+    def _set_position(self, x: int, y: int) -> None:
+        self.write(SAVE_BLOCK_8, x.to_bytes(2, 'little') + y.to_bytes(2, 'little'))
+
+    def position(self):
+        data = self.read(SAVE_BLOCK_8, 4)
+        return int.from_bytes(data[0:2], 'little'), int.from_bytes(data[2:4], 'little')
+
+    def step(self, frames: int) -> None:
+        super().step(frames)
+        held = [name for name, value in self.inputs.items() if value and name in DELTAS]
+        if not held:
+            self.progress = 0
+            return
+        dx, dy = DELTAS[held[0]]
+        self.progress += frames
+        while self.progress >= FRAMES_PER_TILE:
+            self.progress -= FRAMES_PER_TILE
+            x, y = self.position()
+            if (x + dx, y + dy) in self.walls:
+                continue
+            self._set_position(x + dx, y + dy)
+
+
+def make_executor(server):
+    controller = SkyEmuController(host=server.host, port=server.port, input_mode="frame_stepped")
+    return MovementExecutor(controller)
+
+
+def test_straight_run():
+    """A multi-tile run is one held segment costing ~16 frames per tile"""
+    state = WalkingState(5, 5)
+    with StubSkyEmuServer(state=state) as server:
+        executor = make_executor(server)
+        start = time.perf_counter()
+        move = executor.walk("right", 4)
+        elapsed = time.perf_counter() - start
+
+        assert move.completed and not move.blocked, move
+        assert state.position() == (9, 5), state.position()
+        assert move.frames <= 4 * FRAMES_PER_TILE + executor.poll_frames, move.frames
+        assert state.request_counts.get("input") == 2, "run should be a single hold/release"
+        print(f"✅ 4-tile run: {move.frames} frames, {move.polls} polls, {elapsed * 1000:.1f} ms")
+
+
+def test_blocked_step():
+    """Walking into a wall is reported within blocked_after_frames"""
+    state = WalkingState(5, 5, walls={(5, 4)})
+    with StubSkyEmuServer(state=state) as server:
+        executor = make_executor(server)
+        move = executor.walk("up", 2)
+
+        assert move.blocked and move.tiles_moved == 0, move
+        assert move.frames <= executor.blocked_after_frames + executor.poll_frames, move.frames
+        print(f"✅ Blocked step detected after {move.frames} frames")
+
+
+def test_walk_to():
+    """walk_to splits the path into straight runs and routes around a blocked axis"""
+    state = WalkingState(2, 2, walls={(3, 2)})
+    with StubSkyEmuServer(state=state) as server:
+        executor = make_executor(server)
+        path = executor.walk_to(6, 4)
+
+        assert path.reached, path
+        assert state.position() == (6, 4)
+        assert path.buttons.count("right") == 4 and path.buttons.count("down") == 2, path.buttons
+        print(f"✅ walk_to reached (6,4) in {len(path.moves)} runs: {path.buttons}")
+
+
+if __name__ == "__main__":
+    test_straight_run()
+    test_blocked_step()
+    test_walk_to()
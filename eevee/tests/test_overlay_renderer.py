@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test the cached grid overlay renderer against the original drawing code
+
+reference_overlay is the per-frame implementation that VisualAnalysis used
+before (font lookups, grid lines, 64 labels, banner and ring drawn from
+scratch every call). The cached renderer must produce identical pixels with
+and without RAM coordinates, across player moves and map changes. Run
+directly to also print the per-frame cost of both.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+sys.path.insert(0, str(tests_dir.parent))
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from overlay_renderer import GridOverlayRenderer
+
+SCREEN = Image.open(tests_dir / "pokecenter_1.png").convert("RGB")
+
+
+def ram(x: int, y: int, map_bank: int = 3, map_id: int = 0):
+    return {"ram_available": True, "location": {"x": x, "y": y, "map_bank": map_bank, "map_id": map_id}}
+
+
+def reference_overlay(image: Image.Image, coords: dict, grid_size: int = 8) -> Image.Image:
+    """The original VisualAnalysis._add_grid_overlay drawing, minus the PNG/base64 step"""
+    overlay_image = image.copy().convert('RGBA')
+    grid_overlay = Image.new('RGBA', overlay_image.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(grid_overlay)
+    width, height = image.size
+    tile_width = width // grid_size
+    tile_height = height // grid_size
+
+    grid_color = (204, 204, 204, 100)
+    for x in range(0, width, tile_width):
+        draw.line([(x, 0), (x, height)], fill=grid_color, width=1)
+    for y in range(0, height, tile_height):
+        draw.line([(0, y), (width, y)], fill=grid_color, width=1)
+
+    try:
+        font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", max(8, min(12, tile_width // 4)))
+    except:
+        font = ImageFont.load_default()
+
+    text_color = (204, 204, 204, 120)
+    if coords.get("ram_available", False):
+        location = coords.get("location", {})
+        center = grid_size // 2
+        for tile_x in range(grid_size):
+            for tile_y in range(grid_size):
+                coord_text = f"{location.get('x', 0) + tile_x - center},{location.get('y', 0) + tile_y - center}"
+                color = (255, 255, 0, 200) if tile_x == center and tile_y == center else text_color
+                draw.text((tile_x * tile_width + 2, tile_y * tile_height + 2), coord_text, fill=color, font=font)
+        map_display = f"Map:{location.get('map_bank', 0)}-{location.get('map_id', 0)}"
+    else:
+        for tile_x in range(grid_size):
+            for tile_y in range(grid_size):
+                draw.text((tile_x * tile_width + 2, tile_y * tile_height + 2), f"{tile_x},{tile_y}",
+                          fill=text_color, font=font)
+        map_display = "Map:?"
+
+    try:
+        map_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 14)
+    except:
+        map_font = ImageFont.load_default()
+    bbox = draw.textbbox((0, 0), map_display, font=map_font)
+    text_width, text_height = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    padding = 5
+    text_x, text_y = width - text_width - padding, padding
+    draw.rectangle([(text_x - padding, text_y - padding),
+                    (text_x + text_width + padding, text_y + text_height + padding)], fill=(0, 0, 0, 200))
+    draw.text((text_x, text_y), map_display, fill=(255, 255, 255, 255), font=map_font)
+
+    if coords.get("ram_available", False):
+        center_x, center_y = width // 2, height // 2
+        draw.ellipse([center_x - 4, center_y - 4, center_x + 4, center_y + 4], outline=(255, 255, 0, 180), width=1)
+
+    return Image.alpha_composite(overlay_image, grid_overlay).convert('RGB')
+
+
+def assert_same(actual: Image.Image, expected: Image.Image, label: str):
+    difference = np.abs(np.asarray(actual, dtype=int) - np.asarray(expected, dtype=int))
+    assert difference.max() == 0, f"{label}: {np.count_nonzero(difference.any(axis=-1))} pixels differ"
+
+
+def test_matches_reference():
+    renderer = GridOverlayRenderer(grid_size=8)
+    cases = [
+        ("no RAM", {"ram_available": False}),
+        ("start", ram(12, 7)),
+        ("moved", ram(13, 7)),
+        ("negative labels", ram(1, 2)),
+        ("wide labels", ram(123, 104, map_bank=42, map_id=17)),
+        ("back", ram(12, 7)),
+    ]
+    for label, coords in cases:
+        assert_same(renderer.render(SCREEN, coords), reference_overlay(SCREEN, coords), label)
+
+    # A second screen size gets its own grid layer
+    small = SCREEN.resize((160, 96))
+    assert_same(renderer.render(small, ram(5, 5)), reference_overlay(small, ram(5, 5)), "160x96")
+    print(f"✅ Cached overlay identical to the original drawing in {len(cases) + 1} cases")
+
+
+def test_caching():
+    renderer = GridOverlayRenderer(grid_size=8)
+    renderer.render(SCREEN, ram(12, 7))
+    first_misses = renderer.sprite_misses
+    assert first_misses == 64  # every label drawn once
+
+    renderer.render(SCREEN, ram(12, 7))  # player did not move: whole layer reused
+    assert renderer.layer_reuses == 1 and renderer.sprite_misses == first_misses
+
+    renderer.render(SCREEN, ram(13, 7))  # one step right: only the new column of labels is rasterized
+    assert renderer.sprite_misses == first_misses + 8 and renderer.sprite_hits == 56
+    stats = renderer.get_stats()
+    assert stats["renders"] == 3 and stats["layer_reuses"] == 1 and stats["sprites"] == 72
+    print("✅ Overlay caches: layer reused when stationary, one step rasterizes only 8 new labels")
+
+
+def measure_overlay(steps: int = 200):
+    renderer = GridOverlayRenderer(grid_size=8)
+    path = [ram(10 + step % 20, 5 + (step // 20) % 10) for step in range(steps)]
+
+    start = time.perf_counter()
+    for coords in path:
+        reference_overlay(SCREEN, coords)
+    reference_ms = (time.perf_counter() - start) * 1000 / steps
+
+    start = time.perf_counter()
+    for coords in path:
+        renderer.render_layer(SCREEN.size, coords)
+    cold_ms = (time.perf_counter() - start) * 1000 / steps
+
+    start = time.perf_counter()
+    for coords in path:
+        renderer.render_layer(SCREEN.size, coords)
+    layer_ms = (time.perf_counter() - start) * 1000 / steps
+
+    start = time.perf_counter()
+    for coords in path:
+        renderer.render(SCREEN, coords)
+    render_ms = (time.perf_counter() - start) * 1000 / steps
+    print(f"ℹ️  overlay per frame (walking): original {reference_ms:.2f} ms, first visit {cold_ms:.2f} ms, "
+          f"cached layer {layer_ms:.3f} ms, layer + composite {render_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    test_matches_reference()
+    test_caching()
+    measure_overlay()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized Pokémon decoder against the scalar reference path
+
+Covers all 24 substructure orders, party and box strides, level parity with
+_calculate_level_from_experience, and read_pc_boxes over a synthetic RAM
+image. Run directly to also print the scalar vs. vectorized micro-benchmark.
+"""
+
+import random
+import struct
+import sys
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+sys.path.insert(0, str(tests_dir))
+
+import numpy as np
+
+from pokemon_decoder import decode_pokemon, BOX_POKEMON_SIZE, PARTY_POKEMON_SIZE
+from memory_sources import BufferMemorySource, SaveFileMemorySource, EWRAM_START, IWRAM_START
+from analyse_skyemu_ram import PokemonFireRedReader
+from test_memory_sources import encode_pokemon, build_save
+
+GROWTH = struct.Struct('<HHI')
+ATTACKS = struct.Struct('<4H4B')
+PC_SLOTS = PokemonFireRedReader.PC_BOX_COUNT * PokemonFireRedReader.PC_BOX_CAPACITY
+
+
+def random_party(count: int, seed: int = 0) -> bytes:
+    """`count` party Pokémon with random PIDs covering every substructure order"""
+    rng = random.Random(seed)
+    data = b""
+    for i in range(count):
+        pid = rng.getrandbits(27) * 24 + i % 24
+        data += encode_pokemon(pid, rng.getrandbits(32), bytes([0xBB + i % 26]), rng.randint(1, 386),
+                               [rng.randint(1, 354) for _ in range(4)], [rng.randint(0, 40) for _ in range(4)],
+                               rng.randint(0, 300), rng.randint(1, 300),
+                               experience=rng.randint(0, 1_640_000), held_item=rng.randint(0, 375))
+    return data
+
+
+def scalar_decode(reader: PokemonFireRedReader, data: bytes, stride: int):
+    """Fields per slot via the single-structure _decrypt_pokemon_data path"""
+    rows = []
+    for offset in range(0, len(data), stride):
+        raw = data[offset:offset + stride].ljust(reader.POKEMON_SIZE, b'\x00')
+        decrypted = reader._decrypt_pokemon_data(raw)
+        species, held_item, experience = GROWTH.unpack_from(decrypted, 32)
+        attacks = ATTACKS.unpack_from(decrypted, 44)
+        rows.append((species, held_item, experience, list(attacks[:4]), list(attacks[4:])))
+    return rows
+
+
+def test_matches_scalar_decrypt():
+    """Every substructure order decodes identically for party and box strides"""
+    reader = PokemonFireRedReader(BufferMemorySource(bytes(0x48000)))
+    party = random_party(48)
+    box = b"".join(party[i:i + BOX_POKEMON_SIZE] for i in range(0, len(party), PARTY_POKEMON_SIZE))
+
+    for data, stride in ((party, PARTY_POKEMON_SIZE), (box, BOX_POKEMON_SIZE)):
+        count = len(data) // stride
+        decoded = decode_pokemon(data, count, stride)
+        expected = scalar_decode(reader, data, stride)
+        assert sorted(set((decoded.personality % 24).tolist())) == list(range(24))
+        actual = list(zip(decoded.species.tolist(), decoded.held_item.tolist(), decoded.experience.tolist(),
+                          decoded.moves.tolist(), decoded.pp.tolist()))
+        assert actual == expected, f"stride {stride} mismatch"
+
+        levels = reader._levels.levels(decoded.species, decoded.experience).tolist()
+        assert levels == [reader._calculate_level_from_experience(species, experience)
+                          for species, _, experience, _, _ in expected]
+
+    party_view = decode_pokemon(memoryview(party), 48, PARTY_POKEMON_SIZE)
+    assert party_view.max_hp.tolist() == [struct.unpack_from('<H', party, i * 100 + 88)[0] for i in range(48)]
+    try:
+        decode_pokemon(party, 1, 64)
+        raise AssertionError("unsupported stride should be rejected")
+    except ValueError:
+        pass
+    print("✅ Vectorized decode matches _decrypt_pokemon_data for all 24 substructure orders")
+
+
+def build_pc_dump() -> bytes:
+    """RAM image of the synthetic save with three Pokémon stored in the PC"""
+    source = SaveFileMemorySource(bytes(build_save()))
+    regions = {start: bytearray(view) for start, _, view in source.regions}
+    ewram = regions[EWRAM_START]
+    boxes = SaveFileMemorySource.POKEMON_STORAGE_ADDR - EWRAM_START
+    ewram[boxes] = 2  # current box index (0-based)
+    stored = [
+        (0, encode_pokemon(0x0000000B, 0xBEEF, bytes([0xB3, 0xB8, 0xB1, 0xC2, 0xBC]), 4,
+                           (10, 45, 0, 0), (35, 40, 0, 0), 0, 0, experience=135)),
+        (31, encode_pokemon(0x00000017, 0xBEEF, bytes([0xBB]), 133, (33, 0, 0, 0), (35, 0, 0, 0), 0, 0,
+                            experience=1000, held_item=13)),
+        (419, encode_pokemon(0xDEADBEEF, 0xBEEF, bytes([0xBC]), 25, (84, 0, 0, 0), (30, 0, 0, 0), 0, 0)),
+    ]
+    for index, pokemon in stored:
+        offset = boxes + PokemonFireRedReader.PC_BOXES_OFFSET + index * BOX_POKEMON_SIZE
+        ewram[offset:offset + BOX_POKEMON_SIZE] = pokemon[:BOX_POKEMON_SIZE]
+    return bytes(ewram) + bytes(regions[IWRAM_START])
+
+
+def test_read_pc_boxes():
+    """All 420 slots decode in one pass; only occupied slots are returned"""
+    reader = PokemonFireRedReader(BufferMemorySource(build_pc_dump()))
+    storage = reader.read_pc_boxes()
+    assert storage is not None
+    assert storage.current_box == 3
+    assert [(p.box, p.slot, p.species_id) for p in storage.pokemon] == [(1, 1, 4), (2, 2, 133), (14, 30, 25)]
+
+    charmander, eevee, pikachu = storage.pokemon
+    assert charmander.nickname == "CHARL", charmander.nickname
+    assert charmander.level == reader._calculate_level_from_experience(4, 135)
+    assert len(charmander.moves) == 2 and charmander.move_pp == [35, 40]
+    assert eevee.held_item == 13 and eevee.level == reader._calculate_level_from_experience(133, 1000)
+    assert pikachu.level == 1 and pikachu.move_pp == [30]
+
+    empty = PokemonFireRedReader(BufferMemorySource(bytes(0x48000))).read_pc_boxes()
+    assert empty is None  # null storage pointer
+    print("✅ read_pc_boxes decodes 420 slots and reports the occupied ones")
+
+
+def measure_decode(iterations: int = 500):
+    """Scalar per-slot decrypt vs. one vectorized pass, for the party and the PC"""
+    reader = PokemonFireRedReader(BufferMemorySource(bytes(0x48000)))
+    party = random_party(6)
+    pc = b"".join(mon[:BOX_POKEMON_SIZE] for mon in
+                  (random_party(PC_SLOTS, seed=1)[i:i + PARTY_POKEMON_SIZE]
+                   for i in range(0, PC_SLOTS * PARTY_POKEMON_SIZE, PARTY_POKEMON_SIZE)))
+
+    for label, data, count, stride in (("party x6", party, 6, PARTY_POKEMON_SIZE),
+                                       ("PC x420", pc, PC_SLOTS, BOX_POKEMON_SIZE)):
+        runs = max(1, iterations // (10 if count > 6 else 1))
+        start = time.perf_counter()
+        for _ in range(runs):
+            rows = scalar_decode(reader, data, stride)
+            [reader._calculate_level_from_experience(row[0], row[2]) for row in rows]
+        scalar_us = (time.perf_counter() - start) * 1e6 / runs
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            decoded = decode_pokemon(data, count, stride)
+            reader._levels.levels(decoded.species, decoded.experience)
+        vector_us = (time.perf_counter() - start) * 1e6 / runs
+        print(f"ℹ️  {label}: scalar {scalar_us:9.1f} µs, vectorized {vector_us:8.1f} µs "
+              f"({scalar_us / vector_us:.1f}x)")
+
+    reader = PokemonFireRedReader(BufferMemorySource(build_pc_dump()))
+    start = time.perf_counter()
+    for _ in range(iterations):
+        reader.read_pc_boxes()
+    print(f"ℹ️  read_pc_boxes end to end: {(time.perf_counter() - start) * 1e6 / iterations:.1f} µs")
+
+
+if __name__ == "__main__":
+    np.seterr(all='raise')
+    test_matches_scalar_decrypt()
+    test_read_pc_boxes()
+    measure_decode()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test the RAM event stream: typed events from diffs of the hot regions
+
+Drives RamWatcher over the synthetic FireRed save from test_memory_sources,
+patching RAM between polls, and checks that SpatialMemory and the healing
+bookmark system record what they are subscribed to.
+"""
+
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+eevee_dir = tests_dir.parent
+sys.path.insert(0, str(tests_dir))
+sys.path.insert(0, str(eevee_dir))
+
+from memory_sources import BufferMemorySource, SaveFileMemorySource, EWRAM_START, IWRAM_START
+from analyse_skyemu_ram import PokemonFireRedReader
+from test_memory_sources import build_save, MONEY_KEY
+from ram_snapshot import RamSnapshot
+from ram_events import (RamWatcher, RamEvent, PlayerMoved, MapChanged, HpChanged, Healed,
+                        BattleStarted, BattleEnded, ItemGained, MoneyChanged)
+from spatial_memory import SpatialMemory
+from healing_bookmark_system import HealingBookmarkSystem
+
+SAVE_BLOCK_1 = SaveFileMemorySource.SAVE_BLOCK_1_ADDR - EWRAM_START
+PARTY = SaveFileMemorySource.PARTY_DATA_ADDR - EWRAM_START
+BATTLE_FLAGS = PokemonFireRedReader.ADDRESSES['battle_type_flags'] - EWRAM_START
+ITEMS = PokemonFireRedReader.ADDRESSES['save_block_1'] + PokemonFireRedReader.ADDRESSES['items_pocket_start_offset'] - EWRAM_START
+
+
+class DumpSnapshotService:
+    """Stands in for RamSnapshotService: one capture of the dump per frame stamp"""
+
+    def __init__(self, ewram: bytearray, iwram: bytes):
+        self.ewram = ewram
+        self.iwram = iwram
+        self.frame_stamp = 0
+        self._snapshot = None
+
+    def advance(self):
+        self.frame_stamp += 1
+
+    def get_snapshot(self):
+        if self._snapshot is None or self._snapshot.frame_stamp != self.frame_stamp:
+            reader = PokemonFireRedReader(BufferMemorySource(bytes(self.ewram) + self.iwram))
+            self._snapshot = RamSnapshot(frame_stamp=self.frame_stamp, captured_at=time.time(),
+                                         memory=reader.capture_snapshot())
+        return self._snapshot
+
+
+def build_service() -> DumpSnapshotService:
+    source = SaveFileMemorySource(bytes(build_save()))
+    regions = {start: bytearray(view) for start, _, view in source.regions}
+    return DumpSnapshotService(regions[EWRAM_START], bytes(regions[IWRAM_START]))
+
+
+def set_hp(ewram: bytearray, slot: int, hp: int):
+    struct.pack_into('<H', ewram, PARTY + slot * 100 + 86, hp)
+
+
+def test_event_stream():
+    service = build_service()
+    ewram = service.ewram
+    watcher = RamWatcher(snapshot_service=service)
+    received = []
+    watcher.subscribe(RamEvent, received.append)
+
+    def step(buttons=None):
+        service.advance()
+        received.clear()
+        events = watcher.poll(buttons)
+        assert events == received
+        return events
+
+    with tempfile.TemporaryDirectory() as scratch:
+        spatial = SpatialMemory(Path(scratch) / "spatial_memory.json")
+        healing = HealingBookmarkSystem(Path(scratch) / "healing_bookmarks.db")
+        watcher.subscribe(MapChanged, spatial.on_map_changed)
+        watcher.subscribe(Healed, lambda event: healing.record_healed_event(
+            event, {"map_id": event.map[0] * 1000 + event.map[1], "x": event.position[0], "y": event.position[1],
+                    "location_name": "Pokemon Center"}, "test"))
+
+        assert step() == []  # baseline
+        assert watcher.poll() == [] and watcher.unchanged_polls == 1  # same capture
+
+        struct.pack_into('<H', ewram, SAVE_BLOCK_1, 13)
+        assert step(['right']) == [PlayerMoved(2, (12, 7), (13, 7))]
+
+        struct.pack_into('<HHBB', ewram, SAVE_BLOCK_1, 5, 0, 4, 3)
+        [event] = step(['up', 'up'])
+        assert isinstance(event, MapChanged) and event.from_map == (3, 2) and event.to_map == (3, 4)
+        assert event.direction == "up" and event.method == "walk"
+        assert spatial.map_connections[0].to_map == (3, 4)
+
+        struct.pack_into('<I', ewram, BATTLE_FLAGS, 0x4)
+        set_hp(ewram, 0, 5)
+        events = step(['a'])
+        assert HpChanged(4, 1, 20, 5, 22) in events and BattleStarted(4, 0x4) in events
+        struct.pack_into('<I', ewram, BATTLE_FLAGS, 0)
+        assert step(['a']) == [BattleEnded(5)]
+
+        struct.pack_into('<HH', ewram, ITEMS, 13, 7)
+        struct.pack_into('<I', ewram, SAVE_BLOCK_1 + 0x218, 2500 ^ MONEY_KEY)
+        events = step(['a'])
+        assert ItemGained(6, 13, 2, 7) in events and MoneyChanged(6, 3000, 2500) in events
+
+        set_hp(ewram, 0, 22)
+        set_hp(ewram, 1, 19)
+        events = step(['a'])
+        assert [type(event) for event in events] == [HpChanged, HpChanged, Healed]
+        healed = events[-1]
+        assert healed.fainted_before == 1 and healed.map == (3, 4) and healed.position == (5, 0)
+        [location] = healing.get_all_healing_locations()
+        assert location["success_count"] == 1 and location["map_id"] == 3004
+
+        assert step() == []  # nothing else changed
+        assert watcher.get_stats()["events"]["Healed"] == 1
+    print("✅ RAM watcher emits typed events and drives SpatialMemory and healing bookmarks")
+
+
+if __name__ == "__main__":
+    test_event_stream()
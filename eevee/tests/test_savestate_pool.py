@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test the in-memory savestate pool against the stub server
+
+Checks save/load round trips, LRU eviction under the MB budget, automatic
+checkpoints on interval/map/battle events, and that rollback(n) restores
+the right checkpoint with one emulator load.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+sys.path.insert(0, str(tests_dir))
+sys.path.append(str(tests_dir.parent))
+
+from skyemu_stub_server import StubSkyEmuServer
+from skyemu_controller import SkyEmuController
+from savestate_pool import SavestatePool, SavestateSlot, scratch_dir_for
+from ram_events import MapChanged, BattleStarted, PlayerMoved
+
+MARKER = 0x02000000  # first EWRAM byte stands in for "game progress"
+
+
+def set_marker(server, value: int):
+    server.state.write(MARKER, bytes([value]))
+
+
+def marker(server) -> int:
+    return server.state.read(MARKER, 1)[0]
+
+
+def test_save_load_and_eviction():
+    """Slots round-trip; the least recently used slot goes first when over budget"""
+    with StubSkyEmuServer() as server, tempfile.TemporaryDirectory() as scratch:
+        controller = SkyEmuController(host=server.host, port=server.port)
+        state_size = 4 + sum(len(region) for region in server.state.regions.values())
+        pool = SavestatePool(controller, budget_mb=2.5 * state_size / 1024 / 1024, scratch_dir=scratch)
+
+        for value, name in ((1, "a"), (2, "b")):
+            set_marker(server, value)
+            assert pool.save(name)
+        set_marker(server, 9)
+        assert pool.load("a") and marker(server) == 1  # "a" is now most recently used
+
+        set_marker(server, 3)
+        assert pool.save("c")
+        assert [slot["name"] for slot in pool.list_slots()] == ["a", "c"], pool.list_slots()
+        assert pool.evictions == 1 and not pool.load("b")
+        assert list(Path(pool.scratch_dir).iterdir()) == []  # scratch files are transient
+
+        pool.close()
+        assert not Path(pool.scratch_dir).exists()
+    print("✅ Savestate slots round-trip and evict least recently used beyond the budget")
+
+
+def test_checkpoints_and_rollback():
+    """Interval and event checkpoints; rollback(n) restores with a single /load"""
+    with StubSkyEmuServer() as server, tempfile.TemporaryDirectory() as scratch:
+        controller = SkyEmuController(host=server.host, port=server.port)
+        pool = SavestatePool(controller, budget_mb=16, checkpoint_every=5, scratch_dir=scratch)
+
+        map_changed = MapChanged(0, (3, 0), (3, 1), (5, 0), (5, 20), direction="up")
+        for turn in range(1, 13):
+            set_marker(server, turn)
+            events = [PlayerMoved(turn, (0, 0), (0, 1))]
+            if turn == 7:
+                events.append(map_changed)
+            if turn == 8:
+                events.append(BattleStarted(turn, 0x4))
+            pool.maybe_checkpoint(turn, events)
+
+        checkpoints = pool.checkpoints()
+        assert [(slot.turn, slot.reason) for slot in checkpoints] == [
+            (5, "interval"), (7, "MapChanged"), (8, "BattleStarted"), (10, "interval")]
+
+        loads_before = server.state.request_counts.get("load", 0)
+        restored = pool.rollback(2)
+        assert restored.turn == 8 and marker(server) == 8
+        assert server.state.request_counts["load"] - loads_before == 1
+        assert [slot.turn for slot in pool.checkpoints()] == [5, 7, 8]  # the undone branch is dropped
+
+        assert pool.rollback(1).turn == 8  # latest checkpoint can be restored repeatedly
+        assert pool.rollback(4) is None
+        stats = pool.get_stats()
+        assert stats["checkpoints"] == 3 and stats["loads"] == 2
+        pool.close()
+        print(f"✅ Checkpoints on interval/map/battle; rollback restores in one load "
+              f"(save {stats['avg_save_ms']} ms, load {stats['avg_load_ms']} ms)")
+
+
+def test_remote_endpoints_and_failures():
+    """No scratch directory for a remote SkyEmu unless one is configured; failed saves are not fatal"""
+    import os
+    assert scratch_dir_for("localhost") and scratch_dir_for("127.0.0.1") and scratch_dir_for("::1")
+    assert scratch_dir_for("skyemu-3.internal") is None and scratch_dir_for("10.0.0.7") is None
+    os.environ["SKYEMU_SCRATCH_DIR"] = "/mnt/shared"
+    try:
+        assert scratch_dir_for("10.0.0.7") == "/mnt/shared"
+    finally:
+        del os.environ["SKYEMU_SCRATCH_DIR"]
+
+    class BrokenController:
+        host = "localhost"
+
+        def save_state(self, filename, quiet=False):
+            raise ConnectionError("SkyEmu went away")
+
+        def load_state(self, filename, quiet=False):
+            raise ConnectionError("SkyEmu went away")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        pool = SavestatePool(BrokenController(), scratch_dir=scratch)
+        assert not pool.save("manual") and not pool.maybe_checkpoint(10)
+        pool._slots["kept"] = SavestateSlot("kept", b"state", 5, "manual", 0.0)
+        assert not pool.load("kept") and (pool.saves, pool.loads) == (0, 0)
+    print("✅ Remote SkyEmu gets no scratch directory; save/load failures are reported, not raised")
+
+
+if __name__ == "__main__":
+    test_save_load_and_eviction()
+    test_checkpoints_and_rollback()
+    test_remote_endpoints_and_failures()
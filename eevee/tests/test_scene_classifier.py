@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test the local scene classifier on the recorded screenshots
+
+Dialogue boxes and both battle screens must be recognized, overworld and
+Pokemon Center frames left to the vision model; a start menu is drawn onto
+an overworld frame. Also checks the RAM battle flag override, the analysis
+data handed to the strategic stage and the per-frame cost.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+sys.path.insert(0, str(tests_dir.parent))
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from scene_classifier import SceneClassifier
+
+EXPECTED = {
+    "step_talking_NPC.png": ("dialogue", "text_box"),
+    "step_battle_opening.png": ("battle", "message"),
+    "step_battle_fight_moves.png": ("battle", "menu"),
+    "step_overworld_alone.png": (None, ""),
+    "step_overworld_withNPC.png": (None, ""),
+    "pokecenter_1.png": (None, ""),
+    "pokecenter_2.png": (None, ""),
+    "pokecenter_3.png": (None, ""),
+}
+
+
+def load(name: str) -> np.ndarray:
+    return np.asarray(Image.open(tests_dir / name).convert("RGB"))
+
+
+def with_start_menu(name: str) -> np.ndarray:
+    """Overworld frame with FireRed's start menu box in the top-right corner"""
+    image = Image.open(tests_dir / name).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((170, 2, 238, 118), fill=(248, 248, 248), outline=(96, 96, 96), width=2)
+    for row, label in enumerate(["POKéDEX", "POKéMON", "BAG", "RED", "SAVE", "OPTION", "EXIT"]):
+        draw.text((186, 8 + row * 15), label, fill=(96, 96, 96))
+    return np.asarray(image)
+
+
+def test_screenshots():
+    classifier = SceneClassifier()
+    for name, (scene, detail) in EXPECTED.items():
+        result = classifier.classify(load(name))
+        assert (result.scene, result.detail) == (scene, detail), (name, result)
+
+    result = classifier.classify(with_start_menu("step_overworld_alone.png"))
+    assert (result.scene, result.detail) == ("menu", "start_menu"), result.signals
+    assert classifier.classify(np.zeros((96, 160, 3), dtype=np.uint8)).scene is None
+    print(f"✅ Scenes recognized on {len(EXPECTED) + 1} frames: dialogue, battle message/menu, start menu; "
+          f"overworld left to the vision model")
+
+
+def test_ram_battle_flags():
+    classifier = SceneClassifier()
+    overworld = load("step_overworld_alone.png")
+    assert classifier.classify(overworld, battle_flags=0).scene is None
+    # Flags left over from the last battle: the overworld still goes to the vision model
+    assert classifier.classify(overworld, battle_flags=0x4).scene is None
+    battle = load("step_battle_fight_moves.png")
+    assert classifier.classify(battle).source == "pixels"
+    result = classifier.classify(battle, battle_flags=0x4)
+    assert (result.scene, result.source) == ("battle", "ram")
+    print("✅ RAM battle flags only confirm a battle screen; stale flags do not make one")
+
+
+def test_local_analysis():
+    classifier = SceneClassifier()
+    previous = {"scene_type": "pokemon_center", "recommended_template": "pokemon_center_navigation"}
+
+    dialogue = classifier.local_analysis(classifier.classify(load("step_talking_NPC.png")), previous)
+    assert dialogue["scene_type"] == "menu" and dialogue["recommended_template"] == "pokemon_center_navigation"
+    assert [button["key"] for button in dialogue["valid_buttons"]] == ["A", "B"]
+
+    battle = classifier.local_analysis(classifier.classify(load("step_battle_fight_moves.png")), previous)
+    assert battle["scene_type"] == "battle" and battle["recommended_template"] == "battle_analysis"
+
+    # After a battle, dialogue falls back to the exploration template rather than staying on battle_analysis
+    after_battle = classifier.local_analysis(classifier.classify(load("step_talking_NPC.png")), battle)
+    assert after_battle["recommended_template"] == "exploration_strategy"
+
+    for key in ("scene_type", "recommended_template", "valid_buttons", "confidence", "valid_movements",
+                "spatial_context", "visual_description", "template_reason"):
+        assert key in battle and key in dialogue
+    stats = classifier.get_stats()
+    assert stats["vision_calls_saved"] == 3 and stats["scenes"] == {"dialogue": 2, "battle": 1}
+    print("✅ Local analysis has the visual analysis fields and keeps the previous template for dialogue")
+
+
+def measure_classifier(iterations: int = 300):
+    classifier = SceneClassifier()
+    frames = [load(name) for name in EXPECTED]
+    start = time.perf_counter()
+    for step in range(iterations):
+        classifier.classify(frames[step % len(frames)])
+    per_frame_ms = (time.perf_counter() - start) * 1000 / iterations
+    assert per_frame_ms < 1.0, per_frame_ms
+    print(f"ℹ️  scene classification: {per_frame_ms:.3f} ms per frame")
+
+
+if __name__ == "__main__":
+    test_screenshots()
+    test_ram_battle_flags()
+    test_local_analysis()
+    measure_classifier()
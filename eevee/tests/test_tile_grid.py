@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized tile grid engine against the per-tile reference loop
+
+The reference is the original make_ascii_map classifier (PIL crop, OpenCV
+HSV conversion and classification one tile at a time). Checks identical
+classifications on the recorded screenshots, 15x10 metatile statistics, the
+NumPy HSV fallback, opt-in debug output and EeveeAgent's navigation grid.
+Run directly to also print the per-tile vs. vectorized timing.
+"""
+
+import base64
+import sys
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+project_root = tests_dir.parent.parent
+sys.path.insert(0, str(tests_dir))
+sys.path.insert(0, str(tests_dir.parent))
+sys.path.append(str(project_root / "gemini-multimodal-playground" / "standalone"))
+
+import cv2
+import numpy as np
+from PIL import Image
+
+import tile_grid
+from tile_grid import TileGrid, rgb_to_hsv
+
+SCREENSHOTS = sorted(tests_dir.glob("*.png"))
+GBA_SCREEN = tests_dir / "pokecenter_1.png"  # 240x160
+
+
+def reference_classify(tile_array, position):
+    """The original classify_tile_hsv from make_ascii_map"""
+    y, x = position
+    tile_bgr = cv2.cvtColor(tile_array, cv2.COLOR_RGB2BGR)
+    tile_hsv = cv2.cvtColor(tile_bgr, cv2.COLOR_BGR2HSV)
+    h, s, v = np.mean(tile_hsv, axis=(0, 1)).astype(int)
+    if 44 <= h <= 48 and s > 175 and 125 <= v <= 160:
+        return "T", False
+    elif 30 <= h <= 32 and 125 <= s <= 145 and v > 200:
+        return "-", True
+    elif 40 <= h <= 52 and v > 150:
+        if 3 <= y <= 4:
+            return ".", True
+        elif s < 160:
+            return ".", True
+        walkable_positions = [(0, 2), (1, 2), (1, 4), (1, 7), (2, 1), (3, 1), (3, 2), (5, 4), (5, 7)]
+        return ".", (y, x) in walkable_positions
+    elif 90 < h < 130 and s > 50:
+        return "~", False
+    elif s < 40 and v < 100:
+        return "#", False
+    elif (0 <= h < 20 or 160 < h <= 179) and s > 50 and v > 80:
+        return "B", False
+    return ".", True
+
+
+def reference_grid(img: Image.Image, cols: int = 8, rows: int = 8):
+    """Per-tile crop loop: (chars, walkable, mean_rgb) like the original implementation"""
+    tile_w, tile_h = img.width // cols, img.height // rows
+    chars, walkable, mean_rgb = [], [], []
+    for y in range(rows):
+        for x in range(cols):
+            tile = np.array(img.crop((x * tile_w, y * tile_h, (x + 1) * tile_w, (y + 1) * tile_h)))
+            char, ok = reference_classify(tile, (y, x))
+            chars.append(char)
+            walkable.append(ok)
+            mean_rgb.append(np.mean(tile, axis=(0, 1)).astype(int))
+    return (np.array(chars).reshape(rows, cols), np.array(walkable).reshape(rows, cols),
+            np.array(mean_rgb).reshape(rows, cols, 3))
+
+
+def synthetic_frames(count: int = 20, seed: int = 0):
+    """Blocky frames painted with the colours the classifier looks for"""
+    rng = np.random.default_rng(seed)
+    palette = np.array([[56, 120, 40], [120, 200, 80], [232, 216, 128], [64, 96, 224], [48, 48, 48],
+                        [200, 64, 48], [160, 160, 160], [90, 180, 60], [84, 140, 36]], dtype=np.uint8)
+    for _ in range(count):
+        blocks = palette[rng.integers(0, len(palette), size=(10, 15))]
+        frame = blocks.repeat(16, axis=0).repeat(16, axis=1)
+        noise = rng.integers(-12, 13, size=frame.shape)
+        yield Image.fromarray(np.clip(frame.astype(int) + noise, 0, 255).astype(np.uint8))
+
+
+def test_matches_reference():
+    images = [Image.open(path).convert("RGB") for path in SCREENSHOTS] + list(synthetic_frames())
+    engine = TileGrid("8x8")
+    seen = set()
+    for img in images:
+        result = engine.analyze(np.asarray(img))
+        chars, walkable, mean_rgb = reference_grid(img)
+        assert (result.chars == chars).all() and (result.walkable == walkable).all()
+        assert (result.mean_rgb == mean_rgb).all()
+        seen.update(chars.ravel().tolist())
+    assert {"T", "~", "#", "B", "."} <= seen, seen
+    print(f"✅ 8x8 classification identical to the per-tile loop on {len(images)} frames (classes {sorted(seen)})")
+
+
+def test_metatile_grid():
+    img = next(synthetic_frames(1, seed=3))
+    engine = TileGrid("15x10")
+    result = engine.analyze(np.asarray(img))
+    assert result.shape == (10, 15) and engine.player_tile == (5, 7)
+
+    hsv = cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2HSV)
+    for y, x in ((0, 0), (4, 9), (9, 14)):
+        tile = hsv[y * 16:(y + 1) * 16, x * 16:(x + 1) * 16]
+        assert (result.mean_hsv[y, x] == np.mean(tile, axis=(0, 1)).astype(int)).all()
+
+    grid_text = engine.format_grid(result).splitlines()
+    assert grid_text[0] == "  012345678901234" and grid_text[6][2 + 7] == "P"
+    print("✅ 15x10 metatile grid: 16x16 tiles, per-tile HSV means match")
+
+
+def test_numpy_hsv_fallback():
+    screens = [np.asarray(Image.open(path).convert("RGB")).reshape(-1, 3) for path in SCREENSHOTS]
+    every_colour = np.random.default_rng(0).integers(0, 256, size=(200000, 3), dtype=np.uint8)
+    pixels = np.concatenate(screens + [every_colour])
+    expected = cv2.cvtColor(pixels[None], cv2.COLOR_RGB2HSV)[0]
+    tile_grid.CV2_AVAILABLE = False
+    try:
+        actual = rgb_to_hsv(pixels)
+    finally:
+        tile_grid.CV2_AVAILABLE = True
+    assert (actual == expected).all()
+    print(f"✅ NumPy HSV fallback identical to OpenCV on {len(pixels)} pixels")
+
+
+def test_make_ascii_map_debug_opt_in():
+    import os
+    from skyemu_stub_server import StubSkyEmuServer
+
+    # The module connects a SkyEmu client at import time
+    with StubSkyEmuServer() as server:
+        os.environ["SKYEMU_HOST"], os.environ["SKYEMU_PORT"] = server.host, str(server.port)
+        try:
+            from screen_tiling_to_ascii import make_ascii_map
+        finally:
+            del os.environ["SKYEMU_HOST"], os.environ["SKYEMU_PORT"]
+
+    img = Image.open(GBA_SCREEN).convert("RGB")
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+    with tempfile.TemporaryDirectory() as scratch:
+        cwd = os.getcwd()
+        os.chdir(scratch)
+        try:
+            text = make_ascii_map(encoded, None)
+            assert not Path("tiles").exists() and "Debug Info" not in text
+            text = make_ascii_map(encoded, None, grid="15x10", debug=True)
+            assert Path("tiles/tile_analysis.txt").exists() and len(list(Path("tiles").glob("*.jpg"))) == 150
+        finally:
+            os.chdir(cwd)
+    assert text.startswith("Pokemon 15x10 Grid Map:")
+    print("✅ make_ascii_map writes tiles only when debug=True")
+
+
+def test_eevee_navigation_grid():
+    from eevee_agent import EeveeAgent
+
+    agent = EeveeAgent.__new__(EeveeAgent)  # grid only needs memory/verbose, not the emulator
+    agent.memory = None
+    agent.verbose = False
+    buffer = BytesIO()
+    Image.open(GBA_SCREEN).convert("RGB").save(buffer, format="PNG")
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+
+    rows = agent._create_ascii_grid_overlay(encoded).splitlines()
+    assert rows[0] == "  01234567" and rows[5] == "4 ....P..." and len(rows) == 9
+
+    # The native grid goes through the metatile atlas (15x9 metatiles below the half row)
+    import metatile_atlas
+    with tempfile.TemporaryDirectory() as scratch:
+        metatile_atlas._global_metatile_atlas = metatile_atlas.MetatileAtlas(Path(scratch) / "atlas.db")
+        try:
+            rows = agent._create_ascii_grid_overlay(encoded, grid="15x10").splitlines()
+        finally:
+            metatile_atlas._global_metatile_atlas = None
+    assert len(rows) == 10 and rows[5][2 + 7] == "P"
+    print("✅ EeveeAgent navigation grid built by the shared engine (8x8 and 15x10)")
+
+
+def measure_grid(iterations: int = 50):
+    img = Image.open(GBA_SCREEN).convert("RGB")
+    start = time.perf_counter()
+    for _ in range(iterations):
+        reference_grid(img)
+    loop_ms = (time.perf_counter() - start) * 1000 / iterations
+
+    engine = TileGrid("8x8")
+    start = time.perf_counter()
+    for _ in range(iterations):
+        engine.analyze(np.asarray(img))
+    vector_ms = (time.perf_counter() - start) * 1000 / iterations
+    print(f"ℹ️  8x8 grid: per-tile loop {loop_ms:.2f} ms, vectorized {vector_ms:.2f} ms ({loop_ms / vector_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    test_matches_reference()
+    test_metatile_grid()
+    test_numpy_hsv_fallback()
+    test_make_ascii_map_debug_opt_in()
+    test_eevee_navigation_grid()
+    measure_grid()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test the turn pipeline pieces used by ContinuousGameplay
+
+The background writer must keep submission order, coalesce rewrites of the
+same file and survive failing jobs; the capture prefetcher must hand over a
+frame captured after the settle delay and drop stale, failed or cancelled
+ones. tests/benchmark_turn_loop.py runs the whole loop (--sequential to compare).
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+tests_dir = Path(__file__).parent
+sys.path.insert(0, str(tests_dir.parent))
+
+from turn_pipeline import BackgroundWriter, CapturePrefetcher, StageTimer
+
+
+def test_writer_order_and_coalescing():
+    writer = BackgroundWriter(name="TestWriter")
+    gate = threading.Event()
+    written = []
+
+    # Hold the writer so later jobs queue up behind the first one
+    writer.submit("gate", gate.wait)
+    writer.submit("neo4j_turn", written.append, "turn 1")
+    for turn in range(1, 6):
+        writer.submit("session_file", written.append, f"session file after turn {turn}", coalesce_key="session.json")
+    writer.submit("neo4j_turn", written.append, "turn 2")
+    writer.submit("broken", lambda: 1 / 0)
+    writer.submit("neo4j_turn", written.append, "turn 3")
+    assert writer.depth >= 4
+    gate.set()
+    writer.flush()
+
+    assert written == ["turn 1", "session file after turn 5", "turn 2", "turn 3"]
+    stats = writer.get_stats()
+    assert (stats["coalesced"], stats["failed"], stats["pending"]) == (4, 1, 0)
+    assert stats["max_pending"] >= 4 and stats["jobs"]["neo4j_turn"]["count"] == 3
+    print(f"✅ Writer keeps order, coalesces file rewrites and survives failing jobs ({stats['max_pending']} max pending)")
+
+
+def test_prefetch():
+    captures = []
+
+    def capture():
+        captures.append(time.perf_counter())
+        return {"frame": len(captures), "screenshot_data": "..."}
+
+    prefetcher = CapturePrefetcher(capture)
+    assert prefetcher.take() is None  # nothing started
+
+    started = time.perf_counter()
+    prefetcher.start(settle_delay=0.05)
+    time.sleep(0.01)  # the loop's bookkeeping overlaps the settle delay
+    context = prefetcher.take()
+    assert context["frame"] == 1 and captures[0] - started >= 0.05
+
+    # Cancelled (pause/rollback) and stale prefetches are not handed over
+    prefetcher.start(settle_delay=0.05)
+    time.sleep(0.01)  # the worker is already in its settle delay
+    prefetcher.cancel()
+    assert prefetcher.take() is None
+    time.sleep(0.08)
+    assert len(captures) == 1, "a cancelled prefetch still captured"
+
+    prefetcher.max_age = 0.01
+    prefetcher.start()
+    time.sleep(0.05)
+    assert prefetcher.take() is None
+
+    failing = CapturePrefetcher(lambda: {"error": "SkyEmu returned no frame"})
+    failing.start()
+    assert failing.take() is None
+    exploding = CapturePrefetcher(lambda: 1 / 0)
+    exploding.start()
+    assert exploding.take() is None and exploding.get_stats()["failed"] == 1
+
+    # cancel(wait=True) returns only after a capture in progress has finished (rollback loads a state next)
+    in_capture = []
+    slow = CapturePrefetcher(lambda: in_capture.append("start") or time.sleep(0.05) or in_capture.append("end"))
+    slow.start()
+    time.sleep(0.01)
+    slow.cancel(wait=True)
+    assert in_capture == ["start", "end"]
+    slow.close()
+
+    prefetcher.close()
+    prefetcher.max_age = 2.0
+    prefetcher.start()  # usable again after close
+    assert prefetcher.take()["frame"] == len(captures)
+    stats = prefetcher.get_stats()
+    assert (stats["used"], stats["stale"], stats["cancelled"]) == (2, 1, 1)
+    print(f"✅ Prefetched frames are captured after the settle delay; stale/cancelled ones are dropped ({stats})")
+
+
+def test_stage_timer():
+    timer = StageTimer()
+    for _ in range(3):
+        with timer.stage("capture"):
+            time.sleep(0.002)
+    try:
+        with timer.stage("ai_decision"):
+            raise RuntimeError("provider down")
+    except RuntimeError:
+        pass
+    stats = timer.get_stats()
+    assert stats["capture"]["count"] == 3 and stats["capture"]["avg_ms"] >= 2.0
+    assert stats["ai_decision"]["count"] == 1
+    print("✅ Stage timer records every stage, including ones that raise")
+
+
+if __name__ == "__main__":
+    test_writer_order_and_coalescing()
+    test_prefetch()
+    test_stage_timer()
@@ -0,0 +1,417 @@
+"""
+Turn Pipeline for Eevee
+Overlaps the stages of a gameplay turn: persistence (Neo4j turn storage,
+session JSON rewrites) runs on a background writer, and the next frame is
+captured on a worker as soon as the inputs are issued, so a turn costs
+little more than its LLM calls. Periodic episode reviews run on their own
+worker and are applied at a turn boundary. Stage times and queue depths are
+kept for tuning.
+"""
+
+import atexit
+import copy
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+PREFETCH_MAX_AGE = 2.0  # seconds; older prefetched frames are re-captured (same limit as RAM snapshots)
+REVIEW_TIMEOUT = 180.0  # seconds; a review still running after this is abandoned and its result discarded
+
+
+class BackgroundWriter:
+    """
+    Runs persistence jobs in submission order on a daemon thread
+
+    Jobs with a coalesce_key replace a still-pending job with the same key, so
+    a file rewritten every turn is written once however far the writer lags.
+    The queue is bounded: when it is full, submit() waits (backpressure).
+    """
+
+    def __init__(self, name: str = "TurnWriter", max_pending: int = 32):
+        """
+        Args:
+            name: Thread name
+            max_pending: Jobs queued before submit() blocks
+        """
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._coalesced: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.submit_wait_ms = 0.0
+        self._job_ms = defaultdict(list)
+
+    def submit(self, label: str, function: Callable, *args, coalesce_key: Optional[str] = None) -> None:
+        """
+        Queue function(*args)
+
+        Args:
+            label: Job name for the stats
+            function: Callable run on the writer thread; arguments must not be mutated afterwards
+            coalesce_key: Pending jobs with the same key are replaced by this one
+        """
+        with self._lock:
+            self.submitted += 1
+            if coalesce_key is not None:
+                pending = coalesce_key in self._coalesced
+                self._coalesced[coalesce_key] = (label, function, args)
+                if pending:
+                    self.coalesced += 1
+                    return
+                item = ("coalesced", coalesce_key)
+            else:
+                item = ("job", (label, function, args))
+
+        start = time.perf_counter()
+        self._queue.put(item)
+        self.submit_wait_ms += (time.perf_counter() - start) * 1000
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def _run(self) -> None:
+        while True:
+            kind, payload = self._queue.get()
+            try:
+                if kind == "coalesced":
+                    with self._lock:
+                        payload = self._coalesced.pop(payload)
+                label, function, args = payload
+                start = time.perf_counter()
+                try:
+                    function(*args)
+                    self.completed += 1
+                except Exception as e:
+                    self.failed += 1
+                    print(f"⚠️ Background write '{label}' failed: {e}")
+                self._job_ms[label].append((time.perf_counter() - start) * 1000)
+            finally:
+                self._queue.task_done()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self) -> None:
+        """Block until every queued job has run"""
+        self._queue.join()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "coalesced": self.coalesced,
+            "pending": self.depth,
+            "max_pending": self.max_depth,
+            "submit_wait_ms": round(self.submit_wait_ms, 1),
+            "jobs": {label: {"count": len(samples), "avg_ms": round(sum(samples) / len(samples), 2),
+                             "max_ms": round(max(samples), 2)}
+                     for label, samples in self._job_ms.items() if samples},
+        }
+
+
+class CapturePrefetcher:
+    """
+    Captures the next turn's game context on a worker thread
+
+    start() is called once the turn is done with the controller (inputs issued,
+    RAM events polled, savestate checkpointed) so the worker never shares it;
+    the worker waits out the rest of the settle delay (the loop's turn_delay)
+    and captures while the loop finishes its bookkeeping. take() hands the
+    result to the next turn, or None when nothing usable was prefetched
+    (cancelled, failed or older than max_age), in which case the caller
+    captures directly. A cancelled prefetch never touches the controller once
+    its settle delay is interrupted; cancel(wait=True) also waits out a
+    capture already in progress.
+    """
+
+    def __init__(self, capture: Callable[[], Dict[str, Any]], max_age: float = PREFETCH_MAX_AGE):
+        """
+        Args:
+            capture: Returns a game context dict (ContinuousGameplay._capture_game_context)
+            max_age: Seconds after which a prefetched context is too stale to use
+        """
+        self.capture = capture
+        self.max_age = max_age
+        self._executor = None  # created on first start(), shut down by close()
+        self._future = None
+        self._cancel_event = None  # set to stop the pending prefetch before it captures
+
+        # Metrics
+        self.started = 0
+        self.used = 0
+        self.stale = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.wait_ms = 0.0
+
+    def _run(self, settle_delay: float, cancelled: threading.Event):
+        # Waiting on the event (not sleeping) lets cancel() cut the settle delay short
+        if cancelled.wait(max(settle_delay, 0.0)):
+            return time.time(), None
+        context = self.capture()
+        return time.time(), context
+
+    def start(self, settle_delay: float = 0.0) -> None:
+        """Begin capturing the next frame after settle_delay seconds (replaces any unused prefetch)"""
+        self.cancel()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="CapturePrefetch")
+        self.started += 1
+        self._cancel_event = threading.Event()
+        self._future = self._executor.submit(self._run, settle_delay, self._cancel_event)
+
+    def cancel(self, wait: bool = False) -> None:
+        """
+        Discard the pending prefetch (pause, rollback: the frame would no longer match the game)
+
+        Args:
+            wait: Block until a capture that already started has finished, so
+                  the caller can use the controller (e.g. load a savestate)
+        """
+        if self._future is None:
+            return
+        future, self._future = self._future, None
+        self._cancel_event.set()
+        future.cancel()
+        self.cancelled += 1
+        if wait and not future.cancelled():
+            try:
+                future.result()
+            except Exception:
+                pass  # The capture is discarded either way
+
+    @property
+    def pending(self) -> int:
+        return int(self._future is not None)
+
+    def take(self) -> Optional[Dict[str, Any]]:
+        """Wait for the prefetched context; None if there is nothing usable"""
+        future, self._future = self._future, None
+        if future is None:
+            return None
+        start = time.perf_counter()
+        try:
+            captured_at, context = future.result()
+        except Exception as e:
+            self.failed += 1
+            print(f"⚠️ Prefetched capture failed, capturing again: {e}")
+            return None
+        finally:
+            self.wait_ms += (time.perf_counter() - start) * 1000
+        if not context or context.get("error") or time.time() - captured_at > self.max_age:
+            self.stale += 1
+            return None
+        self.used += 1
+        return context
+
+    def close(self) -> None:
+        """Drop the pending prefetch and wait for a capture already in progress"""
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "started": self.started,
+            "used": self.used,
+            "stale": self.stale,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "pending": self.pending,
+            "avg_wait_ms": round(self.wait_ms / (self.used + self.stale + self.failed), 2)
+            if (self.used + self.stale + self.failed) else 0.0,
+        }
+
+
+class BackgroundReviewer:
+    """
+    Runs periodic episode reviews off the turn loop
+
+    submit() deep-copies the review inputs and hands them to compute() on a
+    worker thread; compute() may call LLMs but must not touch shared state.
+    Its result is passed to apply() on the loop thread by the next poll(), so
+    review changes (goal hierarchy, okr.json, templates) land between turns,
+    all at once. Policy: a review submitted while another is running is
+    skipped; one running longer than timeout is abandoned (its worker is left
+    to finish and the result is dropped); cancel() drops the running one.
+    Time the loop spends in submit/poll/apply is counted as blocked.
+    """
+
+    def __init__(self, compute: Callable[..., Any], apply: Callable[[Any], Any],
+                 timeout: float = REVIEW_TIMEOUT, background: bool = True):
+        """
+        Args:
+            compute: compute(turn, *snapshot) -> review result, run on the worker
+            apply: apply(result), run on the loop thread at a turn boundary
+            timeout: Seconds before a running review is abandoned
+            background: False runs compute and apply inline in submit() (sequential loop)
+        """
+        self.compute = compute
+        self.apply = apply
+        self.timeout = timeout
+        self.background = background
+        self._executor = None
+        self._future = None
+        self._started_at = 0.0
+        self._turn = None
+
+        # Metrics
+        self.started = 0
+        self.applied = 0
+        self.failed = 0
+        self.skipped = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self.blocked_ms = 0.0
+        self.max_blocked_ms = 0.0
+        self._review_seconds = []
+
+    @contextmanager
+    def _blocking(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.blocked_ms += elapsed
+            self.max_blocked_ms = max(self.max_blocked_ms, elapsed)
+
+    def _run(self, turn: int, snapshot: tuple):
+        start = time.perf_counter()
+        try:
+            return self.compute(turn, *snapshot)
+        finally:
+            self._review_seconds.append(time.perf_counter() - start)
+
+    @property
+    def running(self) -> bool:
+        return self._future is not None
+
+    def submit(self, turn: int, *snapshot) -> bool:
+        """
+        Start a review of a snapshot of the loop state
+
+        Args:
+            turn: Turn the review was requested at
+            snapshot: Arguments for compute(); deep-copied so later turns cannot change them
+
+        Returns:
+            False if skipped because a review is still running
+        """
+        self.poll()  # applies a review that finished since the last boundary, enforces the timeout
+        if self._future is not None:
+            self.skipped += 1
+            print(f"⏭️ Episode review for turn {turn} skipped: review of turn {self._turn} still running")
+            return False
+
+        with self._blocking():
+            snapshot = copy.deepcopy(snapshot)
+            self.started += 1
+            if not self.background:
+                try:
+                    self.apply(self._run(turn, snapshot))
+                    self.applied += 1
+                except Exception as e:
+                    self.failed += 1
+                    print(f"⚠️ Episode review for turn {turn} failed: {e}")
+                return True
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="EpisodeReview")
+            self._turn = turn
+            self._started_at = time.time()
+            self._future = self._executor.submit(self._run, turn, snapshot)
+        return True
+
+    def poll(self) -> bool:
+        """
+        Turn-boundary check: apply a finished review, abandon one past the timeout
+
+        Returns:
+            True if a review was applied
+        """
+        future = self._future
+        if future is None:
+            return False
+        if not future.done():
+            if time.time() - self._started_at > self.timeout:
+                self.timed_out += 1
+                print(f"⏱️ Episode review for turn {self._turn} exceeded {self.timeout:g}s, discarding it")
+                self._abandon()
+            return False
+
+        self._future = None
+        with self._blocking():
+            try:
+                self.apply(future.result())
+                self.applied += 1
+                return True
+            except Exception as e:
+                self.failed += 1
+                print(f"⚠️ Episode review for turn {self._turn} failed: {e}")
+                return False
+
+    def _abandon(self) -> None:
+        # The worker thread cannot be interrupted; leave it to finish on the old executor
+        self._future.cancel()
+        self._future = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def cancel(self) -> None:
+        """Drop the running review without applying it (session end, rollback)"""
+        if self._future is not None:
+            self.cancelled += 1
+            self._abandon()
+
+    def close(self) -> None:
+        """Cancel any running review; does not wait for its LLM calls"""
+        self.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "started": self.started,
+            "applied": self.applied,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled,
+            "running": self.running,
+            "blocked_ms": round(self.blocked_ms, 1),
+            "max_blocked_ms": round(self.max_blocked_ms, 1),
+            "avg_review_s": round(sum(self._review_seconds) / len(self._review_seconds), 2)
+            if self._review_seconds else 0.0,
+        }
+
+
+class StageTimer:
+    """Wall time per turn-loop stage"""
+
+    def __init__(self):
+        self._samples = defaultdict(list)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._samples[name].append((time.perf_counter() - start) * 1000)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        return {name: {"count": len(samples), "avg_ms": round(sum(samples) / len(samples), 2),
+                       "max_ms": round(max(samples), 2)}
+                for name, samples in self._samples.items() if samples}
@@ -10,7 +10,7 @@ import re
 import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
 from io import BytesIO
 # Import prompt manager to get universal template
 from prompt_manager import PromptManager
@@ -28,6 +28,10 @@ sys.path.append(str(project_root / "gemini-multimodal-playground" / "standalone"
 try:
     from skyemu_controller import SkyEmuController
     from llm_api import call_llm
+    from game_frame import GameFrame, FrameSink
+    from frame_fingerprint import FrameAnalysisCache, fingerprint_frame
+    from overlay_renderer import GridOverlayRenderer
+    from image_encoder import get_image_encoder
 except ImportError as e:
     print(f"Error importing required modules: {e}")
     raise
@@ -35,7 +39,8 @@ except ImportError as e:
 class VisualAnalysis:
     """Production visual analysis system for movement validation and object detection"""
     
-    def __init__(self, grid_size: int = 8, save_logs: bool = True, runs_dir: Path = None):
+    def __init__(self, grid_size: int = 8, save_logs: bool = True, runs_dir: Path = None,
+                 frame_cache_size: int = 8):
         """
         Initialize visual analysis system
         
@@ -43,6 +48,7 @@ class VisualAnalysis:
             grid_size: Grid overlay size (8 recommended for better analysis)
             save_logs: Whether to save analysis logs and screenshots
             runs_dir: Directory to save logs (defaults to eevee/runs/)
+            frame_cache_size: Recent frames whose analysis can be reused when the screen recurs (0 disables)
         """
         self.controller = SkyEmuController()
         self.grid_size = grid_size
@@ -56,6 +62,20 @@ class VisualAnalysis:
         # Step counter for file naming
         self.step_counter = 0
         
+        # Grid images are written in the background so logging never blocks analysis
+        self.frame_sink = FrameSink(self.runs_dir) if save_logs else None
+        
+        # Static grid layer, fonts and label glyphs are cached across frames
+        self.overlay_renderer = GridOverlayRenderer(grid_size=grid_size)
+        
+        # Unchanged screens (dialogue boxes, walking into walls) reuse the last analysis
+        self.frame_cache = FrameAnalysisCache(capacity=frame_cache_size) if frame_cache_size > 0 else None
+        
+        # Overlay payloads are encoded per provider/task profile (format, quality, byte budget)
+        self.image_encoder = get_image_encoder()
+        self.last_payload = None
+        self.scene_classifier = None
+        
         # Initialize coordinate mapper for pathfinding foundation
         try:
             from coordinate_mapper import CoordinateMapper
@@ -65,12 +85,14 @@ class VisualAnalysis:
             self.coordinate_mapper = None
             self.enable_coordinate_mapping = False
         
-    def analyze_current_scene(self, screenshot_base64: str = None, verbose: bool = False, session_name: str = None, clean_output: bool = False) -> Dict:
+    def analyze_current_scene(self, screenshot_base64: str = None, verbose: bool = False, session_name: str = None, clean_output: bool = False, frame: GameFrame = None, scene=None) -> Dict:
         """
         Analyze current game scene for movement validation and object detection
         
         Args:
             screenshot_base64: Base64 encoded screenshot (if None, captures from SkyEmu)
+            frame: In-memory frame from SkyEmuController.capture_frame (preferred over screenshot_base64)
+            scene: SceneClassification the caller already made for this frame (classified here if None)
             verbose: Enable verbose logging
             session_name: Session name for organizing logs (if None, uses timestamp)
             
@@ -84,32 +106,61 @@ class VisualAnalysis:
         self.step_counter += 1
         
         # Capture screenshot if not provided
-        if screenshot_base64 is None:
+        if frame is None and screenshot_base64 is not None:
+            frame = GameFrame.from_base64(screenshot_base64)
+        if frame is None:
             if not self.controller.is_connected():
-                raise ConnectionError("Cannot connect to SkyEmu. Ensure it's running on port 8080.")
+                raise ConnectionError(f"Cannot connect to SkyEmu. Ensure it's running on port {self.controller.port}.")
             
-            screenshot_base64 = self.controller.get_screenshot_base64()
-            if not screenshot_base64:
+            frame = self.controller.capture_frame()
+            if frame is None:
                 raise RuntimeError("Failed to capture screenshot from SkyEmu")
         
+        # Collect RAM data for spatial awareness
+        ram_data = self._collect_ram_data()
+        
+        # Same screen at the same spot as a recent turn: reuse its analysis, skip overlay and LLM call
+        fingerprint = cache_context = None
+        if self.frame_cache is not None:
+            fingerprint = fingerprint_frame(frame)
+            cache_context = self._frame_cache_context(ram_data)
+            cached_data, cache_status = self.frame_cache.lookup(fingerprint, cache_context)
+            if cached_data is not None:
+                if verbose:
+                    stats = self.frame_cache.get_stats()
+                    print(f"♻️ Frame unchanged ({cache_status} match) - reusing visual analysis "
+                          f"(hit rate {stats['hit_rate']:.0%})")
+                if clean_output:
+                    self._log_clean_console_output(cached_data)
+                return cached_data
+        
         # Add grid overlay for spatial reference
-        grid_image_base64 = self._add_grid_overlay(screenshot_base64)
+        grid_image = self._add_grid_overlay(frame)
         
         # Save grid overlay if logging enabled
         if self.save_logs:
-            self._save_grid_image(grid_image_base64, session_name)
+            self._save_grid_image(grid_image, session_name)
         
-        # Collect RAM data for spatial awareness
-        ram_data = self._collect_ram_data()
+        # Encode the overlay the way the vision provider is configured to receive it
+        from provider_config import get_provider_for_hybrid_task
+        payload = self.image_encoder.encode(grid_image, get_provider_for_hybrid_task('visual'),
+                                            self._encoding_task_type(frame, scene))
+        self.last_payload = payload
+        if verbose:
+            print(f"🖼️ Vision payload: {payload.format.upper()} {payload.size[0]}x{payload.size[1]} "
+                  f"q{payload.quality}, {payload.size_bytes / 1024:.1f} KB "
+                  f"({'cached' if payload.cached else f'{payload.encode_ms:.1f} ms'})")
         
         # Get movement analysis from Pixtral with RAM context
-        result = self._call_pixtral_for_analysis(grid_image_base64, verbose, ram_data)
+        result = self._call_pixtral_for_analysis(payload.base64, verbose, ram_data, mime_type=payload.mime_type)
         
         if not result["success"]:
             raise RuntimeError(f"Visual analysis failed: {result['error']}")
         
         # Parse and return structured movement data with RAM integration
         movement_data = self._parse_movement_response(result['response'], ram_data)
+        if self.frame_cache is not None:
+            self.frame_cache.store(fingerprint, movement_data, cache_context)
         
         # Save analysis results if logging enabled
         if self.save_logs:
@@ -148,21 +199,34 @@ class VisualAnalysis:
         
         return movement_data
     
+    def _encoding_task_type(self, frame: GameFrame, scene=None) -> str:
+        """Task type for the vision payload, so battle and menu text is encoded legibly"""
+        try:
+            from provider_config import detect_task_type
+            if scene is None:
+                from scene_classifier import SceneClassifier, read_battle_flags
+                if self.scene_classifier is None:
+                    self.scene_classifier = SceneClassifier()
+                scene = self.scene_classifier.classify(frame.pixels, battle_flags=read_battle_flags())
+            return detect_task_type(has_image=True, context=scene.scene or "")
+        except Exception:
+            return "screenshot_analysis"
+    
+    @staticmethod
+    def _frame_cache_context(ram_data: Dict) -> Optional[Tuple[int, int, int, int]]:
+        """Map and player position a cached analysis is tied to (None without RAM)"""
+        if not ram_data or not ram_data.get("ram_available"):
+            return None
+        location = ram_data.get("location", {})
+        return (location.get("map_bank"), location.get("map_id"), location.get("x"), location.get("y"))
+    
     def _get_ram_coordinates(self) -> Dict[str, Any]:
         """Get current map coordinates from RAM using enhanced compact game state"""
         try:
-            import sys
-            from pathlib import Path
-            tests_path = Path(__file__).parent / "tests"
-            if str(tests_path) not in sys.path:
-                sys.path.insert(0, str(tests_path))
-            from analyse_skyemu_ram import SkyEmuClient, PokemonFireRedReader
+            from ram_snapshot import get_ram_snapshot_service
             
-            client = SkyEmuClient(debug=False)
-            reader = PokemonFireRedReader(client)
-            
-            # Get enhanced compact game state
-            ram_data = reader.get_compact_game_state()
+            # Shared frame-stamped snapshot - no extra emulator read within a frame
+            ram_data = get_ram_snapshot_service().get_compact_game_state()
             
             # Return the full RAM data structure for consistent usage
             return ram_data
@@ -174,148 +238,22 @@ class VisualAnalysis:
                 "location": {"map_bank": 0, "map_id": 0, "x": 0, "y": 0, "location_name": "Error"}
             }
 
-    def _add_grid_overlay(self, screenshot_base64: str) -> str:
-        """Add light grey grid overlay to screenshot for spatial reference and coordinates"""
+    def _add_grid_overlay(self, frame) -> Image.Image:
+        """Add light grey grid overlay to screenshot for spatial reference and coordinates
+        
+        Args:
+            frame: GameFrame (or base64 encoded screenshot for older callers)
+            
+        Returns:
+            Overlay image (encoded per provider by the image encoder)
+        """
         try:
-            # Decode base64 to image
-            image_bytes = base64.b64decode(screenshot_base64)
-            image = Image.open(BytesIO(image_bytes)).convert('RGB')
-            
-            # Create overlay
-            overlay_image = image.copy().convert('RGBA')
-            grid_overlay = Image.new('RGBA', overlay_image.size, (0, 0, 0, 0))
-            draw = ImageDraw.Draw(grid_overlay)
-            
-            width, height = image.size
-            tile_width = width // self.grid_size
-            tile_height = height // self.grid_size
-            
-            # Draw light grey grid lines
-            grid_color = (204, 204, 204, 100)  # Light grey with transparency
-            for x in range(0, width, tile_width):
-                draw.line([(x, 0), (x, height)], fill=grid_color, width=1)
-            
-            for y in range(0, height, tile_height):
-                draw.line([(0, y), (width, y)], fill=grid_color, width=1)
-            
-            # Add coordinate labels (real world coordinates based on player position)
-            try:
-                font_size = max(8, min(12, tile_width // 4))
-                font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", font_size)
-            except:
-                font = ImageFont.load_default()
-            
-            # Get player's real world coordinates from RAM
-            coords = self._get_ram_coordinates()
-            if coords.get("ram_available", False):
-                location = coords.get("location", {})
-                player_ram_x = location.get("x", 0)
-                player_ram_y = location.get("y", 0)
-                
-                # Calculate center grid position (where player is)
-                center_grid_x = self.grid_size // 2
-                center_grid_y = self.grid_size // 2
-                
-                text_color = (204, 204, 204, 120)
-                center_text_color = (255, 255, 0, 200)  # Yellow for player position
-                
-                for tile_x in range(self.grid_size):
-                    for tile_y in range(self.grid_size):
-                        pixel_x = tile_x * tile_width
-                        pixel_y = tile_y * tile_height
-                        
-                        # Calculate real world coordinates for this tile
-                        offset_x = tile_x - center_grid_x
-                        offset_y = tile_y - center_grid_y
-                        real_x = player_ram_x + offset_x
-                        real_y = player_ram_y + offset_y
-                        
-                        coord_text = f"{real_x},{real_y}"
-                        
-                        # Use different color for center tile (player position)
-                        if tile_x == center_grid_x and tile_y == center_grid_y:
-                            draw.text((pixel_x + 2, pixel_y + 2), coord_text, fill=center_text_color, font=font)
-                        else:
-                            draw.text((pixel_x + 2, pixel_y + 2), coord_text, fill=text_color, font=font)
-            else:
-                # Fallback to visual grid coordinates if RAM not available
-                text_color = (204, 204, 204, 120)
-                for tile_x in range(self.grid_size):
-                    for tile_y in range(self.grid_size):
-                        pixel_x = tile_x * tile_width
-                        pixel_y = tile_y * tile_height
-                        coord_text = f"{tile_x},{tile_y}"
-                        draw.text((pixel_x + 2, pixel_y + 2), coord_text, fill=text_color, font=font)
-            
-            # Add map info in top-right corner (map bank/ID only, not coordinates)
-            try:
-                if coords.get("ram_available", False):
-                    location = coords.get("location", {})
-                    map_bank = location.get("map_bank", 0)
-                    map_id = location.get("map_id", 0)
-                    
-                    # Create map display text (no coordinates since they're in the grid)
-                    map_display = f"Map:{map_bank}-{map_id}"
-                else:
-                    map_display = "Map:?"
-                
-                # Use larger font for map display
-                try:
-                    map_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 14)
-                except:
-                    map_font = ImageFont.load_default()
-                
-                # Get text dimensions for background box
-                bbox = draw.textbbox((0, 0), map_display, font=map_font)
-                text_width = bbox[2] - bbox[0]
-                text_height = bbox[3] - bbox[1]
-                
-                # Position in top-right corner with padding
-                padding = 5
-                text_x = width - text_width - padding
-                text_y = padding
-                
-                # Draw black background box
-                box_coords = [
-                    (text_x - padding, text_y - padding),
-                    (text_x + text_width + padding, text_y + text_height + padding)
-                ]
-                draw.rectangle(box_coords, fill=(0, 0, 0, 200))
-                
-                # Draw white text
-                draw.text((text_x, text_y), map_display, fill=(255, 255, 255, 255), font=map_font)
-                
-            except Exception as map_error:
-                # Fallback map display if RAM reading fails
-                map_display = "Map:?"
-                draw.text((width - 60, 5), map_display, fill=(255, 255, 255, 255), font=font)
-            
-            # Add subtle player position indicator at screen center
-            try:
-                if coords.get("ram_available", False):
-                    # Draw small player position indicator at screen center
-                    center_x = width // 2
-                    center_y = height // 2
-                    
-                    # Draw a small yellow circle for player position
-                    circle_radius = 4
-                    
-                    # Draw circle outline
-                    circle_bbox = [
-                        center_x - circle_radius, center_y - circle_radius,
-                        center_x + circle_radius, center_y + circle_radius
-                    ]
-                    draw.ellipse(circle_bbox, outline=(255, 255, 0, 180), width=1)
-                    
-            except Exception as player_indicator_error:
-                # Player indicator is optional, don't fail if it doesn't work
-                pass
+            if not isinstance(frame, GameFrame):
+                frame = GameFrame.from_base64(frame)
             
-            # Composite and convert back to base64
-            result = Image.alpha_composite(overlay_image, grid_overlay).convert('RGB')
-            buffer = BytesIO()
-            result.save(buffer, format='PNG')
-            return base64.b64encode(buffer.getvalue()).decode('utf-8')
+            # Grid, labels, banner and player ring come from cached layers; only changed labels are drawn
+            coords = self._get_ram_coordinates()
+            return self.overlay_renderer.render(frame.image, coords)
             
         except Exception as e:
             raise RuntimeError(f"Failed to add grid overlay: {e}")
@@ -323,19 +261,10 @@ class VisualAnalysis:
     def _collect_ram_data(self) -> Dict[str, Any]:
         """Collect current RAM data from SkyEmu for spatial awareness"""
         try:
-            # Import and initialize RAM analyzer
-            import sys
-            from pathlib import Path
-            tests_path = Path(__file__).parent / "tests"
-            if str(tests_path) not in sys.path:
-                sys.path.insert(0, str(tests_path))
-            from analyse_skyemu_ram import SkyEmuClient, PokemonFireRedReader
-            
-            client = SkyEmuClient(debug=False)
-            reader = PokemonFireRedReader(client)
+            from ram_snapshot import get_ram_snapshot_service
             
-            # Get compact game state using our new standardized method
-            ram_data = reader.get_compact_game_state()
+            # Decode from the shared snapshot captured for this frame
+            ram_data = get_ram_snapshot_service().get_compact_game_state()
             
             return ram_data
             
@@ -344,7 +273,8 @@ class VisualAnalysis:
         except Exception as e:
             return {"ram_available": False, "error": f"RAM collection failed: {str(e)}"}
     
-    def _call_pixtral_for_analysis(self, grid_image_base64: str, verbose: bool = False, ram_data: Dict = None) -> Dict:
+    def _call_pixtral_for_analysis(self, grid_image_base64: str, verbose: bool = False, ram_data: Dict = None,
+                                   mime_type: str = None) -> Dict:
         """Call visual_context_analyzer template with hybrid mode support and RAM data integration"""
         try:
             import time
@@ -418,7 +348,8 @@ This game state data should inform your visual analysis and scene understanding.
                 image_data=grid_image_base64,
                 model=model,
                 provider=provider,
-                max_tokens=800  # Increased for structured response
+                max_tokens=800,  # Increased for structured response
+                mime_type=mime_type
             )
             
             processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds
@@ -628,23 +559,17 @@ This game state data should inform your visual analysis and scene understanding.
     
     
     
-    def _save_grid_image(self, grid_image_base64: str, session_name: str = None) -> None:
-        """Save grid overlay image to runs directory"""
+    def _save_grid_image(self, grid_image: Image.Image, session_name: str = None) -> None:
+        """Save grid overlay image to runs directory (always PNG, whatever format the provider receives)"""
         try:
-            # Create session directory and screenshots subfolder
+            # Save grid image in the session's screenshots subfolder
             session_dir = self._get_session_dir(session_name)
-            session_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Create screenshots subfolder
             screenshots_dir = session_dir / "sshots"
-            screenshots_dir.mkdir(exist_ok=True)
-            
-            # Save grid image in screenshots subfolder
-            image_bytes = base64.b64decode(grid_image_base64)
             image_path = screenshots_dir / f"step_{self.step_counter:04d}_grid.png"
             
-            with open(image_path, 'wb') as f:
-                f.write(image_bytes)
+            # Encoded and written by the background sink (creates directories as needed)
+            if self.frame_sink is not None:
+                self.frame_sink.submit(grid_image, str(image_path))
                 
         except Exception as e:
             # Use debug logger if available, otherwise fallback to print
@@ -0,0 +1,286 @@
+"""
+Element Detector
+
+Finds the player (red hat), carpets (green) and stairs (yellow/tan) in game
+frames and bins them onto the 16x12 memory grid used by gamememory. Each
+pixel gets a label bit from three per-channel lookup tables, and a single
+np.bincount of the labelled pixels over (frame, cell, label) yields the
+occupancy of all three maps at once. The player cell comes from the median of
+the red pixels, read off per-row and per-column histograms. Frames of the same size are stacked, so a batch of
+frames costs one pass as well (offline map building).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+GRID = (16, 12)          # columns x rows
+CROP_FRACTION = 0.1      # border trimmed on each side (window captures include chrome)
+
+# Inclusive RGB ranges, same as the cv2.inRange checks they replace (mutually exclusive)
+PLAYER_RANGE = ((150, 0, 0), (255, 100, 100))
+CARPET_RANGE = ((0, 150, 0), (100, 255, 100))
+STAIR_RANGE = ((150, 150, 0), (255, 255, 150))
+
+# Map grid codes (4 = barrier is written by Neo4jMemory.record_failed_move)
+EMPTY, PLAYER, CARPET, STAIRS = 0, 1, 2, 3
+
+# Per-pixel label bits; the ranges do not overlap, so a pixel carries at most one
+PLAYER_BIT, CARPET_BIT, STAIR_BIT = 1, 2, 4
+LABEL_SLOTS = 8
+
+# Fraction of a cell's pixels that must match for the cell to count (drops specks, like the old area checks)
+MIN_CARPET_FRACTION = 0.25
+MIN_STAIR_FRACTION = 0.15
+
+
+def _channel_tables() -> List[np.ndarray]:
+    """256-entry table per channel: bit set where the channel value lies inside that element's range"""
+    tables = [np.zeros(256, dtype=np.uint8) for _ in range(3)]
+    for bit, (lower, upper) in ((PLAYER_BIT, PLAYER_RANGE), (CARPET_BIT, CARPET_RANGE), (STAIR_BIT, STAIR_RANGE)):
+        for channel in range(3):
+            tables[channel][lower[channel]:upper[channel] + 1] |= bit
+    return tables
+
+
+CHANNEL_TABLES = _channel_tables()
+
+
+@dataclass
+class ElementMaps:
+    """Detection result for one frame"""
+    map_grid: np.ndarray                 # (rows, cols) codes: player over stairs over carpet
+    player_position: Optional[Tuple[int, int]]
+    stair_position: Optional[Tuple[int, int]]
+    player_map: np.ndarray               # (rows, cols) pixel counts per element
+    carpet_map: np.ndarray
+    stair_map: np.ndarray
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The dict Neo4jMemory.detect_player_and_elements returns"""
+        return {
+            'map_grid': self.map_grid,
+            'player_position': self.player_position,
+            'stair_position': self.stair_position,
+            'player_map': self.player_map,
+            'carpet_map': self.carpet_map,
+            'stair_map': self.stair_map,
+        }
+
+
+def _median_index(histograms: np.ndarray, totals: np.ndarray) -> np.ndarray:
+    """
+    np.median of the coordinates behind each histogram row, truncated to int
+
+    Args:
+        histograms: (frames, length) pixel counts per coordinate
+        totals: (frames,) pixel counts (> 0)
+    """
+    cumulative = histograms.cumsum(axis=1)
+    lower = (cumulative <= ((totals - 1) // 2)[:, None]).sum(axis=1)  # value at rank (n-1)//2
+    upper = (cumulative <= (totals // 2)[:, None]).sum(axis=1)        # value at rank n//2
+    return (lower + upper) // 2
+
+
+class ElementDetector:
+    """
+    Vectorized player/carpet/stair detection on in-memory RGB arrays
+
+    Cell indices are precomputed per frame size; detection is three table
+    lookups, one bincount for the three occupancy maps and two for the
+    player median.
+    """
+
+    def __init__(self, grid: Tuple[int, int] = GRID, crop_fraction: float = CROP_FRACTION,
+                 min_carpet_fraction: float = MIN_CARPET_FRACTION, min_stair_fraction: float = MIN_STAIR_FRACTION):
+        """
+        Args:
+            grid: (columns, rows) of the map grid
+            crop_fraction: Border trimmed from each side before binning
+            min_carpet_fraction: Share of a cell that must be carpet-coloured
+            min_stair_fraction: Share of a cell that must be stair-coloured
+        """
+        self.grid = grid
+        self.crop_fraction = crop_fraction
+        self.min_carpet_fraction = min_carpet_fraction
+        self.min_stair_fraction = min_stair_fraction
+        self._layouts: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+        # Metrics
+        self.frames_processed = 0
+        self.batches = 0
+
+    def _layout(self, height: int, width: int) -> Dict[str, Any]:
+        """Crop window, per-pixel cell index and cell sizes for a frame size (cached)"""
+        layout = self._layouts.get((height, width))
+        if layout is None:
+            top, bottom = int(height * self.crop_fraction), int(height * (1 - self.crop_fraction))
+            left, right = int(width * self.crop_fraction), int(width * (1 - self.crop_fraction))
+            cols, rows = self.grid
+            cell_height, cell_width = max(1, (bottom - top) // rows), max(1, (right - left) // cols)
+            # Remainder pixels fold into the last row/column
+            cell_y = np.minimum(np.arange(bottom - top) // cell_height, rows - 1)
+            cell_x = np.minimum(np.arange(right - left) // cell_width, cols - 1)
+            cell_index = (cell_y[:, None] * cols + cell_x[None, :]).astype(np.intp).ravel()
+            layout = {
+                "crop": (slice(top, bottom), slice(left, right)),
+                "crop_size": (bottom - top, right - left),
+                "cell_keys": cell_index * LABEL_SLOTS,
+                "cell_pixels": np.bincount(cell_index, minlength=rows * cols).reshape(rows, cols),
+                "cell_size": (cell_height, cell_width),
+            }
+            self._layouts[(height, width)] = layout
+        return layout
+
+    def detect(self, pixels: np.ndarray) -> ElementMaps:
+        """
+        Detect elements in one frame
+
+        Args:
+            pixels: (height, width, 3) RGB uint8 array
+
+        Returns:
+            ElementMaps
+        """
+        return self.detect_batch([pixels])[0]
+
+    def detect_batch(self, frames: Iterable[np.ndarray]) -> List[ElementMaps]:
+        """
+        Detect elements in many frames; frames of equal size are processed as one stack
+
+        Args:
+            frames: RGB uint8 arrays, or a (frames, height, width, 3) array
+
+        Returns:
+            ElementMaps per frame, in input order
+        """
+        frames = [np.asarray(frame)[..., :3] for frame in frames]
+        results: List[Optional[ElementMaps]] = [None] * len(frames)
+        by_shape: Dict[Tuple[int, int], List[int]] = {}
+        for position, frame in enumerate(frames):
+            by_shape.setdefault(frame.shape[:2], []).append(position)
+        for positions in by_shape.values():
+            if len(positions) == 1:
+                stack = frames[positions[0]][None]
+            else:
+                stack = np.stack([frames[position] for position in positions])
+            for position, result in zip(positions, self._detect_stack(stack)):
+                results[position] = result
+        self.batches += 1
+        self.frames_processed += len(frames)
+        return results
+
+    def _detect_stack(self, stack: np.ndarray) -> List[ElementMaps]:
+        count, height, width = stack.shape[:3]
+        layout = self._layout(height, width)
+        cols, rows = self.grid
+        cells = rows * cols
+        area = stack[(slice(None),) + layout["crop"]]
+        crop_height, crop_width = layout["crop_size"]
+        frame_pixels = crop_height * crop_width
+
+        # Label bits per pixel from three table lookups; only labelled pixels are binned
+        red, green, blue = CHANNEL_TABLES
+        bits = np.take(red, area[..., 0])
+        bits &= np.take(green, area[..., 1])
+        bits &= np.take(blue, area[..., 2])
+        bits = bits.ravel()
+        labelled = np.flatnonzero(bits)
+        frame, pixel = np.divmod(labelled, frame_pixels)
+        keys = frame * (cells * LABEL_SLOTS) + layout["cell_keys"][pixel] + bits[labelled]
+        occupancy = np.bincount(keys, minlength=count * cells * LABEL_SLOTS).reshape(count, rows, cols, LABEL_SLOTS)
+        player_maps = occupancy[..., PLAYER_BIT]
+        carpet_maps = occupancy[..., CARPET_BIT]
+        stair_maps = occupancy[..., STAIR_BIT]
+
+        # Player: median red pixel from per-frame row/column histograms
+        is_player = bits[labelled] == PLAYER_BIT
+        player_frame, player_pixel = frame[is_player], pixel[is_player]
+        player_y, player_x = np.divmod(player_pixel, crop_width)
+        row_hist = np.bincount(player_frame * crop_height + player_y,
+                               minlength=count * crop_height).reshape(count, crop_height)
+        col_hist = np.bincount(player_frame * crop_width + player_x,
+                               minlength=count * crop_width).reshape(count, crop_width)
+        player_totals = row_hist.sum(axis=1)
+        player_cells = [None] * count
+        found = np.flatnonzero(player_totals)
+        if found.size:
+            median_y = _median_index(row_hist[found], player_totals[found])
+            median_x = _median_index(col_hist[found], player_totals[found])
+            cell_height, cell_width = layout["cell_size"]
+            for index, y, x in zip(found, median_y, median_x):
+                player_cells[index] = (int(min(x // cell_width, cols - 1)), int(min(y // cell_height, rows - 1)))
+
+        cell_pixels = layout["cell_pixels"]
+        carpet_cells = carpet_maps >= self.min_carpet_fraction * cell_pixels
+        stair_cells = stair_maps >= self.min_stair_fraction * cell_pixels
+
+        results = []
+        for index in range(count):
+            map_grid = np.zeros((rows, cols), dtype=int)
+            map_grid[carpet_cells[index]] = CARPET
+            map_grid[stair_cells[index]] = STAIRS
+            stair_position = None
+            if stair_cells[index].any():
+                stair_y, stair_x = np.unravel_index(np.argmax(np.where(stair_cells[index], stair_maps[index], -1)),
+                                                    (rows, cols))
+                stair_position = (int(stair_x), int(stair_y))
+            if player_cells[index] is not None:
+                column, row = player_cells[index]
+                map_grid[row, column] = PLAYER
+            results.append(ElementMaps(
+                map_grid=map_grid,
+                player_position=player_cells[index],
+                stair_position=stair_position,
+                player_map=player_maps[index],
+                carpet_map=carpet_maps[index],
+                stair_map=stair_maps[index],
+            ))
+        return results
+
+    def detect_files(self, paths: Iterable[str], batch_size: int = 32) -> Iterator[Tuple[str, Optional[ElementMaps]]]:
+        """
+        Detect elements in screenshot files, batch_size frames at a time (offline map building)
+
+        Yields:
+            (path, ElementMaps) - ElementMaps is None for unreadable files
+        """
+        from PIL import Image
+
+        batch: List[Tuple[str, Optional[np.ndarray]]] = []
+
+        def flush():
+            readable = [(path, pixels) for path, pixels in batch if pixels is not None]
+            detected = dict(zip([path for path, _ in readable], self.detect_batch([pixels for _, pixels in readable])))
+            for path, _ in batch:
+                yield path, detected.get(path)
+            batch.clear()
+
+        for path in paths:
+            try:
+                with Image.open(path) as image:
+                    batch.append((path, np.asarray(image.convert("RGB"))))
+            except Exception as e:
+                print(f"Error: Failed to load image {path}: {e}")
+                batch.append((path, None))
+            if len(batch) >= batch_size:
+                yield from flush()
+        if batch:
+            yield from flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"frames_processed": self.frames_processed, "batches": self.batches,
+                "frame_sizes": len(self._layouts)}
+
+
+# Global detector shared by the memory classes
+_global_element_detector = None
+
+
+def get_element_detector() -> ElementDetector:
+    """Get global element detector instance"""
+    global _global_element_detector
+    if _global_element_detector is None:
+        _global_element_detector = ElementDetector()
+    return _global_element_detector
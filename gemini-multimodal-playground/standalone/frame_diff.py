@@ -0,0 +1,302 @@
+"""
+Frame Diff Engine
+
+Keeps 4x-downsampled grayscale thumbnails of recent frames in a ring buffer
+and classifies what changed between two of them: the player moved (the
+background scrolled by a step), was blocked (background still although a
+direction was pressed), a scene transition (map change, fade, battle intro)
+or a dialogue box opened. Each frame is decoded and reduced once, however
+many comparisons it takes part in, and a comparison only touches the
+player window, the background band and the text box region.
+
+Used by the standalone runners (barrier checks in gamememory and
+run_step_gemini) and by the eevee turn loop.
+"""
+
+import os
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+SCREEN_SIZE = (240, 160)  # GBA frame (width, height); other captures are resized to it
+BLOCK = 4                 # thumbnail cell = 4x4 screen pixels
+THUMB_SIZE = (SCREEN_SIZE[0] // BLOCK, SCREEN_SIZE[1] // BLOCK)
+
+# Thumbnail regions as (top, bottom, left, right)
+BACKGROUND_BAND = (0, 28, 0, 60)   # screen rows 0-112: the map above any text box
+PLAYER_WINDOW = (14, 24, 24, 36)   # player metatile (112, 72) plus a tile on each side
+TEXT_BOX = (30, 38, 4, 56)         # FireRed dialogue box, screen rows 120-152
+
+MAX_SHIFT = 5             # largest scroll searched, in cells (one step = 16 px = 4 cells)
+PIXEL_TOLERANCE = 10      # grey levels two cells may differ by and still count as equal
+STILL_ERROR = 2.0         # mean abs difference below which the background has not moved
+SHIFT_MATCH_ERROR = 6.0   # a scrolled background must match at least this well...
+SHIFT_MATCH_RATIO = 0.5   # ...and at most this fraction of the unshifted error
+TRANSITION_CHANGED = 0.6  # fraction of changed cells that makes an unexplained change a transition
+DARK_LEVEL = 24           # mean grey level of a faded-out screen
+TEXT_BOX_WHITE = 200      # grey level of the text box fill
+TEXT_BOX_FRACTION = 0.5
+
+DIRECTIONS = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}
+
+
+@dataclass
+class FrameRecord:
+    """Thumbnail of one frame plus the per-frame statistics every comparison reuses"""
+    thumb: np.ndarray          # (40, 60) float32 grey levels
+    key: Any = None
+    mean: float = 0.0
+    text_box_white: float = 0.0
+
+    @property
+    def dark(self) -> bool:
+        return self.mean < DARK_LEVEL
+
+    @property
+    def text_box_open(self) -> bool:
+        return self.text_box_white >= TEXT_BOX_FRACTION
+
+
+@dataclass
+class FrameDiff:
+    """What happened between two frames"""
+    kind: str                  # "moved", "blocked", "transition", "dialogue_opened", "unchanged" or "changed"
+    direction: Optional[str] = None       # scroll direction for "moved"
+    shift: Tuple[int, int] = (0, 0)       # background scroll in screen pixels
+    similarity: float = 1.0               # fraction of cells within PIXEL_TOLERANCE
+    background_error: float = 0.0         # mean abs difference of the unshifted background
+    player_changed: bool = False          # sprite in the player window changed (e.g. turned)
+    elapsed_ms: float = 0.0
+    signals: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def moved(self) -> bool:
+        return self.kind == "moved"
+
+    @property
+    def blocked(self) -> bool:
+        return self.kind == "blocked"
+
+    def describe(self) -> Dict[str, Any]:
+        """Compact form for prompts and logs"""
+        result = {"kind": self.kind, "similarity": round(self.similarity, 3)}
+        if self.direction:
+            result["direction"] = self.direction
+        if self.player_changed:
+            result["player_changed"] = True
+        return result
+
+
+def _region(thumb: np.ndarray, region) -> np.ndarray:
+    top, bottom, left, right = region
+    return thumb[top:bottom, left:right]
+
+
+class FrameDiffEngine:
+    """
+    Ring buffer of frame thumbnails with region-wise, shift-aware comparison
+
+    Frames can be given as file paths, GameFrames, PIL images or pixel arrays.
+    Paths are keyed by (path, mtime, size), so a screenshot file that is
+    overwritten in place is re-read, while repeated comparisons of the same
+    capture are served from the buffer.
+    """
+
+    def __init__(self, history: int = 8):
+        """
+        Args:
+            history: Frames kept in the ring buffer
+        """
+        self.frames: deque = deque(maxlen=history)
+
+        # Overlap slices and background weights (player window masked out) are the same for every comparison
+        rows, cols = BACKGROUND_BAND[1] - BACKGROUND_BAND[0], BACKGROUND_BAND[3] - BACKGROUND_BAND[2]
+        background = np.ones((rows, cols), dtype=np.float32)
+        top, bottom, left, right = PLAYER_WINDOW
+        background[top:bottom, left:right] = 0.0
+        self._shifts = {}
+        for dx, dy in [(0, 0)] + [(dx * step, dy * step) for dx, dy in DIRECTIONS.values()
+                                  for step in range(1, MAX_SHIFT + 1)]:
+            new = (slice(max(0, -dy), rows - max(0, dy)), slice(max(0, -dx), cols - max(0, dx)))
+            old = (slice(max(0, dy), rows - max(0, -dy)), slice(max(0, dx), cols - max(0, -dx)))
+            weights = background[new]
+            self._shifts[(dx, dy)] = (new, old, weights, float(weights.sum()))
+
+        # Metrics
+        self.loads = 0
+        self.buffer_hits = 0
+        self.comparisons = 0
+        self.kinds = Counter()
+        self.total_ms = 0.0
+
+    def push(self, source, key: Any = None) -> FrameRecord:
+        """
+        Add a frame to the ring buffer (or return its buffered record)
+
+        Args:
+            source: Path, GameFrame, PIL image, pixel array or FrameRecord
+            key: Identity for buffer lookups (derived from paths automatically)
+
+        Returns:
+            FrameRecord
+        """
+        if isinstance(source, FrameRecord):
+            return source
+        cached = getattr(source, "_diff_record", None)
+        if cached is not None:
+            self.buffer_hits += 1
+            return cached
+
+        if key is None and isinstance(source, (str, Path)):
+            stat = os.stat(source)
+            key = (str(source), stat.st_mtime_ns, stat.st_size)
+        if key is not None:
+            for record in self.frames:
+                if record.key == key:
+                    self.buffer_hits += 1
+                    return record
+
+        record = self._load(source, key)
+        self.frames.append(record)
+        if hasattr(source, "encoded"):
+            source._diff_record = record  # GameFrame: reduce once per frame
+        return record
+
+    def _load(self, source, key: Any) -> FrameRecord:
+        self.loads += 1
+        if isinstance(source, (str, Path)):
+            with Image.open(source) as image:
+                return self._reduce(image, key)
+        if hasattr(source, "encoded"):
+            return self._reduce(source.image, key)
+        if isinstance(source, Image.Image):
+            return self._reduce(source, key)
+        return self._reduce(Image.fromarray(np.asarray(source, dtype=np.uint8)[..., :3]), key)
+
+    @staticmethod
+    def _reduce(image: Image.Image, key: Any) -> FrameRecord:
+        grey = image.convert("L")
+        if grey.size != SCREEN_SIZE:
+            grey = grey.resize(SCREEN_SIZE, Image.BILINEAR)
+        thumb = np.asarray(grey.resize(THUMB_SIZE, Image.BOX), dtype=np.float32)
+        return FrameRecord(
+            thumb=thumb,
+            key=key,
+            mean=float(thumb.mean()),
+            text_box_white=float((_region(thumb, TEXT_BOX) >= TEXT_BOX_WHITE).mean()),
+        )
+
+    def observe(self, source, direction: Optional[str] = None) -> Optional[FrameDiff]:
+        """
+        Add a frame and compare it with the previous one in the buffer
+
+        Returns:
+            FrameDiff, or None for the first frame
+        """
+        previous = self.frames[-1] if self.frames else None
+        record = self.push(source)
+        if previous is None or previous is record:
+            return None
+        return self.compare(previous, record, direction)
+
+    def compare(self, before, after, direction: Optional[str] = None) -> FrameDiff:
+        """
+        Classify the change between two frames
+
+        Args:
+            before: Frame before the input (any source accepted by push)
+            after: Frame after the input
+            direction: D-pad direction pressed in between, if any
+
+        Returns:
+            FrameDiff
+        """
+        start = time.perf_counter()
+        before, after = self.push(before), self.push(after)
+        diff = np.abs(after.thumb - before.thumb)
+        similarity = float((diff < PIXEL_TOLERANCE).mean())
+        changed = 1.0 - similarity
+
+        errors = self._shift_errors(before.thumb, after.thumb)
+        still_error = errors[(0, 0)]
+        best_shift = min(errors, key=errors.get)
+        player_changed = bool(_region(diff, PLAYER_WINDOW).mean() >= STILL_ERROR)
+        signals = {"changed": changed, "background_error": still_error, "best_shift_error": errors[best_shift],
+                   "text_box_white": after.text_box_white}
+
+        shift_dir = None
+        if (best_shift != (0, 0) and errors[best_shift] <= SHIFT_MATCH_ERROR
+                and errors[best_shift] <= SHIFT_MATCH_RATIO * still_error):
+            shift_dir = next(name for name, (dx, dy) in DIRECTIONS.items()
+                             if (np.sign(best_shift[0]), np.sign(best_shift[1])) == (dx, dy))
+
+        if after.text_box_open and not before.text_box_open:
+            kind = "dialogue_opened"
+        elif shift_dir is not None:
+            kind = "moved"
+        elif still_error < STILL_ERROR:
+            kind = "blocked" if direction in DIRECTIONS else "unchanged"
+        elif changed >= TRANSITION_CHANGED or after.dark != before.dark:
+            kind = "transition"
+        else:
+            kind = "changed"
+
+        result = FrameDiff(
+            kind=kind,
+            direction=shift_dir,
+            shift=(best_shift[0] * BLOCK, best_shift[1] * BLOCK) if shift_dir else (0, 0),
+            similarity=similarity,
+            background_error=still_error,
+            player_changed=player_changed,
+            signals=signals,
+        )
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        self.comparisons += 1
+        self.kinds[kind] += 1
+        self.total_ms += result.elapsed_ms
+        return result
+
+    def _shift_errors(self, before: np.ndarray, after: np.ndarray) -> Dict[Tuple[int, int], float]:
+        """
+        Mean abs difference of the background band for each candidate scroll
+
+        A shift of (dx, dy) cells compares after[y, x] with before[y + dy, x + dx]:
+        walking right moves the camera right, so the map content slides left.
+        The player window is masked out since the player stays centred.
+        """
+        old, new = _region(before, BACKGROUND_BAND), _region(after, BACKGROUND_BAND)
+        errors = {}
+        for shift, (new_slice, old_slice, weights, total) in self._shifts.items():
+            errors[shift] = float((np.abs(new[new_slice] - old[old_slice]) * weights).sum() / total)
+        return errors
+
+    def similarity(self, before, after) -> float:
+        """Fraction of thumbnail cells that match within PIXEL_TOLERANCE"""
+        before, after = self.push(before), self.push(after)
+        return float((np.abs(after.thumb - before.thumb) < PIXEL_TOLERANCE).mean())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "comparisons": self.comparisons,
+            "kinds": dict(self.kinds),
+            "frames_loaded": self.loads,
+            "buffer_hits": self.buffer_hits,
+            "avg_ms": round(self.total_ms / self.comparisons, 3) if self.comparisons else 0.0,
+        }
+
+
+# Global engine shared by the runners and the memory classes
+_global_frame_diff = None
+
+
+def get_frame_diff_engine() -> FrameDiffEngine:
+    """Get global frame diff engine instance"""
+    global _global_frame_diff
+    if _global_frame_diff is None:
+        _global_frame_diff = FrameDiffEngine()
+    return _global_frame_diff
@@ -7,6 +7,8 @@ import os
 import time
 import traceback
 from neo4j import GraphDatabase
+from frame_diff import get_frame_diff_engine
+from element_detector import get_element_detector
 
 def read_image_to_base64(image_path):
     """
@@ -484,121 +486,42 @@ class Neo4jMemory:
         # Tracking game progress
         self.last_screen_hash = None
         self.consecutive_similar_screens = 0
+        self.frame_diff = get_frame_diff_engine()
+        self.element_detector = get_element_detector()
     
     def detect_player_and_elements(self, screenshot_path):
         """
         Analyze screenshot to detect the player character and key elements
         
         Args:
-            screenshot_path: Path to the screenshot image
+            screenshot_path: Path to the screenshot image, or an RGB pixel array
             
         Returns:
-            dict: Contains 'map_grid', 'player_position', 'stair_position', etc.
+            dict: Contains 'map_grid', 'player_position', 'stair_position', the per-cell
+                  'player_map'/'carpet_map'/'stair_map' pixel counts and 'original_image'
         """
         try:
-            # Load image
-            img = cv2.imread(screenshot_path)
-            if img is None:
-                print(f"Error: Failed to load image {screenshot_path}")
-                return None
-                
-            # Convert to RGB (OpenCV uses BGR)
-            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            
-            # Create a map representation (simplified 16x12 grid)
-            height, width = img_rgb.shape[:2]
-            
-            # Focus on the game area only (remove borders)
-            # Assuming the game area is in the center of the screenshot
-            game_area_start_x = int(width * 0.1)
-            game_area_end_x = int(width * 0.9)
-            game_area_start_y = int(height * 0.1)
-            game_area_end_y = int(height * 0.9)
-            
-            game_area = img_rgb[game_area_start_y:game_area_end_y, game_area_start_x:game_area_end_x]
-            g_height, g_width = game_area.shape[:2]
-            
-            # Create a simplified map grid (16x12 cells)
-            grid_width, grid_height = 16, 12
-            cell_width = g_width // grid_width
-            cell_height = g_height // grid_height
-            
-            # Initialize map grid
-            map_grid = np.zeros((grid_height, grid_width), dtype=int)
-            
-            # Detect player character (looking for red hat color)
-            # This is a simplified approach - better detection would use ML
-            red_lower = np.array([150, 0, 0])
-            red_upper = np.array([255, 100, 100])
-            red_mask = cv2.inRange(game_area, red_lower, red_upper)
-            red_pixels = np.where(red_mask > 0)
+            if isinstance(screenshot_path, np.ndarray):
+                img_rgb = screenshot_path
+            else:
+                # Load image
+                img = cv2.imread(screenshot_path)
+                if img is None:
+                    print(f"Error: Failed to load image {screenshot_path}")
+                    return None
+                    
+                # Convert to RGB (OpenCV uses BGR)
+                img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
             
-            player_position = None
-            if len(red_pixels[0]) > 0:
-                # Take the center of mass of the red pixels
-                player_y = int(np.median(red_pixels[0]))
-                player_x = int(np.median(red_pixels[1]))
-                
-                # Convert to grid coordinates
-                player_grid_y = min(player_y // cell_height, grid_height - 1)
-                player_grid_x = min(player_x // cell_width, grid_width - 1)
-                
-                player_position = (player_grid_x, player_grid_y)
-                map_grid[player_grid_y, player_grid_x] = 1  # Mark player position
-                
-                print(f"Detected player at position: {player_position}")
+            # Player, carpets and stairs binned onto the 16x12 grid in one pass
+            result = self.element_detector.detect(img_rgb).to_dict()
+            if result['player_position'] is not None:
+                print(f"Detected player at position: {result['player_position']}")
             else:
                 print("Could not detect player character")
             
-            # Detect carpets/green areas
-            green_lower = np.array([0, 150, 0])
-            green_upper = np.array([100, 255, 100])
-            green_mask = cv2.inRange(game_area, green_lower, green_upper)
-            
-            # Find contours of green areas
-            contours, _ = cv2.findContours(green_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            # Mark carpeted areas on the grid
-            for contour in contours:
-                # Process larger contours only to avoid noise
-                if cv2.contourArea(contour) > 50:
-                    for point in contour:
-                        x, y = point[0]
-                        grid_y = min(y // cell_height, grid_height - 1)
-                        grid_x = min(x // cell_width, grid_width - 1)
-                        map_grid[grid_y, grid_x] = 2  # Mark as carpet
-            
-            # Detect stairs - looking for yellow/tan colors common in stair graphics
-            stair_lower = np.array([150, 150, 0])
-            stair_upper = np.array([255, 255, 150])
-            stair_mask = cv2.inRange(game_area, stair_lower, stair_upper)
-            
-            # Find contours for stairs
-            stair_contours, _ = cv2.findContours(stair_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            stair_position = None
-            
-            # Mark stair areas on the grid
-            for contour in stair_contours:
-                if cv2.contourArea(contour) > 30:
-                    # Find the centroid of the stair area
-                    M = cv2.moments(contour)
-                    if M["m00"] > 0:
-                        cx = int(M["m10"] / M["m00"])
-                        cy = int(M["m01"] / M["m00"])
-                        
-                        # Convert to grid coordinates
-                        stair_grid_y = min(cy // cell_height, grid_height - 1)
-                        stair_grid_x = min(cx // cell_width, grid_width - 1)
-                        
-                        map_grid[stair_grid_y, stair_grid_x] = 3  # Mark as stairs
-                        stair_position = (stair_grid_x, stair_grid_y)
-            
-            return {
-                'map_grid': map_grid,
-                'player_position': player_position,
-                'stair_position': stair_position,
-                'original_image': img_rgb
-            }
+            result['original_image'] = img_rgb
+            return result
             
         except Exception as e:
             print(f"Error analyzing screenshot: {str(e)}")
@@ -841,6 +764,7 @@ class Neo4jMemory:
         # Update map from screenshot if provided
         self.add_turn_neo4j(buttons_pressed, observation, screenshot_file=screenshot_path, turn_number=turn)
         if screenshot_path:
+            self._track_screen_change(screenshot_path)
             try:
                 # First process the screenshot to get map data
                 map_data = self.detect_player_and_elements(screenshot_path)
@@ -967,10 +891,25 @@ class Neo4jMemory:
         
         return summary
     
+    def _track_screen_change(self, screenshot_path):
+        """Count consecutive turns whose screenshot matches the previous one (feeds loop detection)"""
+        try:
+            diff = self.frame_diff.observe(screenshot_path)
+        except Exception as e:
+            print(f"Error comparing screenshots: {e}")
+            return
+        if diff is not None and diff.kind in ("unchanged", "blocked"):
+            self.consecutive_similar_screens += 1
+        elif diff is not None:
+            self.consecutive_similar_screens = 0
+    
     def detect_barrier_from_movement(self, pre_screenshot, post_screenshot, direction):
             """
             Detect barriers by analyzing player movement between screenshots
             
+            The camera follows the player, so a successful step scrolls the
+            background; a still background after a direction press is a barrier.
+            
             Args:
                 pre_screenshot: Path to screenshot before movement
                 post_screenshot: Path to screenshot after movement attempt
@@ -980,28 +919,16 @@ class Neo4jMemory:
                 tuple: (barrier_detected, barrier_position)
             """
             try:
-                # Detect player in both screenshots
-                pre_info = self.detect_player_and_elements(pre_screenshot)
-                post_info = self.detect_player_and_elements(post_screenshot)
-                
-                if not pre_info or not post_info:
-                    return False, None
-                    
-                pre_player_pos = pre_info.get('player_position')
-                post_player_pos = post_info.get('player_position')
+                diff = self.frame_diff.compare(pre_screenshot, post_screenshot, direction)
                 
-                if not pre_player_pos or not post_player_pos:
-                    return False, None
+                if diff.blocked:
+                    # Grid position of the player before the attempt (only needed when blocked)
+                    pre_info = self.detect_player_and_elements(pre_screenshot)
+                    pre_player_pos = pre_info.get('player_position') if pre_info else None
+                    if not pre_player_pos:
+                        return True, None
+                    px1, py1 = pre_player_pos
                     
-                # Check if player position changed significantly
-                px1, py1 = pre_player_pos
-                px2, py2 = post_player_pos
-                
-                # Calculate Euclidean distance between positions
-                movement_distance = ((px2-px1)**2 + (py2-py1)**2)**0.5
-                
-                # If player barely moved, likely hit a barrier
-                if movement_distance < 0.8:  # Threshold can be adjusted
                     # Calculate where the barrier would be based on direction
                     barrier_x, barrier_y = px1, py1
                     
@@ -1088,21 +1015,8 @@ init_message = read_prompt("prompts/fight_pokemon_2.md")
 def are_images_similar(image1_path, image2_path, threshold=0.95):
     """Compare two images to detect if movement was blocked by a barrier"""
     try:
-        img1 = Image.open(image1_path).convert('RGB')
-        img2 = Image.open(image2_path).convert('RGB')
-        
-        # Focus on game area only by cropping
-        img1 = img1.resize((200, 200))
-        img2 = img2.resize((200, 200))
-        
-        # Convert to numpy arrays
-        arr1 = np.array(img1)
-        arr2 = np.array(img2)
-        
-        # Simple comparison - check percentage of identical pixels
-        similar_pixels = np.sum(np.abs(arr1 - arr2) < 10) / arr1.size
-        # print(similar_pixels)
-        return similar_pixels > threshold
+        # Grayscale thumbnails from the shared ring buffer - each screenshot is read once
+        return get_frame_diff_engine().similarity(image1_path, image2_path) > threshold
     except Exception as e:
         print(f"Error comparing images: {e}")
         return False
\ No newline at end of file
@@ -9,7 +9,8 @@ from google.generativeai.types import FunctionDeclaration, Tool  # Import Functi
 import traceback
 # Load environment variables from .env file
 load_dotenv()
-from gamememory import GameMemory, init_message, are_images_similar
+from gamememory import GameMemory, init_message
+from frame_diff import get_frame_diff_engine
 
 # Configure the emulator window title
 WINDOW_TITLE = "mGBA - 0.10.5"
@@ -227,19 +228,22 @@ try:
                                 print(f"********** Gemini requested to press: {button_presses}")
                                 actions_taken = []
                                 failed_actions = []
+                                frame_diff = get_frame_diff_engine()
                                 pre_action_screenshot = controller.capture_screen()
+                                # Thumbnail taken now: capture_screen overwrites the same file every time
+                                pre_frame = frame_diff.push(pre_action_screenshot)
                                 for action in button_presses:
                                     success = controller.press_button(action)
                                     time.sleep(1)
                                        # After action, check if we hit a barrier
                                     if action in ["up", "down", "left", "right"]:
-                                        post_action_screenshot = controller.capture_screen()
-                                        barrier_detected = are_images_similar(pre_action_screenshot, post_action_screenshot)
+                                        post_frame = frame_diff.push(controller.capture_screen())
+                                        barrier_detected = frame_diff.compare(pre_frame, post_frame, action).blocked
                                         if barrier_detected:
                                             # print(f"BARRIER DETECTED when moving {action}")
                                             # game_memory.record_failed_move(action)
                                             pass
-                                        pre_action_screenshot = post_action_screenshot
+                                        pre_frame = post_frame
 
                                     if success:
                                         actions_taken.append(action)
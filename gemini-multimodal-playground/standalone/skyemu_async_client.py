@@ -0,0 +1,189 @@
+"""
+Async SkyEmu HTTP API Client
+
+asyncio counterpart of SkyEmuClient. Requests run on worker threads over the
+shared keep-alive pool from skyemu_transport, so a screenshot and a RAM read
+can be in flight at the same time without opening a second connection pool.
+"""
+import asyncio
+from io import BytesIO
+from typing import Dict, List, Optional, Sequence, Tuple, Any
+
+import requests
+
+from skyemu_transport import SkyEmuTransport, get_transport, default_endpoint
+
+
+class AsyncSkyEmuClient:
+    """asyncio client for SkyEmu's HTTP Control Server API."""
+
+    def __init__(self, host=None, port=None, transport: Optional[SkyEmuTransport] = None):
+        """Initialize the async SkyEmu client.
+
+        Args:
+            host: Hostname of the SkyEmu HTTP server (default: SKYEMU_HOST or localhost)
+            port: Port number of the SkyEmu HTTP server (default: SKYEMU_PORT or 8080)
+            transport: Transport to use (process-wide pool if omitted)
+        """
+        default_host, default_port = default_endpoint()
+        host = host or default_host
+        port = port or default_port
+        self.base_url = f"http://{host}:{port}"
+        self.transport = transport if transport is not None else get_transport()
+
+    async def _get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """Make a GET request to the SkyEmu API without blocking the event loop.
+
+        Args:
+            endpoint: API endpoint path
+            params: Optional query parameters
+
+        Returns:
+            Response from the server
+        """
+        return await asyncio.to_thread(self.transport.get, self.base_url, endpoint, params)
+
+    async def ping(self) -> bool:
+        """Check if the SkyEmu server is running.
+
+        Returns:
+            True if server is running, False otherwise
+        """
+        try:
+            response = await self._get("ping")
+            return response.text == "pong"
+        except Exception:
+            return False
+
+    async def step(self, frames: int = 1) -> bool:
+        """Step the emulator forward by a specific number of frames.
+
+        Args:
+            frames: Number of frames to step
+
+        Returns:
+            True if successful
+        """
+        response = await self._get("step", {"frames": frames})
+        return response.text == "ok"
+
+    async def run(self) -> bool:
+        """Unpause the emulator and run at normal speed.
+
+        Returns:
+            True if successful
+        """
+        response = await self._get("run")
+        return response.text == "ok"
+
+    async def get_screen_bytes(self, format="png", embed_state=False) -> bytes:
+        """Get the current emulator screen as encoded image bytes (no decode).
+
+        Args:
+            format: Image format (png, jpg, or bmp)
+            embed_state: Whether to embed emulation state in the image
+
+        Returns:
+            Encoded image bytes exactly as sent by the server
+        """
+        params = {"format": format}
+        if embed_state:
+            params["embed_state"] = 1
+        response = await self._get("screen", params)
+        return response.content
+
+    async def get_screen(self, format="png", embed_state=False):
+        """Get a screenshot of the current emulator screen.
+
+        Args:
+            format: Image format (png, jpg, or bmp)
+            embed_state: Whether to embed emulation state in the image
+
+        Returns:
+            PIL Image object of the current screen
+        """
+        from PIL import Image
+        return Image.open(BytesIO(await self.get_screen_bytes(format, embed_state)))
+
+    async def read_bytes(self, addresses: List[int], map_id: int = 0) -> List[int]:
+        """Read bytes from the emulated memory.
+
+        Args:
+            addresses: List of memory addresses to read
+            map_id: Memory map ID (0 for default, 7 for ARM7, 9 for ARM9 in NDS)
+
+        Returns:
+            List of byte values read from memory
+        """
+        params: Dict[str, Any] = {"addr": [f"{addr:X}" for addr in addresses]}
+        if map_id != 0:
+            params["map"] = map_id
+        response = await self._get("read_byte", params)
+        return list(bytes.fromhex(response.text.strip('\x00 \t\n\r')))
+
+    async def read_regions(self, regions: Sequence[Tuple[int, int]]) -> List[bytes]:
+        """Read several (address, length) regions in one request using inclusive ranges.
+
+        Args:
+            regions: (address, length) pairs
+
+        Returns:
+            One bytes object per region
+        """
+        params = {"addr": [f"{addr:X}" if length == 1 else f"{addr:X}-{addr + length - 1:X}"
+                           for addr, length in regions]}
+        response = await self._get("read_byte", params)
+        data = bytes.fromhex(response.text.strip('\x00 \t\n\r'))
+        if len(data) != sum(length for _, length in regions):
+            raise ValueError(f"Expected {sum(length for _, length in regions)} bytes, got {len(data)}")
+        chunks, offset = [], 0
+        for _, length in regions:
+            chunks.append(data[offset:offset + length])
+            offset += length
+        return chunks
+
+    async def set_input(self, input_states: Dict[str, int]) -> bool:
+        """Set the state of emulator inputs.
+
+        Args:
+            input_states: Dictionary mapping input names to states (0 or 1)
+
+        Returns:
+            True if successful
+        """
+        response = await self._get("input", input_states)
+        return response.text == "ok"
+
+    async def get_status(self) -> Dict:
+        """Get emulator status as a dict (error key on failure)."""
+        try:
+            response = await self._get("status")
+            if response.text.strip() == "":
+                return {"error": "Empty response from server"}
+            return response.json()
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def save_state(self, path: str) -> bool:
+        """Save the current emulation state to a file.
+
+        Args:
+            path: Path where to save the state
+
+        Returns:
+            True if successful
+        """
+        response = await self._get("save", {"path": path})
+        return response.text == "ok"
+
+    async def load_state(self, path: str) -> bool:
+        """Load an emulation state from a file.
+
+        Args:
+            path: Path to the state file
+
+        Returns:
+            True if successful
+        """
+        response = await self._get("load", {"path": path})
+        return response.text == "ok"
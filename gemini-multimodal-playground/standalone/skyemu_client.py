@@ -9,17 +9,21 @@ from typing import Dict, List, Optional, Tuple, Union, Any
 import base64
 from io import BytesIO
 from PIL import Image
+from skyemu_transport import get_transport, default_endpoint
 
 class SkyEmuClient:
     """Client for SkyEmu's HTTP Control Server API."""
     
-    def __init__(self, host="localhost", port=8080):
+    def __init__(self, host=None, port=None):
         """Initialize the SkyEmu client.
         
         Args:
-            host: Hostname of the SkyEmu HTTP server
-            port: Port number of the SkyEmu HTTP server
+            host: Hostname of the SkyEmu HTTP server (default: SKYEMU_HOST or localhost)
+            port: Port number of the SkyEmu HTTP server (default: SKYEMU_PORT or 8080)
         """
+        default_host, default_port = default_endpoint()
+        host = host or default_host
+        port = port or default_port
         self.base_url = f"http://{host}:{port}"
         # Verify the server is running
         self.ping()
@@ -34,10 +38,8 @@ class SkyEmuClient:
         Returns:
             Response from the server
         """
-        url = f"{self.base_url}/{endpoint}"
-        response = requests.get(url, params=params)
-        response.raise_for_status()  # Raise exception for error status codes
-        return response
+        # Shared keep-alive pool; raises for error status codes
+        return get_transport().get(self.base_url, endpoint, params)
     
     def ping(self) -> bool:
         """Check if the SkyEmu server is running.
@@ -72,22 +74,34 @@ class SkyEmuClient:
         response = self._get("run")
         return response.text == "ok"
     
-    def get_screen(self, format="png", embed_state=False) -> Image.Image:
-        """Get a screenshot of the current emulator screen.
+    def get_screen_bytes(self, format="png", embed_state=False) -> bytes:
+        """Get the current emulator screen as encoded image bytes (no decode).
         
         Args:
             format: Image format (png, jpg, or bmp)
             embed_state: Whether to embed emulation state in the image
             
         Returns:
-            PIL Image object of the current screen
+            Encoded image bytes exactly as sent by the server
         """
         params = {"format": format}
         if embed_state:
             params["embed_state"] = 1
             
         response = self._get("screen", params)
-        img_data = BytesIO(response.content)
+        return response.content
+    
+    def get_screen(self, format="png", embed_state=False) -> Image.Image:
+        """Get a screenshot of the current emulator screen.
+        
+        Args:
+            format: Image format (png, jpg, or bmp)
+            embed_state: Whether to embed emulation state in the image
+            
+        Returns:
+            PIL Image object of the current screen
+        """
+        img_data = BytesIO(self.get_screen_bytes(format, embed_state))
         return Image.open(img_data)
     
     def read_bytes(self, addresses: List[int], map_id: int = 0) -> List[int]:
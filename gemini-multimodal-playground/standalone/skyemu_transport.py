@@ -0,0 +1,170 @@
+"""
+SkyEmu HTTP Transport
+
+A process-wide, keep-alive connection pool shared by every SkyEmu client,
+with per-endpoint timeouts, a retry policy for idempotent endpoints and
+latency / connection-reuse metrics.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class SkyEmuTransport:
+    """Pooled HTTP transport for SkyEmu's HTTP Control Server."""
+
+    # Seconds before a request to each endpoint is abandoned
+    DEFAULT_TIMEOUTS = {
+        "ping": 1.0,
+        "status": 1.0,
+        "read_byte": 1.0,
+        "write_byte": 1.0,
+        "input": 1.0,
+        "run": 1.0,
+        "screen": 3.0,
+        "step": 5.0,
+        "save": 10.0,
+        "load": 10.0,
+        "load_rom": 30.0,
+    }
+    DEFAULT_TIMEOUT = 5.0
+
+    # Endpoints whose effect depends on how many times they are sent;
+    # a retry after a timeout could apply them twice
+    NON_IDEMPOTENT_ENDPOINTS = {"step", "load_rom"}
+
+    def __init__(self, pool_size: int = 8, max_retries: int = 2, retry_backoff: float = 0.05,
+                 timeouts: Optional[Dict[str, float]] = None, session: Any = None):
+        """Initialize the transport.
+
+        Args:
+            pool_size: Keep-alive connections kept per host
+            max_retries: Extra attempts for idempotent endpoints on connection errors/timeouts
+            retry_backoff: Base delay in seconds between retries (doubles each attempt)
+            timeouts: Per-endpoint timeout overrides
+            session: Pre-built session (e.g. an offline fake); pooled requests.Session if omitted
+        """
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.timeouts = dict(self.DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+
+        if session is None:
+            session = requests.Session()
+            self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+            session.mount("http://", self._adapter)
+        else:
+            self._adapter = None
+        self.session = session
+
+        self._lock = threading.Lock()
+        self._endpoint_stats: Dict[str, Dict[str, float]] = {}
+
+    def timeout_for(self, endpoint: str) -> float:
+        """Timeout in seconds for an endpoint."""
+        return self.timeouts.get(endpoint, self.DEFAULT_TIMEOUT)
+
+    def get(self, base_url: str, endpoint: str, params: Optional[Dict[str, Any]] = None,
+            timeout: Optional[float] = None) -> requests.Response:
+        """Make a GET request to the SkyEmu API over the shared pool.
+
+        Args:
+            base_url: Server URL, e.g. http://localhost:8080
+            endpoint: API endpoint path
+            params: Optional query parameters
+            timeout: Override for the endpoint's default timeout
+
+        Returns:
+            Response from the server (HTTP errors raise requests.HTTPError)
+        """
+        url = f"{base_url}/{endpoint}"
+        timeout = timeout if timeout is not None else self.timeout_for(endpoint)
+        attempts = 1 if endpoint in self.NON_IDEMPOTENT_ENDPOINTS else 1 + self.max_retries
+
+        for attempt in range(attempts):
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=timeout)
+                response.raise_for_status()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self._record(endpoint, time.perf_counter() - start, error=True, retried=attempt > 0)
+                if attempt + 1 >= attempts:
+                    raise
+                time.sleep(self.retry_backoff * (2 ** attempt))
+                continue
+            except Exception:
+                self._record(endpoint, time.perf_counter() - start, error=True, retried=attempt > 0)
+                raise
+            self._record(endpoint, time.perf_counter() - start, error=False, retried=attempt > 0)
+            return response
+
+    def _record(self, endpoint: str, elapsed: float, error: bool, retried: bool) -> None:
+        with self._lock:
+            stats = self._endpoint_stats.setdefault(
+                endpoint, {"requests": 0, "errors": 0, "retries": 0, "total_ms": 0.0, "max_ms": 0.0})
+            elapsed_ms = elapsed * 1000
+            stats["requests"] += 1
+            stats["errors"] += int(error)
+            stats["retries"] += int(retried)
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def _connection_stats(self) -> Dict[str, int]:
+        """New connections opened vs requests sent, from the urllib3 pools."""
+        opened = sent = 0
+        if self._adapter is not None:
+            for key in list(self._adapter.poolmanager.pools.keys()):
+                pool = self._adapter.poolmanager.pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    sent += pool.num_requests
+        return {
+            "connections_opened": opened,
+            "connections_reused": max(0, sent - opened),
+            "reuse_ratio": (sent - opened) / sent if sent else 0.0,
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-endpoint latency/error counts plus connection reuse."""
+        with self._lock:
+            endpoints = {
+                name: {
+                    "requests": int(s["requests"]),
+                    "errors": int(s["errors"]),
+                    "retries": int(s["retries"]),
+                    "avg_ms": s["total_ms"] / s["requests"] if s["requests"] else 0.0,
+                    "max_ms": s["max_ms"],
+                }
+                for name, s in self._endpoint_stats.items()
+            }
+        metrics = {"endpoints": endpoints}
+        metrics.update(self._connection_stats())
+        return metrics
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+
+def default_endpoint() -> Tuple[str, int]:
+    """SkyEmu host and port from SKYEMU_HOST / SKYEMU_PORT (localhost:8080 by default)."""
+    return os.getenv("SKYEMU_HOST", "localhost"), int(os.getenv("SKYEMU_PORT", "8080"))
+
+
+_global_transport: Optional[SkyEmuTransport] = None
+_global_transport_lock = threading.Lock()
+
+
+def get_transport() -> SkyEmuTransport:
+    """Get the process-wide SkyEmu transport."""
+    global _global_transport
+    if _global_transport is None:
+        with _global_transport_lock:
+            if _global_transport is None:
+                _global_transport = SkyEmuTransport()
+    return _global_transport
@@ -0,0 +1,246 @@
+"""
+Tile Grid Engine
+
+Splits a game frame into a grid of tiles and computes per-tile colour
+statistics and terrain classifications in one vectorized pass. The frame is
+converted to HSV once and reduced tile-wise with segmented sums; tile_view
+exposes the same grid as a (rows, cols, tile_h, tile_w, 3) view for per-pixel
+work. There is no per-tile cropping, copying or colour conversion.
+
+Used by the ASCII map builders (screen_tiling_to_ascii.py, screen_preprocess.py)
+and by EeveeAgent's navigation grid. Grids are given as columns x rows:
+"8x8" is the legacy navigation grid, "15x10" the native 16x16-pixel GBA
+metatile grid.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+LEGACY_GRID = (8, 8)
+METATILE_GRID = (15, 10)  # 240x160 screen / 16px metatiles
+
+# 8x8-grid tiles whose saturated grass is walkable anyway (hand-tuned for the legacy grid only)
+LEGACY_WALKABLE_POSITIONS = [(0, 2), (1, 2), (1, 4), (1, 7), (2, 1), (3, 1), (3, 2), (5, 4), (5, 7)]
+
+
+def parse_grid(spec: Union[str, Tuple[int, int]]) -> Tuple[int, int]:
+    """Parse "15x10" (columns x rows) or a (columns, rows) tuple"""
+    if isinstance(spec, str):
+        cols, _, rows = spec.lower().partition("x")
+        return int(cols), int(rows)
+    cols, rows = spec
+    return int(cols), int(rows)
+
+
+# OpenCV's fixed-point division tables for 8-bit RGB -> HSV (shift of 12 bits)
+HSV_SHIFT = 12
+_levels = np.arange(256, dtype=np.float64)
+SDIV_TABLE = np.where(_levels > 0, np.round((255 << HSV_SHIFT) / np.maximum(_levels, 1)), 0).astype(np.int64)
+HDIV_TABLE = np.where(_levels > 0, np.round((180 << HSV_SHIFT) / (6.0 * np.maximum(_levels, 1))), 0).astype(np.int64)
+
+
+def rgb_to_hsv(pixels: np.ndarray) -> np.ndarray:
+    """
+    Convert an RGB uint8 image to OpenCV-convention HSV (H 0-179, S and V 0-255)
+
+    Uses OpenCV when installed; the NumPy fallback reproduces its integer
+    arithmetic, so both give identical values.
+    """
+    if CV2_AVAILABLE:
+        return cv2.cvtColor(np.ascontiguousarray(pixels), cv2.COLOR_RGB2HSV)
+
+    rgb = pixels.astype(np.int64)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    v = rgb.max(axis=-1)
+    diff = v - rgb.min(axis=-1)
+    round_half = 1 << (HSV_SHIFT - 1)
+    s = (diff * SDIV_TABLE[v] + round_half) >> HSV_SHIFT
+    h = np.where(v == r, g - b, np.where(v == g, b - r + 2 * diff, r - g + 4 * diff))
+    h = (h * HDIV_TABLE[diff] + round_half) >> HSV_SHIFT
+    h = np.where(h < 0, h + 180, h)
+    return np.stack([h, s, v], axis=-1).astype(np.uint8)
+
+
+@dataclass
+class TileGridResult:
+    """Per-tile statistics and classification for one frame; arrays are (rows, cols, ...)"""
+    mean_rgb: np.ndarray   # int, truncated channel means
+    mean_hsv: np.ndarray   # int, truncated channel means
+    chars: np.ndarray      # single-character terrain codes
+    walkable: np.ndarray   # bool
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.chars.shape
+
+    def ascii_rows(self, player: Optional[Tuple[int, int]] = None) -> list:
+        """Map rows as strings, with "P" at `player` (row, col) if given"""
+        chars = self.chars.copy()
+        if player is not None:
+            chars[player] = "P"
+        return ["".join(row) for row in chars]
+
+
+def classify_hsv(mean_hsv: np.ndarray, legacy_positions: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Classify tiles from their mean HSV, all tiles at once
+
+    Same thresholds as the original per-tile classifier; the rules are tried
+    in order and the first match wins.
+
+    Args:
+        mean_hsv: (rows, cols, 3) integer mean HSV per tile
+        legacy_positions: Apply the 8x8-grid row/position exceptions for saturated grass
+
+    Returns:
+        (chars, walkable) arrays of shape (rows, cols)
+    """
+    h, s, v = mean_hsv[..., 0], mean_hsv[..., 1], mean_hsv[..., 2]
+    rows, cols = h.shape
+
+    grass = (40 <= h) & (h <= 52) & (v > 150)
+    conditions = [
+        (44 <= h) & (h <= 48) & (s > 175) & (125 <= v) & (v <= 160),  # tree
+        (30 <= h) & (h <= 32) & (125 <= s) & (s <= 145) & (v > 200),  # path
+        grass,
+        (90 < h) & (h < 130) & (s > 50),                              # water
+        (s < 40) & (v < 100),                                         # wall
+        ((h < 20) | (160 < h)) & (s > 50) & (v > 80),                 # building
+    ]
+    rule = np.select(conditions, range(len(conditions)), default=len(conditions))
+    chars = np.array(["T", "-", ".", "~", "#", "B", "."])[rule]
+
+    # Grass is walkable in the middle rows or when less saturated; otherwise only at known positions
+    row_index = np.arange(rows)[:, None]
+    middle = (row_index >= rows // 2 - 1) & (row_index <= rows // 2)
+    grass_walkable = middle | (s < 160)
+    if legacy_positions:
+        known = np.zeros((rows, cols), dtype=bool)
+        for y, x in LEGACY_WALKABLE_POSITIONS:
+            if y < rows and x < cols:
+                known[y, x] = True
+        grass_walkable |= known
+    walkable = np.array([False, True, False, False, False, False, True])[rule]
+    walkable |= (rule == 2) & grass_walkable
+    return chars, walkable
+
+
+class TileGrid:
+    """
+    Vectorized tile statistics for a fixed grid
+
+    Tiles are width // cols by height // rows pixels, taken from the top-left
+    like the original crop loops (any remainder on the right/bottom edge is
+    ignored).
+    """
+
+    def __init__(self, grid: Union[str, Tuple[int, int]] = LEGACY_GRID,
+                 classifier: Optional[Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]] = None):
+        """
+        Args:
+            grid: "COLSxROWS" or (cols, rows)
+            classifier: Function mapping (rows, cols, 3) mean HSV to (chars, walkable);
+                        defaults to classify_hsv (with the legacy exceptions on the 8x8 grid)
+        """
+        self.cols, self.rows = parse_grid(grid)
+        if classifier is None:
+            legacy = (self.cols, self.rows) == LEGACY_GRID
+            classifier = lambda mean_hsv: classify_hsv(mean_hsv, legacy_positions=legacy)
+        self.classifier = classifier
+
+    @property
+    def player_tile(self) -> Tuple[int, int]:
+        """(row, col) of the player, who is drawn at the screen centre"""
+        return self.rows // 2, self.cols // 2
+
+    def tile_view(self, array: np.ndarray) -> np.ndarray:
+        """(rows, cols, tile_h, tile_w, channels) view of an (H, W, channels) array without copying"""
+        height, width = array.shape[:2]
+        tile_h, tile_w = height // self.rows, width // self.cols
+        if tile_h == 0 or tile_w == 0:
+            raise ValueError(f"{width}x{height} frame is too small for a {self.cols}x{self.rows} grid")
+        cropped = array[:tile_h * self.rows, :tile_w * self.cols]
+        return cropped.reshape(self.rows, tile_h, self.cols, tile_w, -1).swapaxes(1, 2)
+
+    def tile_means(self, array: np.ndarray) -> np.ndarray:
+        """Truncated integer mean per tile and channel, shape (rows, cols, channels)"""
+        height, width = array.shape[:2]
+        tile_h, tile_w = height // self.rows, width // self.cols
+        if tile_h == 0 or tile_w == 0:
+            raise ValueError(f"{width}x{height} frame is too small for a {self.cols}x{self.rows} grid")
+        cropped = array[:tile_h * self.rows, :tile_w * self.cols]
+        # Two segmented reductions (rows of tiles, then columns) beat summing the strided 5-D view
+        sums = np.add.reduceat(cropped, np.arange(0, cropped.shape[0], tile_h), axis=0, dtype=np.uint32)
+        sums = np.add.reduceat(sums, np.arange(0, cropped.shape[1], tile_w), axis=1)
+        return (sums // (tile_h * tile_w)).astype(np.int64)
+
+    def analyze(self, pixels: np.ndarray, classify: bool = True) -> TileGridResult:
+        """
+        Compute per-tile statistics (and classifications) for an RGB frame
+
+        Args:
+            pixels: (H, W, 3) uint8 RGB array
+            classify: Run the classifier (otherwise every tile is walkable ".")
+
+        Returns:
+            TileGridResult
+        """
+        pixels = np.asarray(pixels, dtype=np.uint8)[..., :3]
+        mean_hsv = self.tile_means(rgb_to_hsv(pixels))
+        mean_rgb = self.tile_means(pixels)
+        if classify:
+            chars, walkable = self.classifier(mean_hsv)
+        else:
+            chars = np.full((self.rows, self.cols), ".")
+            walkable = np.ones((self.rows, self.cols), dtype=bool)
+        return TileGridResult(mean_rgb=mean_rgb, mean_hsv=mean_hsv, chars=chars, walkable=walkable)
+
+    def format_grid(self, result: TileGridResult, mark_player: bool = True) -> str:
+        """Grid with a column header and row numbers (multi-digit indices are shown mod 10)"""
+        rows = result.ascii_rows(self.player_tile if mark_player else None)
+        output = "  " + "".join(str(i % 10) for i in range(self.cols)) + "\n"
+        for y, row in enumerate(rows):
+            output += f"{y % 10} {row}\n"
+        return output
+
+    def write_debug(self, image, result: TileGridResult, tiles_dir: str = "tiles") -> str:
+        """
+        Save every tile image plus a text report of the per-tile statistics
+
+        Args:
+            image: PIL image the result was computed from
+            result: Analysis of that image
+            tiles_dir: Output directory
+
+        Returns:
+            Path of the analysis report
+        """
+        os.makedirs(tiles_dir, exist_ok=True)
+        width, height = image.size
+        tile_w, tile_h = width // self.cols, height // self.rows
+        report_path = os.path.join(tiles_dir, "tile_analysis.txt")
+        with open(report_path, "w") as report:
+            report.write("POKEMON TILE ANALYSIS\n")
+            report.write("====================\n\n")
+            report.write("Format: Position (y,x) | Classification | Walkable | Avg RGB | Avg HSV\n\n")
+            for y in range(self.rows):
+                for x in range(self.cols):
+                    tile = image.crop((x * tile_w, y * tile_h, (x + 1) * tile_w, (y + 1) * tile_h))
+                    tile.save(os.path.join(tiles_dir, f"{y}{x}.jpg"))
+                    report.write(f"Tile ({y},{x}): {result.chars[y, x]} | "
+                                 f"{'Walkable' if result.walkable[y, x] else 'Blocked'} | "
+                                 f"RGB={result.mean_rgb[y, x]} | HSV={result.mean_hsv[y, x]}\n")
+            report.write("\n\nTile Classification Summary:\n")
+            report.write("-------------------------\n")
+            for y, row in enumerate(result.ascii_rows(self.player_tile)):
+                report.write(f"Row {y}: {row}\n")
+        return report_path